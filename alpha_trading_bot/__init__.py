@@ -2,14 +2,7 @@
 Alpha Trading Bot - 精简版
 """
 
-from .config.models import (
-    Config,
-    ExchangeConfig,
-    TradingConfig,
-    AIConfig,
-    StopLossConfig,
-)
-from .core.bot import TradingBot, main
+from .utils.lazy_imports import lazy_exports
 
 __version__ = "4.0.0"
 __all__ = [
@@ -21,3 +14,17 @@ __all__ = [
     "TradingBot",
     "main",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".config.models": (
+            "Config",
+            "ExchangeConfig",
+            "TradingConfig",
+            "AIConfig",
+            "StopLossConfig",
+        ),
+        ".core.bot": ("TradingBot", "main"),
+    },
+)
@@ -19,81 +19,7 @@ AI模块 - 支持单AI/多AI融合
 - 信号集成器：统一接口，集成所有优化模块
 """
 
-from .client import AIClient, get_signal
-from .providers import PROVIDERS, get_provider_config
-from .prompt_builder import PromptBuilder, build_prompt
-from .response_parser import ResponseParser, parse_response, extract_signal
-from .fusion import (
-    FusionStrategy,
-    WeightedFusion,
-    MajorityFusion,
-    ConsensusFusion,
-    ConfidenceFusion,
-)
-from .adaptive_buy_condition import (
-    AdaptiveBuyCondition,
-    BuyConditions,
-    BuyConditionResult,
-)
-from .signal_optimizer import SignalOptimizer, OptimizerConfig, OptimizedSignal
-from .high_price_buy_optimizer import (
-    HighPriceBuyOptimizer,
-    HighPriceBuyConfig,
-    HighPriceBuyResult,
-)
-from .btc_price_detector import (
-    BTCPriceLevelConfig,
-    BTCPriceLevelDetector,
-    PriceLevelResult,
-    EnhancedBuyConfig,
-    EnhancedBuyOptimizer,
-)
-from .integrator import (
-    AISignalIntegrator,
-    IntegratedSignalResult,
-    create_integrator,
-)
-from .integrator_config import IntegrationConfig
-from .dynamic_sell_condition import (
-    SellConditionResult,
-    SellConditions,
-    DynamicSellCondition,
-)
-from .prompt_context import (
-    TrendRegime,
-    MomentumStrength,
-    MarketContext,
-)
-from .prompt_optimizer import (
-    PromptConfig,
-    OptimizedPromptBuilder,
-    AdaptivePromptSelector,
-    build_optimized_prompt,
-)
-from .trend_reversal_detector import (
-    TrendReversalSignal,
-    TrendMetrics,
-    TrendReversalDetector,
-)
-from .config_manager import (
-    AIConfig,
-    BuyConditionsConfig,
-    SellConditionsConfig,
-    FusionConfig,
-    TrendDetectionConfig,
-    SignalOptimizerConfig,
-    BacktestConfigConfig,
-    AIConfigManager,
-    load_ai_config,
-    create_default_config,
-)
-from .backtest_validator import (
-    TradeResult,
-    Trade,
-    BacktestResult,
-    BacktestConfig,
-    BacktestValidator,
-)
+from ..utils.lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 
@@ -101,6 +27,7 @@ __all__ = [
     # 客户端
     "AIClient",
     "get_signal",
+    "ReplayAIClient",
     # 提供商
     "PROVIDERS",
     "get_provider_config",
@@ -174,4 +101,85 @@ __all__ = [
     "IntegrationConfig",
     "IntegratedSignalResult",
     "create_integrator",
+    "SignalPipeline",
+    "IntegratorStage",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".client": ("AIClient", "get_signal"),
+        ".replay_client": ("ReplayAIClient",),
+        ".providers": ("PROVIDERS", "get_provider_config"),
+        ".prompt_builder": ("PromptBuilder", "build_prompt"),
+        ".response_parser": ("ResponseParser", "parse_response", "extract_signal"),
+        ".fusion": (
+            "FusionStrategy",
+            "WeightedFusion",
+            "MajorityFusion",
+            "ConsensusFusion",
+            "ConfidenceFusion",
+        ),
+        ".adaptive_buy_condition": (
+            "AdaptiveBuyCondition",
+            "BuyConditions",
+            "BuyConditionResult",
+        ),
+        ".signal_optimizer": ("SignalOptimizer", "OptimizerConfig", "OptimizedSignal"),
+        ".high_price_buy_optimizer": (
+            "HighPriceBuyOptimizer",
+            "HighPriceBuyConfig",
+            "HighPriceBuyResult",
+        ),
+        ".btc_price_detector": (
+            "BTCPriceLevelConfig",
+            "BTCPriceLevelDetector",
+            "PriceLevelResult",
+            "EnhancedBuyConfig",
+            "EnhancedBuyOptimizer",
+        ),
+        ".integrator": (
+            "AISignalIntegrator",
+            "IntegratedSignalResult",
+            "create_integrator",
+        ),
+        ".integrator_config": ("IntegrationConfig",),
+        ".integrator_pipeline": ("SignalPipeline", "IntegratorStage"),
+        ".dynamic_sell_condition": (
+            "SellConditionResult",
+            "SellConditions",
+            "DynamicSellCondition",
+        ),
+        ".prompt_context": ("TrendRegime", "MomentumStrength", "MarketContext"),
+        ".prompt_optimizer": (
+            "PromptConfig",
+            "OptimizedPromptBuilder",
+            "AdaptivePromptSelector",
+            "build_optimized_prompt",
+        ),
+        ".trend_reversal_detector": (
+            "TrendReversalSignal",
+            "TrendMetrics",
+            "TrendReversalDetector",
+        ),
+        ".config_manager": (
+            "AIConfig",
+            "BuyConditionsConfig",
+            "SellConditionsConfig",
+            "FusionConfig",
+            "TrendDetectionConfig",
+            "SignalOptimizerConfig",
+            "BacktestConfigConfig",
+            "AIConfigManager",
+            "load_ai_config",
+            "create_default_config",
+        ),
+        ".backtest_validator": (
+            "TradeResult",
+            "Trade",
+            "BacktestResult",
+            "BacktestConfig",
+            "BacktestValidator",
+        ),
+    },
+)
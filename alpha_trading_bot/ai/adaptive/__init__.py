@@ -5,10 +5,7 @@
 使交易系统能够根据当前市场状况自动调整交易参数。
 """
 
-from .parameter_manager import AdaptiveParameterManager, AdaptiveConfig
-from .market_regime import MarketRegimeDetector, MarketRegime
-from .performance_tracker import PerformanceTracker
-from .rules_engine import AdaptiveRulesEngine
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "AdaptiveParameterManager",
@@ -18,3 +15,13 @@ __all__ = [
     "PerformanceTracker",
     "AdaptiveRulesEngine",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".parameter_manager": ("AdaptiveParameterManager", "AdaptiveConfig"),
+        ".market_regime": ("MarketRegimeDetector", "MarketRegime"),
+        ".performance_tracker": ("PerformanceTracker",),
+        ".rules_engine": ("AdaptiveRulesEngine",),
+    },
+)
@@ -20,6 +20,8 @@ from datetime import datetime
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from ...utils import clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -263,7 +265,7 @@ class CircuitBreakerBoundary(RiskBoundary):
         """检查是否触发熔断"""
         # 检查冷却期
         if self._breaker_triggered and self._breaker_triggered_at:
-            elapsed = (datetime.now() - self._breaker_triggered_at).total_seconds()
+            elapsed = (clock.now() - self._breaker_triggered_at).total_seconds()
             cooldown = self.config.circuit_breaker_cooldown_hours * 3600
 
             if elapsed < cooldown:
@@ -282,7 +284,7 @@ class CircuitBreakerBoundary(RiskBoundary):
     def trigger_breaker(self, reason: str) -> None:
         """触发熔断"""
         self._breaker_triggered = True
-        self._breaker_triggered_at = datetime.now()
+        self._breaker_triggered_at = clock.now()
         self._breaker_reason = reason
         logger.warning(f"[风险] 触发熔断: {reason}")
 
@@ -396,7 +398,7 @@ class RiskControlManager:
             risk_level = RiskLevel.CRITICAL
 
         self._current_risk_level = risk_level
-        self._last_check = datetime.now()
+        self._last_check = clock.now()
 
         return RiskState(
             risk_level=risk_level,
@@ -21,6 +21,7 @@ from alpha_trading_bot.config.thresholds import (
     RSI_TREND_BUY_MAX,
     RSI_TREND_SELL_MIN,
 )
+from alpha_trading_bot.ai.feature_context import FeatureContext
 
 logger = logging.getLogger(__name__)
 
@@ -470,7 +471,7 @@ class CrashBounceStrategy(BaseStrategy):
         # 计算近期最大回撤（从价格历史中）
         max_recent_drop_ratio = 0.0
         if price_history and len(price_history) > 5:
-            recent_high = max(price_history[-30:]) if len(price_history) >= 30 else max(price_history)
+            _, recent_high = FeatureContext.of(market_data).price_range(-30, None)
             if recent_high > 0:
                 max_recent_drop_ratio = (recent_high - current_price) / recent_high
 
@@ -5,20 +5,34 @@
 - 基于历史数据验证交易策略表现
 - 计算关键指标（胜率、盈亏比、最大回撤等）
 - 生成回测报告
+- 撮合由 optimizer.backtest_kernel 完成（支持按最高/最低价判断止损/止盈）
 
 作者：AI Trading System
 日期：2026-02-04
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from statistics import mean, stdev
 
+import numpy as np
+
+from ..utils.result_cache import ResultCache
+from .optimizer.backtest_kernel import (
+    KernelConfig,
+    OHLCArrays,
+    encode_signals,
+    simulate,
+)
+
 logger = logging.getLogger(__name__)
 
+# 结果缓存版本：撮合/指标计算逻辑变化时递增
+_CACHE_VERSION = 1
+
 
 class TradeResult(Enum):
     """交易结果"""
@@ -77,6 +91,7 @@ class BacktestConfig:
     take_profit_percent: float = 0.06
     min_confidence_threshold: float = 0.5
     fee_percent: float = 0.001  # 0.1%手续费
+    tie_break: str = "stop_loss"  # 同一K线同时触及止损/止盈时先成交的一方
 
 
 class BacktestValidator:
@@ -90,14 +105,20 @@ class BacktestValidator:
     4. 生成回测报告
     """
 
-    def __init__(self, config: Optional[BacktestConfig] = None):
+    def __init__(
+        self,
+        config: Optional[BacktestConfig] = None,
+        result_cache: Optional[ResultCache] = None,
+    ):
         """
         初始化回测验证器
 
         Args:
             config: 回测配置
+            result_cache: 结果缓存（输入与配置相同时 run_backtest 直接返回缓存结果）
         """
         self.config = config or BacktestConfig()
+        self.result_cache = result_cache
         self.trades: List[Trade] = []
         self.capital_history: List[float] = [self.config.initial_capital]
         self._validate_config()
@@ -115,144 +136,143 @@ class BacktestValidator:
         signals: List[Dict[str, Any]],
         prices: List[float],
         timestamps: List[str],
+        highs: Optional[Sequence[float]] = None,
+        lows: Optional[Sequence[float]] = None,
+        opens: Optional[Sequence[float]] = None,
     ) -> BacktestResult:
         """
         运行回测
 
+        提供 highs/lows 时按K线最高/最低价判断止损/止盈（同一根K线同时触及时
+        按 config.tie_break 处理）；否则退化为按收盘价判断。
+
         Args:
             signals: 信号列表 [{"signal": "buy", "confidence": 0.7, ...}, ...]
-            prices: 价格列表
+            prices: 价格（收盘价）列表
             timestamps: 时间戳列表
+            highs: 最高价列表（可选）
+            lows: 最低价列表（可选）
+            opens: 开盘价列表（可选，用于跳空成交价）
 
         Returns:
             BacktestResult: 回测结果
         """
-        if not signals or len(signals) != len(prices):
+        if not signals or not len(signals) == len(prices) == len(timestamps):
             raise ValueError("信号、价格、时间戳长度必须一致")
 
-        self.trades.clear()
-        self.capital_history = [self.config.initial_capital]
+        if self.result_cache is not None:
+            key = self.result_cache.key(
+                _CACHE_VERSION,
+                self.config,
+                signals,
+                prices,
+                timestamps,
+                highs,
+                lows,
+                opens,
+            )
+            hit, cached = self.result_cache.lookup("backtest_validator", key)
+            if hit:
+                result: BacktestResult
+                result, self.capital_history = cached
+                self.trades = result.trades
+                return result
+
+        close = np.asarray(prices, dtype=np.float64)
+        ohlc = OHLCArrays(
+            open=close if opens is None else np.asarray(opens, dtype=np.float64),
+            high=close if highs is None else np.asarray(highs, dtype=np.float64),
+            low=close if lows is None else np.asarray(lows, dtype=np.float64),
+            close=close,
+        )
+        directions, confidence = encode_signals(signals, default_confidence=0.6)
+        result = self.run_arrays(ohlc, directions, confidence, timestamps)
 
-        capital = self.config.initial_capital
-        position = None  # 当前持仓
+        if self.result_cache is not None:
+            self.result_cache.put(
+                "backtest_validator", key, (result, self.capital_history)
+            )
+        return result
 
-        for i, (signal, price, timestamp) in enumerate(
-            zip(signals, prices, timestamps)
-        ):
-            confidence = signal.get("confidence", 0.6)
+    def run_arrays(
+        self,
+        ohlc: OHLCArrays,
+        directions: Union[np.ndarray, Sequence[int]],
+        confidence: Union[np.ndarray, Sequence[float]],
+        timestamps: Union[np.ndarray, Sequence[str]],
+    ) -> BacktestResult:
+        """
+        用已编码的列数组运行回测（参数扫描等场景复用同一份数组）
 
-            # 跳过置信度过低的信号
-            if confidence < self.config.min_confidence_threshold:
-                continue
+        Args:
+            ohlc: OHLC 列数组
+            directions: 信号方向数组（1 买 / -1 卖 / 0 观望）
+            confidence: 置信度数组
+            timestamps: 时间戳序列（只按交易的入场/出场下标读取）
 
-            # 处理当前持仓
-            if position:
-                # 检查是否触发止损/止盈
-                pnl_percent = (price - position["entry_price"]) / position[
-                    "entry_price"
-                ]
-                if position["side"] == "sell":
-                    pnl_percent = -pnl_percent
-
-                # 触发止损
-                if pnl_percent <= -self.config.stop_loss_percent:
-                    position = self._close_position(
-                        position, price, timestamp, pnl_percent, "stop_loss", confidence
-                    )
-                # 触发止盈
-                elif pnl_percent >= self.config.take_profit_percent:
-                    position = self._close_position(
-                        position,
-                        price,
-                        timestamp,
-                        pnl_percent,
-                        "take_profit",
-                        confidence,
-                    )
-
-            # 处理新信号
-            if not position and signal["signal"] in ["buy", "sell"]:
-                position = self._open_position(
-                    signal["signal"], price, timestamp, confidence
-                )
-
-        # 处理未平仓的持仓
-        if position:
-            final_price = prices[-1]
-            pnl_percent = (final_price - position["entry_price"]) / position[
-                "entry_price"
-            ]
-            if position["side"] == "sell":
-                pnl_percent = -pnl_percent
-
-            trade = self._close_position(
-                position,
-                final_price,
-                timestamps[-1],
-                pnl_percent,
-                "end_of_backtest",
-                position["confidence"],
-            )
-            trade.result = TradeResult.OPEN
-            self.trades.append(trade)
+        Returns:
+            BacktestResult: 回测结果
+        """
+        kernel = simulate(ohlc, directions, confidence, self.kernel_config())
+
+        self.capital_history = [self.config.initial_capital] + kernel.equity.tolist()
+        self.trades = [
+            self._to_trade(record, timestamps) for record in kernel.trades.to_records()
+        ]
 
         # 计算结果
         return self._calculate_results()
 
-    def _open_position(
-        self, side: str, price: float, timestamp: str, confidence: float
-    ) -> Dict[str, Any]:
-        """开仓"""
-        return {
-            "side": side,
-            "entry_price": price,
-            "entry_time": timestamp,
-            "confidence": confidence,
-        }
+    def kernel_config(self) -> KernelConfig:
+        """回测配置对应的内核参数（允许开空、反向信号不平仓、不复利）"""
+        return KernelConfig(
+            initial_capital=self.config.initial_capital,
+            position_size=self.config.position_size,
+            stop_loss_percent=self.config.stop_loss_percent,
+            take_profit_percent=self.config.take_profit_percent,
+            fee_percent=self.config.fee_percent,
+            min_confidence=self.config.min_confidence_threshold,
+            allow_short=True,
+            exit_on_signal=False,
+            compound=False,
+            tie_break=self.config.tie_break,
+        )
 
-    def _close_position(
-        self,
-        position: Dict[str, Any],
-        price: float,
-        timestamp: str,
-        pnl_percent: float,
-        reason: str,
-        confidence: float,
-    ) -> Optional[Trade]:
-        """平仓"""
-        pnl = self.config.initial_capital * self.config.position_size * pnl_percent
-
-        # 判断结果
-        if pnl_percent > 0.01:
+    def _to_trade(
+        self, record: Dict[str, Any], timestamps: Union[np.ndarray, Sequence[str]]
+    ) -> Trade:
+        """将内核交易记录转换为 Trade"""
+        pnl_percent = record["pnl_percent"]
+
+        # 判断结果（回测结束时仍未平仓的记为 OPEN）
+        if record["reason"] == "end_of_backtest":
+            result = TradeResult.OPEN
+        elif pnl_percent > 0.01:
             result = TradeResult.WIN
         elif pnl_percent < -0.01:
             result = TradeResult.LOSS
         else:
             result = TradeResult.BREAKEVEN
 
-        trade = Trade(
-            entry_time=position["entry_time"],
-            exit_time=timestamp,
-            entry_price=position["entry_price"],
-            exit_price=price,
-            side=position["side"],
-            pnl=pnl,
+        return Trade(
+            entry_time=timestamps[record["entry_index"]],
+            exit_time=timestamps[record["exit_index"]],
+            entry_price=record["entry_price"],
+            exit_price=record["exit_price"],
+            side="buy" if record["side"] == 1 else "sell",
+            pnl=record["pnl"],
             pnl_percent=pnl_percent,
             result=result,
-            confidence=confidence,
-            reason=reason,
+            confidence=record["confidence"],
+            reason=record["reason"],
         )
 
-        self.trades.append(trade)
-        return None
-
     def _calculate_results(self) -> BacktestResult:
         """计算回测结果"""
         # 统计交易
         winning_trades = [t for t in self.trades if t.result == TradeResult.WIN]
         losing_trades = [t for t in self.trades if t.result == TradeResult.LOSS]
         breakeven_trades = [t for t in self.trades if t.result == TradeResult.BREAKEVEN]
-        open_trades = [t for t in self.trades if t.result == TradeResult.CLOSED]
         open_trades = [t for t in self.trades if t.result == TradeResult.OPEN]
 
         # 计算胜率
@@ -308,17 +328,9 @@ class BacktestValidator:
         if not self.capital_history:
             return 0
 
-        max_capital = self.capital_history[0]
-        max_drawdown = 0
-
-        for capital in self.capital_history:
-            if capital > max_capital:
-                max_capital = capital
-            drawdown = (max_capital - capital) / max_capital
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-
-        return max_drawdown
+        capital = np.asarray(self.capital_history, dtype=np.float64)
+        peaks = np.maximum.accumulate(capital)
+        return float(((peaks - capital) / peaks).max())
 
     def _calculate_sharpe_ratio(self, returns: List[float]) -> float:
         """计算夏普比率"""
@@ -0,0 +1,143 @@
+"""
+周期特征上下文
+
+一个交易周期内，收益率、价格区间、市场环境、市场结构等派生特征会被
+多个模块（集成器、策略库、Prompt 构建、持续下跌检测、交易执行）使用。
+FeatureContext 挂在 market_data["features"] 上，各特征首次访问时计算并缓存，
+compute_counts 记录每个特征（含参数）实际计算的次数。
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, cast
+
+from alpha_trading_bot.exchange.models.candles import close_returns
+
+FEATURES_KEY = "features"
+
+
+class FeatureContext:
+    """单周期派生特征（惰性计算，按周期缓存）"""
+
+    def __init__(
+        self,
+        market_data: Dict[str, Any],
+        regime_detector: Any = None,
+        structure_analyzer: Any = None,
+    ) -> None:
+        self.market_data = market_data
+        self.regime_detector = regime_detector
+        self.structure_analyzer = structure_analyzer
+        self.compute_counts: Counter = Counter()
+        self._cache: Dict[Any, Any] = {}
+
+    @classmethod
+    def of(
+        cls,
+        market_data: Dict[str, Any],
+        regime_detector: Any = None,
+        structure_analyzer: Any = None,
+    ) -> "FeatureContext":
+        """
+        获取 market_data 上的特征上下文，不存在时创建并挂载
+
+        注意：不存在时会把新建的上下文写入调用方的 market_data["features"]，
+        之后拿到同一个 dict 的模块共用这份缓存；对 market_data 做拷贝的调用方
+        若需共享，应在拷贝前先调用一次本方法。已有上下文缺少检测器/分析器时
+        补充绑定。
+        """
+        context = market_data.get(FEATURES_KEY)
+        if not isinstance(context, cls):
+            context = cls(market_data)
+            market_data[FEATURES_KEY] = context
+        if context.regime_detector is None:
+            context.regime_detector = regime_detector
+        if context.structure_analyzer is None:
+            context.structure_analyzer = structure_analyzer
+        return context
+
+    # ------------------------------------------------------------------
+    # 基础数据
+    # ------------------------------------------------------------------
+
+    @property
+    def price(self) -> float:
+        return float(self.market_data.get("price", 0) or 0)
+
+    @property
+    def closes(self) -> Sequence[float]:
+        """收盘价序列（有 K 线序列时为零拷贝视图）"""
+        candles = self.market_data.get("candles")
+        if candles is not None:
+            return cast(Sequence[float], candles.closes)
+        return cast(Sequence[float], self.market_data.get("price_history", []))
+
+    # ------------------------------------------------------------------
+    # 派生特征
+    # ------------------------------------------------------------------
+
+    @property
+    def returns(self) -> Sequence[float]:
+        """相邻收盘价变化率"""
+
+        def compute() -> Sequence[float]:
+            candles = self.market_data.get("candles")
+            if candles is not None:
+                return cast(Sequence[float], candles.returns)
+            return close_returns(self.market_data.get("price_history", []))
+
+        return cast(Sequence[float], self._memo("returns", compute))
+
+    def price_range(
+        self, start: Optional[int] = None, stop: Optional[int] = None
+    ) -> Tuple[float, float]:
+        """price_history[start:stop] 的 (最低, 最高)，区间为空时返回 (0.0, 0.0)"""
+
+        def compute() -> Tuple[float, float]:
+            window = self.market_data.get("price_history", [])[start:stop]
+            if not len(window):
+                return 0.0, 0.0
+            return min(window), max(window)
+
+        return cast(
+            Tuple[float, float], self._memo(("price_range", start, stop), compute)
+        )
+
+    @property
+    def regime(self) -> Any:
+        """市场环境（MarketRegimeDetector.detect 每周期只调用一次）"""
+        if self.regime_detector is None:
+            raise RuntimeError("FeatureContext has no regime detector bound")
+        return self._memo(
+            "regime", lambda: self.regime_detector.detect(self.market_data)
+        )
+
+    @property
+    def structure(self) -> Any:
+        """市场结构分析结果"""
+        if self.structure_analyzer is None:
+            raise RuntimeError("FeatureContext has no structure analyzer bound")
+        technical = self.market_data.get("technical", {}) or {}
+        return self._memo(
+            "structure",
+            lambda: self.structure_analyzer.analyze(
+                price_history=self.closes,
+                current_price=self.price,
+                atr_percent=technical.get("atr_percent", 0),
+            ),
+        )
+
+    @property
+    def swing_points(self) -> Tuple[Sequence[float], Sequence[float]]:
+        """摆动高点与低点（取自市场结构分析结果）"""
+        structure = self.structure
+        return structure.swing_highs, structure.swing_lows
+
+    # ------------------------------------------------------------------
+    # 内部方法
+    # ------------------------------------------------------------------
+
+    def _memo(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self.compute_counts[key] += 1
+            self._cache[key] = compute()
+        return self._cache[key]
@@ -2,11 +2,7 @@
 AI信号融合策略模块
 """
 
-from .base import FusionStrategy, get_fusion_strategy
-from .weighted import WeightedFusion
-from .majority import MajorityFusion
-from .consensus import ConsensusFusion
-from .confidence import ConfidenceFusion
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "FusionStrategy",
@@ -16,3 +12,14 @@ __all__ = [
     "ConfidenceFusion",
     "get_fusion_strategy",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".base": ("FusionStrategy", "get_fusion_strategy"),
+        ".weighted": ("WeightedFusion",),
+        ".majority": ("MajorityFusion",),
+        ".consensus": ("ConsensusFusion",),
+        ".confidence": ("ConfidenceFusion",),
+    },
+)
@@ -8,6 +8,9 @@ AI信号优化集成器
 4. BTCPriceLevelDetector - BTC价格水平检测
 5. SustainedDeclineDetector - 持续下跌检测
 
+各模块作为流水线阶段按顺序执行（见 integrator_stages.py），
+阶段顺序可通过 IntegrationConfig.stages 组合。
+
 使用方式：
 from alpha_trading_bot.ai.integrator import AISignalIntegrator
 
@@ -16,8 +19,7 @@ result = integrator.process(market_data)
 """
 
 import logging
-import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 from .adaptive_buy_condition import (
@@ -34,6 +36,8 @@ from .sustained_decline_detector import (
     DeclineDetectionResult,
 )
 from .integrator_config import IntegrationConfig, SignalThresholdsConfig
+from .integrator_pipeline import SignalState, StageTiming
+from .integrator_stages import build_pipeline
 from .market_structure import MarketStructureAnalyzer, MarketStructureResult
 from .risk_reward_calculator import RiskRewardCalculator, RiskRewardResult
 
@@ -65,21 +69,24 @@ class IntegratedSignalResult:
     is_high_risk: bool = False
     is_low_opportunity: bool = False
     is_sustained_decline: bool = False
-    adjustments_made: list = None
+    adjustments_made: Optional[List[str]] = None
+    stage_timings: Optional[List[StageTiming]] = None  # 各阶段耗时
 
 
 class AISignalIntegrator:
     """
     AI信号优化集成器
 
-    信号处理流程：
-    1. SustainedDeclineDetector → 检测持续下跌趋势（新增，最先执行）
-    2. AdaptiveBuyCondition → 判断是否应该买入
-    3. SignalOptimizer → 优化信号和置信度
-    4. BTCPriceLevelDetector → 价格水平检测
-    5. HighPriceBuyOptimizer → 高位信号过滤
+    信号处理流程（默认阶段顺序）：
+    1. SustainedDeclineDetector → 检测持续下跌趋势（最先执行）
+    2. SHORT 信号专用优化
+    3. AdaptiveBuyCondition → 判断是否应该买入
+    4. MarketStructureAnalyzer + RiskRewardCalculator → 市场结构与R/R过滤
+    5. SignalOptimizer → 优化信号和置信度
+    6. BTCPriceLevelDetector → 价格水平检测
+    7. HighPriceBuyOptimizer → 高位信号过滤（仅 BUY）
 
-    最终输出优化后的信号
+    前置条件不满足的阶段直接跳过，最终输出优化后的信号
     """
 
     _thresholds: SignalThresholdsConfig = SignalThresholdsConfig()
@@ -97,6 +104,7 @@ class AISignalIntegrator:
         if thresholds is not None:
             self._thresholds = thresholds
         self._init_modules()
+        self.pipeline = build_pipeline(self, self.config.stages)
 
         logger.info("[AI信号集成器] 初始化完成")
         logger.info(f"  - 自适应买入: {self.config.enable_adaptive_buy}")
@@ -106,6 +114,7 @@ class AISignalIntegrator:
         logger.info(
             f"  - 持续下跌检测: {self.config.enable_sustained_decline_detector}"
         )
+        logger.info(f"  - 处理阶段: {' → '.join(self.pipeline.stage_names)}")
 
     def _init_modules(self):
         """初始化各模块"""
@@ -183,6 +192,8 @@ class AISignalIntegrator:
                     },
                     "price_history": List[float],
                     "hourly_changes": List[float],
+                    "candles": CandleSeries,  # 可选，列式K线序列
+                    "features": FeatureContext,  # 可选，本周期特征上下文
                     "cycle_start_price": float,  # 新增：周期开始价格
                 }
             original_signal: 原始信号
@@ -207,627 +218,34 @@ class AISignalIntegrator:
             )
             original_confidence = original_confidence / 100.0
 
-        # ========== 诊断日志：记录每个阶段的置信度 ==========
-        conf_history = [(0, "原始", original_confidence)]
-
-        # ===== 0. 持续下跌检测 (新增，最先执行) =====
-        decline_result = None
-        if (
-            self.sustained_decline_detector
-            and self.config.enable_sustained_decline_detector
-        ):
-            try:
-                decline_result = self.sustained_decline_detector.detect(
-                    market_data=market_data
-                )
-                result.sustained_decline_result = decline_result
-                result.is_sustained_decline = decline_result.is_detected
-
-                # 如果检测到持续下跌，根据结果调整信号
-                if decline_result.is_detected:
-                    # 记录检测到的下跌级别
-                    if decline_result.decline_level == "severe":
-                        logger.warning(
-                            f"[持续下跌检测] ⚠️ 检测到严重下跌趋势: "
-                            f"累积跌幅{decline_result.metrics.cumulative_decline_percent:.2f}% "
-                            f"(严重级别)"
-                        )
-                    elif decline_result.decline_level == "moderate":
-                        logger.warning(
-                            f"[持续下跌检测] ⚠️ 检测到中度下跌趋势: "
-                            f"累积跌幅{decline_result.metrics.cumulative_decline_percent:.2f}%"
-                        )
-                    else:
-                        logger.info(
-                            f"[持续下跌检测] ℹ️ 检测到轻度下跌趋势: "
-                            f"累积跌幅{decline_result.metrics.cumulative_decline_percent:.2f}%"
-                        )
-
-                    # 根据下跌级别调整信号
-                    if decline_result.should_block_buy:
-                        # 严重下跌，完全阻断BUY信号
-                        if original_signal == "BUY":
-                            original_signal = "HOLD"
-                            result.adjustments_made.append(
-                                "持续下跌检测: 严重下跌趋势，完全阻断BUY信号"
-                            )
-                            logger.warning("[持续下跌检测] 🚫 完全阻断BUY信号")
-                    else:
-                        # 非完全阻断情况下，降低BUY置信度或增加SELL置信度
-                        if original_signal == "BUY" and decline_result.buy_penalty > 0:
-                            old_conf = original_confidence
-                            original_confidence = max(
-                                original_confidence - decline_result.buy_penalty,
-                                self._t().confidence_floor,
-                            )
-                            result.adjustments_made.append(
-                                f"持续下跌检测: BUY信号置信度降低{decline_result.buy_penalty:.0%} "
-                                f"({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                            conf_history.append(
-                                (
-                                    self._t().confidence_base,
-                                    "下跌检测",
-                                    original_confidence,
-                                )
-                            )
-
-                        # 如果是SELL信号，增加置信度
-                        if original_signal == "SELL" and decline_result.sell_boost > 0:
-                            old_conf = original_confidence
-                            original_confidence = min(
-                                original_confidence + decline_result.sell_boost,
-                                self._t().confidence_ceiling,
-                            )
-                            result.adjustments_made.append(
-                                f"持续下跌检测: SELL信号置信度增加{decline_result.sell_boost:.0%} "
-                                f"({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                            conf_history.append(
-                                (
-                                    self._t().confidence_base,
-                                    "下跌检测",
-                                    original_confidence,
-                                )
-                            )
-
-            except Exception as e:
-                logger.warning(
-                    f"持续下跌检测处理失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-                )
-
-        # ===== 0.5. SHORT信号专用处理 =====
-        if original_signal.upper() == "SHORT":
-            logger.info("[信号集成] 检测到 SHORT 信号（趋势下跌苗头），应用做空优化...")
-
-            # 获取市场数据
-            technical = market_data.get("technical", {})
-            trend_direction = technical.get("trend_direction", "neutral")
-            trend_strength = technical.get("trend_strength", 0)
-            price_position = technical.get("price_position", 0.5)
-
-            # SHORT 信号的风险检查
-            # 1. 趋势检查：SHORT 信号需要趋势向下
-            if trend_direction not in ["down", "neutral"]:
-                logger.warning("[SHORT优化] 趋势向上时做空风险高，降低置信度")
-                old_conf = original_confidence
-                penalty = self._t().short_trend_up_penalty
-                penalty_floor = self._t().short_trend_up_penalty_floor
-                new_conf = old_conf * penalty
-                # 防止折扣后被永久封印 (task-card R1 + change-summary §3.3)
-                if new_conf < penalty_floor and old_conf >= penalty_floor:
-                    new_conf = penalty_floor
-                original_confidence = new_conf
-                result.adjustments_made.append(
-                    f"SHORT优化: 趋势非下跌，置信度降低{int((1 - penalty) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                )
-
-            # 2. 价格位置检查：价格太低时不建议做空（接近支撑位）
-            if price_position < self._t().short_very_low_price_threshold:
-                logger.warning(
-                    f"[SHORT优化] 价格位置过低（<{int(self._t().short_very_low_price_threshold * 100)}%），做空风险高"
-                )
-                old_conf = original_confidence
-                original_confidence *= self._t().short_very_low_price_penalty
-                result.adjustments_made.append(
-                    f"SHORT优化: 低价位做空风险高，置信度降低{int((1 - self._t().short_very_low_price_penalty) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                )
-            elif price_position < self._t().short_low_price_threshold:
-                old_conf = original_confidence
-                original_confidence *= self._t().short_low_price_penalty
-                result.adjustments_made.append(
-                    f"SHORT优化: 价格偏低（<{int(self._t().short_low_price_threshold * 100)}%），置信度降低{int((1 - self._t().short_low_price_penalty) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                )
-
-            # 3. 如果在持续下跌趋势中，SHORT 信号应该增强（这是顺势）
-            if decline_result and decline_result.is_detected:
-                old_conf = original_confidence
-                original_confidence = min(
-                    original_confidence * self._t().short_decline_boost,
-                    self._t().short_decline_boost_ceiling,
-                )
-                result.adjustments_made.append(
-                    f"SHORT优化: 持续下跌趋势中，置信度增加{int((self._t().short_decline_boost - 1) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                )
-
-            conf_history.append(
-                (self._t().confidence_base, "SHORT优化", original_confidence)
-            )
-
-            # ===== 0.6. 下跌趋势中 HOLD 转 SHORT =====
-            # 只有在明确的下跌趋势中才转换 HOLD → SHORT
-            # 条件：趋势强度 >= 0.30 + 显著跌幅 + 持续下跌确认 + RSI 确认
-            if original_signal.upper() == "HOLD":
-                technical = market_data.get("technical", {})
-                trend_direction = technical.get("trend_direction", "neutral")
-                trend_strength = technical.get("trend_strength", 0)
-                price_position = technical.get("price_position", 0.5)
-
-                # 获取短期跌幅（最近3根K线约15分钟）
-                short_term_drop = market_data.get("short_term_drop_percent", 0)
-
-                # RSI 条件：下跌趋势中 RSI 应该偏弱（<55）
-                rsi = technical.get("rsi", 50)
-
-                # 检查是否满足做空条件（严格条件）
-                is_downtrend = trend_direction == "down"
-                has_strong_strength = (
-                    trend_strength >= self._t().strong_trend_strength
-                )  # 必须有明显下跌趋势
-                has_significant_drop = (
-                    short_term_drop < self._t().short_term_drop
-                )  # 短期跌幅 >= 1.5%
-                not_too_low = (
-                    price_position > self._t().price_position_too_low
-                )  # 不在极低位（>30%）
-                is_sustained_decline = decline_result and decline_result.is_detected
-                rsi_confirms_down = rsi < self._t().strong_trend_rsi  # RSI 确认下跌
-
-                # 严格条件：必须同时满足
-                # 1. 明确下跌趋势（趋势强度 >= 0.30）
-                # 2. 显著短期跌幅（>= 1.5%）或持续下跌确认
-                # 3. 价格不在极低位（> 30%）
-                # 4. RSI 确认下跌（< 55）
-                should_convert = (
-                    is_downtrend
-                    and has_strong_strength
-                    and (has_significant_drop or is_sustained_decline)
-                    and not_too_low
-                    and rsi_confirms_down
-                )
-
-                if should_convert:
-                    logger.info(
-                        f"[信号转换] HOLD→SHORT: 趋势向下(强度{trend_strength:.2f}), "
-                        f"短期跌幅{short_term_drop:.2f}%, 价格位置{price_position * 100:.0f}%, "
-                        f"RSI={rsi:.1f}, 持续下跌={is_sustained_decline}"
-                    )
-                    original_signal = "SHORT"
-                    # 设置置信度
-                    if is_sustained_decline and has_significant_drop:
-                        original_confidence = (
-                            self._t().confidence_dual_confirm
-                        )  # 双重确认
-                    elif is_sustained_decline:
-                        original_confidence = (
-                            self._t().confidence_sustained
-                        )  # 持续下跌确认
-                    else:
-                        original_confidence = self._t().confidence_general  # 一般情况
-                    result.adjustments_made.append(f"信号转换: HOLD→SHORT (强下跌趋势)")
-                    conf_history.append(
-                        (
-                            self._t().confidence_sustained,
-                            "强下跌转换",
-                            original_confidence,
-                        )
-                    )
-
-            # ===== 下跌趋势中 HOLD 转 SHORT (价格位置检查) =====
-            # 严格条件：趋势强度 >= 0.30 + RSI 确认
-            if original_signal.upper() == "HOLD":
-                technical = market_data.get("technical", {})
-                trend_direction = technical.get("trend_direction", "neutral")
-                trend_strength = technical.get("trend_strength", 0)
-                price_position = technical.get("price_position", 0.5)
-                rsi = technical.get("rsi", 50)
-
-                is_downtrend = trend_direction == "down"
-                has_strong_strength = trend_strength >= self._t().strong_trend_strength
-                not_too_low = price_position > self._t().price_position_too_low
-                is_sustained_decline = decline_result and decline_result.is_detected
-                rsi_confirms_down = rsi < self._t().strong_trend_rsi
-
-                should_convert = (
-                    is_downtrend
-                    and has_strong_strength
-                    and is_sustained_decline
-                    and not_too_low
-                    and rsi_confirms_down
-                )
-
-                if should_convert:
-                    logger.info(
-                        f"[信号转换] HOLD→SHORT: 趋势向下(强度{trend_strength:.2f}), "
-                        f"价格位置{price_position * 100:.0f}%, RSI={rsi:.1f}, 持续下跌={is_sustained_decline}"
-                    )
-                    original_signal = "SHORT"
-                    original_confidence = self._t().confidence_sustained
-                    result.adjustments_made.append(f"信号转换: HOLD→SHORT (强下跌趋势)")
-                    conf_history.append(
-                        (
-                            self._t().confidence_sustained,
-                            "强下跌转换",
-                            original_confidence,
-                        )
-                    )
-
-        # 1. AdaptiveBuyCondition
-        # 1. AdaptiveBuyCondition
-        if self.adaptive_buy and self.config.enable_adaptive_buy:
-            try:
-                buy_result = self.adaptive_buy.should_buy(market_data=market_data)
-                result.buy_condition_result = buy_result
-
-                # 如果买入条件判断可以买入，提高置信度
-                if buy_result.can_buy:
-                    # 检查是否在持续下跌趋势中，如果是则谨慎对待
-                    if (
-                        decline_result
-                        and decline_result.is_detected
-                        and not decline_result.should_block_buy
-                    ):
-                        # 持续下跌趋势中，降低买入条件的置信度加成
-                        adjusted_buy_conf = buy_result.confidence * (
-                            1 - decline_result.buy_penalty
-                        )
-                        original_confidence = max(
-                            original_confidence, adjusted_buy_conf
-                        )
-                        if adjusted_buy_conf < buy_result.confidence:
-                            result.adjustments_made.append(
-                                f"自适应买入: {buy_result.mode}模式通过，但持续下跌趋势降低权重"
-                            )
-                    else:
-                        original_confidence = max(
-                            original_confidence, buy_result.confidence
-                        )
-
-                    original_signal = "BUY"
-                    result.adjustments_made.append(
-                        f"自适应买入: {buy_result.mode}模式通过"
-                    )
-
-                result.price_level = buy_result.mode
-                conf_history.append((1, "AdaptiveBuy", original_confidence))
-
-            except Exception as e:
-                logger.warning(
-                    f"AdaptiveBuyCondition处理失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-                )
-
-        # 1.5. 市场结构分析 + 风险收益比过滤（新增）
-        try:
-            price_history = market_data.get("price_history", [])
-            current_price = market_data.get("price", 0)
-            technical = market_data.get("technical", {})
-            atr_percent = technical.get("atr_percent", 0)
-
-            if price_history and current_price > 0:
-                structure_result = self.market_structure_analyzer.analyze(
-                    price_history=price_history,
-                    current_price=current_price,
-                    atr_percent=atr_percent,
-                )
-                result.market_structure_result = structure_result
-
-                # 将市场结构信息附加到 market_data 供决策引擎使用
-                # （注意：必须操作原始 market_data 引用，确保外部可见）
-                market_data["market_structure"] = structure_result.structure
-                market_data["market_structure_direction"] = (
-                    structure_result.suggested_direction
-                )
-                market_data["risk_reward_ratio"] = structure_result.risk_reward_ratio
-                market_data["nearest_support"] = structure_result.nearest_support
-                market_data["nearest_resistance"] = structure_result.nearest_resistance
-                market_data["position_size_factor"] = (
-                    structure_result.position_size_factor
-                )
-                short_rr_result = self.risk_reward_calculator.calculate_for_short(
-                    current_price=current_price,
-                    support=structure_result.nearest_support,
-                    resistance=structure_result.nearest_resistance,
-                    atr_percent=atr_percent,
-                )
-                market_data["short_risk_reward_ratio"] = short_rr_result.rr_ratio
-
-                # 风险收益比过滤 - 只对BUY信号生效
-                if original_signal == "BUY" and structure_result.risk_reward_ratio > 0:
-                    rr_result = self.risk_reward_calculator.calculate_for_long(
-                        current_price=current_price,
-                        support=structure_result.nearest_support,
-                        resistance=structure_result.nearest_resistance,
-                        atr_percent=atr_percent,
-                    )
-                    result.risk_reward_result = rr_result
-
-                    if not rr_result.should_trade:
-                        if rr_result.rr_ratio <= 0:
-                            # R/R计算因数据不足返回0，降低置信度但保留BUY信号
-                            old_conf = original_confidence
-                            original_confidence *= 0.70
-                            result.adjustments_made.append(
-                                f"R/R过滤: R/R数据不足(R/R=0)，"
-                                f"置信度降低30%({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                            conf_history.append((2, "R/R数据不足", original_confidence))
-                            logger.info(
-                                f"[R/R过滤] BUY信号R/R数据不足(R/R=0)，降级但保留BUY"
-                            )
-                        elif rr_result.rr_ratio >= 1.0:
-                            # R/R在1.0-1.5之间，降低置信度但保留BUY信号（精而准策略）
-                            old_conf = original_confidence
-                            original_confidence *= 0.80
-                            result.adjustments_made.append(
-                                f"R/R过滤: R/R={rr_result.rr_ratio:.2f}偏低，"
-                                f"置信度降低20%({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                            conf_history.append((2, "R/R偏低", original_confidence))
-                            logger.info(
-                                f"[R/R过滤] BUY信号R/R={rr_result.rr_ratio:.2f}偏低，降低置信度"
-                            )
-                        else:
-                            # R/R < 1.0，风险过高，降级为HOLD
-                            old_signal = original_signal
-                            original_signal = "HOLD"
-                            result.adjustments_made.append(
-                                f"R/R过滤: {old_signal}→HOLD, "
-                                f"R/R={rr_result.rr_ratio:.2f}不足(最低1.0)"
-                            )
-                            logger.info(
-                                f"[R/R过滤] {old_signal}→HOLD: R/R={rr_result.rr_ratio:.2f}不足"
-                            )
-                    elif rr_result.quality == "marginal":
-                        # R/R勉强，降低置信度
-                        old_conf = original_confidence
-                        original_confidence *= 0.85
-                        result.adjustments_made.append(
-                            f"R/R过滤: R/R={rr_result.rr_ratio:.2f}勉强, "
-                            f"置信度降低15%({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((2, "R/R过滤", original_confidence))
-                    elif rr_result.quality == "excellent":
-                        # R/R优质，小幅提升置信度
-                        old_conf = original_confidence
-                        original_confidence = min(
-                            original_confidence * 1.05, self._t().confidence_ceiling
-                        )
-                        result.adjustments_made.append(
-                            f"R/R过滤: R/R={rr_result.rr_ratio:.2f}优质, "
-                            f"置信度提升5%({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((2, "R/R优质", original_confidence))
-
-                # SHORT信号的R/R过滤
-                elif (
-                    original_signal == "SHORT"
-                    and structure_result.risk_reward_ratio > 0
-                ):
-                    rr_result = short_rr_result
-                    result.risk_reward_result = short_rr_result
-
-                    if not rr_result.should_trade:
-                        if rr_result.rr_ratio <= 0:
-                            old_conf = original_confidence
-                            original_confidence *= 0.70
-                            result.adjustments_made.append(
-                                f"R/R过滤: SHORT R/R数据不足(R/R=0)，"
-                                f"置信度降低30%({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                        elif rr_result.rr_ratio >= 1.0:
-                            old_conf = original_confidence
-                            original_confidence *= 0.80
-                            result.adjustments_made.append(
-                                f"R/R过滤: SHORT R/R={rr_result.rr_ratio:.2f}偏低，"
-                                f"置信度降低20%({old_conf:.0%}→{original_confidence:.0%})"
-                            )
-                        else:
-                            old_signal = original_signal
-                            original_signal = "HOLD"
-                            result.adjustments_made.append(
-                                f"R/R过滤: {old_signal}→HOLD, "
-                                f"R/R={rr_result.rr_ratio:.2f}不足(最低1.0)"
-                            )
-
-                # HOLD信号时，市场结构确认（诊断增强，不修改逻辑）
-                elif (
-                    original_signal == "HOLD" and structure_result.risk_reward_ratio > 0
-                ):
-                    if structure_result.risk_reward_ratio < 1.5:
-                        result.adjustments_made.append(
-                            f"市场结构确认: R/R={structure_result.risk_reward_ratio:.2f}不足，"
-                            f"HOLD决策合理"
-                        )
-
-        except Exception as e:
-            logger.warning(
-                f"市场结构/R/R分析失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-            )
-
-        # 2. SignalOptimizer
-        if self.signal_optimizer and self.config.enable_signal_optimizer:
-            try:
-                price = market_data.get("price", 0)
-                optimized = self.signal_optimizer.optimize(
-                    signal=original_signal,
-                    confidence=original_confidence,
-                    price=price,
-                    market_data=market_data,
-                )
-
-                if optimized.signal != original_signal:
-                    original_signal = optimized.signal
-                    result.adjustments_made.append(
-                        f"信号优化: {original_signal} → {optimized.signal}"
-                    )
-
-                original_confidence = optimized.confidence
-                result.optimized_signal = optimized
-                conf_history.append((2, "SignalOptimizer", original_confidence))
-
-                # 更新价格历史
-                self.signal_optimizer.update_price_history(price)
-
-            except Exception as e:
-                logger.warning(
-                    f"SignalOptimizer处理失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-                )
-
-        # 3. BTC价格水平检测
-        if self.btc_detector and self.config.enable_btc_detector:
-            try:
-                price = market_data.get("price", 0)
-                btc_result = self.btc_detector.detect_level(price)
-
-                result.btc_level_result = {
-                    "level": btc_result.level,
-                    "is_high_risk": btc_result.is_high_risk,
-                    "is_low_opportunity": btc_result.is_low_opportunity,
-                    "distance_to_high": btc_result.distance_to_high,
-                    "distance_to_low": btc_result.distance_to_low,
-                }
-
-                result.price_level = btc_result.level
-                result.is_high_risk = btc_result.is_high_risk
-                result.is_low_opportunity = btc_result.is_low_opportunity
-
-                # 如果是高风险，降低置信度
-                if btc_result.is_high_risk and original_signal == "BUY":
-                    if decline_result and decline_result.is_detected:
-                        penalty = self._t().btc_high_risk_penalty
-                        old_conf = original_confidence
-                        original_confidence *= 1 - penalty
-                        result.adjustments_made.append(
-                            f"BTC检测: 高位风险+持续下跌，置信度降低{penalty * 100:.0f}% ({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((3, "BTC高位", original_confidence))
-                    else:
-                        penalty = self._t().btc_high_risk_penalty_no_decline
-                        old_conf = original_confidence
-                        original_confidence *= penalty
-                        result.adjustments_made.append(
-                            f"BTC检测: 高位风险，置信度降低{int((1 - penalty) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((3, "BTC高位", original_confidence))
-
-                # 如果是低机会，增加置信度
-                if btc_result.is_low_opportunity and original_signal == "BUY":
-                    old_conf = original_confidence
-                    original_confidence *= self._t().btc_low_opportunity_boost
-                    result.adjustments_made.append(
-                        f"BTC检测: 低位机会，置信度增加{int((self._t().btc_low_opportunity_boost - 1) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                    )
-                    conf_history.append((3, "BTC低位", original_confidence))
-
-                # SHORT 信号的特殊处理：低位是风险，高位是机会
-                if original_signal == "SHORT":
-                    # 低位做空是风险
-                    if btc_result.is_low_opportunity:
-                        old_conf = original_confidence
-                        original_confidence *= self._t().btc_short_penalty
-                        result.adjustments_made.append(
-                            f"BTC检测: SHORT+低价位风险高，置信度降低{int((1 - self._t().btc_short_penalty) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((3, "BTC低位SHORT", original_confidence))
-                    # 高位做空是机会
-                    elif btc_result.is_high_risk:
-                        old_conf = original_confidence
-                        original_confidence *= self._t().btc_short_boost
-                        result.adjustments_made.append(
-                            f"BTC检测: SHORT+高位机会，置信度增加{int((self._t().btc_short_boost - 1) * 100)}% ({old_conf:.0%}→{original_confidence:.0%})"
-                        )
-                        conf_history.append((3, "BTC高位SHORT", original_confidence))
-
-            except Exception as e:
-                logger.warning(
-                    f"BTC价格检测处理失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-                )
-        # 4. HighPriceBuyOptimizer
-        # HIGHPRICE-BUY-ONLY：本优化器仅作用于 BUY 信号；SHORT/SELL 跳过（task-card R2）。
-        # 原惩罚（RSI/trend/价格位置快速上升等）是仅对 BUY 信号设计，不应作用于反方向信号。
-        # SHORT 信号已由上面的 BTC 检测 + 自己的 SHORT 专用 block 处理；
-        # SELL 信号无需 BUY 惩罚（仅用于平仓场景）。
-        if (
-            self.high_price_optimizer
-            and self.config.enable_high_price_filter
-            and original_signal == "BUY"
-        ):
-            try:
-                # 传递持续下跌检测结果给高位优化器
-                market_data_with_decline = dict(market_data)
-                if decline_result:
-                    market_data_with_decline["sustained_decline"] = {
-                        "is_detected": decline_result.is_detected,
-                        "decline_level": decline_result.decline_level,
-                        "buy_penalty": decline_result.buy_penalty,
-                    }
-
-                optimized = self.high_price_optimizer.optimize_high_price_buy(
-                    market_data=market_data_with_decline,
-                    original_confidence=original_confidence,
-                    original_can_buy=True,
-                    buy_mode=result.price_level,
-                    original_signal=original_signal,
-                )
-
-                result.high_price_result = {
-                    "adjusted_confidence": optimized.adjusted_confidence,
-                    "should_buy": optimized.should_buy,
-                    "price_level": optimized.price_level,
-                    "adjustment_reason": optimized.adjustment_reason,
-                    "penalty_applied": optimized.penalty_applied,
-                }
-
-                # 如果优化器说不要买入，改为HOLD
-                if not optimized.should_buy:
-                    original_signal = "HOLD"
-                    result.adjustments_made.append(
-                        f"高位过滤: 不建议买入 - {optimized.adjustment_reason[:50]}..."
-                    )
-                elif (
-                    optimized.penalty_applied
-                    and optimized.adjusted_confidence < 0.40
-                ):
-                    original_signal = "HOLD"
-                    result.adjustments_made.append(
-                        "高位过滤: BUY被压到低置信，降级HOLD继续评估策略"
-                    )
-
-                original_confidence = optimized.adjusted_confidence
-                conf_history.append((4, "HighPrice", original_confidence))
-
-            except Exception as e:
-                logger.warning(
-                    f"HighPriceBuyOptimizer处理失败: {e}, 位置: {traceback.format_exc(limit=3)}"
-                )
-        else:
-            # SHORT/SELL/未启用快速路径：记录跳过原因，便于审计
-            conf_history.append((4, "HighPrice(skip non-BUY)", original_confidence))
+        # 按阶段顺序执行流水线，conf_history 记录每个阶段的置信度
+        state = SignalState(
+            market_data=market_data,
+            signal=original_signal,
+            confidence=original_confidence,
+            result=result,
+            conf_history=[(0, "原始", original_confidence)],
+        )
+        result.stage_timings = self.pipeline.run(state)
 
-        # 5. 最终结果
-        result.final_signal = original_signal
+        # 最终结果
+        result.final_signal = state.signal
         result.final_confidence = min(
-            max(original_confidence, self._t().confidence_floor),
+            max(state.confidence, self._t().confidence_floor),
             self._t().confidence_ceiling,
         )
 
         # 记录置信度变化历史
+        conf_history = state.conf_history
         conf_history.append((5, "最终", result.final_confidence))
 
-        # 打印诊断日志
-        logger.info("[信号诊断] 置信度变化流程:")
-        for stage, name, conf in conf_history:
-            logger.info(f"  [{stage}] {name}: {conf:.1%}")
+        # 打印诊断日志（单行，跳过的阶段不输出）
+        logger.info(
+            "[信号诊断] 置信度变化流程: "
+            + " → ".join(
+                f"[{stage}]{name}={conf:.1%}" for stage, name, conf in conf_history
+            )
+        )
 
         # 记录最终结果
         logger.info(
@@ -844,7 +262,7 @@ class AISignalIntegrator:
 
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
-        stats = {}
+        stats = {"pipeline": self.pipeline.get_statistics()}
 
         if self.signal_optimizer:
             stats["signal_optimizer"] = self.signal_optimizer.get_statistics()
@@ -865,6 +283,7 @@ class AISignalIntegrator:
             self.signal_optimizer.reset()
         if self.sustained_decline_detector:
             self.sustained_decline_detector.reset_cycle()
+        self.pipeline.reset_statistics()
         logger.info("[AI信号集成器] 已重置")
 
 
@@ -1,8 +1,10 @@
 """集成器配置"""
 
-from typing import Optional
+from typing import Optional, Sequence, Type, Union
 from dataclasses import dataclass
 
+from .integrator_pipeline import IntegratorStage
+
 
 @dataclass
 class SignalThresholdsConfig:
@@ -104,6 +106,7 @@ class IntegrationConfig:
         high_price_config: Optional[object] = None,
         btc_detector_config: Optional[object] = None,
         sustained_decline_config: Optional[object] = None,
+        stages: Optional[Sequence[Union[str, Type[IntegratorStage]]]] = None,
     ):
         self.enable_adaptive_buy = enable_adaptive_buy
         self.enable_signal_optimizer = enable_signal_optimizer
@@ -115,3 +118,5 @@ class IntegrationConfig:
         self.high_price_config = high_price_config
         self.btc_detector_config = btc_detector_config
         self.sustained_decline_config = sustained_decline_config
+        # 流水线阶段顺序（阶段名或 IntegratorStage 子类），None 为默认顺序
+        self.stages = stages
@@ -0,0 +1,152 @@
+"""
+信号集成流水线
+
+AISignalIntegrator 的处理流程由若干阶段（IntegratorStage）顺序组成：
+- 每个阶段声明读取（inputs）与写入（outputs）的状态字段
+- applies() 判断前置条件，不满足时跳过（如 BUY 专用过滤器遇到 HOLD 信号）
+- 每个阶段单独计时，并累计运行/跳过/失败次数
+
+阶段之间通过 SignalState 传递信号、置信度与中间结果。
+"""
+
+import logging
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignalState:
+    """流水线在阶段之间传递的状态"""
+
+    market_data: Dict[str, Any]
+    signal: str
+    confidence: float
+    result: Any  # IntegratedSignalResult
+    conf_history: List[Tuple[Any, str, float]] = field(default_factory=list)
+
+    # 中间结果
+    decline_result: Any = None  # DeclineDetectionResult
+    structure_result: Any = None  # MarketStructureResult
+    short_rr_result: Any = None  # RiskRewardResult
+
+
+@dataclass
+class StageTiming:
+    """单个阶段的执行记录"""
+
+    name: str
+    elapsed_ms: float
+    skipped: bool = False
+    failed: bool = False
+
+
+class IntegratorStage(ABC):
+    """
+    流水线阶段基类
+
+    子类设置 name/inputs/outputs，实现 applies() 与 run()。
+    error_label 不为 None 时，阶段异常只记录警告，流水线继续执行；
+    为 None 时异常向上抛出。
+    """
+
+    name: str = ""
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    error_label: Optional[str] = None
+
+    def __init__(self, integrator: Any) -> None:
+        self.integrator = integrator
+
+    def _t(self) -> Any:
+        """获取集成器阈值配置"""
+        return self.integrator._t()
+
+    def applies(self, state: SignalState) -> bool:
+        """前置条件，返回 False 时跳过本阶段"""
+        return True
+
+    @abstractmethod
+    def run(self, state: SignalState) -> None:
+        """执行本阶段，读写 state"""
+        pass
+
+    def on_skip(self, state: SignalState) -> None:
+        """阶段被跳过时的回调（默认无操作）"""
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "inputs": list(self.inputs),
+            "outputs": list(self.outputs),
+        }
+
+
+class SignalPipeline:
+    """按顺序执行阶段，记录每个阶段的耗时与跳过情况"""
+
+    def __init__(self, stages: Sequence[IntegratorStage]) -> None:
+        names = [stage.name for stage in stages]
+        duplicated = sorted({name for name in names if names.count(name) > 1})
+        if duplicated:
+            raise ValueError(f"流水线阶段重复: {duplicated}")
+        self.stages = list(stages)
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"runs": 0, "skips": 0, "failures": 0, "total_ms": 0.0}
+        )
+
+    @property
+    def stage_names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+
+    def run(self, state: SignalState) -> List[StageTiming]:
+        """依次执行各阶段，返回本次执行的计时记录"""
+        timings: List[StageTiming] = []
+        for stage in self.stages:
+            started = time.perf_counter()
+            skipped = failed = False
+            try:
+                if stage.applies(state):
+                    stage.run(state)
+                else:
+                    skipped = True
+                    stage.on_skip(state)
+            except Exception as e:
+                if stage.error_label is None:
+                    raise
+                failed = True
+                logger.warning(
+                    f"{stage.error_label}: {e}, 位置: {traceback.format_exc(limit=3)}"
+                )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            timings.append(StageTiming(stage.name, elapsed_ms, skipped, failed))
+
+            stats = self._stats[stage.name]
+            stats["skips" if skipped else "runs"] += 1
+            stats["failures"] += failed
+            stats["total_ms"] += elapsed_ms
+
+        logger.debug(
+            "[信号流水线] "
+            + ", ".join(
+                f"{t.name}={'skip' if t.skipped else f'{t.elapsed_ms:.2f}ms'}"
+                for t in timings
+            )
+        )
+        return timings
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """各阶段的输入/输出声明"""
+        return [stage.describe() for stage in self.stages]
+
+    def get_statistics(self) -> Dict[str, Dict[str, float]]:
+        """各阶段累计运行、跳过、失败次数与耗时"""
+        return {name: dict(self._stats[name]) for name in self.stage_names}
+
+    def reset_statistics(self) -> None:
+        self._stats.clear()
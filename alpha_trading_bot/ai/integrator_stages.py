@@ -0,0 +1,704 @@
+"""
+信号集成流水线的内置阶段
+
+默认顺序（DEFAULT_STAGES）：
+1. sustained_decline - 持续下跌检测（最先执行）
+2. short_signal - SHORT 信号专用优化
+3. adaptive_buy - 自适应买入条件
+4. market_structure - 市场结构分析（结果写回 market_data）
+5. risk_reward - 风险收益比过滤
+6. signal_optimizer - 信号优化器
+7. btc_level - BTC 价格水平检测
+8. high_price_filter - 高位买入过滤（仅 BUY）
+
+可选阶段：
+- hold_to_short - 强下跌趋势中 HOLD 转 SHORT（默认不启用）
+
+IntegrationConfig.stages 可按名称（或 IntegratorStage 子类）组合阶段顺序。
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from .feature_context import FeatureContext
+from .integrator_pipeline import IntegratorStage, SignalPipeline, SignalState
+
+logger = logging.getLogger(__name__)
+
+
+class SustainedDeclineStage(IntegratorStage):
+    """持续下跌检测：严重下跌阻断 BUY，其余情况调整 BUY/SELL 置信度"""
+
+    name = "sustained_decline"
+    inputs = ("market_data", "signal", "confidence")
+    outputs = ("signal", "confidence", "decline_result")
+    error_label = "持续下跌检测处理失败"
+
+    def applies(self, state: SignalState) -> bool:
+        integrator = self.integrator
+        return bool(
+            integrator.sustained_decline_detector
+            and integrator.config.enable_sustained_decline_detector
+        )
+
+    def run(self, state: SignalState) -> None:
+        result = state.result
+        decline_result = self.integrator.sustained_decline_detector.detect(
+            market_data=state.market_data
+        )
+        state.decline_result = decline_result
+        result.sustained_decline_result = decline_result
+        result.is_sustained_decline = decline_result.is_detected
+
+        if not decline_result.is_detected:
+            return
+
+        # 记录检测到的下跌级别
+        cumulative = decline_result.metrics.cumulative_decline_percent
+        if decline_result.decline_level == "severe":
+            logger.warning(
+                f"[持续下跌检测] ⚠️ 检测到严重下跌趋势: "
+                f"累积跌幅{cumulative:.2f}% (严重级别)"
+            )
+        elif decline_result.decline_level == "moderate":
+            logger.warning(
+                f"[持续下跌检测] ⚠️ 检测到中度下跌趋势: 累积跌幅{cumulative:.2f}%"
+            )
+        else:
+            logger.info(
+                f"[持续下跌检测] ℹ️ 检测到轻度下跌趋势: 累积跌幅{cumulative:.2f}%"
+            )
+
+        # 根据下跌级别调整信号
+        if decline_result.should_block_buy:
+            # 严重下跌，完全阻断BUY信号
+            if state.signal == "BUY":
+                state.signal = "HOLD"
+                result.adjustments_made.append(
+                    "持续下跌检测: 严重下跌趋势，完全阻断BUY信号"
+                )
+                logger.warning("[持续下跌检测] 🚫 完全阻断BUY信号")
+            return
+
+        # 非完全阻断情况下，降低BUY置信度或增加SELL置信度
+        if state.signal == "BUY" and decline_result.buy_penalty > 0:
+            old_conf = state.confidence
+            state.confidence = max(
+                state.confidence - decline_result.buy_penalty,
+                self._t().confidence_floor,
+            )
+            result.adjustments_made.append(
+                f"持续下跌检测: BUY信号置信度降低{decline_result.buy_penalty:.0%} "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+            state.conf_history.append(
+                (self._t().confidence_base, "下跌检测", state.confidence)
+            )
+
+        # 如果是SELL信号，增加置信度
+        if state.signal == "SELL" and decline_result.sell_boost > 0:
+            old_conf = state.confidence
+            state.confidence = min(
+                state.confidence + decline_result.sell_boost,
+                self._t().confidence_ceiling,
+            )
+            result.adjustments_made.append(
+                f"持续下跌检测: SELL信号置信度增加{decline_result.sell_boost:.0%} "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+            state.conf_history.append(
+                (self._t().confidence_base, "下跌检测", state.confidence)
+            )
+
+
+class ShortSignalStage(IntegratorStage):
+    """SHORT 信号专用处理：趋势、价格位置与持续下跌对置信度的影响"""
+
+    name = "short_signal"
+    inputs = ("market_data", "signal", "confidence", "decline_result")
+    outputs = ("confidence",)
+
+    def applies(self, state: SignalState) -> bool:
+        return state.signal == "SHORT"
+
+    def run(self, state: SignalState) -> None:
+        logger.info("[信号集成] 检测到 SHORT 信号（趋势下跌苗头），应用做空优化...")
+        t = self._t()
+        result = state.result
+        technical = state.market_data.get("technical", {})
+        trend_direction = technical.get("trend_direction", "neutral")
+        price_position = technical.get("price_position", 0.5)
+
+        # 1. 趋势检查：SHORT 信号需要趋势向下
+        if trend_direction not in ["down", "neutral"]:
+            logger.warning("[SHORT优化] 趋势向上时做空风险高，降低置信度")
+            old_conf = state.confidence
+            penalty = t.short_trend_up_penalty
+            penalty_floor = t.short_trend_up_penalty_floor
+            new_conf = old_conf * penalty
+            # 防止折扣后被永久封印 (task-card R1 + change-summary §3.3)
+            if new_conf < penalty_floor and old_conf >= penalty_floor:
+                new_conf = penalty_floor
+            state.confidence = new_conf
+            result.adjustments_made.append(
+                f"SHORT优化: 趋势非下跌，置信度降低{int((1 - penalty) * 100)}% "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+
+        # 2. 价格位置检查：价格太低时不建议做空（接近支撑位）
+        if price_position < t.short_very_low_price_threshold:
+            logger.warning(
+                "[SHORT优化] 价格位置过低"
+                f"（<{int(t.short_very_low_price_threshold * 100)}%），做空风险高"
+            )
+            old_conf = state.confidence
+            state.confidence *= t.short_very_low_price_penalty
+            result.adjustments_made.append(
+                "SHORT优化: 低价位做空风险高，置信度降低"
+                f"{int((1 - t.short_very_low_price_penalty) * 100)}% "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+        elif price_position < t.short_low_price_threshold:
+            old_conf = state.confidence
+            state.confidence *= t.short_low_price_penalty
+            result.adjustments_made.append(
+                f"SHORT优化: 价格偏低（<{int(t.short_low_price_threshold * 100)}%），"
+                f"置信度降低{int((1 - t.short_low_price_penalty) * 100)}% "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+
+        # 3. 如果在持续下跌趋势中，SHORT 信号应该增强（这是顺势）
+        if state.decline_result and state.decline_result.is_detected:
+            old_conf = state.confidence
+            state.confidence = min(
+                state.confidence * t.short_decline_boost,
+                t.short_decline_boost_ceiling,
+            )
+            result.adjustments_made.append(
+                "SHORT优化: 持续下跌趋势中，置信度增加"
+                f"{int((t.short_decline_boost - 1) * 100)}% "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+
+        state.conf_history.append((t.confidence_base, "SHORT优化", state.confidence))
+
+
+class HoldToShortStage(IntegratorStage):
+    """
+    下跌趋势中 HOLD 转 SHORT（可选阶段，默认不启用）
+
+    条件：明确下跌趋势 + 显著短期跌幅或持续下跌确认 + 价格不在极低位 + RSI 确认
+    """
+
+    name = "hold_to_short"
+    inputs = ("market_data", "signal", "decline_result")
+    outputs = ("signal", "confidence")
+
+    def applies(self, state: SignalState) -> bool:
+        return state.signal == "HOLD"
+
+    def run(self, state: SignalState) -> None:
+        t = self._t()
+        technical = state.market_data.get("technical", {})
+        trend_direction = technical.get("trend_direction", "neutral")
+        trend_strength = technical.get("trend_strength", 0)
+        price_position = technical.get("price_position", 0.5)
+        rsi = technical.get("rsi", 50)
+        # 短期跌幅（最近3根K线约15分钟）
+        short_term_drop = state.market_data.get("short_term_drop_percent", 0)
+
+        is_downtrend = trend_direction == "down"
+        has_strong_strength = trend_strength >= t.strong_trend_strength
+        has_significant_drop = short_term_drop < t.short_term_drop
+        not_too_low = price_position > t.price_position_too_low
+        is_sustained_decline = bool(
+            state.decline_result and state.decline_result.is_detected
+        )
+        rsi_confirms_down = rsi < t.strong_trend_rsi
+
+        should_convert = (
+            is_downtrend
+            and has_strong_strength
+            and (has_significant_drop or is_sustained_decline)
+            and not_too_low
+            and rsi_confirms_down
+        )
+        if not should_convert:
+            return
+
+        logger.info(
+            f"[信号转换] HOLD→SHORT: 趋势向下(强度{trend_strength:.2f}), "
+            f"短期跌幅{short_term_drop:.2f}%, 价格位置{price_position * 100:.0f}%, "
+            f"RSI={rsi:.1f}, 持续下跌={is_sustained_decline}"
+        )
+        state.signal = "SHORT"
+        if is_sustained_decline and has_significant_drop:
+            state.confidence = t.confidence_dual_confirm  # 双重确认
+        elif is_sustained_decline:
+            state.confidence = t.confidence_sustained  # 持续下跌确认
+        else:
+            state.confidence = t.confidence_general
+        state.result.adjustments_made.append("信号转换: HOLD→SHORT (强下跌趋势)")
+        state.conf_history.append(
+            (t.confidence_sustained, "强下跌转换", state.confidence)
+        )
+
+
+class AdaptiveBuyStage(IntegratorStage):
+    """自适应买入条件：满足任一买入模式时转为 BUY 并提高置信度"""
+
+    name = "adaptive_buy"
+    inputs = ("market_data", "signal", "confidence", "decline_result")
+    outputs = ("signal", "confidence", "result.price_level")
+    error_label = "AdaptiveBuyCondition处理失败"
+
+    def applies(self, state: SignalState) -> bool:
+        integrator = self.integrator
+        return bool(integrator.adaptive_buy and integrator.config.enable_adaptive_buy)
+
+    def run(self, state: SignalState) -> None:
+        result = state.result
+        decline_result = state.decline_result
+        buy_result = self.integrator.adaptive_buy.should_buy(
+            market_data=state.market_data
+        )
+        result.buy_condition_result = buy_result
+
+        # 如果买入条件判断可以买入，提高置信度
+        if buy_result.can_buy:
+            # 检查是否在持续下跌趋势中，如果是则谨慎对待
+            if (
+                decline_result
+                and decline_result.is_detected
+                and not decline_result.should_block_buy
+            ):
+                # 持续下跌趋势中，降低买入条件的置信度加成
+                adjusted_buy_conf = buy_result.confidence * (
+                    1 - decline_result.buy_penalty
+                )
+                state.confidence = max(state.confidence, adjusted_buy_conf)
+                if adjusted_buy_conf < buy_result.confidence:
+                    result.adjustments_made.append(
+                        f"自适应买入: {buy_result.mode}模式通过，但持续下跌趋势降低权重"
+                    )
+            else:
+                state.confidence = max(state.confidence, buy_result.confidence)
+
+            state.signal = "BUY"
+            result.adjustments_made.append(f"自适应买入: {buy_result.mode}模式通过")
+
+        result.price_level = buy_result.mode
+        state.conf_history.append((1, "AdaptiveBuy", state.confidence))
+
+
+class MarketStructureStage(IntegratorStage):
+    """市场结构分析：结果附加到 market_data 供决策引擎使用"""
+
+    name = "market_structure"
+    inputs = ("market_data",)
+    outputs = (
+        "structure_result",
+        "short_rr_result",
+        "market_data.market_structure",
+        "market_data.risk_reward_ratio",
+        "market_data.short_risk_reward_ratio",
+    )
+    error_label = "市场结构/R/R分析失败"
+
+    def applies(self, state: SignalState) -> bool:
+        features = FeatureContext.of(
+            state.market_data,
+            structure_analyzer=self.integrator.market_structure_analyzer,
+        )
+        current_price = state.market_data.get("price", 0)
+        return bool(len(features.closes) and current_price > 0)
+
+    def run(self, state: SignalState) -> None:
+        market_data = state.market_data
+        current_price = market_data.get("price", 0)
+        atr_percent = market_data.get("technical", {}).get("atr_percent", 0)
+
+        structure_result = FeatureContext.of(market_data).structure
+        state.result.market_structure_result = structure_result
+
+        # 注意：必须操作原始 market_data 引用，确保外部可见
+        market_data["market_structure"] = structure_result.structure
+        market_data["market_structure_direction"] = structure_result.suggested_direction
+        market_data["risk_reward_ratio"] = structure_result.risk_reward_ratio
+        market_data["nearest_support"] = structure_result.nearest_support
+        market_data["nearest_resistance"] = structure_result.nearest_resistance
+        market_data["position_size_factor"] = structure_result.position_size_factor
+        short_rr_result = self.integrator.risk_reward_calculator.calculate_for_short(
+            current_price=current_price,
+            support=structure_result.nearest_support,
+            resistance=structure_result.nearest_resistance,
+            atr_percent=atr_percent,
+        )
+        market_data["short_risk_reward_ratio"] = short_rr_result.rr_ratio
+
+        state.structure_result = structure_result
+        state.short_rr_result = short_rr_result
+
+
+class RiskRewardStage(IntegratorStage):
+    """风险收益比过滤：BUY/SHORT 按 R/R 调整置信度或降级为 HOLD"""
+
+    name = "risk_reward"
+    inputs = ("market_data", "signal", "confidence", "structure_result")
+    outputs = ("signal", "confidence", "result.risk_reward_result")
+    error_label = "市场结构/R/R分析失败"
+
+    def applies(self, state: SignalState) -> bool:
+        return (
+            state.short_rr_result is not None
+            and state.structure_result.risk_reward_ratio > 0
+            and state.signal in ("BUY", "SHORT", "HOLD")
+        )
+
+    def run(self, state: SignalState) -> None:
+        if state.signal == "BUY":
+            self._filter_buy(state)
+        elif state.signal == "SHORT":
+            self._filter_short(state)
+        elif state.structure_result.risk_reward_ratio < 1.5:
+            # HOLD信号时，市场结构确认（诊断增强，不修改逻辑）
+            state.result.adjustments_made.append(
+                f"市场结构确认: R/R={state.structure_result.risk_reward_ratio:.2f}不足，"
+                f"HOLD决策合理"
+            )
+
+    def _filter_buy(self, state: SignalState) -> None:
+        result = state.result
+        structure_result = state.structure_result
+        rr_result = self.integrator.risk_reward_calculator.calculate_for_long(
+            current_price=state.market_data.get("price", 0),
+            support=structure_result.nearest_support,
+            resistance=structure_result.nearest_resistance,
+            atr_percent=state.market_data.get("technical", {}).get("atr_percent", 0),
+        )
+        result.risk_reward_result = rr_result
+
+        if not rr_result.should_trade:
+            if rr_result.rr_ratio <= 0:
+                # R/R计算因数据不足返回0，降低置信度但保留BUY信号
+                old_conf = state.confidence
+                state.confidence *= 0.70
+                result.adjustments_made.append(
+                    f"R/R过滤: R/R数据不足(R/R=0)，"
+                    f"置信度降低30%({old_conf:.0%}→{state.confidence:.0%})"
+                )
+                state.conf_history.append((2, "R/R数据不足", state.confidence))
+                logger.info("[R/R过滤] BUY信号R/R数据不足(R/R=0)，降级但保留BUY")
+            elif rr_result.rr_ratio >= 1.0:
+                # R/R在1.0-1.5之间，降低置信度但保留BUY信号（精而准策略）
+                old_conf = state.confidence
+                state.confidence *= 0.80
+                result.adjustments_made.append(
+                    f"R/R过滤: R/R={rr_result.rr_ratio:.2f}偏低，"
+                    f"置信度降低20%({old_conf:.0%}→{state.confidence:.0%})"
+                )
+                state.conf_history.append((2, "R/R偏低", state.confidence))
+                logger.info(
+                    f"[R/R过滤] BUY信号R/R={rr_result.rr_ratio:.2f}偏低，降低置信度"
+                )
+            else:
+                # R/R < 1.0，风险过高，降级为HOLD
+                old_signal = state.signal
+                state.signal = "HOLD"
+                result.adjustments_made.append(
+                    f"R/R过滤: {old_signal}→HOLD, "
+                    f"R/R={rr_result.rr_ratio:.2f}不足(最低1.0)"
+                )
+                logger.info(
+                    f"[R/R过滤] {old_signal}→HOLD: R/R={rr_result.rr_ratio:.2f}不足"
+                )
+        elif rr_result.quality == "marginal":
+            # R/R勉强，降低置信度
+            old_conf = state.confidence
+            state.confidence *= 0.85
+            result.adjustments_made.append(
+                f"R/R过滤: R/R={rr_result.rr_ratio:.2f}勉强, "
+                f"置信度降低15%({old_conf:.0%}→{state.confidence:.0%})"
+            )
+            state.conf_history.append((2, "R/R过滤", state.confidence))
+        elif rr_result.quality == "excellent":
+            # R/R优质，小幅提升置信度
+            old_conf = state.confidence
+            state.confidence = min(
+                state.confidence * 1.05, self._t().confidence_ceiling
+            )
+            result.adjustments_made.append(
+                f"R/R过滤: R/R={rr_result.rr_ratio:.2f}优质, "
+                f"置信度提升5%({old_conf:.0%}→{state.confidence:.0%})"
+            )
+            state.conf_history.append((2, "R/R优质", state.confidence))
+
+    def _filter_short(self, state: SignalState) -> None:
+        result = state.result
+        rr_result = state.short_rr_result
+        result.risk_reward_result = rr_result
+
+        if rr_result.should_trade:
+            return
+        if rr_result.rr_ratio <= 0:
+            old_conf = state.confidence
+            state.confidence *= 0.70
+            result.adjustments_made.append(
+                f"R/R过滤: SHORT R/R数据不足(R/R=0)，"
+                f"置信度降低30%({old_conf:.0%}→{state.confidence:.0%})"
+            )
+        elif rr_result.rr_ratio >= 1.0:
+            old_conf = state.confidence
+            state.confidence *= 0.80
+            result.adjustments_made.append(
+                f"R/R过滤: SHORT R/R={rr_result.rr_ratio:.2f}偏低，"
+                f"置信度降低20%({old_conf:.0%}→{state.confidence:.0%})"
+            )
+        else:
+            old_signal = state.signal
+            state.signal = "HOLD"
+            result.adjustments_made.append(
+                f"R/R过滤: {old_signal}→HOLD, "
+                f"R/R={rr_result.rr_ratio:.2f}不足(最低1.0)"
+            )
+
+
+class SignalOptimizerStage(IntegratorStage):
+    """信号优化器：优化信号与置信度，并更新价格历史"""
+
+    name = "signal_optimizer"
+    inputs = ("market_data", "signal", "confidence")
+    outputs = ("signal", "confidence", "result.optimized_signal")
+    error_label = "SignalOptimizer处理失败"
+
+    def applies(self, state: SignalState) -> bool:
+        integrator = self.integrator
+        return bool(
+            integrator.signal_optimizer and integrator.config.enable_signal_optimizer
+        )
+
+    def run(self, state: SignalState) -> None:
+        signal_optimizer = self.integrator.signal_optimizer
+        price = state.market_data.get("price", 0)
+        optimized = signal_optimizer.optimize(
+            signal=state.signal,
+            confidence=state.confidence,
+            price=price,
+            market_data=state.market_data,
+        )
+
+        if optimized.signal != state.signal:
+            state.signal = optimized.signal
+            state.result.adjustments_made.append(
+                f"信号优化: {state.signal} → {optimized.signal}"
+            )
+
+        state.confidence = optimized.confidence
+        state.result.optimized_signal = optimized
+        state.conf_history.append((2, "SignalOptimizer", state.confidence))
+
+        # 更新价格历史
+        signal_optimizer.update_price_history(price)
+
+
+class BTCLevelStage(IntegratorStage):
+    """BTC 价格水平检测：高位/低位对 BUY 与 SHORT 的置信度调整"""
+
+    name = "btc_level"
+    inputs = ("market_data", "signal", "confidence", "decline_result")
+    outputs = ("confidence", "result.price_level", "result.is_high_risk")
+    error_label = "BTC价格检测处理失败"
+
+    def applies(self, state: SignalState) -> bool:
+        integrator = self.integrator
+        return bool(integrator.btc_detector and integrator.config.enable_btc_detector)
+
+    def run(self, state: SignalState) -> None:
+        t = self._t()
+        result = state.result
+        btc_result = self.integrator.btc_detector.detect_level(
+            state.market_data.get("price", 0)
+        )
+
+        result.btc_level_result = {
+            "level": btc_result.level,
+            "is_high_risk": btc_result.is_high_risk,
+            "is_low_opportunity": btc_result.is_low_opportunity,
+            "distance_to_high": btc_result.distance_to_high,
+            "distance_to_low": btc_result.distance_to_low,
+        }
+        result.price_level = btc_result.level
+        result.is_high_risk = btc_result.is_high_risk
+        result.is_low_opportunity = btc_result.is_low_opportunity
+
+        # 如果是高风险，降低置信度
+        if btc_result.is_high_risk and state.signal == "BUY":
+            old_conf = state.confidence
+            if state.decline_result and state.decline_result.is_detected:
+                penalty = t.btc_high_risk_penalty
+                state.confidence *= 1 - penalty
+                result.adjustments_made.append(
+                    f"BTC检测: 高位风险+持续下跌，置信度降低{penalty * 100:.0f}% "
+                    f"({old_conf:.0%}→{state.confidence:.0%})"
+                )
+            else:
+                penalty = t.btc_high_risk_penalty_no_decline
+                state.confidence *= penalty
+                result.adjustments_made.append(
+                    f"BTC检测: 高位风险，置信度降低{int((1 - penalty) * 100)}% "
+                    f"({old_conf:.0%}→{state.confidence:.0%})"
+                )
+            state.conf_history.append((3, "BTC高位", state.confidence))
+
+        # 如果是低机会，增加置信度
+        if btc_result.is_low_opportunity and state.signal == "BUY":
+            old_conf = state.confidence
+            state.confidence *= t.btc_low_opportunity_boost
+            result.adjustments_made.append(
+                "BTC检测: 低位机会，置信度增加"
+                f"{int((t.btc_low_opportunity_boost - 1) * 100)}% "
+                f"({old_conf:.0%}→{state.confidence:.0%})"
+            )
+            state.conf_history.append((3, "BTC低位", state.confidence))
+
+        # SHORT 信号的特殊处理：低位是风险，高位是机会
+        if state.signal == "SHORT":
+            if btc_result.is_low_opportunity:
+                old_conf = state.confidence
+                state.confidence *= t.btc_short_penalty
+                result.adjustments_made.append(
+                    "BTC检测: SHORT+低价位风险高，置信度降低"
+                    f"{int((1 - t.btc_short_penalty) * 100)}% "
+                    f"({old_conf:.0%}→{state.confidence:.0%})"
+                )
+                state.conf_history.append((3, "BTC低位SHORT", state.confidence))
+            elif btc_result.is_high_risk:
+                old_conf = state.confidence
+                state.confidence *= t.btc_short_boost
+                result.adjustments_made.append(
+                    "BTC检测: SHORT+高位机会，置信度增加"
+                    f"{int((t.btc_short_boost - 1) * 100)}% "
+                    f"({old_conf:.0%}→{state.confidence:.0%})"
+                )
+                state.conf_history.append((3, "BTC高位SHORT", state.confidence))
+
+
+class HighPriceFilterStage(IntegratorStage):
+    """
+    高位买入过滤
+
+    HIGHPRICE-BUY-ONLY：仅作用于 BUY 信号；SHORT/SELL/HOLD 跳过（task-card R2）。
+    原惩罚（RSI/trend/价格位置快速上升等）是仅对 BUY 信号设计，不应作用于反方向信号。
+    """
+
+    name = "high_price_filter"
+    inputs = ("market_data", "signal", "confidence", "decline_result")
+    outputs = ("signal", "confidence", "result.high_price_result")
+    error_label = "HighPriceBuyOptimizer处理失败"
+
+    def applies(self, state: SignalState) -> bool:
+        integrator = self.integrator
+        return bool(
+            integrator.high_price_optimizer
+            and integrator.config.enable_high_price_filter
+            and state.signal == "BUY"
+        )
+
+    def on_skip(self, state: SignalState) -> None:
+        # 记录跳过原因，便于审计
+        state.conf_history.append((4, "HighPrice(skip non-BUY)", state.confidence))
+
+    def run(self, state: SignalState) -> None:
+        result = state.result
+        decline_result = state.decline_result
+
+        # 传递持续下跌检测结果给高位优化器
+        market_data_with_decline = dict(state.market_data)
+        if decline_result:
+            market_data_with_decline["sustained_decline"] = {
+                "is_detected": decline_result.is_detected,
+                "decline_level": decline_result.decline_level,
+                "buy_penalty": decline_result.buy_penalty,
+            }
+
+        optimized = self.integrator.high_price_optimizer.optimize_high_price_buy(
+            market_data=market_data_with_decline,
+            original_confidence=state.confidence,
+            original_can_buy=True,
+            buy_mode=result.price_level,
+            original_signal=state.signal,
+        )
+
+        result.high_price_result = {
+            "adjusted_confidence": optimized.adjusted_confidence,
+            "should_buy": optimized.should_buy,
+            "price_level": optimized.price_level,
+            "adjustment_reason": optimized.adjustment_reason,
+            "penalty_applied": optimized.penalty_applied,
+        }
+
+        # 如果优化器说不要买入，改为HOLD
+        if not optimized.should_buy:
+            state.signal = "HOLD"
+            result.adjustments_made.append(
+                f"高位过滤: 不建议买入 - {optimized.adjustment_reason[:50]}..."
+            )
+        elif optimized.penalty_applied and optimized.adjusted_confidence < 0.40:
+            state.signal = "HOLD"
+            result.adjustments_made.append(
+                "高位过滤: BUY被压到低置信，降级HOLD继续评估策略"
+            )
+
+        state.confidence = optimized.adjusted_confidence
+        state.conf_history.append((4, "HighPrice", state.confidence))
+
+
+STAGES: Dict[str, Type[IntegratorStage]] = {
+    stage.name: stage
+    for stage in (
+        SustainedDeclineStage,
+        ShortSignalStage,
+        HoldToShortStage,
+        AdaptiveBuyStage,
+        MarketStructureStage,
+        RiskRewardStage,
+        SignalOptimizerStage,
+        BTCLevelStage,
+        HighPriceFilterStage,
+    )
+}
+
+DEFAULT_STAGES = (
+    "sustained_decline",
+    "short_signal",
+    "adaptive_buy",
+    "market_structure",
+    "risk_reward",
+    "signal_optimizer",
+    "btc_level",
+    "high_price_filter",
+)
+
+StageSpec = Union[str, Type[IntegratorStage]]
+
+
+def build_pipeline(
+    integrator: Any, stages: Optional[Sequence[StageSpec]] = None
+) -> SignalPipeline:
+    """
+    按名称或阶段类组装流水线
+
+    Args:
+        integrator: 提供各检测模块与阈值配置的集成器
+        stages: 阶段顺序，None 时使用 DEFAULT_STAGES
+    """
+    built: List[IntegratorStage] = []
+    for spec in DEFAULT_STAGES if stages is None else stages:
+        if isinstance(spec, str):
+            if spec not in STAGES:
+                raise ValueError(
+                    f"未知的流水线阶段: {spec}，可选: {', '.join(sorted(STAGES))}"
+                )
+            spec = STAGES[spec]
+        built.append(spec(integrator))
+    return SignalPipeline(built)
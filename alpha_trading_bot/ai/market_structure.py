@@ -17,7 +17,8 @@
 """
 
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
+from typing import Optional, List, Sequence, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -104,9 +105,10 @@ class MarketStructureAnalyzer:
 
     def analyze(
         self,
-        price_history: List[float],
+        price_history: Sequence[float],
         current_price: float,
         atr_percent: float = 0.0,
+        swing_points: Optional[Tuple[List[float], List[float]]] = None,
     ) -> MarketStructureResult:
         """
         分析市场结构
@@ -115,6 +117,7 @@ class MarketStructureAnalyzer:
             price_history: 历史价格列表（从最近到最远）
             current_price: 当前价格
             atr_percent: ATR百分比（用于动态调整参数）
+            swing_points: 可选，预先计算的摆动高低点（如 SwingPointTracker 增量结果）
 
         Returns:
             MarketStructureResult: 市场结构分析结果
@@ -124,7 +127,9 @@ class MarketStructureAnalyzer:
             return self._create_neutral_result(current_price)
 
         # 1. 识别摆动高低点
-        swing_highs, swing_lows = self._find_swing_points(price_history)
+        if swing_points is None:
+            swing_points = self._find_swing_points(price_history)
+        swing_highs, swing_lows = swing_points
 
         if not swing_highs or not swing_lows:
             logger.debug("[市场结构] 无法识别摆动点，返回中性结构")
@@ -179,7 +184,7 @@ class MarketStructureAnalyzer:
         return result
 
     def _find_swing_points(
-        self, price_history: List[float]
+        self, price_history: Sequence[float]
     ) -> Tuple[List[float], List[float]]:
         """
         识别摆动高低点
@@ -193,38 +198,7 @@ class MarketStructureAnalyzer:
         Returns:
             (swing_highs, swing_lows): 摆动高点和低点列表
         """
-        swing_highs: List[float] = []
-        swing_lows: List[float] = []
-        window = self.swing_window
-
-        # 反转以从远到近处理
-        prices = list(reversed(price_history))
-
-        if len(prices) < 2 * window + 1:
-            # 数据不足，使用简单方法
-            if len(prices) >= 3:
-                swing_highs.append(max(prices))
-                swing_lows.append(min(prices))
-            return swing_highs, swing_lows
-
-        for i in range(window, len(prices) - window):
-            is_high = True
-            is_low = True
-
-            for j in range(i - window, i + window + 1):
-                if j == i:
-                    continue
-                if prices[j] >= prices[i]:
-                    is_high = False
-                if prices[j] <= prices[i]:
-                    is_low = False
-
-            if is_high:
-                swing_highs.append(prices[i])
-            if is_low:
-                swing_lows.append(prices[i])
-
-        return swing_highs, swing_lows
+        return find_swing_points(price_history, self.swing_window)
 
     def _determine_structure(
         self, swing_highs: List[float], swing_lows: List[float]
@@ -387,7 +361,7 @@ class MarketStructureAnalyzer:
         current_price: float,
         resistance: float,
         support: float,
-        price_history: List[float],
+        price_history: Sequence[float],
     ) -> Tuple[bool, bool, str]:
         """
         检测市场结构突破/破位
@@ -524,3 +498,113 @@ class MarketStructureAnalyzer:
             swing_highs=[],
             swing_lows=[],
         )
+
+
+def _sliding_extremes(
+    prices: Sequence[float], width: int
+) -> Tuple[List[float], List[float]]:
+    """
+    单调双端队列求滑动窗口极值
+
+    Returns:
+        (maxima, minima)，第 k 项为 prices[k:k+width] 的最大/最小值
+    """
+    maxima: List[float] = []
+    minima: List[float] = []
+    max_queue: deque = deque()
+    min_queue: deque = deque()
+    for i, price in enumerate(prices):
+        while max_queue and prices[max_queue[-1]] <= price:
+            max_queue.pop()
+        max_queue.append(i)
+        while min_queue and prices[min_queue[-1]] >= price:
+            min_queue.pop()
+        min_queue.append(i)
+        start = i - width + 1
+        if start < 0:
+            continue
+        if max_queue[0] < start:
+            max_queue.popleft()
+        if min_queue[0] < start:
+            min_queue.popleft()
+        maxima.append(prices[max_queue[0]])
+        minima.append(prices[min_queue[0]])
+    return maxima, minima
+
+
+def find_swing_points(
+    price_history: Sequence[float], window: int
+) -> Tuple[List[float], List[float]]:
+    """
+    O(n) 识别摆动高低点
+
+    某点严格高于（低于）其前后各 window 个点时为摆动高（低）点，
+    即该点大于左右两侧长度为 window 的滑动窗口的最大值（小于最小值）。
+    结果按从最近到最远排列；数据不足 2*window+1 个时退化为整体最高/最低价。
+    """
+    n = len(price_history)
+    if n < 2 * window + 1:
+        if n >= 3:
+            return [max(price_history)], [min(price_history)]
+        return [], []
+    if window <= 0:
+        prices = list(reversed(price_history))
+        return prices, list(prices)
+
+    maxima, minima = _sliding_extremes(price_history, window)
+    swing_highs: List[float] = []
+    swing_lows: List[float] = []
+    for i in range(n - window - 1, window - 1, -1):
+        price = price_history[i]
+        # 左侧窗口 [i-window, i) 对应 maxima[i-window]，右侧 (i, i+window] 对应 maxima[i+1]
+        if price > maxima[i - window] and price > maxima[i + 1]:
+            swing_highs.append(price)
+        if price < minima[i - window] and price < minima[i + 1]:
+            swing_lows.append(price)
+    return swing_highs, swing_lows
+
+
+class SwingPointTracker:
+    """
+    增量摆动点跟踪
+
+    逐根追加价格时只评估刚凑齐右侧窗口的那个点（O(window)），
+    已确认的摆动点不再重算；结果与 find_swing_points 对全量序列的结果一致。
+    """
+
+    def __init__(self, window: int = MarketStructureAnalyzer.DEFAULT_SWING_WINDOW):
+        self.window = window
+        self._prices: List[float] = []
+        self._highs: List[float] = []
+        self._lows: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def extend(self, prices: Sequence[float]) -> None:
+        for price in prices:
+            self.append(price)
+
+    def append(self, price: float) -> None:
+        """追加一根最新收盘价"""
+        prices = self._prices
+        prices.append(price)
+        window = self.window
+        i = len(prices) - 1 - window
+        if i < window:
+            return
+        candidate = prices[i]
+        neighbours = prices[i - window : i] + prices[i + 1 :]
+        if all(candidate > other for other in neighbours):
+            self._highs.append(candidate)
+        if all(candidate < other for other in neighbours):
+            self._lows.append(candidate)
+
+    def swing_points(self) -> Tuple[List[float], List[float]]:
+        """当前摆动高低点（从最近到最远）"""
+        n = len(self._prices)
+        if n < 2 * self.window + 1:
+            if n >= 3:
+                return [max(self._prices)], [min(self._prices)]
+            return [], []
+        return self._highs[::-1], self._lows[::-1]
@@ -2,35 +2,7 @@
 ML Module - 机器学习优化模块
 """
 
-from .weight_optimizer import WeightOptimizer, get_optimized_weights
-from .performance_tracker import PerformanceTracker, get_performance_summary
-from .ab_test_framework import ABTestFramework, run_ab_test, ABTestVariant
-from .trend_detector import (
-    EnhancedTrendDetector,
-    TrendDirection,
-    TrendState,
-    detect_market_trend,
-)
-from .adaptive_fusion import (
-    AdaptiveFusionStrategy,
-    FusionConfig,
-    FusionMode,
-    adaptive_fuse,
-)
-from .monitoring_dashboard import (
-    MonitoringDashboard,
-    AlertManager,
-    get_dashboard_status,
-)
-from ..prompt_optimizer import (
-    OptimizedPromptBuilder,
-    build_optimized_prompt,
-)
-from ..prompt_context import (
-    TrendRegime,
-    MomentumStrength,
-    MarketContext,
-)
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "WeightOptimizer",
@@ -57,3 +29,32 @@ __all__ = [
     "MarketContext",
     "build_optimized_prompt",
 ]
+
+# pandas/NumPy 依赖的子模块在首次访问对应名称时才导入
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".weight_optimizer": ("WeightOptimizer", "get_optimized_weights"),
+        ".performance_tracker": ("PerformanceTracker", "get_performance_summary"),
+        ".ab_test_framework": ("ABTestFramework", "run_ab_test", "ABTestVariant"),
+        ".trend_detector": (
+            "EnhancedTrendDetector",
+            "TrendDirection",
+            "TrendState",
+            "detect_market_trend",
+        ),
+        ".adaptive_fusion": (
+            "AdaptiveFusionStrategy",
+            "FusionConfig",
+            "FusionMode",
+            "adaptive_fuse",
+        ),
+        ".monitoring_dashboard": (
+            "MonitoringDashboard",
+            "AlertManager",
+            "get_dashboard_status",
+        ),
+        "..prompt_optimizer": ("OptimizedPromptBuilder", "build_optimized_prompt"),
+        "..prompt_context": ("TrendRegime", "MomentumStrength", "MarketContext"),
+    },
+)
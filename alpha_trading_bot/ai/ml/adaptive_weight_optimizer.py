@@ -11,7 +11,7 @@
 """
 
 import logging
-from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, cast
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -20,11 +20,15 @@ if TYPE_CHECKING:
     import pandas as pd
 
 from alpha_trading_bot.ai.provider_utils import get_runtime_fusion_providers
+from alpha_trading_bot.utils.result_cache import ResultCache
 
 from .ml_data_manager import get_ml_data_manager
 
 logger = logging.getLogger(__name__)
 
+# 结果缓存版本：评分/搜索逻辑变化时递增
+_CACHE_VERSION = 1
+
 
 @dataclass
 class OptimizationResult:
@@ -55,6 +59,7 @@ class AdaptiveWeightOptimizer:
         db_path: str = "data_json/trading_data.db",
         window_days: int = 30,
         min_trades: int = 20,
+        result_cache: Optional[ResultCache] = None,
     ):
         """
         初始化优化器
@@ -63,10 +68,12 @@ class AdaptiveWeightOptimizer:
             db_path: 数据库路径
             window_days: 分析窗口天数
             min_trades: 最少需要的交易数
+            result_cache: 结果缓存（历史信号不变时直接返回上次的权重）
         """
         self.db_path = db_path
         self.window_days = window_days
         self.min_trades = min_trades
+        self.result_cache = result_cache
 
         self.data_manager = get_ml_data_manager(db_path)
         self.default_providers: List[str] = get_runtime_fusion_providers()
@@ -125,6 +132,18 @@ class AdaptiveWeightOptimizer:
             logger.warning("[权重优化] 无历史数据，返回默认权重")
             return self._default_weights()
 
+        if self.result_cache is None:
+            return self._performance_weights(signals)
+        weights = self.result_cache.get_or_compute(
+            "performance_weights",
+            (_CACHE_VERSION, signals),
+            lambda: self._performance_weights(signals),
+        )
+        self._set_cached_weights(weights)
+        return weights
+
+    def _performance_weights(self, signals: List[Dict[str, Any]]) -> Dict[str, float]:
+        """由历史信号及其结果计算各提供商权重"""
         # 计算各提供商性能
         performance = self.data_manager.calculate_provider_performance(signals)
 
@@ -170,15 +189,153 @@ class AdaptiveWeightOptimizer:
         logger.info(f"[权重优化] 计算权重: {weights}")
         return weights
 
+    @staticmethod
+    def _provider_statistics(
+        df: "pd.DataFrame",
+    ) -> Tuple[List[str], Dict[str, "np.ndarray"]]:
+        """
+        一次性计算各提供商已平仓信号的充分统计量
+
+        Returns:
+            Tuple: (提供商列表, {"count", "wins", "pnl_sum", "pnl_sq_sum"} 数组)
+        """
+        import numpy as np
+        import pandas as pd
+
+        providers = [str(p) for p in df["provider"].unique()]
+        if "trade_status" in df.columns:
+            closed = df[df["trade_status"] == "closed"]
+        else:
+            closed = df.iloc[0:0]
+
+        pnl = (
+            closed["pnl"].astype(float).fillna(0.0)
+            if "pnl" in closed.columns
+            else pd.Series(0.0, index=closed.index)
+        )
+        grouped = (
+            closed.assign(_pnl=pnl, _win=pnl > 0, _pnl_sq=pnl * pnl)
+            .groupby(closed["provider"].astype(str))
+            .agg(
+                count=("_pnl", "size"),
+                wins=("_win", "sum"),
+                pnl_sum=("_pnl", "sum"),
+                pnl_sq_sum=("_pnl_sq", "sum"),
+            )
+            .reindex(providers)
+            .fillna(0.0)
+        )
+        stats = {
+            column: grouped[column].to_numpy(dtype=np.float64)
+            for column in ("count", "wins", "pnl_sum", "pnl_sq_sum")
+        }
+        return providers, stats
+
+    @staticmethod
+    def _sample_weight_candidates(
+        n_candidates: int,
+        n_providers: int,
+        method: str = "dirichlet",
+        min_weight: float = 0.05,
+        seed: Optional[int] = None,
+    ) -> "np.ndarray":
+        """
+        生成候选权重矩阵（每行和为1，且每个权重不低于 min_weight）
+
+        Args:
+            n_candidates: 候选数量（simplex 网格取不超过该数量的最细网格）
+            n_providers: 提供商数量
+            method: dirichlet（随机采样）/ simplex（均匀网格）
+            min_weight: 单个提供商最低权重
+            seed: 随机种子
+
+        Returns:
+            np.ndarray: 形状为 (候选数, 提供商数) 的矩阵
+        """
+        import numpy as np
+        from itertools import combinations
+        from math import comb
+
+        min_weight = min(max(min_weight, 0.0), 1.0 / n_providers)
+        free = 1.0 - min_weight * n_providers
+
+        if method == "simplex":
+            resolution = 1
+            while comb(resolution + n_providers, n_providers - 1) <= n_candidates:
+                resolution += 1
+            bars = np.array(
+                list(
+                    combinations(range(resolution + n_providers - 1), n_providers - 1)
+                ),
+                dtype=np.int64,
+            ).reshape(-1, n_providers - 1)
+            edges = np.hstack(
+                [
+                    np.full((len(bars), 1), -1),
+                    bars,
+                    np.full((len(bars), 1), resolution + n_providers - 1),
+                ]
+            )
+            simplex = (np.diff(edges, axis=1) - 1) / resolution
+        elif method == "dirichlet":
+            rng = np.random.default_rng(seed)
+            simplex = rng.dirichlet(np.ones(n_providers), size=n_candidates)
+        else:
+            raise ValueError(f"未知的采样方法: {method}")
+
+        candidates: np.ndarray = min_weight + free * simplex
+        return candidates
+
+    @staticmethod
+    def _score_weight_candidates(
+        candidates: "np.ndarray", stats: Dict[str, "np.ndarray"], objective: str
+    ) -> "np.ndarray":
+        """
+        向量化计算所有候选权重的目标得分
+
+        各信号收益按所属提供商权重缩放后视为一个收益序列：
+        - win_rate: 按信号数加权的胜率
+        - return: 加权平均收益
+        - sharpe: 加权收益均值 / 标准差
+        """
+        import numpy as np
+
+        total = stats["count"].sum()
+        if objective == "win_rate":
+            win_rate: np.ndarray = candidates @ stats["wins"] / total
+            return win_rate
+
+        mean: np.ndarray = candidates @ stats["pnl_sum"] / total
+        if objective == "return":
+            return mean
+        if objective == "sharpe":
+            second_moment = (candidates * candidates) @ stats["pnl_sq_sum"] / total
+            std = np.sqrt(np.maximum(second_moment - mean * mean, 0.0))
+            sharpe: np.ndarray = np.divide(
+                mean, std, out=np.zeros_like(mean), where=std > 1e-12
+            )
+            return sharpe
+        raise ValueError(f"未知的优化目标: {objective}")
+
     def optimize_weights_grid_search(
-        self, n_iterations: int = 100, objective: str = "sharpe"
+        self,
+        n_iterations: int = 10000,
+        objective: str = "win_rate",
+        method: str = "dirichlet",
+        min_weight: float = 0.05,
+        seed: Optional[int] = None,
     ) -> Tuple[Dict[str, float], float]:
         """
-        使用网格搜索寻找最优权重
+        使用向量化搜索寻找最优权重
+
+        先计算各提供商充分统计量，再以矩阵运算一次评估所有候选权重
 
         Args:
-            n_iterations: 迭代次数
-            objective: 优化目标 (sharpe / return / win_rate)
+            n_iterations: 候选权重数量
+            objective: 优化目标 (win_rate / return / sharpe)
+            method: 候选生成方式 (dirichlet / simplex)
+            min_weight: 单个提供商最低权重
+            seed: 随机种子
 
         Returns:
             Tuple: (最优权重, 预期得分)
@@ -193,54 +350,53 @@ class AdaptiveWeightOptimizer:
             logger.warning(f"[权重优化] 数据不足: {len(signals)} < {self.min_trades}")
             return self.calculate_performance_based_weights(), 0.0
 
+        # seed=None 时复用同一输入上次的随机搜索结果
+        cache = self.result_cache
+        key = None
+        if cache is not None:
+            key = cache.key(
+                _CACHE_VERSION,
+                signals,
+                n_iterations,
+                objective,
+                method,
+                min_weight,
+                seed,
+            )
+            hit, cached = cache.lookup("weight_grid_search", key)
+            if hit:
+                weights, score = cast(Tuple[Dict[str, float], float], cached)
+                logger.info(f"[权重优化] 历史信号未变化，使用缓存权重: {weights}")
+                return weights, score
+
         df = pd.DataFrame(signals)
-        providers = df["provider"].unique()
+        providers, stats = self._provider_statistics(df)
 
         if len(providers) < 2:
             return {providers[0]: 1.0}, 0.0
 
-        best_score = -float("inf")
-        best_weights = {}
-
-        # 简单网格搜索
-        for _ in range(n_iterations):
-            # 随机生成权重
-            weights = {}
-            for p in providers:
-                weights[p] = np.random.uniform(0.1, 0.9)
-
-            # 归一化
-            total = sum(weights.values())
-            weights = {p: w / total for p, w in weights.items()}
-
-            # 计算加权得分
-            weighted_score = 0
-            total_signals = 0
-
-            for provider in providers:
-                provider_df = df[df["provider"] == provider]
-                closed = provider_df[provider_df["trade_status"] == "closed"]
-
-                if len(closed) == 0:
-                    continue
-
-                win_rate = (closed["pnl"] > 0).mean()
-
-                weighted_score += weights[provider] * win_rate * len(closed)
-                total_signals += len(closed)
-
-            if total_signals == 0:
-                continue
+        if stats["count"].sum() == 0:
+            logger.warning("[权重优化] 无已平仓信号，使用历史表现权重")
+            return self.calculate_performance_based_weights(), 0.0
 
-            score = weighted_score / total_signals
+        candidates = self._sample_weight_candidates(
+            n_iterations, len(providers), method, min_weight, seed
+        )
+        scores = self._score_weight_candidates(candidates, stats, objective)
+        best = int(np.argmax(scores))
 
-            if score > best_score:
-                best_score = score
-                best_weights = weights
+        best_weights = {
+            provider: float(weight)
+            for provider, weight in zip(providers, candidates[best])
+        }
+        best_score = float(scores[best])
 
         logger.info(
-            f"[权重优化] 网格搜索最优权重: {best_weights}, 得分: {best_score:.4f}"
+            f"[权重优化] 网格搜索最优权重: {best_weights}, 得分: {best_score:.4f} "
+            f"(目标={objective}, 候选数={len(candidates)})"
         )
+        if cache is not None and key is not None:
+            cache.put("weight_grid_search", key, (best_weights, best_score))
         return best_weights, best_score
 
     def online_update(
@@ -417,9 +573,10 @@ class EnsembleWeightOptimizer:
 # 便捷函数
 def get_weight_optimizer(
     db_path: str = "data_json/trading_data.db",
+    result_cache: Optional[ResultCache] = None,
 ) -> AdaptiveWeightOptimizer:
     """获取权重优化器实例"""
-    return AdaptiveWeightOptimizer(db_path)
+    return AdaptiveWeightOptimizer(db_path, result_cache=result_cache)
 
 
 def run_learning_cycle(db_path: str = "data_json/trading_data.db") -> Dict[str, Any]:
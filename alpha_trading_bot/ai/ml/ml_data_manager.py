@@ -24,6 +24,8 @@ if TYPE_CHECKING:
 
 from alpha_trading_bot.ai.provider_utils import get_runtime_fusion_providers
 
+from .sqlite_store import get_sqlite_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,11 +70,8 @@ class MLDataManager:
         return {provider: equal for provider in target_providers}
 
     def get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接"""
-        db_dir = Path(self.db_path).parent
-        if str(db_dir) not in {"", "."}:
-            db_dir.mkdir(parents=True, exist_ok=True)
-        return sqlite3.connect(self.db_path)
+        """获取数据库连接（共享持久连接，WAL 模式）"""
+        return get_sqlite_store(self.db_path).connection()
 
     @staticmethod
     def _ensure_model_weights_table(conn: sqlite3.Connection) -> None:
@@ -186,6 +185,8 @@ class MLDataManager:
         if not signals:
             return {}
 
+        import pandas as pd
+
         df = pd.DataFrame(signals)
 
         performance = {}
@@ -404,6 +405,7 @@ class MLDataManager:
         try:
             with self.get_connection() as conn:
                 self._ensure_model_weights_table(conn)
+                get_sqlite_store(self.db_path).ensure_indexes(conn)
                 cursor = conn.cursor()
 
                 for provider, weight in weights.items():
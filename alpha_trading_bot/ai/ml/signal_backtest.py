@@ -12,7 +12,7 @@
 
 import logging
 import sqlite3
-from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, cast
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -20,9 +20,15 @@ if TYPE_CHECKING:
     import pandas as pd
 
 from alpha_trading_bot.ai.provider_utils import get_runtime_fusion_providers
+from alpha_trading_bot.utils.result_cache import ResultCache
+
+from .sqlite_store import get_sqlite_store
 
 logger = logging.getLogger(__name__)
 
+# 结果缓存版本：假设盈亏/统计逻辑变化时递增
+_CACHE_VERSION = 1
+
 
 @dataclass
 class BacktestResult:
@@ -38,6 +44,114 @@ class BacktestResult:
     provider_stats: Dict[str, Dict]
 
 
+class _MarketWindow:
+    """按时间升序排列的市场数据列数组，用于区间定位持有期数据"""
+
+    def __init__(self, df: "pd.DataFrame"):
+        import numpy as np
+
+        if df.empty or "timestamp" not in df.columns:
+            self.size = 0
+            return
+
+        # 保持 SQL 排序（稳定排序仅作为防御）
+        timestamps = df["timestamp"].astype(str).to_numpy()
+        order = np.argsort(timestamps, kind="stable")
+        df = df.iloc[order].reset_index(drop=True)
+
+        self.size = len(df)
+        self.timestamps = timestamps[order].astype(str)
+        self.raw_timestamps = df["timestamp"].to_numpy(dtype=object)
+        self.open = df["open"].to_numpy() if "open" in df.columns else None
+        self.close = df["close"].to_numpy() if "close" in df.columns else None
+        self.price = df["price"].to_numpy() if "price" in df.columns else None
+        self.high = df["high"].to_numpy() if "high" in df.columns else None
+        self.low = df["low"].to_numpy() if "low" in df.columns else None
+
+    def fingerprint(self) -> tuple:
+        """窗口数据内容（用于结果缓存键）"""
+        if self.size == 0:
+            return ()
+        return (
+            self.timestamps,
+            self.open,
+            self.close,
+            self.price,
+            self.high,
+            self.low,
+        )
+
+    @staticmethod
+    def _range_reduce(ufunc: Any, values: Any, left: Any, right: Any) -> Any:
+        """对每个 [left, right) 区间做归约（要求 left < right）"""
+        import numpy as np
+
+        padded = np.append(values, values[-1:])
+        bounds = np.column_stack([left, right]).ravel()
+        return ufunc.reduceat(padded, bounds)[::2]
+
+    def resolve(
+        self, starts: List[str], ends: List[str], signal_prices: List[float]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        定位每个持有期 [start, end] 的入场/出场/最高/最低价
+
+        Returns:
+            List: 每个区间的假设盈亏信息，数据不足（<2 条）时为 None
+        """
+        import numpy as np
+
+        if self.size == 0:
+            return [None] * len(starts)
+
+        # 按数组查找返回下标数组（np.asarray 使类型检查不落到标量重载）
+        left = np.asarray(
+            np.searchsorted(self.timestamps, np.asarray(starts, dtype=str), "left")
+        )
+        right = np.asarray(
+            np.searchsorted(self.timestamps, np.asarray(ends, dtype=str), "right")
+        )
+        valid = (right - left) >= 2
+
+        highs = lows = None
+        if valid.any():
+            v_left, v_right = left[valid], right[valid]
+            if self.high is not None:
+                highs = iter(self._range_reduce(np.fmax, self.high, v_left, v_right))
+            if self.low is not None:
+                lows = iter(self._range_reduce(np.fmin, self.low, v_left, v_right))
+
+        results: List[Optional[Dict[str, Any]]] = []
+        for i, signal_price in enumerate(signal_prices):
+            if not valid[i]:
+                results.append(None)
+                continue
+            first, last = int(left[i]), int(right[i]) - 1
+
+            entry_price = self.open[first] if self.open is not None else signal_price
+            if self.close is not None:
+                exit_price = self.close[last]
+            elif self.price is not None:
+                exit_price = self.price[last]
+            else:
+                exit_price = signal_price
+
+            results.append(
+                {
+                    "entry_time": self.raw_timestamps[first],
+                    "entry_price": entry_price,
+                    "exit_time": self.raw_timestamps[last],
+                    "exit_price": exit_price,
+                    "pnl": exit_price - entry_price,
+                    "pnl_percent": (exit_price - entry_price) / entry_price * 100,
+                    "high": next(highs) if highs is not None else exit_price,
+                    "low": next(lows) if lows is not None else entry_price,
+                    "source": "market_data",
+                }
+            )
+        return results
+
+
 class SignalBacktestLearner:
     """
     信号回测学习器
@@ -45,14 +159,20 @@ class SignalBacktestLearner:
     对历史信号进行回测，无需真实交易也能学习
     """
 
-    def __init__(self, db_path: str = "data_json/trading_data.db"):
+    def __init__(
+        self,
+        db_path: str = "data_json/trading_data.db",
+        result_cache: Optional[ResultCache] = None,
+    ):
         """
         初始化回测学习器
 
         Args:
             db_path: 数据库路径
+            result_cache: 结果缓存（信号与行情窗口不变时 backtest_signals 直接返回）
         """
         self.db_path = db_path
+        self.result_cache = result_cache
         self.default_providers = get_runtime_fusion_providers()
 
     def _default_weights(self) -> Dict[str, float]:
@@ -61,8 +181,8 @@ class SignalBacktestLearner:
         return {provider: equal for provider in self.default_providers}
 
     def get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接"""
-        return sqlite3.connect(self.db_path)
+        """获取数据库连接（共享持久连接，WAL 模式）"""
+        return get_sqlite_store(self.db_path).connection()
 
     def get_historical_signals(
         self, days: int = 60, min_confidence: float = 0.5
@@ -135,6 +255,75 @@ class SignalBacktestLearner:
             logger.error(f"[回测] 获取市场数据失败: {e}")
             return []
 
+    def _load_market_window(
+        self, symbol: str, start: str, end: str
+    ) -> Optional["_MarketWindow"]:
+        """
+        一次性加载 [start, end] 区间的市场数据为按时间排序的数组
+
+        Args:
+            symbol: 交易对
+            start: 开始时间（ISO 字符串，与 SQLite 文本比较语义一致）
+            end: 结束时间（ISO 字符串）
+
+        Returns:
+            _MarketWindow: 市场数据窗口，查询失败时返回 None
+        """
+        try:
+            import pandas as pd
+
+            with self.get_connection() as conn:
+                query = """
+                    SELECT * FROM market_data
+                    WHERE symbol = :symbol
+                    AND timestamp BETWEEN :start AND :end
+                    ORDER BY timestamp ASC
+                """
+                df = pd.read_sql(
+                    query,
+                    conn,
+                    params={"symbol": symbol, "start": start, "end": end},
+                )
+            return _MarketWindow(df)
+        except Exception as e:
+            logger.debug(f"[回测] market_data 查询失败: {e}")
+            return None
+
+    @staticmethod
+    def _simulate_pnl(
+        signal_time: str, signal_price: float, signal_dt: datetime, end_dt: datetime
+    ) -> Dict[str, Any]:
+        """无真实市场数据时，基于信号价格模拟持有收益"""
+        import numpy as np
+
+        # 基于信号置信度和历史表现模拟
+        np.random.seed(int(signal_dt.timestamp()) % (2**32))
+
+        # 模拟收益分布（基于信号置信度）
+        base_return = signal_price * 0.001 * np.random.randn()  # 基础波动
+        confidence_factor = (float(signal_price) - 40000) / 20000  # 价格因素
+
+        # BUY 信号倾向于上涨
+        simulated_return = (
+            base_return + confidence_factor * 0.1 + np.random.uniform(-0.5, 1.5)
+        )
+        simulated_return = max(-3, min(5, simulated_return))  # 限制在 -3% 到 5%
+
+        simulated_pnl_percent = simulated_return
+        simulated_pnl = signal_price * simulated_return / 100
+
+        return {
+            "entry_time": signal_time,
+            "entry_price": signal_price,
+            "exit_time": end_dt.isoformat(),
+            "exit_price": signal_price * (1 + simulated_return / 100),
+            "pnl": simulated_pnl,
+            "pnl_percent": simulated_pnl_percent,
+            "high": signal_price * (1 + abs(simulated_return) * 1.2 / 100),
+            "low": signal_price * (1 - abs(simulated_return) * 0.8 / 100),
+            "source": "simulated",
+        }
+
     def calculate_hypothetical_pnl(
         self,
         signal_time: str,
@@ -158,108 +347,109 @@ class SignalBacktestLearner:
             Dict: 假设盈亏信息
         """
         try:
-            import numpy as np
-            import pandas as pd
-
             signal_dt = datetime.fromisoformat(signal_time.replace("Z", "+00:00"))
 
             # 尝试获取持有期间的市场数据
             end_dt = signal_dt + timedelta(hours=holding_hours)
+            start, end = signal_dt.isoformat(), end_dt.isoformat()
 
-            try:
-                with self.get_connection() as conn:
-                    query = """
-                        SELECT * FROM market_data
-                        WHERE symbol = :symbol
-                        AND timestamp BETWEEN :start AND :end
-                        ORDER BY timestamp ASC
-                    """
-                    df = pd.read_sql(
-                        query,
-                        conn,
-                        params={
-                            "symbol": symbol,
-                            "start": signal_dt.isoformat(),
-                            "end": end_dt.isoformat(),
-                        },
-                    )
-
-                    if not df.empty and len(df) >= 2:
-                        # 使用真实市场数据
-                        entry_price = (
-                            df.iloc[0]["open"] if "open" in df.columns else signal_price
-                        )
-                        exit_price = (
-                            df.iloc[-1]["close"]
-                            if "close" in df.columns
-                            else df.iloc[-1].get("price", signal_price)
-                        )
-
-                        pnl_percent = (exit_price - entry_price) / entry_price * 100
-                        pnl = exit_price - entry_price
-
-                        return {
-                            "entry_time": (
-                                df.iloc[0]["timestamp"]
-                                if "timestamp" in df.columns
-                                else signal_time
-                            ),
-                            "entry_price": entry_price,
-                            "exit_time": (
-                                df.iloc[-1]["timestamp"]
-                                if "timestamp" in df.columns
-                                else end_dt.isoformat()
-                            ),
-                            "exit_price": exit_price,
-                            "pnl": pnl,
-                            "pnl_percent": pnl_percent,
-                            "high": (
-                                df["high"].max() if "high" in df.columns else exit_price
-                            ),
-                            "low": (
-                                df["low"].min() if "low" in df.columns else entry_price
-                            ),
-                            "source": "market_data",
-                        }
-            except Exception as e:
-                logger.debug(f"[回测] market_data 查询失败: {e}")
+            window = self._load_market_window(symbol, start, end)
+            if window is not None:
+                resolved = window.resolve([start], [end], [signal_price])[0]
+                if resolved is not None:
+                    return resolved
 
             # 如果没有真实数据，使用模拟方法
-            # 基于信号置信度和历史表现模拟
-            np.random.seed(int(signal_dt.timestamp()) % (2**32))
-
-            # 模拟收益分布（基于信号置信度）
-            base_return = signal_price * 0.001 * np.random.randn()  # 基础波动
-            confidence_factor = (float(signal_price) - 40000) / 20000  # 价格因素
-
-            # BUY 信号倾向于上涨
-            simulated_return = (
-                base_return + confidence_factor * 0.1 + np.random.uniform(-0.5, 1.5)
-            )
-            simulated_return = max(-3, min(5, simulated_return))  # 限制在 -3% 到 5%
-
-            simulated_pnl_percent = simulated_return
-            simulated_pnl = signal_price * simulated_return / 100
-
-            return {
-                "entry_time": signal_time,
-                "entry_price": signal_price,
-                "exit_time": end_dt.isoformat(),
-                "exit_price": signal_price * (1 + simulated_return / 100),
-                "pnl": simulated_pnl,
-                "pnl_percent": simulated_pnl_percent,
-                "high": signal_price * (1 + abs(simulated_return) * 1.2 / 100),
-                "low": signal_price * (1 - abs(simulated_return) * 0.8 / 100),
-                "source": "simulated",
-            }
+            return self._simulate_pnl(signal_time, signal_price, signal_dt, end_dt)
 
         except Exception as e:
             logger.error(f"[回测] 计算假设盈亏失败: {e}")
             return None
 
-        except Exception as e:
-            logger.error(f"[回测] 计算假设盈亏失败: {e}")
+    def _calculate_hypothetical_pnls(
+        self,
+        signals: List[Dict[str, Any]],
+        holding_hours: int,
+        symbol: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        批量计算假设盈亏（单次查询 + searchsorted 区间定位）
+
+        与逐个调用 calculate_hypothetical_pnl 的结果一致
+
+        Args:
+            signals: 信号列表
+            holding_hours: 持有小时数
+            symbol: 交易对
+
+        Returns:
+            List[Dict]: 合并了假设盈亏信息的信号列表
+        """
+        prepared = self._prepare_signals(signals, holding_hours)
+        if not prepared:
+            return []
+        return self._resolve_pnls(
+            prepared, self._load_prepared_window(prepared, symbol)
+        )
+
+    @staticmethod
+    def _prepare_signals(
+        signals: List[Dict[str, Any]], holding_hours: int
+    ) -> List[tuple]:
+        """解析信号时间，返回 (信号, 时间, 价格, 开始, 结束) 列表（跳过无效信号）"""
+        prepared = []
+        for signal in signals:
+            signal_time = signal.get("timestamp", "")
+            signal_price = signal.get("market_price", 0)
+
+            if not signal_time or signal_price == 0:
+                continue
+
+            try:
+                signal_dt = datetime.fromisoformat(signal_time.replace("Z", "+00:00"))
+                end_dt = signal_dt + timedelta(hours=holding_hours)
+            except Exception as e:
+                logger.error(f"[回测] 计算假设盈亏失败: {e}")
+                continue
+            prepared.append((signal, signal_time, signal_price, signal_dt, end_dt))
+        return prepared
+
+    def _load_prepared_window(
+        self, prepared: List[tuple], symbol: str
+    ) -> Optional["_MarketWindow"]:
+        """单次加载覆盖所有持有期的市场数据窗口"""
+        if not prepared:
             return None
+        starts = [item[3].isoformat() for item in prepared]
+        ends = [item[4].isoformat() for item in prepared]
+        return self._load_market_window(symbol, min(starts), max(ends))
+
+    def _resolve_pnls(
+        self, prepared: List[tuple], window: Optional["_MarketWindow"]
+    ) -> List[Dict[str, Any]]:
+        """在窗口内定位每个持有期，数据不足的信号回退到模拟"""
+        starts = [item[3].isoformat() for item in prepared]
+        ends = [item[4].isoformat() for item in prepared]
+        resolved: List[Optional[Dict[str, Any]]] = (
+            window.resolve(starts, ends, [item[2] for item in prepared])
+            if window is not None
+            else [None] * len(prepared)
+        )
+
+        results = []
+        for (signal, signal_time, signal_price, signal_dt, end_dt), pnl_info in zip(
+            prepared, resolved
+        ):
+            try:
+                if pnl_info is None:
+                    pnl_info = self._simulate_pnl(
+                        signal_time, signal_price, signal_dt, end_dt
+                    )
+            except Exception as e:
+                logger.error(f"[回测] 计算假设盈亏失败: {e}")
+                continue
+            results.append({**signal, **pnl_info})
+        return results
 
     def backtest_signals(
         self, days: int = 60, holding_hours: int = 4, min_confidence: float = 0.5
@@ -294,25 +484,39 @@ class SignalBacktestLearner:
         # 获取市场数据用于计算假设盈亏
         symbol = signals[0].get("symbol", "BTC/USDT") if signals else "BTC/USDT"
 
-        # 对每个信号计算假设盈亏
-        backtest_results = []
-        for signal in signals:
-            signal_time = signal.get("timestamp", "")
-            signal_price = signal.get("market_price", 0)
-
-            if not signal_time or signal_price == 0:
-                continue
-
-            pnl_info = self.calculate_hypothetical_pnl(
-                signal_time=signal_time,
-                signal_price=signal_price,
-                holding_hours=holding_hours,
-                symbol=symbol,
+        # 单次加载市场数据窗口
+        prepared = self._prepare_signals(signals, holding_hours)
+        window = self._load_prepared_window(prepared, symbol)
+
+        # 信号与行情窗口都未变化时直接返回上次的结果
+        cache = self.result_cache
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(
+                _CACHE_VERSION,
+                signals,
+                holding_hours,
+                symbol,
+                window.fingerprint() if window is not None else None,
             )
+            hit, cached = cache.lookup("signal_backtest", cache_key)
+            if hit:
+                cached_result = cast(BacktestResult, cached)
+                logger.info(
+                    f"[回测] 输入未变化，使用缓存结果: "
+                    f"总信号={cached_result.total_signals}"
+                )
+                return cached_result
 
-            if pnl_info:
-                backtest_results.append({**signal, **pnl_info})
+        result = self._summarize_backtest(self._resolve_pnls(prepared, window))
+        if cache is not None and cache_key is not None:
+            cache.put("signal_backtest", cache_key, result)
+        return result
 
+    def _summarize_backtest(
+        self, backtest_results: List[Dict[str, Any]]
+    ) -> BacktestResult:
+        """由逐信号假设盈亏计算总体与各提供商指标"""
         if not backtest_results:
             logger.warning("[回测] 无法计算任何信号的假设盈亏")
             return BacktestResult(
@@ -417,7 +621,18 @@ class SignalBacktestLearner:
         """
         # 运行回测
         result = self.backtest_signals(days=60, holding_hours=4, min_confidence=0.5)
+        return self.weights_from_backtest(result)
 
+    def weights_from_backtest(self, result: BacktestResult) -> Dict[str, float]:
+        """
+        根据已有回测结果计算权重（避免重复回测）
+
+        Args:
+            result: 回测结果
+
+        Returns:
+            Dict: 学习后的权重
+        """
         if result.total_signals == 0:
             logger.warning("[回测学习] 无回测结果，返回默认权重")
             return self._default_weights()
@@ -511,9 +726,10 @@ class SignalBacktestLearner:
 # 便捷函数
 def get_backtest_learner(
     db_path: str = "data_json/trading_data.db",
+    result_cache: Optional[ResultCache] = None,
 ) -> SignalBacktestLearner:
     """获取回测学习器实例"""
-    return SignalBacktestLearner(db_path)
+    return SignalBacktestLearner(db_path, result_cache=result_cache)
 
 
 def run_backtest_learning(
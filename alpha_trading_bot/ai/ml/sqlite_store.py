@@ -0,0 +1,208 @@
+"""
+SQLite 数据访问层
+
+功能：
+- 按数据库路径共享的持久连接（每线程一个连接，进程 fork 后自动重建）
+- WAL 模式与调优 PRAGMA，学习任务读取不阻塞交易循环写入
+- 自动创建常用查询索引（表存在时才创建，可重复执行）
+- 预编译语句缓存与查询辅助方法
+
+作者：AI Trading System
+日期：2026-10-18
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+Row = Union[Sequence[Any], Mapping[str, Any]]
+Params = Optional[Row]
+
+# (索引名, 表名, 列)
+INDEX_SPECS: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("idx_ai_signals_timestamp_provider", "ai_signals", ("timestamp", "provider")),
+    ("idx_trades_status_timestamp_symbol", "trades", ("status", "timestamp", "symbol")),
+    ("idx_market_data_symbol_timestamp", "market_data", ("symbol", "timestamp")),
+    ("idx_model_weights_timestamp", "model_weights", ("timestamp",)),
+)
+
+PRAGMAS: Tuple[Tuple[str, Any], ...] = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", 5000),
+    ("temp_store", "MEMORY"),
+    ("cache_size", -16000),  # 约 16MB
+    ("mmap_size", 64 * 1024 * 1024),
+)
+
+
+class SQLiteStore:
+    """
+    SQLite 数据访问对象
+
+    同一数据库路径在进程内共享一个实例（见 get_sqlite_store），
+    每个线程持有独立的持久连接。
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = 256):
+        """
+        初始化数据访问对象
+
+        Args:
+            db_path: 数据库路径
+            cached_statements: 每个连接的预编译语句缓存数量
+        """
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._indexed: set = set()
+
+    def connection(self) -> sqlite3.Connection:
+        """获取当前线程的持久连接（首次调用时创建并调优）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return cast(sqlite3.Connection, conn)
+
+        db_dir = Path(self.db_path).parent
+        if str(db_dir) not in {"", "."}:
+            db_dir.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, cached_statements=self.cached_statements)
+        self._apply_pragmas(conn)
+        self.ensure_indexes(conn)
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection) -> None:
+        for name, value in PRAGMAS:
+            try:
+                conn.execute(f"PRAGMA {name}={value}")
+            except sqlite3.DatabaseError as e:
+                logger.debug(f"[SQLite] 设置 PRAGMA {name} 失败: {e}")
+
+    def ensure_indexes(self, conn: Optional[sqlite3.Connection] = None) -> List[str]:
+        """
+        为已存在的表创建缺失的索引
+
+        表或列不存在时跳过，待下次建立连接或手动调用时再创建
+
+        Returns:
+            List[str]: 本次新建的索引名
+        """
+        conn = conn or self.connection()
+        created: List[str] = []
+        try:
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+            for index_name, table, columns in INDEX_SPECS:
+                if index_name in existing or index_name in self._indexed:
+                    continue
+                table_columns = {
+                    row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                }
+                if not table_columns or not set(columns) <= table_columns:
+                    continue
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {table} ({', '.join(columns)})"
+                )
+                created.append(index_name)
+            conn.commit()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"[SQLite] 创建索引失败: {e}")
+            return created
+
+        with self._lock:
+            self._indexed.update(created)
+        if created:
+            logger.info(f"[SQLite] 已创建索引: {created}")
+        return created
+
+    def query(self, sql: str, params: Params = None) -> List[Dict[str, Any]]:
+        """执行查询，返回字典列表"""
+        cursor = self.connection().execute(sql, params or ())
+        columns = [column[0] for column in cursor.description or ()]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def query_df(self, sql: str, params: Params = None) -> "pd.DataFrame":
+        """执行查询，返回 DataFrame"""
+        import pandas as pd
+
+        return pd.read_sql(sql, self.connection(), params=params)
+
+    def execute(self, sql: str, params: Params = None) -> int:
+        """执行单条写入并提交，返回影响行数"""
+        conn = self.connection()
+        with conn:
+            return conn.execute(sql, params or ()).rowcount
+
+    def executemany(self, sql: str, rows: Sequence[Row]) -> int:
+        """批量写入（单事务）并提交，返回影响行数"""
+        conn = self.connection()
+        with conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def close(self) -> None:
+        """关闭所有线程的连接"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+_STORES: Dict[str, SQLiteStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_sqlite_store(db_path: str = "data_json/trading_data.db") -> SQLiteStore:
+    """获取数据库路径对应的共享数据访问对象"""
+    key = db_path if db_path == ":memory:" else str(Path(db_path).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = SQLiteStore(db_path)
+            _STORES[key] = store
+        return store
+
+
+def close_sqlite_stores() -> None:
+    """关闭所有共享连接（进程退出或测试清理时调用）"""
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
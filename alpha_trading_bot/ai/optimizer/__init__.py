@@ -4,14 +4,15 @@
 提供离线参数优化能力：
 - 贝叶斯优化 (Optuna)
 - 回测引擎
+- 回测参数并行扫描
+- 滚动窗口优化（折结果缓存与稳定性检查）
+- 蒙特卡洛稳健性分析（回撤/期末权益/破产概率分布）
 - 配置热更新
 
 此模块在后台运行，不影响实时交易
 """
 
-from .bayesian_optimizer import BayesianOptimizer, OptimizationResult
-from .backtest_engine import BacktestEngine, BacktestResult
-from .config_updater import ConfigUpdater, ConfigChange
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "BayesianOptimizer",
@@ -19,5 +20,29 @@ __all__ = [
     "BacktestEngine",
     "BacktestResult",
     "ConfigUpdater",
-    "ConfigUpdate",
+    "ConfigChange",
+    "ParameterSweep",
+    "SweepTable",
+    "WalkForwardOptimizer",
+    "WalkForwardConfig",
+    "WalkForwardReport",
+    "MonteCarloConfig",
+    "MonteCarloResult",
+    "run_monte_carlo",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".bayesian_optimizer": ("BayesianOptimizer", "OptimizationResult"),
+        ".backtest_engine": ("BacktestEngine", "BacktestResult"),
+        ".config_updater": ("ConfigUpdater", "ConfigChange"),
+        ".parameter_sweep": ("ParameterSweep", "SweepTable"),
+        ".walk_forward": (
+            "WalkForwardOptimizer",
+            "WalkForwardConfig",
+            "WalkForwardReport",
+        ),
+        ".monte_carlo": ("MonteCarloConfig", "MonteCarloResult", "run_monte_carlo"),
+    },
+)
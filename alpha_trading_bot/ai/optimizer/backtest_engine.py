@@ -5,16 +5,28 @@
 - 基于历史K线数据回测策略表现
 - 支持多策略并行回测
 - 生成详细的回测报告
+
+撮合与权益计算由 backtest_kernel 完成（按K线最高/最低价判断止损/止盈）
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Union
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 import json
 import os
 
+import numpy as np
+
+from .backtest_kernel import (
+    KernelConfig,
+    KernelResult,
+    OHLCArrays,
+    encode_signals,
+    simulate,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +47,7 @@ class BacktestConfig:
     stop_loss_percent: float = 0.02
     take_profit_percent: float = 0.06
     fee_percent: float = 0.001  # 0.1% 手续费
+    tie_break: str = "stop_loss"  # 同一K线同时触及止损/止盈时先成交的一方
 
 
 @dataclass
@@ -77,7 +90,7 @@ class BacktestEngine:
     def __init__(self, config: Optional[BacktestConfig] = None):
         self.config = config or BacktestConfig()
         self._trade_history: list[Dict[str, Any]] = []
-        self._capital_history: list[float] = []
+        self._capital_history: np.ndarray = np.array([self.config.initial_capital])
 
     def run_backtest(
         self,
@@ -87,6 +100,9 @@ class BacktestEngine:
         """
         运行回测
 
+        止损/止盈按K线最高/最低价判断（缺少 high/low 时退化为收盘价），
+        同一根K线同时触及时按 config.tie_break 处理。
+
         Args:
             market_data: 历史K线数据
             strategy_signals: 策略信号列表
@@ -94,109 +110,108 @@ class BacktestEngine:
         Returns:
             BacktestResult: 回测结果
         """
-        capital = self.config.initial_capital
-        position = 0.0  # 持仓数量
-        entry_price = 0.0
-        in_position = False
-        self._trade_history = []
-        self._capital_history = [capital]
-
-        for i, candle in enumerate(market_data):
-            price = candle.get("close", 0)
-            timestamp = candle.get("timestamp", "")
-
-            # 获取对应信号
-            signal = strategy_signals[i] if i < len(strategy_signals) else {}
-
-            if not in_position:
-                # 无持仓，尝试买入
-                if signal.get("signal") == "buy" and signal.get("confidence", 0) > 0.5:
-                    # 买入
-                    trade_capital = capital * self.config.position_size
-                    fee = trade_capital * self.config.fee_percent
-                    position = (trade_capital - fee) / price
-
-                    self._trade_history.append(
-                        {
-                            "action": TradeAction.BUY.value,
-                            "price": price,
-                            "amount": position,
-                            "timestamp": timestamp,
-                            "capital_before": capital,
-                        }
-                    )
-
-                    capital = capital - trade_capital
-                    entry_price = price
-                    in_position = True
+        ohlc = OHLCArrays.from_dicts(market_data)
+        signals = [
+            strategy_signals[i] if i < len(strategy_signals) else {}
+            for i in range(len(market_data))
+        ]
+        directions, confidence = encode_signals(signals)
+        # 买入需要置信度 > 0.5，卖出信号无条件平仓
+        directions[(directions == 1) & ~(confidence > 0.5)] = 0
+        timestamps = [candle.get("timestamp", "") for candle in market_data]
+        return self.run_arrays(ohlc, directions, confidence, timestamps)
 
-            else:
-                # 有持仓，检查是否卖出
-                pnl_percent = (price - entry_price) / entry_price
-
-                # 止损检查
-                if pnl_percent < -self.config.stop_loss_percent:
-                    self._close_position(
-                        TradeAction.SELL.value,
-                        price,
-                        position,
-                        timestamp,
-                        "stop_loss",
-                    )
-                    capital = price * position * (1 - self.config.fee_percent)
-                    position = 0
-                    in_position = False
-
-                # 止盈检查
-                elif pnl_percent > self.config.take_profit_percent:
-                    self._close_position(
-                        TradeAction.SELL.value,
-                        price,
-                        position,
-                        timestamp,
-                        "take_profit",
-                    )
-                    capital = price * position * (1 - self.config.fee_percent)
-                    position = 0
-                    in_position = False
-
-                # 信号卖出
-                elif signal.get("signal") == "sell":
-                    self._close_position(
-                        TradeAction.SELL.value,
-                        price,
-                        position,
-                        timestamp,
-                        "signal",
-                    )
-                    capital = price * position * (1 - self.config.fee_percent)
-                    position = 0
-                    in_position = False
-
-            # 记录资本
-            portfolio_value = capital + position * price
-            self._capital_history.append(portfolio_value)
-
-        # 计算结果
-        result = self._calculate_result()
-        return result
+    def run_arrays(
+        self,
+        ohlc: OHLCArrays,
+        signals: Union[np.ndarray, Sequence[int]],
+        confidence: Union[np.ndarray, Sequence[float], None] = None,
+        timestamps: Optional[Sequence[Any]] = None,
+    ) -> BacktestResult:
+        """
+        基于列数组运行回测（参数扫描时可复用同一份 OHLCArrays）
+
+        Args:
+            ohlc: OHLC 列数组
+            signals: 每根K线的信号方向（1 买入 / -1 卖出平仓 / 0 观望）
+            confidence: 信号置信度
+            timestamps: 时间戳（仅用于交易记录）
+        """
+        kernel = simulate(ohlc, signals, confidence, self._kernel_config())
+        self._capital_history = np.concatenate(
+            ([float(self.config.initial_capital)], kernel.equity)
+        )
+        self._trade_history = self._build_trade_history(kernel, timestamps)
+        return self._calculate_result()
+
+    def _kernel_config(self) -> KernelConfig:
+        return KernelConfig(
+            initial_capital=self.config.initial_capital,
+            position_size=self.config.position_size,
+            stop_loss_percent=self.config.stop_loss_percent,
+            take_profit_percent=self.config.take_profit_percent,
+            fee_percent=self.config.fee_percent,
+            allow_short=False,
+            exit_on_signal=True,
+            compound=True,
+            tie_break=self.config.tie_break,
+        )
+
+    def _build_trade_history(
+        self, kernel: KernelResult, timestamps: Optional[Sequence[Any]]
+    ) -> List[Dict[str, Any]]:
+        """将内核交易列表转换为买入/卖出记录"""
+        history: List[Dict[str, Any]] = []
+        trades = kernel.trades
+        if not len(trades):
+            return history
+
+        def timestamp(index: int) -> Any:
+            return timestamps[index] if timestamps is not None else index
+
+        capital_before = np.concatenate(
+            ([float(self.config.initial_capital)], kernel.equity[trades.exit_index])
+        )
+        for k, trade in enumerate(trades.to_records()):
+            history.append(
+                {
+                    "action": TradeAction.BUY.value,
+                    "price": trade["entry_price"],
+                    "amount": trade["quantity"],
+                    "timestamp": timestamp(trade["entry_index"]),
+                    "capital_before": float(capital_before[k]),
+                }
+            )
+            self._close_position(
+                history,
+                TradeAction.SELL.value,
+                trade["exit_price"],
+                trade["quantity"],
+                timestamp(trade["exit_index"]),
+                trade["reason"],
+                trade["pnl_percent"],
+            )
+        return history
 
     def _close_position(
         self,
+        history: List[Dict[str, Any]],
         action: str,
         price: float,
         amount: float,
         timestamp: str,
         reason: str,
+        pnl_percent: float,
     ) -> None:
         """记录平仓"""
-        self._trade_history.append(
+        history.append(
             {
                 "action": action,
                 "price": price,
                 "amount": amount,
                 "timestamp": timestamp,
                 "reason": reason,
+                "pnl_percent": pnl_percent,
             }
         )
 
@@ -204,7 +219,7 @@ class BacktestEngine:
         """计算回测结果"""
         capital_history = self._capital_history
         initial_capital = self.config.initial_capital
-        final_capital = capital_history[-1]
+        final_capital = float(capital_history[-1])
 
         # 总收益
         total_return = (final_capital - initial_capital) / initial_capital
@@ -214,35 +229,25 @@ class BacktestEngine:
         annual_return = (1 + total_return) ** (365 / n_days) - 1 if n_days > 0 else 0
 
         # 夏普比率
-        returns = [
-            (capital_history[i + 1] - capital_history[i]) / capital_history[i]
-            for i in range(len(capital_history) - 1)
-        ]
-        if returns and len(returns) > 1:
-            import statistics
-
-            mean_return = statistics.mean(returns)
-            std_return = statistics.stdev(returns) if len(returns) > 1 else 0.001
-            sharpe = (mean_return / std_return) * 15 if std_return > 0 else 0
+        returns = np.diff(capital_history) / capital_history[:-1]
+        if len(returns) > 1:
+            std_return = float(returns.std(ddof=1))
+            sharpe = (float(returns.mean()) / std_return) * 15 if std_return > 0 else 0
         else:
             sharpe = 0
 
         # 最大回撤
-        max_capital = 0
-        max_drawdown = 0
-        for capital in capital_history:
-            if capital > max_capital:
-                max_capital = capital
-            drawdown = (max_capital - capital) / max_capital
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-
-        # 交易统计
-        trades = [
-            t for t in self._trade_history if t["action"] == TradeAction.BUY.value
-        ]
+        peaks = np.maximum.accumulate(np.maximum(capital_history, 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = np.where(peaks > 0, (peaks - capital_history) / peaks, 0.0)
+        max_drawdown = float(drawdowns.max())
+
+        # 交易统计（按平仓盈亏计，回测结束时的强制平仓不计入）
         closes = [
-            t for t in self._trade_history if t["action"] == TradeAction.SELL.value
+            t
+            for t in self._trade_history
+            if t["action"] == TradeAction.SELL.value
+            and t["reason"] != "end_of_backtest"
         ]
 
         winning_trades = 0
@@ -251,12 +256,12 @@ class BacktestEngine:
         total_losses = 0
 
         for close in closes:
-            if close.get("reason") in ["take_profit", "signal"]:
+            if close["pnl_percent"] > 0:
                 winning_trades += 1
-                total_wins += close.get("pnl_percent", 0)
-            elif close.get("reason") == "stop_loss":
+                total_wins += close["pnl_percent"]
+            else:
                 losing_trades += 1
-                total_losses += abs(close.get("pnl_percent", 0))
+                total_losses += abs(close["pnl_percent"])
 
         total_trades = winning_trades + losing_trades
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
@@ -287,4 +292,4 @@ class BacktestEngine:
 
     def get_capital_history(self) -> List[float]:
         """获取资本曲线"""
-        return self._capital_history
+        return list(map(float, self._capital_history))
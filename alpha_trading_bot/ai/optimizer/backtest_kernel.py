@@ -0,0 +1,362 @@
+"""
+OHLC 回测内核
+
+BacktestEngine 与 BacktestValidator 共用的 NumPy 回测内核：
+- 输入 open/high/low/close 列数组与信号/置信度数组
+- 按收盘价入场，之后逐根K线用最高/最低价判断止损/止盈（含跳空按开盘价成交）
+- 同一根K线同时触及止损与止盈时按 tie_break 决定先后
+- 计入手续费与仓位比例（可选复利），输出逐K线权益曲线与交易列表
+
+循环只发生在交易之间：每笔交易用向量化分块扫描定位出场K线，
+空仓区间用 searchsorted 跳到下一个入场信号，耗时与K线数近似线性。
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# 出场原因（KernelTrades.reason 存储下标）
+REASONS = ("stop_loss", "take_profit", "signal", "end_of_backtest")
+STOP_LOSS, TAKE_PROFIT, SIGNAL_EXIT, END_OF_BACKTEST = range(len(REASONS))
+
+TIE_BREAKS = ("stop_loss", "take_profit")
+
+# 出场扫描的初始分块长度，未命中时逐次翻倍
+_SCAN_CHUNK = 64
+
+
+@dataclass
+class KernelConfig:
+    """内核参数"""
+
+    initial_capital: float = 10000
+    position_size: float = 0.1  # 每笔交易占用资金比例
+    stop_loss_percent: float = 0.02
+    take_profit_percent: float = 0.06
+    fee_percent: float = 0.001  # 单边手续费
+    min_confidence: float = 0.0  # 入场信号的最低置信度（>=）
+    allow_short: bool = False  # 卖出信号是否开空
+    exit_on_signal: bool = True  # 反向信号是否按收盘价平仓
+    compound: bool = True  # 按当前权益（True）或初始资金（False）计算仓位
+    tie_break: str = "stop_loss"  # 同一K线同时触及止损/止盈时先成交的一方
+
+    def __post_init__(self) -> None:
+        if self.tie_break not in TIE_BREAKS:
+            raise ValueError(
+                f"tie_break 必须是 {TIE_BREAKS} 之一，实际值 {self.tie_break}"
+            )
+
+
+@dataclass
+class OHLCArrays:
+    """按时间升序排列的 OHLC 列数组（float64）"""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_close(cls, close: Sequence[float]) -> "OHLCArrays":
+        """只有收盘价时，开高低均取收盘价（退化为收盘价回测）"""
+        prices = np.asarray(close, dtype=np.float64)
+        return cls(prices, prices, prices, prices)
+
+    @classmethod
+    def from_candles(cls, candles: Any) -> "OHLCArrays":
+        """由 CandleSeries 构建（零拷贝读取列缓冲区）"""
+        return cls(
+            np.asarray(candles.opens, dtype=np.float64),
+            np.asarray(candles.highs, dtype=np.float64),
+            np.asarray(candles.lows, dtype=np.float64),
+            np.asarray(candles.closes, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_dicts(cls, candles: Sequence[Dict[str, Any]]) -> "OHLCArrays":
+        """由 K线字典列表构建，缺失的开高低字段回退为收盘价"""
+        close = np.array([c.get("close", 0) for c in candles], dtype=np.float64)
+        columns = [
+            np.array([c.get(name, c.get("close", 0)) for c in candles], np.float64)
+            for name in ("open", "high", "low")
+        ]
+        return cls(columns[0], columns[1], columns[2], close)
+
+
+@dataclass
+class KernelTrades:
+    """交易列表（列式存储，每列长度为交易笔数）"""
+
+    entry_index: np.ndarray
+    exit_index: np.ndarray
+    side: np.ndarray  # 1 多 / -1 空
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    quantity: np.ndarray
+    confidence: np.ndarray
+    pnl: np.ndarray  # 扣除双边手续费后的盈亏金额
+    pnl_percent: np.ndarray  # 价格收益率（按方向）
+    reason: np.ndarray  # REASONS 下标
+
+    def __len__(self) -> int:
+        return len(self.entry_index)
+
+    def reason_names(self) -> List[str]:
+        return [REASONS[r] for r in self.reason]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """转换为字典列表"""
+        columns = {
+            name: getattr(self, name).tolist()
+            for name in self.__dataclass_fields__
+            if name != "reason"
+        }
+        columns["reason"] = self.reason_names()
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+@dataclass
+class KernelResult:
+    """内核输出"""
+
+    equity: np.ndarray  # 每根K线收盘时的权益（持仓按收盘价计值）
+    trades: KernelTrades
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity[-1]) if len(self.equity) else 0.0
+
+
+def encode_signals(
+    signals: Iterable[Dict[str, Any]], default_confidence: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将信号字典列表编码为 (方向, 置信度) 数组
+
+    buy/long → 1，sell/short → -1，其余 → 0
+    """
+    directions = {"buy": 1, "long": 1, "sell": -1, "short": -1}
+    side: List[int] = []
+    confidence: List[float] = []
+    for signal in signals:
+        side.append(directions.get(str(signal.get("signal", "")).lower(), 0))
+        confidence.append(signal.get("confidence", default_confidence))
+    return np.array(side, dtype=np.int8), np.array(confidence, dtype=np.float64)
+
+
+def simulate(
+    ohlc: OHLCArrays,
+    signals: Union[np.ndarray, Sequence[int]],
+    confidence: Union[np.ndarray, Sequence[float], None] = None,
+    config: Optional[KernelConfig] = None,
+) -> KernelResult:
+    """
+    运行回测
+
+    Args:
+        ohlc: OHLC 列数组
+        signals: 每根K线的信号方向（1 买入 / -1 卖出 / 0 观望）
+        confidence: 每根K线的信号置信度，None 时视为 1.0
+        config: 内核参数
+
+    Returns:
+        KernelResult: 权益曲线与交易列表
+    """
+    config = config or KernelConfig()
+    n = len(ohlc)
+    sig = np.asarray(signals, dtype=np.int8)
+    if len(sig) != n:
+        raise ValueError("信号数组长度必须与K线数量一致")
+    conf = np.ones(n) if confidence is None else np.asarray(confidence, np.float64)
+
+    # 出场只取决于入场K线与方向，与资金无关：先确定交易路径，再向量化结算
+    entries, exits, stop_hits, target_hits = _trade_path(ohlc, sig, conf, config)
+    trades = _settle(ohlc, sig, conf, config, entries, exits, stop_hits, target_hits)
+    return KernelResult(_equity_curve(ohlc, config, trades), trades)
+
+
+def _trade_path(
+    ohlc: OHLCArrays,
+    signals: np.ndarray,
+    confidence: np.ndarray,
+    config: KernelConfig,
+) -> Tuple[List[int], List[int], List[bool], List[bool]]:
+    """依次确定每笔交易的入场/出场K线，以及出场K线是否触及止损/止盈"""
+    opened = (confidence >= config.min_confidence) & (ohlc.close > 0)
+    entry_mask = opened & (signals == 1)
+    if config.allow_short:
+        entry_mask |= opened & (signals == -1)
+    candidates = np.flatnonzero(entry_mask).tolist()
+
+    exit_signals = {1: signals == -1, -1: signals == 1}
+    entries: List[int] = []
+    exits: List[int] = []
+    stop_hits: List[bool] = []
+    target_hits: List[bool] = []
+    k = 0
+    while k < len(candidates):
+        i = candidates[k]
+        side = int(signals[i])
+        j, stop_hit, target_hit = _find_exit(
+            ohlc, exit_signals[side] if config.exit_on_signal else None, i, side, config
+        )
+        entries.append(i)
+        exits.append(j)
+        stop_hits.append(stop_hit)
+        target_hits.append(target_hit)
+        # 出场K线之后的下一个入场信号
+        k = bisect_right(candidates, j, k)
+    return entries, exits, stop_hits, target_hits
+
+
+def _find_exit(
+    ohlc: OHLCArrays,
+    exit_signal: Optional[np.ndarray],
+    entry_index: int,
+    side: int,
+    config: KernelConfig,
+) -> Tuple[int, bool, bool]:
+    """从入场后的下一根K线开始分块扫描，返回 (出场K线, 触及止损, 触及止盈)"""
+    n = len(ohlc)
+    entry_price = ohlc.close[entry_index]
+    stop = entry_price * (1 - side * config.stop_loss_percent)
+    target = entry_price * (1 + side * config.take_profit_percent)
+
+    start = entry_index + 1
+    chunk = _SCAN_CHUNK
+    while start < n:
+        window = slice(start, min(start + chunk, n))
+        # 多头：低点触及止损、高点触及止盈；空头相反
+        if side == 1:
+            stop_hit = ohlc.low[window] <= stop
+            target_hit = ohlc.high[window] >= target
+        else:
+            stop_hit = ohlc.high[window] >= stop
+            target_hit = ohlc.low[window] <= target
+        hit = stop_hit | target_hit
+        if exit_signal is not None:
+            hit |= exit_signal[window]
+        offset = int(hit.argmax())
+        if hit[offset]:
+            return start + offset, bool(stop_hit[offset]), bool(target_hit[offset])
+        start = window.stop
+        chunk *= 2
+
+    # 未触发出场，按最后一根K线收盘价结算
+    return n - 1, False, False
+
+
+def _settle(
+    ohlc: OHLCArrays,
+    signals: np.ndarray,
+    confidence: np.ndarray,
+    config: KernelConfig,
+    entries: List[int],
+    exits: List[int],
+    stop_hits: List[bool],
+    target_hits: List[bool],
+) -> KernelTrades:
+    """计算成交价、出场原因、仓位与盈亏"""
+    entry_index = np.array(entries, dtype=np.int64)
+    exit_index = np.array(exits, dtype=np.int64)
+    stop_hit = np.array(stop_hits, dtype=bool)
+    target_hit = np.array(target_hits, dtype=bool)
+    side = signals[entry_index]
+    entry_price = ohlc.close[entry_index]
+
+    stop = entry_price * (1 - side * config.stop_loss_percent)
+    target = entry_price * (1 + side * config.take_profit_percent)
+    open_price = ohlc.open[exit_index]
+    # 跳空越过触发价时按开盘价成交
+    gapped_stop = side * (open_price - stop) <= 0
+    gapped_target = side * (open_price - target) >= 0
+    both = stop_hit & target_hit
+    stop_first = both & (
+        gapped_stop | (~gapped_target & (config.tie_break == "stop_loss"))
+    )
+    stop_exit = (stop_hit & ~both) | stop_first
+    target_exit = (target_hit & ~both) | (both & ~stop_first)
+    ended = ~(stop_hit | target_hit) & (exit_index == len(ohlc) - 1)
+    if config.exit_on_signal and len(ohlc):
+        ended &= signals[-1] != -side
+
+    exit_price = np.select(
+        [
+            stop_exit & gapped_stop,
+            stop_exit,
+            target_exit & gapped_target,
+            target_exit,
+        ],
+        [open_price, stop, open_price, target],
+        default=ohlc.close[exit_index],
+    )
+    reason = np.select(
+        [stop_exit, target_exit, ended],
+        [STOP_LOSS, TAKE_PROFIT, END_OF_BACKTEST],
+        default=SIGNAL_EXIT,
+    ).astype(np.int8)
+
+    # 单位名义价值的净收益：价格收益 - 开仓手续费 - 平仓手续费
+    pnl_percent = side * (exit_price - entry_price) / entry_price
+    fee = config.fee_percent
+    net_return = pnl_percent - fee - exit_price / entry_price * fee
+    if config.compound:
+        growth = 1 + config.position_size * net_return
+        equity_before = config.initial_capital * np.concatenate(
+            ([1.0], np.cumprod(growth)[:-1])
+        )
+    else:
+        equity_before = np.full(len(entry_index), float(config.initial_capital))
+    base = equity_before if config.compound else config.initial_capital
+    notional = base * config.position_size * np.ones(len(entry_index))
+
+    return KernelTrades(
+        entry_index=entry_index,
+        exit_index=exit_index,
+        side=side,
+        entry_price=entry_price,
+        exit_price=exit_price,
+        quantity=notional / entry_price,
+        confidence=confidence[entry_index],
+        pnl=notional * net_return,
+        pnl_percent=pnl_percent,
+        reason=reason,
+    )
+
+
+def _equity_curve(
+    ohlc: OHLCArrays, config: KernelConfig, trades: KernelTrades
+) -> np.ndarray:
+    """
+    逐K线权益：现金 + 持仓数量 × 收盘价
+
+    K线按 [空仓, 持仓, 空仓, 持仓, ..., 空仓] 分段，每段现金与持仓数量不变，
+    用 np.repeat 展开后一次乘加得到权益曲线。
+    """
+    n = len(ohlc)
+    count = len(trades)
+    realized = config.initial_capital + np.concatenate(([0.0], np.cumsum(trades.pnl)))
+    entry_fee = trades.quantity * trades.entry_price * config.fee_percent
+    signed_quantity = trades.side * trades.quantity
+
+    bounds: np.ndarray = np.empty(2 * count + 2, dtype=np.int64)
+    bounds[0], bounds[-1] = 0, n
+    bounds[1:-1:2] = trades.entry_index
+    bounds[2:-1:2] = trades.exit_index
+    lengths = np.diff(bounds)
+
+    cash = np.empty(2 * count + 1)
+    cash[0::2] = realized
+    cash[1::2] = realized[:-1] - entry_fee - signed_quantity * trades.entry_price
+    position = np.zeros(2 * count + 1)
+    position[1::2] = signed_quantity
+
+    equity: np.ndarray = np.repeat(position, lengths)
+    equity *= ohlc.close
+    equity += np.repeat(cash, lengths)
+    return equity
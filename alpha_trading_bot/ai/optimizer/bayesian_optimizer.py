@@ -8,19 +8,34 @@
 - 详细的学习过程日志记录
 - 优化结果可视化
 - 学习历史追踪
+- 多进程并行试验（共享同一个 SQLite study，主进程只等待不参与计算）
+- 目标函数可上报中间值，配合 Median / Hyperband 剪枝提前终止落后的试验
+- 硬性时间预算：到期后终止仍在运行的试验进程
 """
 
+import inspect
 import logging
-from typing import Dict, Any, Optional, Callable
-from dataclasses import dataclass
+import multiprocessing
+import time
+from typing import Dict, Any, List, Optional, Callable, Sequence, Union
+from dataclasses import dataclass, fields, replace
 from datetime import datetime
-import json
 import os
 
+import numpy as np
+
 from alpha_trading_bot.ai.provider_utils import get_runtime_fusion_providers
 
+from .backtest_kernel import KernelConfig, OHLCArrays, simulate
+from .monte_carlo import MonteCarloConfig, run_monte_carlo, trade_returns
+
 logger = logging.getLogger(__name__)
 
+PRUNERS = ("none", "median", "hyperband")
+
+# 多进程共享 SQLite 时写锁的等待时间（秒）
+_SQLITE_LOCK_TIMEOUT = 30
+
 
 # 学习历史记录（全局）
 _learning_history: list[Dict[str, Any]] = []
@@ -51,6 +66,197 @@ class OptimizationResult:
         }
 
 
+class KernelObjective:
+    """
+    基于回测内核的分段目标函数（可 pickle，供多进程试验使用）
+
+    把K线按时间切成 steps 段逐段运行 simulate，每段结束后通过 report 上报
+    截至该段的累计收益率，剪枝器据此提前终止明显落后的试验。
+    各段独立从初始资金开始，段末未平仓的交易按收盘价结算。
+    参数字典中只有 KernelConfig 的字段会生效。
+
+    给出 robustness 时，全部段的逐笔收益再做蒙特卡洛重抽样作为约束：
+    最大回撤的 drawdown_quantile 分位数超过 max_drawdown 时，
+    超出部分乘以 penalty 从目标值中扣除（软约束，违规试验仍可比较）。
+    """
+
+    def __init__(
+        self,
+        ohlc: OHLCArrays,
+        directions: Union[np.ndarray, Sequence[int]],
+        confidence: Union[np.ndarray, Sequence[float], None] = None,
+        base_config: Optional[KernelConfig] = None,
+        steps: int = 8,
+        robustness: Optional[MonteCarloConfig] = None,
+        max_drawdown: float = 0.25,
+        drawdown_quantile: float = 0.95,
+        penalty: float = 10.0,
+    ) -> None:
+        n = len(ohlc)
+        if len(directions) != n:
+            raise ValueError("信号数组长度必须与K线数量一致")
+        self.ohlc = ohlc
+        self.directions = np.asarray(directions, dtype=np.int8)
+        self.confidence = (
+            np.ones(n) if confidence is None else np.asarray(confidence, np.float64)
+        )
+        self.base_config = base_config or KernelConfig()
+        edges = np.linspace(0, n, max(1, min(steps, n)) + 1).astype(int)
+        self.segments = list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+        self.robustness = robustness
+        self.max_drawdown = max_drawdown
+        self.drawdown_quantile = drawdown_quantile
+        self.penalty = penalty
+
+    def __call__(
+        self,
+        params: Dict[str, float],
+        report: Optional[Callable[[int, float], None]] = None,
+    ) -> float:
+        names = {f.name for f in fields(KernelConfig)}
+        overrides: Dict[str, Any] = {k: v for k, v in params.items() if k in names}
+        config = replace(self.base_config, **overrides)
+        total_return = 0.0
+        returns = []
+        for step, (start, stop) in enumerate(self.segments):
+            segment = OHLCArrays(
+                self.ohlc.open[start:stop],
+                self.ohlc.high[start:stop],
+                self.ohlc.low[start:stop],
+                self.ohlc.close[start:stop],
+            )
+            result = simulate(
+                segment,
+                self.directions[start:stop],
+                self.confidence[start:stop],
+                config,
+            )
+            total_return += result.final_equity / config.initial_capital - 1
+            if self.robustness is not None:
+                returns.append(trade_returns(result.trades, config.initial_capital))
+            if report is not None:
+                report(step, total_return)
+
+        if self.robustness is not None:
+            return total_return - self.penalty * self.drawdown_excess(
+                np.concatenate(returns)
+            )
+        return total_return
+
+    def drawdown_excess(self, returns: np.ndarray) -> float:
+        """重抽样最大回撤分位数超出上限的部分（未超出为 0）"""
+        result = run_monte_carlo(returns, self.robustness)
+        return max(
+            0.0, result.drawdown_quantile(self.drawdown_quantile) - self.max_drawdown
+        )
+
+
+def _make_storage(storage_path: str) -> Any:
+    import optuna
+
+    return optuna.storages.RDBStorage(
+        f"sqlite:///{storage_path}",
+        engine_kwargs={"connect_args": {"timeout": _SQLITE_LOCK_TIMEOUT}},
+    )
+
+
+def _make_pruner(name: str) -> Any:
+    import optuna
+
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner()
+    return optuna.pruners.NopPruner()
+
+
+def _accepts_report(func: Optional[Callable]) -> bool:
+    """目标函数声明了 report 参数时才传入中间值上报函数"""
+    if func is None:
+        return False
+    try:
+        return "report" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _suggest_params(
+    trial: Any, search_space: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+
+    for name, config in search_space.items():
+        if config["type"] == "float":
+            if config.get("log", False):
+                params[name] = trial.suggest_float(
+                    name,
+                    config["low"],
+                    config["high"],
+                    log=True,
+                )
+            else:
+                params[name] = trial.suggest_float(name, config["low"], config["high"])
+        elif config["type"] == "int":
+            params[name] = trial.suggest_int(
+                name, int(config["low"]), int(config["high"])
+            )
+        elif config["type"] == "categorical":
+            params[name] = trial.suggest_categorical(name, config["choices"])
+
+    return params
+
+
+def _build_objective(
+    search_space: Dict[str, Dict[str, Any]], objective_func: Optional[Callable]
+) -> Callable[[Any], float]:
+    """由搜索空间与用户目标函数构建 Optuna 目标函数"""
+    import optuna
+
+    wants_report = _accepts_report(objective_func)
+
+    def objective(trial: Any) -> float:
+        params = _suggest_params(trial, search_space)
+        if objective_func is None:
+            return 0.0
+        if not wants_report:
+            return float(objective_func(params))
+
+        def report(step: int, value: float) -> None:
+            trial.report(value, step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+        return float(objective_func(params, report=report))
+
+    return objective
+
+
+def _run_worker(
+    storage_path: str,
+    study_name: str,
+    search_space: Dict[str, Dict[str, Any]],
+    objective_func: Optional[Callable],
+    pruner: str,
+    max_trials: int,
+    deadline: Optional[float],
+) -> None:
+    """子进程入口：加载共享 study，试验总数达到 max_trials 或到期后退出"""
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_make_storage(storage_path),
+        pruner=_make_pruner(pruner),
+    )
+    study.optimize(
+        _build_objective(search_space, objective_func),
+        timeout=None if deadline is None else max(0.0, deadline - time.time()),
+        callbacks=[optuna.study.MaxTrialsCallback(max_trials, states=None)],
+        show_progress_bar=False,
+    )
+
+
 class BayesianOptimizer:
     """
     贝叶斯参数优化器
@@ -63,6 +269,9 @@ class BayesianOptimizer:
         study_name: str = "trading_bot_optimization",
         storage_path: str = "data_json/optuna_study.db",
         n_trials: int = 100,
+        n_workers: int = 0,
+        timeout_seconds: Optional[float] = None,
+        pruner: str = "median",
     ):
         """
         初始化优化器
@@ -71,10 +280,20 @@ class BayesianOptimizer:
             study_name: 研究名称
             storage_path: SQLite 存储路径
             n_trials: 优化试验次数
+            n_workers: 并行试验进程数；0 为在当前进程内顺序运行
+                （多进程时目标函数需可 pickle，如 KernelObjective）
+            timeout_seconds: 时间预算；多进程时到期强制终止仍在运行的试验，
+                进程内运行时只在试验之间检查
+            pruner: 剪枝器 none / median / hyperband（仅对上报中间值的目标函数生效）
         """
+        if pruner not in PRUNERS:
+            raise ValueError(f"pruner 必须是 {PRUNERS} 之一，实际值 {pruner}")
         self.study_name = study_name
         self.storage_path = storage_path
         self.n_trials = n_trials
+        self.n_workers = n_workers
+        self.timeout_seconds = timeout_seconds
+        self.pruner = pruner
         self._objective_func: Optional[Callable] = None
         self._search_space: Dict[str, Dict[str, Any]] = {}
         self.providers: list[str] = get_runtime_fusion_providers()
@@ -119,6 +338,10 @@ class BayesianOptimizer:
         self._search_space = search_space
         return search_space
 
+    def set_search_space(self, search_space: Dict[str, Dict[str, Any]]) -> None:
+        """使用自定义搜索空间（格式同 define_search_space）"""
+        self._search_space = dict(search_space)
+
     def set_objective(
         self,
         objective_func: Callable[[Dict[str, float]], float],
@@ -131,41 +354,9 @@ class BayesianOptimizer:
         """
         self._objective_func = objective_func
 
-    def _create_optuna_objective(self):
+    def _create_optuna_objective(self) -> Callable[[Any], float]:
         """创建 Optuna 目标函数"""
-        import optuna
-
-        search_space = self._search_space
-
-        def objective(trial):
-            params = {}
-
-            for name, config in search_space.items():
-                if config["type"] == "float":
-                    if config.get("log", False):
-                        params[name] = trial.suggest_float(
-                            name,
-                            config["low"],
-                            config["high"],
-                            log=True,
-                        )
-                    else:
-                        params[name] = trial.suggest_float(
-                            name, config["low"], config["high"]
-                        )
-                elif config["type"] == "int":
-                    params[name] = trial.suggest_int(
-                        name, int(config["low"]), int(config["high"])
-                    )
-                elif config["type"] == "categorical":
-                    params[name] = trial.suggest_categorical(name, config["choices"])
-
-            obj_func = self._objective_func
-            if obj_func is not None:
-                return obj_func(params)
-            return 0.0
-
-        return objective
+        return _build_objective(self._search_space, self._objective_func)
 
     def optimize(self) -> OptimizationResult:
         """
@@ -174,54 +365,97 @@ class BayesianOptimizer:
         Returns:
             OptimizationResult: 优化结果
         """
-        import optuna
-        import time
-
         start_time = time.time()
+        deadline = (
+            None if self.timeout_seconds is None else start_time + self.timeout_seconds
+        )
 
         try:
+            import optuna
+            from optuna.trial import TrialState
+
             # 创建或加载研究
-            storage = f"sqlite:///{self.storage_path}"
+            directory = os.path.dirname(self.storage_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            storage = _make_storage(self.storage_path)
             study = optuna.create_study(
                 study_name=self.study_name,
                 storage=storage,
                 load_if_exists=True,
                 direction="maximize",
+                pruner=_make_pruner(self.pruner),
             )
+            first_trial = len(study.get_trials(deepcopy=False))
 
             # 运行优化
-            study.optimize(
-                self._create_optuna_objective(),
-                n_trials=self.n_trials,
-                show_progress_bar=False,
-            )
+            timed_out = False
+            if self.n_workers > 0:
+                timed_out = self._optimize_in_workers(
+                    first_trial + self.n_trials, deadline
+                )
+                if timed_out:
+                    self._fail_running_trials(storage, study, first_trial)
+            else:
+                study.optimize(
+                    self._create_optuna_objective(),
+                    n_trials=self.n_trials,
+                    timeout=self.timeout_seconds,
+                    show_progress_bar=False,
+                )
 
             optimization_time = time.time() - start_time
 
-            # 获取最优参数
-            best_params = study.best_params
-            best_value = study.best_value
+            trials = study.get_trials(deepcopy=False)[first_trial:]
+            states = [t.state for t in trials]
 
             # 记录学习详情
-            learning_details = {
+            learning_details: Dict[str, Any] = {
                 "search_space": self._search_space,
-                "trials_completed": len(study.trials),
-                "best_trial_number": study.best_trial.number,
+                "trials_completed": states.count(TrialState.COMPLETE),
+                "trials_pruned": states.count(TrialState.PRUNED),
+                "trials_failed": states.count(TrialState.FAIL),
+                "n_workers": self.n_workers,
+                "pruner": self.pruner,
+                "timed_out": timed_out,
             }
 
+            if not any(
+                t.state == TrialState.COMPLETE for t in study.get_trials(deepcopy=False)
+            ):
+                logger.warning("[贝叶斯优化] 没有完成的试验，无法给出最优参数")
+                learning_details["error"] = "no completed trials"
+                return OptimizationResult(
+                    best_params={},
+                    best_value=0,
+                    n_trials=len(trials),
+                    optimization_time_seconds=optimization_time,
+                    study_name=self.study_name,
+                    timestamp=datetime.now().isoformat(),
+                    learning_details=learning_details,
+                )
+
+            # 获取最优参数
+            best_params = study.best_params
+            best_value = study.best_value
+            learning_details["best_trial_number"] = study.best_trial.number
+
             # 详细的学习日志
             logger.info(
                 f"[贝叶斯优化] 学习完成: "
                 f"最优值={best_value:.4f}, "
-                f"试验次数={len(study.trials)}, "
+                f"试验次数={len(trials)}"
+                f"（完成{learning_details['trials_completed']}/"
+                f"剪枝{learning_details['trials_pruned']}）, "
                 f"耗时={optimization_time:.2f}秒"
+                + ("（已到时间预算）" if timed_out else "")
             )
             logger.info(f"[贝叶斯优化] 最优参数: {best_params}")
 
             return OptimizationResult(
                 best_params=best_params,
                 best_value=best_value,
-                n_trials=len(study.trials),
+                n_trials=len(trials),
                 optimization_time_seconds=optimization_time,
                 study_name=self.study_name,
                 timestamp=datetime.now().isoformat(),
@@ -240,6 +474,63 @@ class BayesianOptimizer:
                 learning_details={"error": "optuna not installed"},
             )
 
+    def _optimize_in_workers(self, max_trials: int, deadline: Optional[float]) -> bool:
+        """
+        在 n_workers 个子进程中并行运行试验，返回是否因时间预算终止
+
+        使用 spawn 启动子进程，不复制交易进程的线程与事件循环；
+        主进程只阻塞在 join 上，不持有 GIL。
+        """
+        context = multiprocessing.get_context("spawn")
+        workers: List[multiprocessing.process.BaseProcess] = [
+            context.Process(
+                target=_run_worker,
+                args=(
+                    self.storage_path,
+                    self.study_name,
+                    self._search_space,
+                    self._objective_func,
+                    self.pruner,
+                    max_trials,
+                    deadline,
+                ),
+                name=f"optuna-worker-{i}",
+                daemon=True,
+            )
+            for i in range(self.n_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.time()))
+
+        timed_out = False
+        for worker in workers:
+            if worker.is_alive():
+                timed_out = True
+                worker.terminate()
+                worker.join()
+            elif worker.exitcode:
+                logger.warning(
+                    f"[贝叶斯优化] 试验进程 {worker.name} 异常退出: {worker.exitcode}"
+                )
+        return timed_out
+
+    def _fail_running_trials(self, storage: Any, study: Any, first_trial: int) -> None:
+        """被强制终止的试验在存储中仍为 RUNNING，标记为 FAIL"""
+        from optuna.trial import TrialState
+
+        study_id = storage.get_study_id_from_name(self.study_name)
+        for trial in study.get_trials(deepcopy=False, states=(TrialState.RUNNING,)):
+            if trial.number < first_trial:
+                continue
+            trial_id = storage.get_trial_id_from_study_id_trial_number(
+                study_id, trial.number
+            )
+            storage.set_trial_state_values(trial_id, TrialState.FAIL)
+        logger.warning("[贝叶斯优化] 已到时间预算，终止仍在运行的试验")
+
     def get_best_params(self) -> Dict[str, float]:
         """获取当前最优参数"""
         try:
@@ -0,0 +1,250 @@
+"""
+回测结果的蒙特卡洛稳健性分析
+
+单次回测只给出一条权益路径的夏普与回撤。这里把回测的逐笔（或逐K线）收益率
+有放回重抽样成上万条路径，得到最大回撤、期末权益与破产概率的分布：
+- bootstrap: 逐笔独立重抽样（假设收益之间无相关）
+- block: 循环块重抽样，保留块内的连续亏损/波动聚集
+- 全部用 NumPy 矩阵运算：收益先转为对数增长率，按下标矩阵取值；路径按列排布，
+  每一步对上万条路径同时更新，Python 循环只沿步数进行
+- 1 万条路径 × 数百笔交易约 0.05 秒、× 3000 根K线约 0.6 秒，
+  可作为每次优化试验的约束
+
+收益率是相对于交易前权益的比例（0.01 即 +1%），路径按复利累积。
+
+用法:
+    returns = trade_returns(result.trades, initial_capital=10000)
+    mc = run_monte_carlo(returns, MonteCarloConfig(n_paths=10000, method="block"))
+    print(mc.format())
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from ..backtest_validator import Trade, TradeResult
+from .backtest_kernel import KernelTrades
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("bootstrap", "block")
+
+# 单笔亏损不超过 100%，否则对数增长率为 -inf
+_MIN_RETURN = -1 + 1e-12
+
+
+@dataclass
+class MonteCarloConfig:
+    """重抽样设置"""
+
+    n_paths: int = 10000
+    method: str = "bootstrap"
+    block_size: Optional[int] = None  # None 时取 round(n ** (1/3))
+    ruin_level: float = 0.5  # 权益跌破初始资金的该比例即视为破产
+    seed: Optional[int] = None
+    chunk_elements: int = 2_000_000  # 每批下标矩阵 步数 × 路径数 的上限
+
+    def __post_init__(self) -> None:
+        if self.n_paths <= 0:
+            raise ValueError("路径数必须大于0")
+        if self.method not in METHODS:
+            raise ValueError(f"未知的重抽样方式: {self.method}，可选 {METHODS}")
+        if self.block_size is not None and self.block_size <= 0:
+            raise ValueError("块长度必须大于0")
+        if not 0 < self.ruin_level < 1:
+            raise ValueError("破产线必须在 (0, 1) 之间")
+
+
+def trade_returns(
+    trades: Union[KernelTrades, Sequence[Trade], Sequence[float]],
+    initial_capital: float,
+) -> np.ndarray:
+    """
+    逐笔盈亏金额 → 相对交易前权益的收益率
+
+    Args:
+        trades: 回测内核的 KernelTrades、BacktestValidator 的交易列表，
+            或按平仓顺序排列的盈亏金额
+        initial_capital: 初始资金
+
+    Returns:
+        np.ndarray: 收益率数组（未平仓交易被忽略）
+    """
+    if isinstance(trades, KernelTrades):
+        order = np.argsort(trades.exit_index, kind="stable")
+        pnl = trades.pnl[order]
+    elif len(trades) and isinstance(trades[0], Trade):
+        pnl = np.array(
+            [
+                t.pnl
+                for t in trades
+                if isinstance(t, Trade) and t.result != TradeResult.OPEN
+            ]
+        )
+    else:
+        pnl = np.asarray(trades, dtype=np.float64)
+
+    pnl = pnl.astype(np.float64)
+    equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    returns: np.ndarray = pnl / np.maximum(equity_before, 1e-12)
+    return returns
+
+
+def bar_returns(
+    equity: Union[Sequence[float], np.ndarray], initial_capital: Optional[float] = None
+) -> np.ndarray:
+    """
+    权益曲线 → 逐K线收益率
+
+    Args:
+        equity: 每根K线的权益（如 KernelResult.equity）
+        initial_capital: 第一根K线之前的权益，给出时第一根K线的收益也计入
+    """
+    values = np.asarray(equity, dtype=np.float64)
+    if initial_capital is not None:
+        values = np.concatenate(([initial_capital], values))
+    returns: np.ndarray = values[1:] / values[:-1] - 1
+    return returns
+
+
+@dataclass
+class MonteCarloResult:
+    """重抽样路径的分布（权益以初始资金为 1 计）"""
+
+    max_drawdown: np.ndarray
+    terminal_equity: np.ndarray
+    ruined: np.ndarray
+    method: str
+    n_steps: int
+    block_size: int
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.max_drawdown)
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(self.ruined.mean()) if self.n_paths else 0.0
+
+    @property
+    def loss_probability(self) -> float:
+        """期末权益低于初始资金的概率"""
+        return float((self.terminal_equity < 1).mean()) if self.n_paths else 0.0
+
+    def drawdown_quantile(self, q: float) -> float:
+        return float(np.quantile(self.max_drawdown, q)) if self.n_paths else 0.0
+
+    def terminal_quantile(self, q: float) -> float:
+        return float(np.quantile(self.terminal_equity, q)) if self.n_paths else 1.0
+
+    def summary(self) -> Dict[str, Any]:
+        dd = np.quantile(self.max_drawdown, [0.5, 0.95, 0.99])
+        terminal = np.quantile(self.terminal_equity, [0.05, 0.5, 0.95])
+        return {
+            "n_paths": self.n_paths,
+            "n_steps": self.n_steps,
+            "method": self.method,
+            "block_size": self.block_size,
+            "max_drawdown_p50": float(dd[0]),
+            "max_drawdown_p95": float(dd[1]),
+            "max_drawdown_p99": float(dd[2]),
+            "terminal_return_p5": float(terminal[0] - 1),
+            "terminal_return_p50": float(terminal[1] - 1),
+            "terminal_return_p95": float(terminal[2] - 1),
+            "loss_probability": self.loss_probability,
+            "ruin_probability": self.ruin_probability,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        method = (
+            "逐笔重抽样"
+            if self.method == "bootstrap"
+            else f"块重抽样(块长 {self.block_size})"
+        )
+        return "\n".join(
+            [
+                f"蒙特卡洛: {self.n_paths} 条路径 × {self.n_steps} 步, {method}",
+                f"最大回撤  P50 {s['max_drawdown_p50']:.2%}  "
+                f"P95 {s['max_drawdown_p95']:.2%}  P99 {s['max_drawdown_p99']:.2%}",
+                f"期末收益  P5 {s['terminal_return_p5']:.2%}  "
+                f"P50 {s['terminal_return_p50']:.2%}  "
+                f"P95 {s['terminal_return_p95']:.2%}",
+                f"亏损概率 {s['loss_probability']:.2%}, "
+                f"破产概率 {s['ruin_probability']:.2%}",
+            ]
+        )
+
+
+def _resample_steps(
+    rng: np.random.Generator,
+    n: int,
+    steps: range,
+    n_paths: int,
+    starts: Optional[np.ndarray],
+    block: int,
+) -> np.ndarray:
+    """steps 这几步在各条路径上抽到的下标，形状 (len(steps), n_paths)"""
+    index: np.ndarray
+    if starts is None:
+        index = rng.integers(0, n, size=(len(steps), n_paths), dtype=np.int32)
+    else:
+        t = np.arange(steps.start, steps.stop)
+        # 循环块：第 t 步取第 t // block 块起点之后的第 t % block 个，越过末尾从头接上
+        index = (starts[t // block] + (t % block)[:, None]) % n
+    return index
+
+
+def run_monte_carlo(
+    returns: Union[Sequence[float], np.ndarray],
+    config: Optional[MonteCarloConfig] = None,
+) -> MonteCarloResult:
+    """
+    对收益率序列做重抽样，返回最大回撤、期末权益与破产的分布
+
+    路径按列排布，逐步推进时对全部路径同时更新累计对数权益、峰值、
+    最大回撤与最低点；下标矩阵按步分批生成，内存与路径长度无关。
+
+    Args:
+        returns: 逐笔或逐K线收益率（见 trade_returns / bar_returns）
+        config: 重抽样设置
+    """
+    config = config or MonteCarloConfig()
+    series = np.asarray(returns, dtype=np.float64)
+    n = len(series)
+    n_paths = config.n_paths
+    block = config.block_size or max(1, int(round(n ** (1 / 3))))
+    block = min(block, max(n, 1))
+
+    growth = np.log1p(np.maximum(series, _MIN_RETURN))
+    rng = np.random.default_rng(config.seed)
+    starts = None
+    if config.method == "block" and block > 1:
+        starts = rng.integers(0, n, size=(-(-n // block), n_paths), dtype=np.int32)
+
+    # 对数权益；峰值从 0（初始资金）起算
+    log_equity = np.zeros(n_paths)
+    peak = np.zeros(n_paths)
+    worst = np.zeros(n_paths)  # 最深回撤（对数，<= 0）
+    low = np.zeros(n_paths)
+    gap = np.empty(n_paths)
+    chunk = max(1, config.chunk_elements // n_paths)
+    for first in range(0, n, chunk):
+        steps = range(first, min(first + chunk, n))
+        for row in growth[_resample_steps(rng, n, steps, n_paths, starts, block)]:
+            log_equity += row
+            np.maximum(peak, log_equity, out=peak)
+            np.minimum(low, log_equity, out=low)
+            np.subtract(log_equity, peak, out=gap)
+            np.minimum(worst, gap, out=worst)
+
+    return MonteCarloResult(
+        max_drawdown=1 - np.exp(worst),
+        terminal_equity=np.exp(log_equity),
+        ruined=low <= np.log(config.ruin_level),
+        method=config.method,
+        n_steps=n,
+        block_size=block,
+    )
@@ -0,0 +1,467 @@
+"""
+回测参数扫描
+
+对 BacktestConfig 的参数（止损/止盈/最低置信度等）做网格、随机或拉丁超立方采样，
+用 ProcessPoolExecutor 并行运行 BacktestValidator：
+- K线、信号、置信度与时间戳只写入一次 multiprocessing.shared_memory，
+  子进程在初始化时按名称挂载为 NumPy 视图（零拷贝），任务只传参数字典
+- 参数点按块提交，完成一块即并入排行表（SweepTable），可通过回调实时查看
+- max_workers=1 时在当前进程顺序执行（不创建进程池与共享内存）
+
+用法:
+    sweep = ParameterSweep.from_signals(signals, closes, timestamps, highs, lows)
+    points = latin_hypercube_points(
+        {"stop_loss_percent": (0.005, 0.03), "take_profit_percent": (0.01, 0.08)},
+        n=512,
+        seed=7,
+    )
+    table = sweep.run(points, metric="sharpe_ratio")
+    print(table.format(top=20))
+"""
+
+import itertools
+import logging
+import math
+import os
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from ..backtest_validator import BacktestConfig, BacktestValidator
+from .backtest_kernel import OHLCArrays, encode_signals
+
+logger = logging.getLogger(__name__)
+
+# 可排序的指标；max_drawdown 越小越好，其余越大越好
+METRICS = (
+    "sharpe_ratio",
+    "max_drawdown",
+    "profit_factor",
+    "total_return",
+    "win_rate",
+    "total_trades",
+)
+_LOWER_IS_BETTER = {"max_drawdown"}
+
+# 共享内存中各列的起始偏移按缓存行对齐
+_ALIGN = 64
+
+# 每个子进程平均分到的任务块数（兼顾负载均衡与提交开销）
+_CHUNKS_PER_WORKER = 4
+
+
+def _config_fields() -> List[str]:
+    return [f.name for f in fields(BacktestConfig)]
+
+
+def _check_names(names: Sequence[str]) -> None:
+    unknown = sorted(set(names) - set(_config_fields()))
+    if unknown:
+        raise ValueError(f"BacktestConfig 没有参数: {', '.join(unknown)}")
+
+
+def grid_points(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """网格采样：各参数取值的笛卡尔积"""
+    _check_names(list(grid))
+    names = list(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def random_points(
+    bounds: Mapping[str, Tuple[float, float]], n: int, seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """随机采样：各参数在 [low, high) 内独立均匀分布"""
+    _check_names(list(bounds))
+    rng = np.random.default_rng(seed)
+    unit = rng.random((n, len(bounds)))
+    return _scale(bounds, unit)
+
+
+def latin_hypercube_points(
+    bounds: Mapping[str, Tuple[float, float]], n: int, seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """拉丁超立方采样：每个参数的 n 个等分区间各落一个点"""
+    _check_names(list(bounds))
+    rng = np.random.default_rng(seed)
+    strata = np.column_stack([rng.permutation(n) for _ in bounds])
+    unit = (strata + rng.random((n, len(bounds)))) / n
+    return _scale(bounds, unit)
+
+
+def _scale(
+    bounds: Mapping[str, Tuple[float, float]], unit: np.ndarray
+) -> List[Dict[str, float]]:
+    low = np.array([b[0] for b in bounds.values()], dtype=np.float64)
+    high = np.array([b[1] for b in bounds.values()], dtype=np.float64)
+    values = low + unit * (high - low)
+    names = list(bounds)
+    return [dict(zip(names, map(float, row))) for row in values]
+
+
+@dataclass
+class SweepRow:
+    """单个参数点的回测指标"""
+
+    params: Dict[str, Any]
+    total_trades: int = 0
+    win_rate: float = 0.0
+    total_return: float = 0.0
+    sharpe_ratio: float = 0.0
+    max_drawdown: float = 0.0
+    profit_factor: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SweepTable:
+    """按指标排序的扫描结果表（逐行插入，任何时刻都保持有序）"""
+
+    def __init__(self, metric: str = "sharpe_ratio") -> None:
+        if metric not in METRICS:
+            raise ValueError(f"metric 必须是 {METRICS} 之一，实际值 {metric}")
+        self.metric = metric
+        self.rows: List[SweepRow] = []
+        self.failed: List[SweepRow] = []
+        self._keys: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _key(self, row: SweepRow) -> float:
+        value = float(getattr(row, self.metric))
+        if math.isnan(value):
+            return math.inf
+        return value if self.metric in _LOWER_IS_BETTER else -value
+
+    def add(self, row: SweepRow) -> int:
+        """插入一行，返回其当前名次（从 1 开始）；失败的参数点单独保存"""
+        if row.error is not None:
+            self.failed.append(row)
+            return 0
+        key = self._key(row)
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self.rows.insert(index, row)
+        return index + 1
+
+    @property
+    def best(self) -> Optional[SweepRow]:
+        return self.rows[0] if self.rows else None
+
+    def top(self, k: int = 10) -> List[SweepRow]:
+        return self.rows[:k]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [row.to_dict() for row in self.rows]
+
+    def format(self, top: int = 20) -> str:
+        names = sorted({name for row in self.rows for name in row.params})
+        header = (
+            f"{'#':>4} "
+            + "".join(f"{name[:18]:>20}" for name in names)
+            + f"{'夏普':>9}{'最大回撤':>8}{'盈亏比':>8}{'总收益':>9}{'胜率':>8}{'交易':>6}"
+        )
+        lines = [
+            f"参数扫描: {len(self.rows)} 个参数点（失败 {len(self.failed)}），"
+            f"按 {self.metric} 排序",
+            header,
+        ]
+        for rank, row in enumerate(self.rows[:top], start=1):
+            params = "".join(
+                f"{_format_value(row.params.get(name)):>20}" for name in names
+            )
+            lines.append(
+                f"{rank:>4} {params}{row.sharpe_ratio:>11.2f}"
+                f"{row.max_drawdown:>12.2%}{row.profit_factor:>11.2f}"
+                f"{row.total_return:>12.2%}{row.win_rate:>10.2%}{row.total_trades:>8}"
+            )
+        return "\n".join(lines)
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return "-" if value is None else str(value)
+
+
+@contextmanager
+def _quiet_validator(level: int = logging.WARNING) -> Iterator[None]:
+    """屏蔽每次构造 BacktestValidator 时的初始化日志"""
+    validator_logger = logging.getLogger(BacktestValidator.__module__)
+    previous = validator_logger.level
+    validator_logger.setLevel(max(level, previous))
+    try:
+        yield
+    finally:
+        validator_logger.setLevel(previous)
+
+
+@dataclass
+class _Arrays:
+    """一次扫描共享的只读输入"""
+
+    ohlc: OHLCArrays
+    directions: np.ndarray
+    confidence: np.ndarray
+    timestamps: np.ndarray  # 定长 unicode 数组
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {
+            "open": self.ohlc.open,
+            "high": self.ohlc.high,
+            "low": self.ohlc.low,
+            "close": self.ohlc.close,
+            "directions": self.directions,
+            "confidence": self.confidence,
+            "timestamps": self.timestamps,
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray]) -> "_Arrays":
+        return cls(
+            OHLCArrays(
+                columns["open"], columns["high"], columns["low"], columns["close"]
+            ),
+            columns["directions"],
+            columns["confidence"],
+            columns["timestamps"],
+        )
+
+
+# (列名, dtype, shape, 偏移)，可 pickle 传给子进程
+_Layout = List[Tuple[str, str, Tuple[int, ...], int]]
+
+
+def _share(
+    columns: Mapping[str, np.ndarray],
+) -> Tuple[shared_memory.SharedMemory, _Layout]:
+    """把各列复制进一块共享内存，返回共享内存与布局"""
+    layout: _Layout = []
+    offset = 0
+    for name, array in columns.items():
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (_, _, _, start), array in zip(layout, columns.values()):
+        _view(shm, array.dtype.str, array.shape, start)[...] = array
+    return shm, layout
+
+
+def _view(
+    shm: shared_memory.SharedMemory, dtype: str, shape: Tuple[int, ...], offset: int
+) -> np.ndarray:
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+
+
+def _attach(
+    shm_name: str, layout: _Layout
+) -> Tuple[shared_memory.SharedMemory, _Arrays]:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    columns = {}
+    for name, dtype, shape, offset in layout:
+        view = _view(shm, dtype, shape, offset)
+        view.flags.writeable = False
+        columns[name] = view
+    return shm, _Arrays.from_columns(columns)
+
+
+# 子进程状态：共享内存句柄需保持引用，否则视图底层缓冲区会被释放
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_arrays: Optional[_Arrays] = None
+_worker_base: Optional[BacktestConfig] = None
+
+
+def _init_worker(shm_name: str, layout: _Layout, base: BacktestConfig) -> None:
+    global _worker_shm, _worker_arrays, _worker_base
+    _worker_shm, _worker_arrays = _attach(shm_name, layout)
+    _worker_base = base
+    logging.getLogger(BacktestValidator.__module__).setLevel(logging.WARNING)
+
+
+def _run_chunk(points: List[Dict[str, Any]]) -> List[SweepRow]:
+    assert _worker_arrays is not None and _worker_base is not None
+    return [_evaluate(_worker_arrays, _worker_base, params) for params in points]
+
+
+def _evaluate(
+    arrays: _Arrays, base: BacktestConfig, params: Dict[str, Any]
+) -> SweepRow:
+    try:
+        validator = BacktestValidator(replace(base, **params))
+        result = validator.run_arrays(
+            arrays.ohlc, arrays.directions, arrays.confidence, arrays.timestamps
+        )
+    except ValueError as e:
+        return SweepRow(params=params, error=str(e))
+    return SweepRow(
+        params=params,
+        total_trades=result.total_trades,
+        win_rate=result.win_rate,
+        total_return=result.total_return,
+        sharpe_ratio=result.sharpe_ratio,
+        max_drawdown=result.max_drawdown,
+        profit_factor=result.profit_factor,
+    )
+
+
+class ParameterSweep:
+    """BacktestValidator 参数扫描"""
+
+    def __init__(
+        self,
+        ohlc: OHLCArrays,
+        directions: Union[np.ndarray, Sequence[int]],
+        confidence: Union[np.ndarray, Sequence[float], None] = None,
+        timestamps: Union[np.ndarray, Sequence[str], None] = None,
+        base_config: Optional[BacktestConfig] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            ohlc: OHLC 列数组
+            directions: 信号方向数组（1 买 / -1 卖 / 0 观望）
+            confidence: 置信度数组，None 时视为 1.0
+            timestamps: 时间戳（用于月度收益），None 时用K线下标
+            base_config: 未扫描参数的取值
+            max_workers: 进程数，None 为 CPU 核数，1 为当前进程顺序执行
+        """
+        n = len(ohlc)
+        sig = np.ascontiguousarray(directions, dtype=np.int8)
+        if len(sig) != n:
+            raise ValueError("信号数组长度必须与K线数量一致")
+        conf = (
+            np.ones(n)
+            if confidence is None
+            else np.ascontiguousarray(confidence, dtype=np.float64)
+        )
+        if timestamps is None:
+            timestamps = np.arange(n).astype(str)
+        elif len(timestamps) != n:
+            raise ValueError("时间戳长度必须与K线数量一致")
+        self.arrays = _Arrays(
+            OHLCArrays(
+                *(
+                    np.ascontiguousarray(column, dtype=np.float64)
+                    for column in (ohlc.open, ohlc.high, ohlc.low, ohlc.close)
+                )
+            ),
+            sig,
+            conf,
+            np.asarray(timestamps, dtype=str),
+        )
+        self.base_config = base_config or BacktestConfig()
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @classmethod
+    def from_signals(
+        cls,
+        signals: List[Dict[str, Any]],
+        prices: Sequence[float],
+        timestamps: Optional[Sequence[str]] = None,
+        highs: Optional[Sequence[float]] = None,
+        lows: Optional[Sequence[float]] = None,
+        opens: Optional[Sequence[float]] = None,
+        **kwargs: Any,
+    ) -> "ParameterSweep":
+        """与 BacktestValidator.run_backtest 相同的输入（信号字典列表 + 价格序列）"""
+        close = np.asarray(prices, dtype=np.float64)
+        ohlc = OHLCArrays(
+            open=close if opens is None else np.asarray(opens, dtype=np.float64),
+            high=close if highs is None else np.asarray(highs, dtype=np.float64),
+            low=close if lows is None else np.asarray(lows, dtype=np.float64),
+            close=close,
+        )
+        directions, confidence = encode_signals(signals, default_confidence=0.6)
+        return cls(ohlc, directions, confidence, timestamps, **kwargs)
+
+    def run(
+        self,
+        points: Sequence[Dict[str, Any]],
+        metric: str = "sharpe_ratio",
+        on_result: Optional[Callable[[SweepRow, int], None]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> SweepTable:
+        """
+        运行扫描
+
+        Args:
+            points: 参数点列表（grid_points / random_points / latin_hypercube_points）
+            metric: 排序指标
+            on_result: 每得到一行结果时回调 (row, 当前名次)，名次 0 表示该参数点无效
+            chunk_size: 每个任务包含的参数点数，None 时按进程数自动划分
+
+        Returns:
+            SweepTable: 按 metric 排序的结果表
+        """
+        table = SweepTable(metric)
+        points = list(points)
+        _check_names([name for params in points for name in params])
+        if not points:
+            return table
+
+        workers = min(self.max_workers, len(points))
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(points) / (workers * _CHUNKS_PER_WORKER)))
+        chunks = [points[i : i + chunk_size] for i in range(0, len(points), chunk_size)]
+
+        logger.info(
+            f"[参数扫描] {len(points)} 个参数点, {len(self.arrays.ohlc)} 根K线, "
+            f"{workers} 个进程, {len(chunks)} 个任务块"
+        )
+        for rows in self._iter_chunks(chunks, workers):
+            for row in rows:
+                rank = table.add(row)
+                if on_result is not None:
+                    on_result(row, rank)
+        if table.best is not None:
+            logger.info(
+                f"[参数扫描] 完成: 最优 {table.best.params} "
+                f"{metric}={getattr(table.best, metric):.4f}"
+            )
+        return table
+
+    def _iter_chunks(
+        self, chunks: List[List[Dict[str, Any]]], workers: int
+    ) -> Iterator[List[SweepRow]]:
+        if workers <= 1:
+            with _quiet_validator():
+                for chunk in chunks:
+                    yield [_evaluate(self.arrays, self.base_config, p) for p in chunk]
+            return
+
+        shm, layout = _share(self.arrays.columns())
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shm.name, layout, self.base_config),
+            ) as executor:
+                pending = {executor.submit(_run_chunk, chunk) for chunk in chunks}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        finally:
+            shm.close()
+            shm.unlink()
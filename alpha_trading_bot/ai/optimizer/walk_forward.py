@@ -0,0 +1,509 @@
+"""
+滚动窗口（Walk-Forward）参数优化
+
+把K线切成滚动的训练/测试折：每折在训练段上用 BayesianOptimizer 搜索参数，
+再在紧随其后的测试段上做样本外评估。
+- 各折相互独立，用进程池并行优化（spawn 子进程）
+- 每折结果按内容哈希缓存到磁盘：数据（该折K线与信号的字节）、代码版本
+  （内核/优化器/本模块源码）、搜索空间与试验设置任一变化都会换一个键；
+  K线追加后重新运行时只计算新增的折
+- 汇总样本外收益、正收益折占比、训练/测试效率与参数离散度，
+  只有稳定性检查通过时 WalkForwardReport.apply 才交给 ConfigUpdater 应用
+
+折从第一根K线开始按 step_bars 滚动，K线只在末尾追加时旧折的边界不变。
+
+用法:
+    pipeline = WalkForwardOptimizer.from_candles(candles, directions, confidence)
+    report = pipeline.run()
+    print(report.format())
+    report.apply(ConfigUpdater())
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import backtest_kernel, bayesian_optimizer
+from .backtest_kernel import KernelConfig, OHLCArrays
+from .bayesian_optimizer import BayesianOptimizer, KernelObjective
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式版本，结构变化时递增使旧缓存失效
+_CACHE_VERSION = 1
+
+# 默认搜索空间：回测内核能评估的参数
+DEFAULT_SEARCH_SPACE: Dict[str, Dict[str, Any]] = {
+    "stop_loss_percent": {"type": "float", "low": 0.002, "high": 0.015, "log": False},
+    "take_profit_percent": {"type": "float", "low": 0.004, "high": 0.05, "log": False},
+    "min_confidence": {"type": "float", "low": 0.5, "high": 0.8, "log": False},
+}
+
+
+@dataclass
+class WalkForwardConfig:
+    """滚动优化配置"""
+
+    train_bars: int = 2880  # 训练段K线数（15分钟K线约30天）
+    test_bars: int = 672  # 测试段K线数（约7天）
+    step_bars: Optional[int] = None  # 滚动步长，None 时等于 test_bars
+    n_trials: int = 50  # 每折试验次数
+    objective_steps: int = 8  # 训练段分段数（剪枝的中间上报点）
+    pruner: str = "median"
+    n_workers: int = 1  # 并行折数，1 为当前进程顺序运行
+    cache_dir: str = "data_json/walk_forward_cache"
+    base_config: KernelConfig = field(
+        default_factory=lambda: KernelConfig(allow_short=True)
+    )
+    # 稳定性门槛
+    min_folds: int = 3
+    min_positive_ratio: float = 0.5  # 样本外正收益折占比
+    min_efficiency: float = 0.3  # 每根K线平均测试收益 / 每根K线平均训练收益
+    max_param_cv: float = 0.5  # 各参数跨折变异系数上限
+
+    def __post_init__(self) -> None:
+        if self.train_bars <= 0 or self.test_bars <= 0:
+            raise ValueError("训练/测试段K线数必须大于0")
+        if self.step_bars is None:
+            self.step_bars = self.test_bars
+        if self.step_bars <= 0:
+            raise ValueError("滚动步长必须大于0")
+
+
+@dataclass
+class Fold:
+    """一折的K线下标区间（左闭右开）"""
+
+    index: int
+    train: Tuple[int, int]
+    test: Tuple[int, int]
+
+
+def make_folds(
+    n_bars: int, train_bars: int, test_bars: int, step_bars: int
+) -> List[Fold]:
+    """从第一根K线开始按步长滚动切分，丢弃测试段不完整的尾部"""
+    folds: List[Fold] = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        middle = start + train_bars
+        folds.append(Fold(len(folds), (start, middle), (middle, middle + test_bars)))
+        start += step_bars
+    return folds
+
+
+@dataclass
+class FoldResult:
+    """一折的优化与样本外评估结果"""
+
+    index: int
+    train_period: Tuple[float, float]  # 训练段首/末K线时间戳
+    test_period: Tuple[float, float]
+    best_params: Dict[str, Any]
+    train_value: float  # 训练段目标值（累计收益率）
+    test_value: float  # 测试段收益率
+    trials: int
+    cache_key: str = ""
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("cached")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FoldResult":
+        data = dict(data)
+        data["train_period"] = tuple(data["train_period"])
+        data["test_period"] = tuple(data["test_period"])
+        return cls(**data)
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """参与折计算的源码哈希（内核、优化器、本模块）"""
+    digest = hashlib.sha256()
+    for module in (backtest_kernel, bayesian_optimizer):
+        assert module.__file__ is not None
+        digest.update(Path(module.__file__).read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class _FoldTask:
+    """一折的输入（可 pickle，交给子进程）"""
+
+    fold: Fold
+    key: str
+    ohlc: OHLCArrays  # 该折训练+测试段切片
+    directions: np.ndarray
+    confidence: np.ndarray
+    period: Tuple[float, float, float, float]
+    search_space: Dict[str, Dict[str, Any]]
+    config: WalkForwardConfig
+
+
+def _optimize_fold(task: _FoldTask) -> FoldResult:
+    """在训练段上搜索参数，并在测试段上评估最优参数"""
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    config = task.config
+    train_bars = task.fold.train[1] - task.fold.train[0]
+
+    def segment(start: int, stop: Optional[int], steps: int) -> KernelObjective:
+        return KernelObjective(
+            OHLCArrays(
+                task.ohlc.open[start:stop],
+                task.ohlc.high[start:stop],
+                task.ohlc.low[start:stop],
+                task.ohlc.close[start:stop],
+            ),
+            task.directions[start:stop],
+            task.confidence[start:stop],
+            base_config=config.base_config,
+            steps=steps,
+        )
+
+    study_dir = Path(config.cache_dir) / "studies"
+    study_dir.mkdir(parents=True, exist_ok=True)
+    storage_path = study_dir / f"{task.key}.db"
+    storage_path.unlink(missing_ok=True)
+
+    optimizer = BayesianOptimizer(
+        study_name=f"walk_forward_{task.key}",
+        storage_path=str(storage_path),
+        n_trials=config.n_trials,
+        pruner=config.pruner,
+    )
+    optimizer.set_search_space(task.search_space)
+    optimizer.set_objective(segment(0, train_bars, config.objective_steps))
+    try:
+        result = optimizer.optimize()
+    finally:
+        storage_path.unlink(missing_ok=True)
+
+    test_value = (
+        segment(train_bars, None, 1)(result.best_params) if result.best_params else 0.0
+    )
+    train_start, train_end, test_start, test_end = task.period
+    return FoldResult(
+        index=task.fold.index,
+        train_period=(train_start, train_end),
+        test_period=(test_start, test_end),
+        best_params=result.best_params,
+        train_value=float(result.best_value),
+        test_value=float(test_value),
+        trials=result.n_trials,
+        cache_key=task.key,
+    )
+
+
+@dataclass
+class WalkForwardReport:
+    """滚动优化汇总与稳定性检查"""
+
+    folds: List[FoldResult]
+    config: WalkForwardConfig
+
+    @property
+    def computed(self) -> int:
+        return sum(1 for fold in self.folds if not fold.cached)
+
+    @property
+    def test_returns(self) -> List[float]:
+        return [fold.test_value for fold in self.folds]
+
+    @property
+    def mean_test_return(self) -> float:
+        return float(np.mean(self.test_returns)) if self.folds else 0.0
+
+    @property
+    def mean_train_return(self) -> float:
+        return (
+            float(np.mean([f.train_value for f in self.folds])) if self.folds else 0.0
+        )
+
+    @property
+    def positive_ratio(self) -> float:
+        if not self.folds:
+            return 0.0
+        return sum(1 for value in self.test_returns if value > 0) / len(self.folds)
+
+    @property
+    def efficiency(self) -> float:
+        """样本外/样本内收益比（按每根K线折算）；训练段不盈利时为 0"""
+        train = self.mean_train_return / self.config.train_bars
+        test = self.mean_test_return / self.config.test_bars
+        return test / train if train > 0 else 0.0
+
+    def param_cv(self) -> Dict[str, float]:
+        """各参数跨折的变异系数（标准差 / |均值|）"""
+        names = sorted({name for fold in self.folds for name in fold.best_params})
+        result = {}
+        for name in names:
+            values = np.array(
+                [f.best_params[name] for f in self.folds if name in f.best_params],
+                dtype=np.float64,
+            )
+            mean = abs(values.mean())
+            result[name] = float(values.std() / mean) if mean > 0 else 0.0
+        return result
+
+    @property
+    def recommended_params(self) -> Dict[str, Any]:
+        """最近一折的最优参数"""
+        return dict(self.folds[-1].best_params) if self.folds else {}
+
+    def instability_reasons(self) -> List[str]:
+        config = self.config
+        reasons = []
+        if len(self.folds) < config.min_folds:
+            reasons.append(f"折数 {len(self.folds)} < {config.min_folds}")
+        if self.positive_ratio < config.min_positive_ratio:
+            reasons.append(
+                f"样本外正收益折占比 {self.positive_ratio:.0%} < "
+                f"{config.min_positive_ratio:.0%}"
+            )
+        if self.efficiency < config.min_efficiency:
+            reasons.append(f"效率 {self.efficiency:.2f} < {config.min_efficiency}")
+        for name, cv in self.param_cv().items():
+            if cv > config.max_param_cv:
+                reasons.append(
+                    f"参数 {name} 跨折变异系数 {cv:.2f} > {config.max_param_cv}"
+                )
+        return reasons
+
+    @property
+    def stable(self) -> bool:
+        return not self.instability_reasons()
+
+    def format(self) -> str:
+        lines = [
+            f"滚动优化: {len(self.folds)} 折（新计算 {self.computed}，"
+            f"缓存命中 {len(self.folds) - self.computed}）",
+            f"{'折':>4}{'训练收益':>12}{'测试收益':>12}  最优参数",
+        ]
+        for fold in self.folds:
+            params = ", ".join(
+                f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+                for name, value in sorted(fold.best_params.items())
+            )
+            lines.append(
+                f"{fold.index:>4}{fold.train_value:>14.2%}"
+                f"{fold.test_value:>14.2%}  {params}"
+            )
+        cv = ", ".join(f"{name}={value:.2f}" for name, value in self.param_cv().items())
+        lines.append(
+            f"样本外平均收益 {self.mean_test_return:.2%}, "
+            f"正收益折占比 {self.positive_ratio:.0%}, 效率 {self.efficiency:.2f}, "
+            f"参数变异系数 {{{cv}}}"
+        )
+        reasons = self.instability_reasons()
+        lines.append(
+            "稳定性检查: 通过"
+            if not reasons
+            else "稳定性检查: 未通过 - " + "; ".join(reasons)
+        )
+        return "\n".join(lines)
+
+    def apply(self, updater: Any, reason: str = "滚动优化") -> bool:
+        """稳定性检查通过后把最近一折的最优参数交给 ConfigUpdater 应用"""
+        logger.info(f"[滚动优化] 应用前稳定性报告:\n{self.format()}")
+        reasons = self.instability_reasons()
+        if reasons:
+            logger.warning(
+                f"[滚动优化] 稳定性检查未通过，不应用参数: {'; '.join(reasons)}"
+            )
+            return False
+        return bool(updater.apply_optimized_params(self.recommended_params, reason))
+
+
+class WalkForwardOptimizer:
+    """滚动窗口参数优化流水线"""
+
+    def __init__(
+        self,
+        ohlc: OHLCArrays,
+        directions: Sequence[int],
+        confidence: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[float]] = None,
+        config: Optional[WalkForwardConfig] = None,
+        search_space: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            ohlc: OHLC 列数组
+            directions: 信号方向数组（1 买 / -1 卖 / 0 观望）
+            confidence: 置信度数组，None 时视为 1.0
+            timestamps: K线时间戳（毫秒），None 时用下标
+            config: 滚动优化配置
+            search_space: 搜索空间（格式同 BayesianOptimizer.define_search_space）
+        """
+        n = len(ohlc)
+        if len(directions) != n:
+            raise ValueError("信号数组长度必须与K线数量一致")
+        self.ohlc = OHLCArrays(
+            *(
+                np.ascontiguousarray(column, dtype=np.float64)
+                for column in (ohlc.open, ohlc.high, ohlc.low, ohlc.close)
+            )
+        )
+        self.directions = np.ascontiguousarray(directions, dtype=np.int8)
+        self.confidence = (
+            np.ones(n)
+            if confidence is None
+            else np.ascontiguousarray(confidence, dtype=np.float64)
+        )
+        self.timestamps = (
+            np.arange(n, dtype=np.float64)
+            if timestamps is None
+            else np.ascontiguousarray(timestamps, dtype=np.float64)
+        )
+        self.config = config or WalkForwardConfig()
+        self.search_space = dict(search_space or DEFAULT_SEARCH_SPACE)
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: Any,
+        directions: Sequence[int],
+        confidence: Optional[Sequence[float]] = None,
+        **kwargs: Any,
+    ) -> "WalkForwardOptimizer":
+        """由 CandleSeries 构建（时间戳取K线开盘时间）"""
+        return cls(
+            OHLCArrays.from_candles(candles),
+            directions,
+            confidence,
+            np.asarray(candles.timestamps, dtype=np.float64),
+            **kwargs,
+        )
+
+    def folds(self) -> List[Fold]:
+        config = self.config
+        assert config.step_bars is not None  # __post_init__ 已补为 test_bars
+        return make_folds(
+            len(self.ohlc), config.train_bars, config.test_bars, config.step_bars
+        )
+
+    def fold_key(self, fold: Fold) -> str:
+        """折的内容哈希：数据区间字节 + 代码版本 + 搜索空间与试验设置"""
+        start, stop = fold.train[0], fold.test[1]
+        digest = hashlib.sha256()
+        for column in (
+            self.timestamps,
+            self.ohlc.open,
+            self.ohlc.high,
+            self.ohlc.low,
+            self.ohlc.close,
+            self.directions,
+            self.confidence,
+        ):
+            digest.update(column[start:stop].tobytes())
+        config = self.config
+        settings = {
+            "version": _CACHE_VERSION,
+            "code": code_version(),
+            "search_space": self.search_space,
+            "train_bars": fold.train[1] - fold.train[0],
+            "test_bars": fold.test[1] - fold.test[0],
+            "n_trials": config.n_trials,
+            "objective_steps": config.objective_steps,
+            "pruner": config.pruner,
+            "base_config": asdict(config.base_config),
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()[:32]
+
+    def _cache_path(self, key: str) -> Path:
+        return Path(self.config.cache_dir) / "folds" / f"{key}.json"
+
+    def _load_cached(self, key: str) -> Optional[FoldResult]:
+        path = self._cache_path(key)
+        if not path.exists():
+            return None
+        try:
+            result = FoldResult.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"[滚动优化] 缓存 {path.name} 无法读取，重新计算: {e}")
+            return None
+        result.cached = True
+        return result
+
+    def _store(self, result: FoldResult) -> None:
+        path = self._cache_path(result.cache_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(result.to_dict(), ensure_ascii=False), encoding="utf-8"
+        )
+        os.replace(tmp, path)
+
+    def _task(self, fold: Fold, key: str) -> _FoldTask:
+        start, stop = fold.train[0], fold.test[1]
+        return _FoldTask(
+            fold=fold,
+            key=key,
+            ohlc=OHLCArrays(
+                self.ohlc.open[start:stop],
+                self.ohlc.high[start:stop],
+                self.ohlc.low[start:stop],
+                self.ohlc.close[start:stop],
+            ),
+            directions=self.directions[start:stop],
+            confidence=self.confidence[start:stop],
+            period=(
+                float(self.timestamps[fold.train[0]]),
+                float(self.timestamps[fold.train[1] - 1]),
+                float(self.timestamps[fold.test[0]]),
+                float(self.timestamps[fold.test[1] - 1]),
+            ),
+            search_space=self.search_space,
+            config=self.config,
+        )
+
+    def run(self) -> WalkForwardReport:
+        """优化所有折（命中缓存的折直接读取），返回汇总报告"""
+        results: Dict[int, FoldResult] = {}
+        tasks: List[_FoldTask] = []
+        for fold in self.folds():
+            key = self.fold_key(fold)
+            cached = self._load_cached(key)
+            if cached is not None:
+                cached.index = fold.index
+                results[fold.index] = cached
+            else:
+                tasks.append(self._task(fold, key))
+
+        logger.info(
+            f"[滚动优化] 共 {len(results) + len(tasks)} 折，"
+            f"缓存命中 {len(results)}，需计算 {len(tasks)}"
+        )
+        for result in self._compute(tasks):
+            self._store(result)
+            results[result.index] = result
+
+        return WalkForwardReport(
+            [results[index] for index in sorted(results)], self.config
+        )
+
+    def _compute(self, tasks: List[_FoldTask]) -> List[FoldResult]:
+        workers = min(self.config.n_workers, len(tasks))
+        if workers <= 1:
+            return [_optimize_fold(task) for task in tasks]
+        # spawn 子进程：不复制调用方（可能是交易进程）的线程与事件循环
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn")
+        ) as executor:
+            return list(executor.map(_optimize_fold, tasks))
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 from alpha_trading_bot.config.thresholds import RSI_BUY_OVERSOLD_MAX, PROMPT_BUY_RSI_THRESHOLD, PROMPT_BUY_ADX_THRESHOLD, PROMPT_SELL_RSI_THRESHOLD, PROMPT_WATCH_TREND_STRENGTH, PROMPT_WATCH_ADX_THRESHOLD, PROMPT_WATCH_ATR_THRESHOLD, PROMPT_CRASH_DROP_THRESHOLD, PROMPT_SHORT_TERM_BUY_THRESHOLD, PROMPT_DEEPSEEK_LOW_POSITION_THRESHOLD, PROMPT_DEEPSEEK_REBOUND_RSI_MAX
+from .feature_context import FeatureContext
 
 
 @dataclass
@@ -122,8 +123,7 @@ class PromptBuilder:
 
         price_history = market_data.get("price_history", [])
         if len(price_history) >= 7:
-            low = min(price_history[:7])
-            high = max(price_history[:7])
+            low, high = FeatureContext.of(market_data).price_range(0, 7)
             if high > low:
                 price_position = (current_price - low) / (high - low) * 100
             else:
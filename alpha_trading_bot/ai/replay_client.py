@@ -0,0 +1,140 @@
+"""
+回放回测用 AI 客户端
+
+ReplayAIClient 只替换提供商调用这一步：原始响应由 responder 产出，
+之后的解析、融合与 AISignalIntegrator 集成流程与 AIClient 完全相同。
+
+responder 是 (provider, market_data) -> 原始响应文本 的可调用对象：
+- StaticResponder: 每个周期返回同一响应，默认 HOLD，即仅由策略层决策
+- RecordedResponses: 按虚拟时间回放录制的原始响应
+- ModelResponder: 由确定性模型函数 market_data -> (signal, confidence) 生成响应
+"""
+
+import bisect
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from alpha_trading_bot.config.models import AIConfig
+from alpha_trading_bot.utils import clock
+
+from .client import AIClient
+
+logger = logging.getLogger(__name__)
+
+Responder = Callable[[str, Dict[str, Any]], str]
+
+
+def format_response(signal: str, confidence: float) -> str:
+    """生成 ResponseParser 可解析的标准响应，confidence 为 0-1"""
+    return f"{signal.lower()} | confidence: {int(round(confidence * 100))}%"
+
+
+class StaticResponder:
+    """所有周期返回同一响应"""
+
+    def __init__(self, signal: str = "hold", confidence: float = 0.5) -> None:
+        self.response = format_response(signal, confidence)
+
+    def __call__(self, provider: str, market_data: Dict[str, Any]) -> str:
+        return self.response
+
+
+class ModelResponder:
+    """由确定性模型函数生成响应"""
+
+    def __init__(self, model: Callable[[Dict[str, Any]], Tuple[str, float]]) -> None:
+        self.model = model
+
+    def __call__(self, provider: str, market_data: Dict[str, Any]) -> str:
+        signal, confidence = self.model(market_data)
+        return format_response(signal, confidence)
+
+
+def rsi_trend_model(market_data: Dict[str, Any]) -> Tuple[str, float]:
+    """示例确定性模型：RSI 超卖且趋势向上买入，超买且趋势向下做空"""
+    technical = market_data.get("technical") or {}
+    rsi = technical.get("rsi", 50)
+    trend = technical.get("trend_direction", "neutral")
+    if rsi < 40 and trend == "up":
+        return "buy", 0.75
+    if rsi > 60 and trend == "down":
+        return "short", 0.7
+    return "hold", 0.5
+
+
+class RecordedResponses:
+    """
+    按时间回放录制的原始 AI 响应
+
+    记录格式: {"timestamp": 毫秒, "response": 原始文本, "provider": 可选}
+    查询时取虚拟时间之前最近一条记录；未指定 provider 的记录对所有提供商生效。
+    超过 max_age_seconds 或没有记录时返回 default。
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        default: str = format_response("hold", 0.5),
+        max_age_seconds: Optional[float] = None,
+    ) -> None:
+        self.default = default
+        self.max_age_seconds = max_age_seconds
+        self.misses = 0
+        grouped: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        for record in records:
+            grouped[record.get("provider") or ""].append(
+                (float(record["timestamp"]), str(record["response"]))
+            )
+        self._timestamps: Dict[str, List[float]] = {}
+        self._responses: Dict[str, List[str]] = {}
+        for provider, items in grouped.items():
+            items.sort(key=lambda item: item[0])
+            self._timestamps[provider] = [ts for ts, _ in items]
+            self._responses[provider] = [text for _, text in items]
+
+    @classmethod
+    def from_jsonl(cls, path: str, **kwargs: Any) -> "RecordedResponses":
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return cls(records, **kwargs)
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._responses.values())
+
+    def __call__(self, provider: str, market_data: Dict[str, Any]) -> str:
+        now_ms = clock.time() * 1000
+        for key in (provider, ""):
+            timestamps = self._timestamps.get(key)
+            if not timestamps:
+                continue
+            i = bisect.bisect_right(timestamps, now_ms) - 1
+            if i < 0:
+                continue
+            age = (now_ms - timestamps[i]) / 1000
+            if self.max_age_seconds is not None and age > self.max_age_seconds:
+                continue
+            return self._responses[key][i]
+        self.misses += 1
+        return self.default
+
+
+class ReplayAIClient(AIClient):
+    """不发网络请求的 AIClient，提供商响应由 responder 产出"""
+
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        config: Optional[AIConfig] = None,
+    ) -> None:
+        # 缓存按墙钟时间过期，回放时关闭
+        super().__init__(config=config or AIConfig(), api_keys={}, enable_cache=False)
+        self.responder = responder or StaticResponder()
+        self.calls = 0
+
+    async def _call_ai_with_retry(
+        self, provider: str, market_data: Dict[str, Any], api_key: str
+    ) -> str:
+        self.calls += 1
+        return self.responder(provider, market_data)
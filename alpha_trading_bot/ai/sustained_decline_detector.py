@@ -22,11 +22,13 @@ date: 2026-03-07
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from .feature_context import FeatureContext
+
 logger = logging.getLogger(__name__)
 
 
@@ -170,6 +172,7 @@ class SustainedDeclineDetector:
                 - price: 当前价格
                 - hourly_changes: 小时级别变化率列表 (正=上涨, 负=下跌)
                 - price_history: 历史价格列表
+                - candles: 可选，CandleSeries K线序列
                 - recent_change_percent: 最近1小时涨跌幅
                 - daily_change_percent: 24小时涨跌幅
                 - cycle_start_price: 可选，周期开始价格
@@ -233,11 +236,9 @@ class SustainedDeclineDetector:
         # 获取小时变化数据
         hourly_changes = market_data.get("hourly_changes", [])
 
-        # 如果没有小时变化数据，尝试从价格历史计算
+        # 如果没有小时变化数据，使用本周期特征上下文的收益率
         if not hourly_changes:
-            price_history = market_data.get("price_history", [])
-            if len(price_history) >= 2:
-                hourly_changes = self._calculate_hourly_changes(price_history)
+            hourly_changes = FeatureContext.of(market_data).returns
 
         # 计算下跌指标
         metrics = self._calculate_decline_metrics(
@@ -306,35 +307,12 @@ class SustainedDeclineDetector:
             log_message=log_msg,
         )
 
-    def _calculate_hourly_changes(self, price_history: List[float]) -> List[float]:
-        """
-        从价格历史计算小时变化率
-
-        Args:
-            price_history: 价格历史列表（从旧到新）
-
-        Returns:
-            List[float]: 小时变化率列表
-        """
-        if len(price_history) < 2:
-            return []
-
-        changes = []
-        for i in range(1, len(price_history)):
-            if price_history[i - 1] > 0:
-                change = (price_history[i] - price_history[i - 1]) / price_history[
-                    i - 1
-                ]
-                changes.append(change)
-
-        return changes
-
     def _calculate_decline_metrics(
         self,
         current_price: float,
         start_price: float,
         start_time: Optional[datetime],
-        hourly_changes: List[float],
+        hourly_changes: Sequence[float],
         recent_change: float,
         daily_change: float,
     ) -> DeclineMetrics:
@@ -382,9 +360,7 @@ class SustainedDeclineDetector:
 
         # 计算下跌周期占比
         down_periods = sum(1 for change in recent_changes if change < -0.001)
-        down_ratio = (
-            down_periods / len(recent_changes) if recent_changes else 0
-        )
+        down_ratio = down_periods / len(recent_changes) if recent_changes else 0
 
         # 3. 反弹分析
         rebounds = [c for c in hourly_changes if c > 0.003]  # 超过0.3%视为反弹
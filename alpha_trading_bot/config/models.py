@@ -124,6 +124,11 @@ class TradingConfig:
     runtime_environment: str = "dev"
     order_confirm_timeout_seconds: float = 5.0
     order_confirm_poll_interval_seconds: float = 0.25
+    loop_watchdog_enabled: bool = True
+    loop_lag_threshold_seconds: float = 0.25
+    algo_cache_reconcile_seconds: float = 60.0  # 算法单缓存 REST 全量对账间隔
+    instrument_cache_ttl_seconds: float = 86400.0  # 合约规格磁盘缓存有效期，0 为关闭
+    cycle_record_path: str = ""  # 周期输入录制文件（用于离线回放），空为关闭
 
     VALID_RUNTIME_ENVIRONMENTS = ["dev", "test", "staging", "prod", "production"]
     LIVE_ALLOWED_ENVIRONMENTS = ["prod", "production"]
@@ -159,6 +164,12 @@ class TradingConfig:
             > self.order_confirm_timeout_seconds
         ):
             errors.append("订单确认轮询间隔不能大于确认超时")
+        if self.loop_lag_threshold_seconds <= 0:
+            errors.append("事件循环延迟阈值必须大于0")
+        if self.algo_cache_reconcile_seconds < 0:
+            errors.append("算法单缓存对账间隔不能为负数")
+        if self.instrument_cache_ttl_seconds < 0:
+            errors.append("合约规格缓存有效期不能为负数")
 
         if self.runtime_environment not in self.VALID_RUNTIME_ENVIRONMENTS:
             errors.append(
@@ -372,6 +383,8 @@ class StopLossConfig:
     # OKX 止损触发价 tick size（用于比较新/旧止损价时对齐精度，
     # 避免 OKX 把 62501.4225 截为 62501.4 后误判 "新值更紧" 造成每周期重复取消+重建算法单）
     stop_loss_tick_tolerance: float = 0.1
+    # 开仓单通过 OKX attachAlgoOrds 附带止损，成交即受保护；失败时回退为成交后单独下止损单
+    attach_stop_loss_on_entry: bool = False
 
     def validate(self) -> List[str]:
         """验证配置，返回错误列表"""
@@ -525,6 +538,18 @@ class Config:
                 order_confirm_poll_interval_seconds=float(
                     os.getenv("ORDER_CONFIRM_POLL_INTERVAL_SECONDS", "0.25")
                 ),
+                loop_watchdog_enabled=os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower()
+                == "true",
+                loop_lag_threshold_seconds=float(
+                    os.getenv("LOOP_LAG_THRESHOLD_SECONDS", "0.25")
+                ),
+                algo_cache_reconcile_seconds=float(
+                    os.getenv("ALGO_CACHE_RECONCILE_SECONDS", "60")
+                ),
+                instrument_cache_ttl_seconds=float(
+                    os.getenv("INSTRUMENT_CACHE_TTL_SECONDS", "86400")
+                ),
+                cycle_record_path=os.getenv("CYCLE_RECORD_PATH", "").strip(),
             ),
             ai=AIConfig.from_env(),
             stop_loss=StopLossConfig(
@@ -569,6 +594,10 @@ class Config:
                 stop_loss_tick_tolerance=float(
                     os.getenv("STOP_LOSS_TICK_TOLERANCE", "0.1")
                 ),
+                attach_stop_loss_on_entry=os.getenv(
+                    "ATTACH_STOP_LOSS_ON_ENTRY", "false"
+                ).lower()
+                == "true",
             ),
             system=SystemConfig(
                 log_level=os.getenv("LOG_LEVEL", "INFO"),
@@ -2,11 +2,7 @@
 Core模块 - 交易机器人核心组件
 """
 
-from .bot import TradingBot, main
-from .trading_scheduler import TradingScheduler, create_scheduler
-from .signal_processor import SignalProcessor, process_signal, validate_signal
-from .position_manager import Position
-from .position_manager import PositionManager, create_position_manager
+from ..utils.lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 
@@ -25,4 +21,22 @@ __all__ = [
     # 仓位管理器
     "PositionManager",
     "create_position_manager",
+    # 回放回测
+    "ReplayBacktester",
+    "ReplayConfig",
+    "CycleRecorder",
+    "CycleReplayer",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".bot": ("TradingBot", "main"),
+        ".trading_scheduler": ("TradingScheduler", "create_scheduler"),
+        ".signal_processor": ("SignalProcessor", "process_signal", "validate_signal"),
+        ".position_manager": ("Position", "PositionManager", "create_position_manager"),
+        ".replay": ("ReplayBacktester", "ReplayConfig"),
+        ".cycle_recorder": ("CycleRecorder",),
+        ".cycle_replay": ("CycleReplayer",),
+    },
+)
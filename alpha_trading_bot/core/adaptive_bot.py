@@ -13,8 +13,9 @@
 import asyncio
 import inspect
 import logging
+import uuid
 from typing import Dict, Any, Optional, Tuple
-from datetime import datetime, timezone
+from datetime import timezone
 
 from .trading_scheduler import TradingScheduler
 from .signal_processor import SignalProcessor
@@ -25,9 +26,12 @@ from .position_close_audit import (
     extract_float,
 )
 from .opportunity_audit import OpportunityAuditor
+from ..ai.feature_context import FeatureContext
 from ..config.models import Config
 from ..exchange.models.orders import OrderIntent
+from ..utils import clock
 from ..utils.observability import record_live_guard_block
+from ..utils.phase_timer import PhaseTimer
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +53,18 @@ def _normalize_stop_price_for_order(
     return stop_price
 
 
+def _supports_stop_amend(exchange: Any) -> bool:
+    """判断交易所客户端是否支持原地修改算法单。"""
+    return asyncio.iscoroutinefunction(getattr(exchange, "amend_algo_order", None))
+
+
+def _supports_attached_stop_loss(exchange: Any) -> bool:
+    """判断交易所客户端是否支持开仓单附带止损并找回算法单ID。"""
+    return asyncio.iscoroutinefunction(
+        getattr(exchange, "find_attached_algo_order", None)
+    )
+
+
 def _supports_order_intent(method: Any) -> bool:
     """判断下单方法是否支持订单意图参数。"""
     try:
@@ -88,6 +104,11 @@ class AdaptiveTradingBot:
         self._ml_optimization_task: Optional[Any] = None
         self._decision_engine: Optional[Any] = None
         self._param_applier: Optional[Any] = None
+        self._loop_watchdog: Optional[Any] = None
+
+        # 周期分阶段计时；设置 cycle_record_path 时录制每个周期的外部输入
+        self.phase_timer = PhaseTimer()
+        self._cycle_recorder: Optional[Any] = None
 
         # === 方向冷却机制 ===
         self._last_position_side: str = ""  # 上一次的持仓方向
@@ -231,6 +252,7 @@ class AdaptiveTradingBot:
             logger.info("初始化自适应交易机器人...")
 
             from ..exchange.client import ExchangeClient
+            from .state_persistence import resolve_state_data_dir
 
             self._exchange = ExchangeClient(
                 api_key=self.config.exchange.api_key,
@@ -246,9 +268,33 @@ class AdaptiveTradingBot:
                 order_confirm_poll_interval_seconds=(
                     self.config.trading.order_confirm_poll_interval_seconds
                 ),
+                algo_cache_reconcile_seconds=(
+                    self.config.trading.algo_cache_reconcile_seconds
+                ),
+                instrument_cache_dir=str(resolve_state_data_dir()),
+                instrument_cache_ttl_seconds=(
+                    self.config.trading.instrument_cache_ttl_seconds
+                ),
             )
-            await self._exchange.initialize()
-            await self._exchange.set_leverage(self.config.exchange.leverage)
+
+            async def _init_exchange() -> None:
+                await self._exchange.initialize()
+                await self._exchange.set_leverage(self.config.exchange.leverage)
+
+            # 交易所连接（网络往返）与 AI 客户端构建（模块导入）互不依赖，并发执行
+            loop = asyncio.get_running_loop()
+            _, self._ai_client = await asyncio.gather(
+                _init_exchange(), loop.run_in_executor(None, self._build_ai_client)
+            )
+
+            if self.config.trading.cycle_record_path:
+                from .cycle_recorder import CycleRecorder
+
+                self._cycle_recorder = CycleRecorder.open(
+                    self.config.trading.cycle_record_path, self.config
+                )
+                self._exchange = self._cycle_recorder.wrap_exchange(self._exchange)
+                self._cycle_recorder.wrap_ai_client(self._ai_client)
 
             from .position_recovery import PositionRecoveryManager
             from .adaptive_stop_loss import AdaptiveStopLossManager
@@ -258,12 +304,6 @@ class AdaptiveTradingBot:
             )
             self._adaptive_stop_loss = AdaptiveStopLossManager(self._exchange)
 
-            from ..ai.client import AIClient
-
-            self._ai_client = AIClient(
-                config=self.config.ai, api_keys=self.config.ai.api_keys
-            )
-
             self._initialized = True
             logger.info("初始化完成")
             return True
@@ -272,6 +312,12 @@ class AdaptiveTradingBot:
             logger.exception(f"初始化失败: {e}")
             return False
 
+    def _build_ai_client(self) -> Any:
+        """构建 AI 客户端（在线程池中执行，与交易所初始化并行）"""
+        from ..ai.client import AIClient
+
+        return AIClient(config=self.config.ai, api_keys=self.config.ai.api_keys)
+
     async def run(self) -> None:
         """主循环"""
         if not self._initialized:
@@ -283,6 +329,9 @@ class AdaptiveTradingBot:
         logger.info("自适应交易机器人 v2.0 启动")
         logger.info("=" * 60)
 
+        # 启动事件循环延迟看门狗
+        self._start_loop_watchdog()
+
         # 启动后台优化任务
         asyncio.create_task(self._background_optimization_task())
 
@@ -314,6 +363,9 @@ class AdaptiveTradingBot:
         """
         # 1. 等待周期
         await self.scheduler.wait_for_next_cycle(first_run)
+        self.phase_timer.start()
+        if self._cycle_recorder is not None:
+            self._cycle_recorder.begin_cycle(first_run)
 
         logger.info("=" * 60)
         logger.info("开始新的自适应交易周期")
@@ -324,9 +376,13 @@ class AdaptiveTradingBot:
             assert self._exchange is not None, "Exchange client not initialized"
             assert self._ai_client is not None, "AI client not initialized"
 
-            # 2. 获取市场数据
+            # 2. 获取市场数据（挂载本周期特征上下文，派生特征只计算一次）
             market_data = await self._exchange.get_market_data()
+            features = FeatureContext.of(
+                market_data, regime_detector=self.regime_detector
+            )
             current_price = market_data.get("price", 0)
+            self.phase_timer.mark("market_data")
 
             logger.info(f"[市场] 当前价格: {current_price}")
             logger.info(f"[市场] 24h涨跌: {market_data.get('change_percent', 0):.2f}%")
@@ -339,12 +395,13 @@ class AdaptiveTradingBot:
             )
 
             # 3. 市场环境检测
-            market_state = self.regime_detector.detect(market_data)
+            market_state = features.regime
             logger.info(
                 f"[环境] 市场状态: {market_state.regime.value}, "
                 f"置信度: {market_state.confidence:.0%}, "
                 f"趋势: {market_state.trend_strength:.2f}"
             )
+            self.phase_timer.mark("regime")
 
             current_params = self.param_manager.get_parameters()
             if self._param_applier:
@@ -357,12 +414,14 @@ class AdaptiveTradingBot:
                     f"  - {s.strategy_type.value}: {s.signal.upper()} "
                     f"(置信度: {s.confidence:.0%}, 原因: {s.reason})"
                 )
+            self.phase_timer.mark("strategies")
 
             # 5. 获取AI融合信号
             logger.info("[AI] 获取融合信号...")
             ai_signal = await self._ai_client.get_signal(market_data)
             ai_signal = SignalProcessor.process(ai_signal)
             logger.info(f"[AI] 原始信号: {ai_signal}")
+            self.phase_timer.mark("ai_signal")
 
             # 5.5 HOLD+无持仓快速退出：避免两个"不操作"信号叠加浪费周期
             # 优化：AI=HOLD时仍允许策略层评估，高置信度策略BUY可覆盖AI-HOLD
@@ -388,6 +447,7 @@ class AdaptiveTradingBot:
             )
             for reason in selected.reasons:
                 logger.info(f"  - {reason}")
+            self.phase_timer.mark("strategy_select")
 
             # 7. 获取持仓状态（带重试机制）
             position_data = (
@@ -440,6 +500,7 @@ class AdaptiveTradingBot:
                         )
                         pm.clear_position()
                 logger.info("[持仓] 无持仓")
+            self.phase_timer.mark("position")
 
             # 8. 风险状态评估
             risk_state = self.risk_manager.assess_risk(market_data, position_data)
@@ -448,6 +509,7 @@ class AdaptiveTradingBot:
                 f"回撤: {risk_state.current_drawdown:.2%}, "
                 f"熔断: {'是' if risk_state.circuit_breaker_active else '否'}"
             )
+            self.phase_timer.mark("risk")
 
             if risk_state.circuit_breaker_active:
                 logger.warning(f"[风险] 熔断中: {risk_state.circuit_breaker_reason}")
@@ -456,7 +518,6 @@ class AdaptiveTradingBot:
 
             # 9. 规则评估（缓存结果供后续使用）
             perf = self.performance_tracker.get_performance_metrics()
-            market_state = self.regime_detector.detect(market_data)
             rule_result = self.rules_engine.evaluate_all(market_state, perf)
 
             if rule_result["adjustments"]:
@@ -476,9 +537,7 @@ class AdaptiveTradingBot:
             _in_cooldown = False
             cool_down_elapsed = 0.0
             if not has_position and self._position_close_time > 0:
-                import time
-
-                cool_down_elapsed = time.time() - self._position_close_time
+                cool_down_elapsed = clock.time() - self._position_close_time
                 cooldown_seconds = self._get_direction_cooldown_seconds(
                     {}, market_data, self._last_closed_side
                 )
@@ -560,6 +619,10 @@ class AdaptiveTradingBot:
                             "reason": f"方向冷却({this_side})",
                         }
 
+            self.phase_timer.mark("decision")
+            if self._cycle_recorder is not None:
+                self._cycle_recorder.record_decision(final_signal)
+
             if final_signal["action"] == "skip":
                 self._opportunity_auditor.log_skip(
                     ai_signal=ai_signal,
@@ -596,15 +659,21 @@ class AdaptiveTradingBot:
             logger.error(f"[周期] 执行出错: {e}")
             logger.exception("详细错误:")
             return
+        finally:
+            timings = self.phase_timer.finish()
+            if self._cycle_recorder is not None:
+                self._cycle_recorder.end_cycle(timings)
+            logger.debug(
+                "[周期] 阶段耗时: "
+                + ", ".join(f"{name}={ms:.1f}ms" for name, ms in timings.items())
+            )
 
         logger.info("[周期] 完成")
         logger.info("=" * 60)
 
     async def _record_position_disappeared(self) -> None:
         """记录持仓消失后的方向和盈亏质量，用于同向再入场冷却。"""
-        import time
-
-        self._position_close_time = time.time()
+        self._position_close_time = clock.time()
         self._last_closed_side = self._last_position_side
         self._last_close_was_profitable = self._last_position_unrealized_pnl > 0
         self._last_close_pnl_percent = self._estimate_last_close_pnl_percent()
@@ -829,7 +898,9 @@ class AdaptiveTradingBot:
             )
         else:
             perf = self.performance_tracker.get_performance_metrics()
-            market_state = self.regime_detector.detect(market_data)
+            market_state = FeatureContext.of(
+                market_data, regime_detector=self.regime_detector
+            ).regime
             rule_result = self.rules_engine.evaluate_all(market_state, perf)
 
             if rule_result["adjustments"]:
@@ -940,6 +1011,16 @@ class AdaptiveTradingBot:
             # 下市价单开仓 (根据 position_side 决定买入还是卖出)
             order_side = "buy" if position_side == "long" else "sell"
 
+            # 支持时随开仓单附带止损，成交与保护一次往返完成
+            attach_kwargs: Dict[str, Any] = {}
+            if stop_loss_price and AdaptiveTradingBot._should_attach_stop_loss(self):
+                attach_kwargs = {
+                    "attached_stop_price": _normalize_stop_price_for_order(
+                        stop_loss_price, current_price, position_side
+                    ),
+                    "attach_algo_cl_ord_id": f"sl{uuid.uuid4().hex[:30]}",
+                }
+
             fill = await self._create_confirmed_market_order(
                 symbol=symbol,
                 side=order_side,
@@ -947,6 +1028,7 @@ class AdaptiveTradingBot:
                 current_price=current_price,
                 intent=OrderIntent.OPEN,
                 position_side=position_side,
+                **attach_kwargs,
             )
 
             # P0: 验证订单是否创建成功
@@ -959,10 +1041,12 @@ class AdaptiveTradingBot:
             entry_price = fill["average_price"]
 
             # === P1: 记录开仓（学习闭环开始） ===
-            market_state = self.regime_detector.detect(market_data)
+            market_state = FeatureContext.of(
+                market_data, regime_detector=self.regime_detector
+            ).regime
             confidence = selected_strategy.confidence if selected_strategy else 0.5
             self.performance_tracker.record_trade(
-                entry_time=datetime.now(timezone.utc).isoformat(),
+                entry_time=clock.now(timezone.utc).isoformat(),
                 entry_price=entry_price,
                 side=order_side,
                 confidence=confidence,
@@ -1000,15 +1084,43 @@ class AdaptiveTradingBot:
             )
             logger.info(f"[执行] 开仓订单已提交: {order_id}")
 
+            stop_order_id = None
+            if attach_kwargs:
+                stop_order_id = await AdaptiveTradingBot._resolve_attached_stop_order(
+                    self, symbol, attach_kwargs["attach_algo_cl_ord_id"]
+                )
+                if stop_order_id:
+                    stop_loss_price = attach_kwargs["attached_stop_price"]
+                    logger.info(f"[附带止损] 开仓单附带止损已生效: id={stop_order_id}")
+                else:
+                    # 附带止损可能已生效只是查询未命中：先强制对账收养现有止损，
+                    # 避免再建一张单独止损而让附带止损脱离跟踪
+                    (
+                        stop_order_id,
+                        existing_stop_price,
+                    ) = await self._get_existing_stop_order_id(force_refresh=True)
+                    if stop_order_id and existing_stop_price:
+                        stop_loss_price = existing_stop_price
+                        logger.warning(
+                            f"[附带止损] 查询未命中，对账收养现有止损: "
+                            f"{stop_order_id}@{existing_stop_price}"
+                        )
+                    else:
+                        stop_order_id = None
+                        logger.warning(
+                            "[附带止损] 未确认附带止损，回退为单独创建止损单"
+                        )
+
             # 如果有止损价，设置止损单（带重试机制）
             if stop_loss_price:
-                stop_order_id = await self._create_stop_loss_with_retry(
-                    amount=filled_amount,
-                    stop_price=stop_loss_price,
-                    current_price=current_price,
-                    position_side=position_side,
-                    max_retries=3,
-                )
+                if not stop_order_id:
+                    stop_order_id = await self._create_stop_loss_with_retry(
+                        amount=filled_amount,
+                        stop_price=stop_loss_price,
+                        current_price=current_price,
+                        position_side=position_side,
+                        max_retries=3,
+                    )
                 if stop_order_id:
                     self.position_manager.set_stop_order(stop_order_id, stop_loss_price)
                     self._remember_position_close_audit_context(
@@ -1046,7 +1158,7 @@ class AdaptiveTradingBot:
 
             # === P1: 记录平仓（学习闭环完成） ===
             closed_trade = self.performance_tracker.close_trade(
-                exit_time=datetime.now(timezone.utc).isoformat(),
+                exit_time=clock.now(timezone.utc).isoformat(),
                 exit_price=current_price,
                 reason="signal_close",
             )
@@ -1122,6 +1234,8 @@ class AdaptiveTradingBot:
         current_price: float,
         intent: OrderIntent = OrderIntent.OPEN,
         position_side: str = "",
+        attached_stop_price: Optional[float] = None,
+        attach_algo_cl_ord_id: str = "",
     ) -> Optional[Dict[str, Any]]:
         """提交市价单并确认真实成交数量和均价。"""
         assert self._exchange is not None, "Exchange client not initialized"
@@ -1130,12 +1244,19 @@ class AdaptiveTradingBot:
             self._exchange, "create_confirmed_market_order", None
         )
         if callable(create_confirmed):
+            attach_kwargs = {}
+            if attached_stop_price:
+                attach_kwargs = {
+                    "attached_stop_price": attached_stop_price,
+                    "attach_algo_cl_ord_id": attach_algo_cl_ord_id,
+                }
             result = await create_confirmed(
                 symbol,
                 side,
                 amount,
                 intent,
                 position_side,
+                **attach_kwargs,
             )
         else:
             create_with_status = getattr(
@@ -1200,6 +1321,28 @@ class AdaptiveTradingBot:
             "average_price": average_price,
         }
 
+    def _should_attach_stop_loss(self) -> bool:
+        """是否在开仓单上附带止损。"""
+        return (
+            self.config.stop_loss.attach_stop_loss_on_entry is True
+            and _supports_attached_stop_loss(self._exchange)
+        )
+
+    async def _resolve_attached_stop_order(
+        self, symbol: str, attach_algo_cl_ord_id: str
+    ) -> Optional[str]:
+        """成交后按 algoClOrdId 找回附带止损的算法单ID。"""
+        try:
+            order = await self._exchange.find_attached_algo_order(
+                symbol, attach_algo_cl_ord_id
+            )
+        except Exception as e:
+            logger.warning(f"[附带止损] 查询附带止损失败: {e}")
+            return None
+        if not order:
+            return None
+        return str(order.get("id") or "") or None
+
     async def _maybe_create_take_profit_order(
         self,
         position_side: str,
@@ -1355,10 +1498,35 @@ class AdaptiveTradingBot:
             return
         await self._ml_optimization_task.run()
 
+    def _start_loop_watchdog(self) -> None:
+        """启动事件循环延迟看门狗，定位阻塞事件循环的同步调用"""
+        trading_config = getattr(self.config, "trading", None)
+        if not getattr(trading_config, "loop_watchdog_enabled", False):
+            return
+        from ..utils.loop_watchdog import EventLoopWatchdog
+
+        self._loop_watchdog = EventLoopWatchdog(
+            threshold=trading_config.loop_lag_threshold_seconds
+        )
+        asyncio.create_task(self._loop_watchdog.run())
+
     async def cleanup(self) -> None:
         """清理资源"""
         logger.info("清理资源...")
 
+        loop_watchdog = getattr(self, "_loop_watchdog", None)
+        if loop_watchdog is not None:
+            loop_watchdog.stop()
+
+        ml_optimization_task = getattr(self, "_ml_optimization_task", None)
+        if ml_optimization_task is not None:
+            ml_optimization_task.cancel()
+
+        # 写出延迟的持仓状态
+        position_manager = getattr(self, "position_manager", None)
+        if position_manager is not None:
+            position_manager.close()
+
         # 保存表现数据
         self.performance_tracker._save_history()
 
@@ -1368,6 +1536,9 @@ class AdaptiveTradingBot:
         if hasattr(self, "_exchange") and self._exchange is not None:
             await self._exchange.cleanup()
 
+        if self._cycle_recorder is not None:
+            self._cycle_recorder.close()
+
         logger.info("清理完成")
 
     async def _create_stop_loss_with_retry(
@@ -1551,33 +1722,15 @@ class AdaptiveTradingBot:
                 new_stop_price = checked_stop_price
 
             logger.info(f"[止损-智能] 执行更新: {old_stop:.1f} → {new_stop_price:.1f}")
-            try:
-                cancel_success, cancel_reason = await self._exchange.cancel_algo_order(
-                    str(existing_stop_id), self._exchange.symbol
-                )
-                if not cancel_success and cancel_reason != "already_gone":
-                    logger.warning(
-                        f"[止损-智能] 取消旧止损单失败: {existing_stop_id}, "
-                        f"原因={cancel_reason}，跳过创建新止损单"
-                    )
-                    return
-            except Exception as e:
-                logger.warning(f"[止损-智能] 取消旧止损单失败: {e}")
-                return
-
-            stop_order_id = await self._create_stop_loss_with_retry(
+            await AdaptiveTradingBot._replace_stop_order(
+                self,
+                existing_stop_id=str(existing_stop_id),
                 amount=amount,
-                stop_price=new_stop_price,
+                new_stop_price=new_stop_price,
                 current_price=current_price,
                 position_side=position_side,
-                max_retries=3,
+                log_tag="[止损-智能]",
             )
-            if stop_order_id:
-                self.position_manager.set_stop_order(stop_order_id, new_stop_price)
-                self._refresh_close_audit_stop(stop_order_id, new_stop_price)
-                logger.info(f"[止损-智能] 更新成功: {stop_order_id}")
-            else:
-                await AdaptiveTradingBot._recover_stop_state_after_failed_update(self)
             return
 
         # === 传统模式：ATR动态止损 ===
@@ -1711,20 +1864,70 @@ class AdaptiveTradingBot:
             new_stop_price = checked_stop_price
 
         logger.info(f"[止损] 执行更新: {old_stop:.1f} → {new_stop_price:.1f}")
+        await AdaptiveTradingBot._replace_stop_order(
+            self,
+            existing_stop_id=str(existing_stop_id),
+            amount=amount,
+            new_stop_price=new_stop_price,
+            current_price=current_price,
+            position_side=position_side,
+            log_tag="[止损]",
+        )
 
-        try:
-            cancel_success, cancel_reason = await self._exchange.cancel_algo_order(
-                str(existing_stop_id), self._exchange.symbol
-            )
-            if not cancel_success and cancel_reason != "already_gone":
+    async def _replace_stop_order(
+        self,
+        existing_stop_id: str,
+        amount: float,
+        new_stop_price: float,
+        current_price: float,
+        position_side: str,
+        log_tag: str = "[止损]",
+    ) -> None:
+        """替换现有止损单：优先原地修改触发价，仅在不支持修改时回退为取消+新建。
+
+        - 修改成功：沿用原 algoId，无无保护窗口
+        - 修改失败（failed）：原止损单保持有效，跳过本次更新
+        - 原止损单已不存在（already_gone）：直接新建
+        - 不支持修改（unsupported）：取消旧单后新建
+        """
+        amend_reason = "unsupported"
+        if _supports_stop_amend(self._exchange):
+            try:
+                amended, amend_reason = await self._exchange.amend_algo_order(
+                    existing_stop_id,
+                    self._exchange.symbol,
+                    new_stop_price=new_stop_price,
+                )
+            except Exception as e:
+                logger.warning(f"{log_tag} 修改止损单异常: {e}")
+                amended, amend_reason = False, "failed"
+
+            if amended:
+                self.position_manager.set_stop_order(existing_stop_id, new_stop_price)
+                self._refresh_close_audit_stop(existing_stop_id, new_stop_price)
+                logger.info(f"{log_tag} 原地修改成功: {existing_stop_id}")
+                return
+            if amend_reason == "failed":
                 logger.warning(
-                    f"[止损] 取消旧止损单失败: {existing_stop_id}, "
-                    f"原因={cancel_reason}，跳过创建新止损单"
+                    f"{log_tag} 修改止损单失败: {existing_stop_id}，"
+                    "保留原止损单，下个周期重试"
                 )
                 return
-        except Exception as e:
-            logger.warning(f"[止损] 取消旧止损单失败: {e}")
-            return
+
+        if amend_reason == "unsupported":
+            try:
+                cancel_success, cancel_reason = await self._exchange.cancel_algo_order(
+                    existing_stop_id, self._exchange.symbol
+                )
+                if not cancel_success and cancel_reason != "already_gone":
+                    logger.warning(
+                        f"{log_tag} 取消旧止损单失败: {existing_stop_id}, "
+                        f"原因={cancel_reason}，跳过创建新止损单"
+                    )
+                    return
+            except Exception as e:
+                logger.warning(f"{log_tag} 取消旧止损单失败: {e}")
+                return
 
         stop_order_id = await self._create_stop_loss_with_retry(
             amount=amount,
@@ -1736,7 +1939,7 @@ class AdaptiveTradingBot:
         if stop_order_id:
             self.position_manager.set_stop_order(stop_order_id, new_stop_price)
             self._refresh_close_audit_stop(stop_order_id, new_stop_price)
-            logger.info(f"[止损] 更新成功: {stop_order_id}")
+            logger.info(f"{log_tag} 更新成功: {stop_order_id}")
         else:
             await AdaptiveTradingBot._recover_stop_state_after_failed_update(self)
 
@@ -1745,7 +1948,7 @@ class AdaptiveTradingBot:
         (
             recovered_stop_id,
             recovered_stop_price,
-        ) = await self._get_existing_stop_order_id()
+        ) = await self._get_existing_stop_order_id(force_refresh=True)
         if recovered_stop_id and recovered_stop_price:
             self.position_manager.set_stop_order(
                 recovered_stop_id, recovered_stop_price
@@ -1759,11 +1962,29 @@ class AdaptiveTradingBot:
             logger.error("[止损] 新止损创建失败，且未查询到有效止损保护")
 
     async def _get_existing_stop_order_id(
-        self,
+        self, force_refresh: bool = False
     ) -> Tuple[Optional[str], Optional[float]]:
-        """查询交易所中现有的止损单ID和止损价格"""
+        """查询交易所中现有的止损单ID和止损价格
+
+        优先读取算法单缓存；本地记录的止损单不在缓存中时视为不一致，强制 REST 对账。
+        """
         try:
-            algo_orders = await self._exchange.get_algo_orders(self._exchange.symbol)
+            symbol = self._exchange.symbol
+            get_cached = getattr(self._exchange, "get_cached_algo_orders", None)
+            if asyncio.iscoroutinefunction(get_cached):
+                algo_orders = await get_cached(symbol, force_refresh=force_refresh)
+                local_stop_id = self.position_manager.stop_order_id
+                if (
+                    not force_refresh
+                    and local_stop_id
+                    and all(order.get("id") != local_stop_id for order in algo_orders)
+                ):
+                    logger.info(
+                        f"[止损查询] 缓存缺少本地止损单 {local_stop_id}，强制对账"
+                    )
+                    algo_orders = await get_cached(symbol, force_refresh=True)
+            else:
+                algo_orders = await self._exchange.get_algo_orders(symbol)
             for order in algo_orders:
                 info = order.get("info", {})
                 algo_id = info.get("algoId")
@@ -1789,4 +2010,15 @@ class AdaptiveTradingBot:
             "strategies": self.strategy_library.get_strategy_summary(),
             "performance": self.performance_tracker.get_performance_metrics().__dict__,
             "config_version": self.config_updater.get_summary()["version"],
+            "event_loop": (
+                self._loop_watchdog.snapshot()
+                if self._loop_watchdog is not None
+                else None
+            ),
+            "algo_order_cache": (
+                self._exchange.algo_order_cache.snapshot(self._exchange.symbol)
+                if self._exchange is not None
+                and hasattr(self._exchange, "algo_order_cache")
+                else None
+            ),
         }
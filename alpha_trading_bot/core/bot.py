@@ -50,6 +50,7 @@ class TradingBot:
             logger.info("初始化交易机器人...")
 
             from ..exchange.client import ExchangeClient
+            from .state_persistence import resolve_state_data_dir
 
             self._exchange = ExchangeClient(
                 api_key=self.config.exchange.api_key,
@@ -65,6 +66,13 @@ class TradingBot:
                 order_confirm_poll_interval_seconds=(
                     self.config.trading.order_confirm_poll_interval_seconds
                 ),
+                algo_cache_reconcile_seconds=(
+                    self.config.trading.algo_cache_reconcile_seconds
+                ),
+                instrument_cache_dir=str(resolve_state_data_dir()),
+                instrument_cache_ttl_seconds=(
+                    self.config.trading.instrument_cache_ttl_seconds
+                ),
             )
             await self._exchange.initialize()
             await self._exchange.set_leverage(self.config.exchange.leverage)
@@ -509,6 +517,8 @@ class TradingBot:
     async def cleanup(self) -> None:
         """清理资源"""
         logger.info("清理资源...")
+        if hasattr(self, "position_manager"):
+            self.position_manager.close()
         if hasattr(self, "_exchange"):
             await self._exchange.cleanup()
 
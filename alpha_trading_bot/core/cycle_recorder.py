@@ -0,0 +1,466 @@
+"""
+交易周期输入录制
+
+设置 CYCLE_RECORD_PATH 后，CycleRecorder 把每个周期的全部外部输入写入只追加的二进制日志：
+- exchange: 交易所调用序列（方法名、参数、返回值或异常），按调用顺序记录
+- ai: 各提供商的原始响应
+- signal / decision: AI 处理后的信号与本周期最终决策
+- timings: 各阶段耗时（毫秒）
+
+每次启动写入一条 header：脱敏后的配置快照与状态目录中的 JSON 状态文件。
+core.cycle_replay 读取日志，在无网络的情况下重放 _adaptive_trading_cycle 并报告分歧。
+
+日志格式：文件头 MAGIC，之后每帧为 4 字节大端长度 + 1 字节编码 + 负载，
+负载为 zlib 压缩的 JSON。进程崩溃留下的残缺尾帧读取时忽略，追加写入前截断。
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import struct
+import zlib
+from dataclasses import asdict, fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Type, Union, cast
+
+from ..config.models import (
+    AIConfig,
+    Config,
+    ExchangeConfig,
+    StopLossConfig,
+    SystemConfig,
+    TradingConfig,
+)
+from ..exchange.models.candles import CandleSeries
+from ..exchange.models.orders import OrderResult, OrderStatus
+from ..utils import clock
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ATBCYC\x00\x01"
+FORMAT_VERSION = 1
+
+_FRAME_HEADER = struct.Struct(">IB")
+CODEC_JSON = 0
+CODEC_ZLIB = 1
+
+# 录制的交易所协程方法（与 ExchangeClient 公开接口一致）
+RECORDED_CALLS = frozenset(
+    {
+        "initialize",
+        "set_leverage",
+        "get_balance",
+        "get_position",
+        "get_position_with_retry",
+        "get_ohlcv",
+        "get_candles",
+        "get_market_data",
+        "calculate_max_contracts",
+        "create_order",
+        "create_order_with_status",
+        "create_confirmed_market_order",
+        "find_attached_algo_order",
+        "get_order_status",
+        "create_stop_loss",
+        "create_take_profit",
+        "cancel_order",
+        "cancel_algo_order",
+        "create_orders_batch",
+        "cancel_orders_batch",
+        "cancel_algo_orders",
+        "amend_algo_order",
+        "get_open_orders",
+        "get_algo_orders",
+        "get_cached_algo_orders",
+        "get_algo_order_history",
+        "cleanup",
+    }
+)
+
+# 改变交易所状态的调用，回放时逐一比较参数
+WRITE_CALLS = frozenset(
+    {
+        "set_leverage",
+        "create_order",
+        "create_order_with_status",
+        "create_confirmed_market_order",
+        "create_stop_loss",
+        "create_take_profit",
+        "cancel_order",
+        "cancel_algo_order",
+        "create_orders_batch",
+        "cancel_orders_batch",
+        "cancel_algo_orders",
+        "amend_algo_order",
+    }
+)
+
+# 每次运行随机生成的参数，比较时忽略
+VOLATILE_ARGS = frozenset({"attach_algo_cl_ord_id"})
+
+REDACTED = "<redacted>"
+
+
+# ============================================================================
+# 值编码
+# ============================================================================
+
+
+def encode_value(value: Any) -> Any:
+    """转换为可 JSON 序列化的值；CandleSeries、OrderResult、tuple 带类型标记以便还原"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode_value(item) for item in value]}
+    if isinstance(value, CandleSeries):
+        return {"__candles__": value.to_rows()}
+    if isinstance(value, OrderResult):
+        data = {f.name: getattr(value, f.name) for f in fields(value)}
+        data["status"] = value.status.value
+        return {"__order_result__": encode_value(data)}
+    if isinstance(value, Enum):
+        return encode_value(value.value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return encode_value(asdict(value))
+    if isinstance(value, memoryview):
+        return value.tolist()
+    # numpy 标量/数组
+    for name in ("item", "tolist"):
+        convert = getattr(value, name, None)
+        if callable(convert):
+            return encode_value(convert())
+    return repr(value)
+
+
+def decode_value(value: Any) -> Any:
+    """encode_value 的逆变换"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        if "__tuple__" in value:
+            return tuple(decode_value(item) for item in value["__tuple__"])
+        if "__candles__" in value:
+            return CandleSeries.from_rows(value["__candles__"])
+        if "__order_result__" in value:
+            data = dict(value["__order_result__"])
+            data["status"] = OrderStatus(data["status"])
+            return OrderResult(**data)
+    return {key: decode_value(item) for key, item in value.items()}
+
+
+# ============================================================================
+# 帧读写
+# ============================================================================
+
+
+def _valid_end(path: Path) -> int:
+    """返回最后一个完整帧的结束位置"""
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是周期录制文件: {path}")
+        end = len(MAGIC)
+        while end + _FRAME_HEADER.size <= size:
+            f.seek(end)
+            length, _ = _FRAME_HEADER.unpack(f.read(_FRAME_HEADER.size))
+            frame_end = end + _FRAME_HEADER.size + length
+            if frame_end > size:
+                break
+            end = frame_end
+    return end
+
+
+class CycleLogWriter:
+    """只追加的帧写入器"""
+
+    def __init__(self, path: Union[str, Path], compress_level: int = 6) -> None:
+        self.path = Path(path)
+        self.compress_level = compress_level
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO
+        if self.path.exists() and self.path.stat().st_size > 0:
+            end = _valid_end(self.path)
+            self._file = open(self.path, "r+b")
+            if end < self.path.stat().st_size:
+                logger.warning(f"[周期录制] 截断残缺尾帧: {self.path} @ {end}")
+                self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(MAGIC)
+            self._file.flush()
+
+    def write(self, record: Dict[str, Any]) -> int:
+        """写入一帧并刷新，返回写入字节数"""
+        payload = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        data = zlib.compress(payload.encode("utf-8"), self.compress_level)
+        frame = _FRAME_HEADER.pack(len(data), CODEC_ZLIB) + data
+        self._file.write(frame)
+        self._file.flush()
+        return len(frame)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_cycle_log(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """按写入顺序读取记录（值保持编码形式，需要时用 decode_value 还原）"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是周期录制文件: {path}")
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < _FRAME_HEADER.size:
+                logger.warning(f"[周期录制] 忽略残缺尾帧: {path}")
+                return
+            length, codec = _FRAME_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                logger.warning(f"[周期录制] 忽略残缺尾帧: {path}")
+                return
+            if codec == CODEC_ZLIB:
+                payload = zlib.decompress(payload)
+            elif codec != CODEC_JSON:
+                raise ValueError(f"未知帧编码: {codec}")
+            yield json.loads(payload)
+
+
+# ============================================================================
+# 配置与状态快照
+# ============================================================================
+
+
+def config_snapshot(config: Config) -> Dict[str, Any]:
+    """配置快照，凭证替换为占位符（保留是否已配置，回放时实盘闸门结果不变）"""
+    data = asdict(config)
+    for name in ("api_key", "secret", "password"):
+        if data["exchange"][name]:
+            data["exchange"][name] = REDACTED
+    data["ai"]["api_keys"] = {provider: REDACTED for provider in data["ai"]["api_keys"]}
+    return data
+
+
+# Config 各配置段对应的 dataclass
+_CONFIG_SECTIONS: Dict[str, Type[Any]] = {
+    "exchange": ExchangeConfig,
+    "trading": TradingConfig,
+    "ai": AIConfig,
+    "stop_loss": StopLossConfig,
+    "system": SystemConfig,
+}
+
+
+def config_from_snapshot(data: Dict[str, Any]) -> Config:
+    """由快照重建 Config，忽略当前版本不认识的字段"""
+    sections = {}
+    for name, section_cls in _CONFIG_SECTIONS.items():
+        known = {f.name for f in fields(section_cls)}
+        values = data.get(name, {})
+        sections[name] = section_cls(
+            **{key: value for key, value in values.items() if key in known}
+        )
+    return Config(**sections)
+
+
+def _read_state_files(state_dir: Optional[Path]) -> Dict[str, str]:
+    from .state_persistence import resolve_state_data_dir
+
+    directory = resolve_state_data_dir(state_dir)
+    if not directory.is_dir():
+        return {}
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(directory.glob("*.json"))
+    }
+
+
+# ============================================================================
+# 录制
+# ============================================================================
+
+
+class RecordingExchange:
+    """交易所透明代理：录制 RECORDED_CALLS 与 last_query_failed，其余属性直接转发"""
+
+    def __init__(self, exchange: Any, recorder: "CycleRecorder") -> None:
+        self._exchange = exchange
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._exchange, name)
+        if name == "last_query_failed":
+            self._recorder.record_call(name, (), {}, result=attr)
+            return attr
+        if name in RECORDED_CALLS and asyncio.iscoroutinefunction(attr):
+            return self._wrap(name, attr)
+        return attr
+
+    def _wrap(self, name: str, method: Any) -> Any:
+        recorder = self._recorder
+
+        @functools.wraps(method)
+        async def recorded(*args: Any, **kwargs: Any) -> Any:
+            try:
+                result = await method(*args, **kwargs)
+            except Exception as e:
+                recorder.record_call(name, args, kwargs, error=e)
+                raise
+            recorder.record_call(name, args, kwargs, result=result)
+            return result
+
+        return recorded
+
+
+class CycleRecorder:
+    """
+    周期输入录制器
+
+    writer 为 None 时只在内存中保留最近一个周期（回放时用于采集重放结果）。
+    """
+
+    def __init__(self, writer: Optional[CycleLogWriter] = None) -> None:
+        self.writer = writer
+        self.last_cycle: Optional[Dict[str, Any]] = None
+        self.bytes_written = 0
+        self._cycle: Optional[Dict[str, Any]] = None
+        self._seq = 0
+
+    @classmethod
+    def open(
+        cls,
+        path: Union[str, Path],
+        config: Config,
+        state_dir: Optional[Path] = None,
+    ) -> "CycleRecorder":
+        """打开（或续写）录制文件并写入本次会话的 header"""
+        recorder = cls(CycleLogWriter(path))
+        recorder._write(
+            {
+                "type": "header",
+                "version": FORMAT_VERSION,
+                "time": clock.time(),
+                "config": config_snapshot(config),
+                "state_files": _read_state_files(state_dir),
+            }
+        )
+        logger.info(f"[周期录制] 已开启: {path}")
+        return recorder
+
+    def wrap_exchange(self, exchange: Any) -> RecordingExchange:
+        return RecordingExchange(exchange, self)
+
+    def wrap_ai_client(self, ai_client: Any) -> None:
+        """在实例上替换提供商调用与 get_signal，录制原始响应与处理后的信号"""
+        call_provider = ai_client._call_ai_with_retry
+        get_signal = ai_client.get_signal
+
+        async def recorded_call(
+            provider: str, market_data: Dict[str, Any], api_key: str
+        ) -> str:
+            try:
+                response = await call_provider(provider, market_data, api_key)
+            except Exception as e:
+                self.record_ai(provider, error=e)
+                raise
+            self.record_ai(provider, response=response)
+            return cast(str, response)
+
+        async def recorded_signal(market_data: Dict[str, Any]) -> str:
+            signal = await get_signal(market_data)
+            if self._cycle is not None:
+                self._cycle["signal"] = signal
+            return cast(str, signal)
+
+        ai_client._call_ai_with_retry = recorded_call
+        ai_client.get_signal = recorded_signal
+
+    # === 周期钩子（由 AdaptiveTradingBot 调用）===
+
+    def begin_cycle(self, first_run: bool = False) -> None:
+        self._cycle = {
+            "type": "cycle",
+            "seq": self._seq,
+            "time": clock.time(),
+            "first_run": first_run,
+            "exchange": [],
+            "ai": [],
+            "signal": None,
+            "decision": None,
+        }
+
+    def record_call(
+        self,
+        name: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if self._cycle is None:
+            return
+        event: Dict[str, Any] = {
+            "call": name,
+            "t": clock.time(),
+            "args": encode_value(list(args)),
+            "kwargs": encode_value(kwargs),
+        }
+        if error is not None:
+            event["error"] = str(error)
+            event["error_type"] = type(error).__name__
+        else:
+            event["result"] = encode_value(result)
+        self._cycle["exchange"].append(event)
+
+    def record_ai(
+        self,
+        provider: str,
+        response: Optional[str] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if self._cycle is None:
+            return
+        event: Dict[str, Any] = {"provider": provider, "t": clock.time()}
+        if error is not None:
+            event["error"] = str(error)
+        else:
+            event["response"] = response
+        self._cycle["ai"].append(event)
+
+    def record_decision(self, decision: Dict[str, Any]) -> None:
+        if self._cycle is not None:
+            self._cycle["decision"] = encode_value(decision)
+
+    def end_cycle(self, timings: Dict[str, float]) -> None:
+        cycle = self._cycle
+        if cycle is None:
+            return
+        self._cycle = None
+        self._seq += 1
+        cycle["timings"] = dict(timings)
+        self.last_cycle = cycle
+        if self.writer is None:
+            return
+        try:
+            self._write(cycle)
+        except Exception as e:
+            # 录制失败不能影响交易
+            logger.warning(f"[周期录制] 写入失败: {e}")
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self.writer is not None:
+            self.bytes_written += self.writer.write(record)
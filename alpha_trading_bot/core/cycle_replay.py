@@ -0,0 +1,358 @@
+"""
+周期录制回放
+
+读取 CycleRecorder 写出的日志，用录制的交易所返回值与 AI 原始响应驱动真实的
+_adaptive_trading_cycle（不发任何网络请求），逐周期比较 AI 信号、最终决策与
+交易所调用序列（写操作还比较参数），并统计各阶段耗时。
+
+用法:
+    report = CycleReplayer("data/cycles.rec").run_sync()
+    print(report.format())
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union, cast
+
+from ..utils.clock import VirtualClock, get_clock, use_clock
+from .cycle_recorder import (
+    RECORDED_CALLS,
+    VOLATILE_ARGS,
+    WRITE_CALLS,
+    CycleRecorder,
+    config_from_snapshot,
+    decode_value,
+    read_cycle_log,
+)
+from .replay import _isolated_state_dir, _package_log_level
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMismatchError(RuntimeError):
+    """回放中出现录制里没有的交易所调用"""
+
+
+@dataclass
+class Divergence:
+    """一处回放分歧"""
+
+    session: int
+    cycle: int
+    kind: str  # signal / decision / args / missing / unexpected
+    call: str
+    expected: Any = None
+    actual: Any = None
+
+    def describe(self) -> str:
+        return (
+            f"会话{self.session} 周期{self.cycle} [{self.kind}] {self.call}: "
+            f"录制={self.expected!r} 回放={self.actual!r}"
+        )
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summarize(phases: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        name: {
+            "mean": sum(values) / len(values),
+            "p50": _percentile(values, 0.5),
+            "p95": _percentile(values, 0.95),
+            "max": max(values),
+            "total": sum(values),
+        }
+        for name, values in phases.items()
+        if values
+    }
+
+
+@dataclass
+class CycleReplayReport:
+    """回放报告"""
+
+    sessions: int = 0
+    cycles: int = 0
+    divergences: List[Divergence] = field(default_factory=list)
+    phase_ms: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    recorded_phase_ms: Dict[str, List[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    elapsed_seconds: float = 0.0
+
+    @property
+    def diverged(self) -> bool:
+        return bool(self.divergences)
+
+    @property
+    def diverged_cycles(self) -> int:
+        return len({(d.session, d.cycle) for d in self.divergences})
+
+    def phase_summary(self, recorded: bool = False) -> Dict[str, Dict[str, float]]:
+        """各阶段耗时统计（毫秒）；recorded=True 时为录制时的实盘耗时"""
+        return _summarize(self.recorded_phase_ms if recorded else self.phase_ms)
+
+    def format(self, max_divergences: int = 20) -> str:
+        per_cycle = self.elapsed_seconds * 1000 / max(self.cycles, 1)
+        lines = [
+            f"周期回放: {self.sessions} 个会话, {self.cycles} 个周期, "
+            f"分歧 {len(self.divergences)} 处（{self.diverged_cycles} 个周期）, "
+            f"耗时 {self.elapsed_seconds:.2f}s（{per_cycle:.1f}ms/周期）",
+            f"{'阶段':<16}{'回放均值':>10}{'回放P95':>10}{'录制均值':>10}",
+        ]
+        replayed = self.phase_summary()
+        recorded = self.phase_summary(recorded=True)
+        for name, stats in replayed.items():
+            live = recorded.get(name, {}).get("mean")
+            lines.append(
+                f"{name:<16}{stats['mean']:>10.2f}{stats['p95']:>10.2f}"
+                f"{'-' if live is None else f'{live:.2f}':>10}"
+            )
+        for divergence in self.divergences[:max_divergences]:
+            lines.append(divergence.describe())
+        if len(self.divergences) > max_divergences:
+            lines.append(f"... 另有 {len(self.divergences) - max_divergences} 处分歧")
+        return "\n".join(lines)
+
+
+def _advance_clock(timestamp: Optional[float]) -> None:
+    current = get_clock()
+    if (
+        isinstance(current, VirtualClock)
+        and timestamp is not None
+        and timestamp > current.time()
+    ):
+        current.set(timestamp)
+
+
+def _comparable(event: Dict[str, Any]) -> Tuple[Any, Any]:
+    kwargs = {
+        key: value
+        for key, value in (event.get("kwargs") or {}).items()
+        if key not in VOLATILE_ARGS
+    }
+    return event.get("args"), kwargs
+
+
+def compare_cycles(
+    expected: Dict[str, Any], actual: Dict[str, Any]
+) -> List[Tuple[str, str, Any, Any]]:
+    """比较录制周期与回放周期，返回 (kind, call, expected, actual) 列表"""
+    found: List[Tuple[str, str, Any, Any]] = []
+    if expected.get("signal") != actual.get("signal"):
+        found.append(("signal", "get_signal", expected["signal"], actual["signal"]))
+    expected_decision = expected.get("decision") or {}
+    actual_decision = actual.get("decision") or {}
+    if expected_decision.get("action") != actual_decision.get("action"):
+        found.append(("decision", "final_signal", expected_decision, actual_decision))
+
+    expected_calls = expected.get("exchange", [])
+    actual_calls = actual.get("exchange", [])
+    matcher = SequenceMatcher(
+        a=[event["call"] for event in expected_calls],
+        b=[event["call"] for event in actual_calls],
+        autojunk=False,
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for exp, act in zip(expected_calls[i1:i2], actual_calls[j1:j2]):
+                if exp["call"] in WRITE_CALLS and _comparable(exp) != _comparable(act):
+                    found.append(
+                        ("args", exp["call"], _comparable(exp), _comparable(act))
+                    )
+            continue
+        for exp in expected_calls[i1:i2]:
+            found.append(("missing", exp["call"], _comparable(exp), None))
+        for act in actual_calls[j1:j2]:
+            found.append(("unexpected", act["call"], None, _comparable(act)))
+    return found
+
+
+class RecordedExchange:
+    """按录制顺序返回交易所调用结果的离线交易所"""
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self._events: List[Dict[str, Any]] = []
+        self._cursor = 0
+
+    def load_cycle(self, events: List[Dict[str, Any]]) -> None:
+        self._events = events
+        self._cursor = 0
+
+    @property
+    def last_query_failed(self) -> bool:
+        event = self._take("last_query_failed")
+        return bool(event and event.get("result"))
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in RECORDED_CALLS:
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            event = self._take(name)
+            if event is None:
+                raise ReplayMismatchError(f"录制中没有对应的交易所调用: {name}")
+            if "error" in event:
+                raise RuntimeError(event["error"])
+            return decode_value(event.get("result"))
+
+        call.__name__ = name
+        return call
+
+    def _take(self, name: str) -> Optional[Dict[str, Any]]:
+        """取下一个同名录制调用；跳过的调用由 compare_cycles 报告为 missing"""
+        for index in range(self._cursor, len(self._events)):
+            event = self._events[index]
+            if event["call"] == name:
+                self._cursor = index + 1
+                _advance_clock(event.get("t"))
+                return event
+        return None
+
+
+class RecordedAIResponses:
+    """按提供商返回录制的原始 AI 响应（ReplayAIClient 的 responder）"""
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, str] = {}
+
+    def load_cycle(self, events: List[Dict[str, Any]]) -> None:
+        pending: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for event in events:
+            pending[event["provider"]].append(event)
+        self._pending = pending
+
+    def __call__(self, provider: str, market_data: Dict[str, Any]) -> str:
+        queue = self._pending.get(provider)
+        if queue:
+            event = queue.popleft()
+            _advance_clock(event.get("t"))
+            if "error" in event:
+                raise RuntimeError(event["error"])
+            response = cast(str, event["response"])
+            self._last[provider] = response
+            return response
+        # 录制时命中信号缓存（未调用提供商），沿用该提供商上一次的响应
+        if provider in self._last:
+            return self._last[provider]
+        from ..ai.replay_client import format_response
+
+        return format_response("hold", 0.5)
+
+
+class _ImmediateScheduler:
+    async def wait_for_next_cycle(self, first_run: bool = False) -> None:
+        return None
+
+
+class _ReplaySession:
+    """一次录制会话（header 之后的周期）对应的机器人实例"""
+
+    def __init__(self, index: int, header: Dict[str, Any], state_dir: Path) -> None:
+        from ..ai.replay_client import ReplayAIClient
+        from .adaptive_bot import AdaptiveTradingBot
+        from .adaptive_stop_loss import AdaptiveStopLossManager
+        from .position_recovery import PositionRecoveryManager
+
+        state_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in (header.get("state_files") or {}).items():
+            (state_dir / name).write_text(content, encoding="utf-8")
+        os.environ["TRADING_STATE_DIR"] = str(state_dir)
+
+        config = config_from_snapshot(header["config"])
+        self.index = index
+        self.exchange = RecordedExchange(config.exchange.symbol)
+        self.responses = RecordedAIResponses()
+        # 回放侧同样经过录制代理，得到可与录制直接比较的周期记录
+        self.observer = CycleRecorder()
+
+        bot = AdaptiveTradingBot(config)
+        bot._exchange = self.observer.wrap_exchange(self.exchange)
+        bot._ai_client = ReplayAIClient(self.responses, config=config.ai)
+        self.observer.wrap_ai_client(bot._ai_client)
+        bot._position_recovery = PositionRecoveryManager(
+            bot._exchange, bot.position_manager
+        )
+        bot._adaptive_stop_loss = AdaptiveStopLossManager(bot._exchange)
+        # 鸭子类型替换 TradingScheduler
+        bot.scheduler = cast(Any, _ImmediateScheduler())
+        bot._cycle_recorder = self.observer
+        bot._initialized = True
+        self.bot = bot
+
+    async def replay(self, record: Dict[str, Any], report: CycleReplayReport) -> None:
+        _advance_clock(record.get("time"))
+        self.exchange.load_cycle(record.get("exchange", []))
+        self.responses.load_cycle(record.get("ai", []))
+
+        await self.bot._adaptive_trading_cycle(first_run=record.get("first_run", False))
+
+        actual = self.observer.last_cycle or {}
+        for kind, call, expected, got in compare_cycles(record, actual):
+            report.divergences.append(
+                Divergence(self.index, record.get("seq", -1), kind, call, expected, got)
+            )
+        for name, ms in (actual.get("timings") or {}).items():
+            report.phase_ms[name].append(ms)
+        for name, ms in (record.get("timings") or {}).items():
+            report.recorded_phase_ms[name].append(ms)
+
+
+class CycleReplayer:
+    """周期录制回放驱动"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        log_level: Optional[int] = logging.WARNING,
+        state_dir: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.log_level = log_level
+        self.state_dir = state_dir
+
+    async def run(self, max_cycles: Optional[int] = None) -> CycleReplayReport:
+        report = CycleReplayReport()
+        started = time.perf_counter()
+        with (
+            _isolated_state_dir(self.state_dir) as root,
+            use_clock(VirtualClock()),
+            _package_log_level(self.log_level),
+        ):
+            session: Optional[_ReplaySession] = None
+            for record in read_cycle_log(self.path):
+                if record.get("type") == "header":
+                    _advance_clock(record.get("time"))
+                    session = _ReplaySession(
+                        report.sessions,
+                        record,
+                        Path(root) / f"session-{report.sessions}",
+                    )
+                    report.sessions += 1
+                    continue
+                if record.get("type") != "cycle" or session is None:
+                    continue
+                if max_cycles is not None and report.cycles >= max_cycles:
+                    break
+                await session.replay(record, report)
+                report.cycles += 1
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            f"[周期回放] {report.cycles} 个周期，分歧 {len(report.divergences)} 处，"
+            f"耗时 {report.elapsed_seconds:.2f}s"
+        )
+        return report
+
+    def run_sync(self, max_cycles: Optional[int] = None) -> CycleReplayReport:
+        return asyncio.run(self.run(max_cycles))
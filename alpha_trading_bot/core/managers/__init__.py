@@ -9,11 +9,7 @@ Core Managers - 职责分离后的专门管理器
 - LearningManager: 学习模块管理
 """
 
-from .market_regime_manager import MarketRegimeManager
-from .strategy_manager import StrategyExecutionManager
-from .risk_manager import RiskControlManager
-from .parameter_manager import ParameterManager
-from .learning_manager import LearningManager
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "MarketRegimeManager",
@@ -22,3 +18,14 @@ __all__ = [
     "ParameterManager",
     "LearningManager",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".market_regime_manager": ("MarketRegimeManager",),
+        ".strategy_manager": ("StrategyExecutionManager",),
+        ".risk_manager": ("RiskControlManager",),
+        ".parameter_manager": ("ParameterManager",),
+        ".learning_manager": ("LearningManager",),
+    },
+)
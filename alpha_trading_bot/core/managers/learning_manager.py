@@ -9,6 +9,7 @@
 """
 
 import logging
+import os
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -19,9 +20,12 @@ class LearningManager:
 
     整合 MLDataManager, AdaptiveWeightOptimizer, BacktestLearner,
     提供统一的学习和优化接口。
+
+    数据库路径依次取 db_path 参数、环境变量 TRADING_ML_DB_PATH、
+    默认的 data_json/trading_data.db。
     """
 
-    def __init__(self) -> None:
+    def __init__(self, db_path: Optional[str] = None) -> None:
         from alpha_trading_bot.ai.ml.ml_data_manager import get_ml_data_manager
         from alpha_trading_bot.ai.ml.adaptive_weight_optimizer import (
             get_weight_optimizer,
@@ -29,10 +33,16 @@ class LearningManager:
         from alpha_trading_bot.ai.ml.signal_backtest import get_backtest_learner
         from alpha_trading_bot.ai.ml.learning_integrator import SimpleLearningLoop
 
-        self._ml_data_manager = get_ml_data_manager()
-        self._weight_optimizer = get_weight_optimizer()
-        self._backtest_learner = get_backtest_learner()
-        self._learning_loop = SimpleLearningLoop()
+        db_path = (
+            db_path
+            or os.getenv("TRADING_ML_DB_PATH", "").strip()
+            or "data_json/trading_data.db"
+        )
+        self.db_path = db_path
+        self._ml_data_manager = get_ml_data_manager(db_path)
+        self._weight_optimizer = get_weight_optimizer(db_path)
+        self._backtest_learner = get_backtest_learner(db_path)
+        self._learning_loop = SimpleLearningLoop(db_path)
         logger.info("[LearningManager] 初始化完成")
 
     def record_trade(self, trade_data: Dict[str, Any]) -> None:
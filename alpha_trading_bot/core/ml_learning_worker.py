@@ -0,0 +1,294 @@
+"""ML学习子进程执行模块
+
+将回测学习、交易学习、权重优化等 pandas/SQLite 密集型计算放到独立进程执行，
+避免阻塞事件循环（止损更新、交易周期）。
+
+任务与结果均为可序列化的数据类，进程间仅通过队列传递字典：
+- ("progress", job_id, stage, fraction)
+- ("result", job_id, result_dict)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.observability import record_result_cache
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, str, float], None]
+
+
+@dataclass(frozen=True)
+class LearningJob:
+    """ML学习任务（可序列化）"""
+
+    db_path: str
+    days: int = 60
+    holding_hours: int = 4
+    min_confidence: float = 0.5
+    learn_from_trades: bool = False
+    # 结果缓存目录（默认与数据库同目录的 result_cache），为空字符串时不使用缓存
+    cache_dir: Optional[str] = None
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+
+    def resolved_cache_dir(self) -> str:
+        if self.cache_dir is not None:
+            return self.cache_dir
+        return os.path.join(os.path.dirname(self.db_path) or ".", "result_cache")
+
+
+@dataclass
+class LearningJobResult:
+    """ML学习任务结果（可序列化）"""
+
+    job_id: str
+    success: bool
+    total_signals: int = 0
+    win_rate: float = 0.0
+    average_return: float = 0.0
+    provider_stats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    backtest_weights: Dict[str, float] = field(default_factory=dict)
+    trade_weights: Dict[str, float] = field(default_factory=dict)
+    optimized_weights: Dict[str, float] = field(default_factory=dict)
+    confidence: float = 0.0
+    duration_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+    error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LearningJobResult":
+        return cls(**data)
+
+
+def run_learning_job(
+    job: LearningJob, report: Optional[Callable[[str, float], None]] = None
+) -> LearningJobResult:
+    """执行学习流水线（在子进程中调用，也可直接同步调用）"""
+    from alpha_trading_bot.ai.ml.adaptive_weight_optimizer import (
+        get_weight_optimizer,
+    )
+    from alpha_trading_bot.ai.ml.learning_integrator import SimpleLearningLoop
+    from alpha_trading_bot.ai.ml.signal_backtest import get_backtest_learner
+    from alpha_trading_bot.utils.result_cache import get_result_cache
+
+    def _report(stage: str, fraction: float) -> None:
+        if report is not None:
+            report(stage, fraction)
+
+    started = time.monotonic()
+    result = LearningJobResult(job_id=job.job_id, success=False)
+
+    cache_dir = job.resolved_cache_dir()
+    cache = get_result_cache(cache_dir) if cache_dir else None
+    before = cache.stats_snapshot() if cache is not None else {}
+
+    try:
+        _report("backtest", 0.0)
+        learner = get_backtest_learner(job.db_path, result_cache=cache)
+        backtest = learner.backtest_signals(
+            days=job.days,
+            holding_hours=job.holding_hours,
+            min_confidence=job.min_confidence,
+        )
+        result.total_signals = backtest.total_signals
+        result.win_rate = backtest.win_rate
+        result.average_return = backtest.average_return
+        result.provider_stats = backtest.provider_stats
+
+        if backtest.total_signals > 0:
+            _report("learn_backtest", 0.4)
+            result.backtest_weights = learner.weights_from_backtest(backtest)
+
+            simple_learning = SimpleLearningLoop(job.db_path)
+            if job.learn_from_trades:
+                _report("learn_trades", 0.55)
+                result.trade_weights = simple_learning.learn_from_trades()
+
+            simple_learning.data_manager.save_model_weights(
+                result.backtest_weights, source="backtest_learn"
+            )
+
+        _report("optimize", 0.75)
+        weights, confidence = get_weight_optimizer(
+            job.db_path, result_cache=cache
+        ).get_optimized_weights()
+        result.optimized_weights = dict(weights or {})
+        result.confidence = float(confidence)
+        result.success = True
+        _report("done", 1.0)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    if cache is not None:
+        _count_cache_usage(result, before, cache.stats_snapshot())
+    result.duration_seconds = time.monotonic() - started
+    return result
+
+
+def _count_cache_usage(
+    result: LearningJobResult,
+    before: Dict[str, Dict[str, Any]],
+    after: Dict[str, Dict[str, Any]],
+) -> None:
+    """本次任务的缓存命中/未命中/淘汰次数（共享缓存实例的统计差值）"""
+    for namespace, stats in after.items():
+        previous = before.get(namespace, {})
+        result.cache_hits += stats["hits"] - previous.get("hits", 0)
+        result.cache_misses += stats["misses"] - previous.get("misses", 0)
+        result.cache_evictions += stats["evictions"] - previous.get("evictions", 0)
+
+
+def _worker_main(
+    job: LearningJob,
+    channel: Any,
+    target: Callable[..., LearningJobResult],
+) -> None:
+    """子进程入口"""
+
+    def _report(stage: str, fraction: float) -> None:
+        channel.put(("progress", job.job_id, stage, fraction))
+
+    try:
+        result = target(job, _report)
+    except BaseException as e:  # 子进程内兜底，保证主进程总能收到结果
+        result = LearningJobResult(
+            job_id=job.job_id, success=False, error=f"{type(e).__name__}: {e}"
+        )
+    channel.put(("result", job.job_id, result.to_dict()))
+
+
+class LearningWorker:
+    """ML学习子进程管理器
+
+    每个任务启动一个独立子进程（spawn），支持：
+    - 超时：超时后终止子进程
+    - 取消：cancel() 或外部取消 await 时终止子进程
+    - 进度：子进程阶段进度回调到事件循环
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 900.0,
+        poll_interval: float = 0.2,
+        on_progress: Optional[ProgressCallback] = None,
+        target: Callable[..., LearningJobResult] = run_learning_job,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.poll_interval = poll_interval
+        self._on_progress = on_progress
+        self._target = target
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process: Optional[Any] = None
+        self.last_progress: Dict[str, Any] = {}
+
+    @property
+    def busy(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    async def submit(self, job: LearningJob) -> LearningJobResult:
+        """提交任务并等待结果（不阻塞事件循环）"""
+        if self.busy:
+            return LearningJobResult(
+                job_id=job.job_id, success=False, error="worker_busy"
+            )
+
+        channel = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(job, channel, self._target),
+            name=f"ml-learning-{job.job_id}",
+            daemon=True,
+        )
+        self._process = process
+        process.start()
+        deadline = time.monotonic() + self.timeout_seconds
+
+        try:
+            while True:
+                result = self._drain(channel, job.job_id)
+                if result is not None:
+                    return result
+                if not process.is_alive():
+                    # 进程退出后再读一次，避免遗漏最后的结果消息
+                    result = self._drain(channel, job.job_id)
+                    if result is not None:
+                        return result
+                    return LearningJobResult(
+                        job_id=job.job_id,
+                        success=False,
+                        error=f"worker_exited: code={process.exitcode}",
+                    )
+                if time.monotonic() >= deadline:
+                    logger.warning(
+                        f"[ML学习] 子进程超时({self.timeout_seconds:.0f}s)，终止任务 {job.job_id}"
+                    )
+                    self._terminate()
+                    return LearningJobResult(
+                        job_id=job.job_id, success=False, error="timeout"
+                    )
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            logger.info(f"[ML学习] 任务被取消，终止子进程 {job.job_id}")
+            self._terminate()
+            raise
+        finally:
+            if self._process is process:
+                process.join(timeout=1.0)
+                self._process = None
+            channel.close()
+
+    def cancel(self) -> None:
+        """终止当前子进程"""
+        self._terminate()
+
+    def _terminate(self) -> None:
+        process = self._process
+        if process is None or not process.is_alive():
+            return
+        process.terminate()
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=1.0)
+
+    def _drain(self, channel: Any, job_id: str) -> Optional[LearningJobResult]:
+        """读取队列中的所有消息，返回结果（若已到达）"""
+        while True:
+            try:
+                message = channel.get_nowait()
+            except queue.Empty:
+                return None
+            kind, message_job_id = message[0], message[1]
+            if message_job_id != job_id:
+                continue
+            if kind == "progress":
+                stage, fraction = message[2], message[3]
+                self.last_progress = {
+                    "job_id": job_id,
+                    "stage": stage,
+                    "fraction": fraction,
+                }
+                logger.debug(f"[ML学习] 进度: {stage} {fraction:.0%}")
+                if self._on_progress is not None:
+                    self._on_progress(job_id, stage, fraction)
+            elif kind == "result":
+                result = LearningJobResult.from_dict(message[2])
+                # 子进程内的缓存统计不会进入本进程的运行时指标，在此汇总
+                record_result_cache(
+                    hits=result.cache_hits,
+                    misses=result.cache_misses,
+                    evictions=result.cache_evictions,
+                )
+                return result
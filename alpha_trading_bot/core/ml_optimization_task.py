@@ -6,7 +6,9 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Dict, Optional
+
+from .ml_learning_worker import LearningJob, LearningJobResult, LearningWorker
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +23,15 @@ class MLOptimizationTask:
         backtest_learner: Any,
         simple_learning: Any,
         weight_optimizer: Any,
+        worker: Optional[LearningWorker] = None,
     ):
         self._bot_ref = bot_ref
         self._performance_tracker = performance_tracker
         self._backtest_learner = backtest_learner
         self._simple_learning = simple_learning
         self._weight_optimizer = weight_optimizer
+        self._worker = worker or LearningWorker()
+        self.last_result: Optional[LearningJobResult] = None
 
     async def run(self) -> None:
         """后台优化任务（每6小时运行一次ML学习）"""
@@ -53,65 +58,86 @@ class MLOptimizationTask:
                     f"胜率={daily_data.get('win_rate', 0):.2%}"
                 )
 
-                try:
-                    backtest_result = self._backtest_learner.backtest_signals(
-                        days=60, holding_hours=4, min_confidence=0.5
-                    )
-
-                    if backtest_result.total_signals > 0:
-                        logger.info(
-                            f"[ML学习] 回测结果: 信号数={backtest_result.total_signals}, "
-                            f"胜率={backtest_result.win_rate:.2%}, "
-                            f"平均收益={backtest_result.average_return:.2f}%"
-                        )
-
-                        for provider, stats in backtest_result.provider_stats.items():
-                            logger.info(
-                                f"[ML学习] {provider}: 胜率={stats.get('win_rate', 0):.2%}, "
-                                f"平均收益={stats.get('average_return', 0):.2f}%"
-                            )
-
-                        backtest_weights = self._backtest_learner.learn_from_backtest()
-
-                        if metrics.total_trades > 0:
-                            trade_weights = self._simple_learning.learn_from_trades()
-                            logger.info(f"[ML学习] 真实交易权重: {trade_weights}")
-
-                        self._simple_learning.data_manager.save_model_weights(
-                            backtest_weights, source="backtest_learn"
-                        )
-
-                        logger.info(f"[ML学习] 回测学习权重已保存: {backtest_weights}")
-                    else:
-                        logger.warning("[ML学习] 回测无结果，跳过回测学习")
-
-                except Exception as e:
-                    logger.warning(f"[ML学习] 回测学习失败: {e}")
-
-                optimized_weights, confidence = (
-                    self._weight_optimizer.get_optimized_weights()
-                )
-                logger.info(
-                    f"[ML学习] 优化权重: {optimized_weights}, 置信度={confidence:.2f}"
+                job = LearningJob(
+                    db_path=self._resolve_db_path(),
+                    days=60,
+                    holding_hours=4,
+                    min_confidence=0.5,
+                    learn_from_trades=metrics.total_trades > 0,
                 )
-
-                if optimized_weights and confidence > 0.5:
-                    try:
-                        old_weights = getattr(
-                            self._bot_ref.config.ai, "fusion_weights", {}
-                        )
-                        self._bot_ref.config.ai.fusion_weights = optimized_weights
-                        logger.info(
-                            f"[ML学习] 权重已应用: {old_weights} -> {optimized_weights}"
-                        )
-                    except Exception as e:
-                        logger.warning(f"[ML学习] 应用权重失败: {e}")
-                else:
-                    logger.info(f"[ML学习] 跳过应用: 置信度={confidence:.2f} <= 0.5")
+                result = await self._worker.submit(job)
+                self._handle_result(result)
 
                 logger.info("[ML学习] 后台优化任务完成")
 
             except asyncio.CancelledError:
+                self._worker.cancel()
                 break
             except Exception as e:
                 logger.error(f"[ML学习] 任务出错: {e}")
+
+    def cancel(self) -> None:
+        """终止进行中的学习子进程"""
+        self._worker.cancel()
+
+    def _resolve_db_path(self) -> str:
+        """子进程按数据库路径重建学习器"""
+        for component in (
+            self._backtest_learner,
+            self._simple_learning,
+            self._weight_optimizer,
+        ):
+            db_path = getattr(component, "db_path", None)
+            if db_path:
+                return str(db_path)
+        return "data_json/trading_data.db"
+
+    def _handle_result(self, result: LearningJobResult) -> None:
+        """在事件循环中处理子进程结果"""
+        self.last_result = result
+        if not result.success:
+            logger.warning(f"[ML学习] 学习任务失败: {result.error}")
+            return
+
+        logger.info(f"[ML学习] 学习任务耗时 {result.duration_seconds:.1f}s")
+        if result.total_signals > 0:
+            logger.info(
+                f"[ML学习] 回测结果: 信号数={result.total_signals}, "
+                f"胜率={result.win_rate:.2%}, "
+                f"平均收益={result.average_return:.2f}%"
+            )
+            for provider, stats in result.provider_stats.items():
+                logger.info(
+                    f"[ML学习] {provider}: 胜率={stats.get('win_rate', 0):.2%}, "
+                    f"平均收益={stats.get('average_return', 0):.2f}%"
+                )
+            if result.trade_weights:
+                logger.info(f"[ML学习] 真实交易权重: {result.trade_weights}")
+            logger.info(f"[ML学习] 回测学习权重已保存: {result.backtest_weights}")
+        else:
+            logger.warning("[ML学习] 回测无结果，跳过回测学习")
+
+        optimized_weights, confidence = result.optimized_weights, result.confidence
+        logger.info(f"[ML学习] 优化权重: {optimized_weights}, 置信度={confidence:.2f}")
+
+        if optimized_weights and confidence > 0.5:
+            self._apply_weights(optimized_weights)
+        else:
+            logger.info(f"[ML学习] 跳过应用: 置信度={confidence:.2f} <= 0.5")
+
+    def _apply_weights(self, weights: Dict[str, float]) -> bool:
+        """校验后整体替换融合权重（单次赋值，周期内不会读到半更新状态）"""
+        try:
+            new_weights = {str(k): float(v) for k, v in weights.items()}
+            if any(v < 0 for v in new_weights.values()) or not any(
+                new_weights.values()
+            ):
+                logger.warning(f"[ML学习] 权重无效，跳过应用: {new_weights}")
+                return False
+            old_weights = getattr(self._bot_ref.config.ai, "fusion_weights", {})
+            self._bot_ref.config.ai.fusion_weights = new_weights
+            logger.info(f"[ML学习] 权重已应用: {old_weights} -> {new_weights}")
+            return True
+        except Exception as e:
+            logger.warning(f"[ML学习] 应用权重失败: {e}")
+            return False
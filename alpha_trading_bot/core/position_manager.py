@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 
 from ..config.models import Config
+from ..utils import clock
 from .state_persistence import StatePersistence, create_state_persistence
 from .trading_state_machine import derive_lifecycle_state
 
@@ -189,7 +190,7 @@ class PositionManager:
             return 0.0
         try:
             entry_dt = datetime.fromisoformat(self._entry_time)
-            delta = datetime.now() - entry_dt
+            delta = clock.now() - entry_dt
             return max(0.0, delta.total_seconds() / 3600.0)
         except (ValueError, TypeError):
             return 0.0
@@ -299,7 +300,7 @@ class PositionManager:
                     f"[仓位更新] 初始化做空最低价: {self._lowest_price_since_entry}"
                 )
 
-            # 持久化保存
+            # 持久化保存（每周期调用，延迟合并写入；保护单变化时会同步落盘）
             self._persistence.save_position(
                 symbol=position_data["symbol"],
                 side=side,
@@ -311,6 +312,7 @@ class PositionManager:
                 last_take_profit_price=self._last_take_profit_price,
                 highest_price_since_entry=self._highest_price_since_entry,
                 lowest_price_since_entry=self._lowest_price_since_entry,
+                flush=False,
             )
 
             logger.info(
@@ -743,7 +745,7 @@ class PositionManager:
         self._entry_dynamic_stop_loss_percent = None
 
         self._entry_price = entry_price
-        self._entry_time = datetime.now().isoformat()
+        self._entry_time = clock.now().isoformat()
         self._position = Position(
             symbol=symbol,
             side=side,
@@ -779,6 +781,10 @@ class PositionManager:
             f"[持仓更新] 开仓成功: {symbol}, 方向:{side}, 数量:{amount}, 入场价:{entry_price}"
         )
 
+    def close(self) -> None:
+        """退出前调用：同步写出延迟的持仓状态"""
+        self._persistence.close()
+
 
 def create_position_manager(
     config: Optional[Config] = None,
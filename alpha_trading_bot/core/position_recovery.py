@@ -5,6 +5,7 @@
 - 平仓前取消止损单
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -47,9 +48,7 @@ class PositionRecoveryManager:
             else:
                 query_failed = getattr(self._exchange, "last_query_failed", False)
                 if query_failed:
-                    logger.warning(
-                        "[状态验证] API查询持仓失败，保留本地持仓状态不清理"
-                    )
+                    logger.warning("[状态验证] API查询持仓失败，保留本地持仓状态不清理")
                 else:
                     if self._position_manager.has_position():
                         local_pos = self._position_manager.position
@@ -77,12 +76,11 @@ class PositionRecoveryManager:
                 return
 
             all_cleared = True
+            results = await self._cancel_algo_orders(protection_ids)
             for algo_id in protection_ids:
-                logger.info(f"[平仓] 取消现有保护单: {algo_id}")
-                result = await self._exchange.cancel_algo_order(
-                    str(algo_id), self._exchange.symbol
+                cancel_success, cancel_reason = results.get(
+                    str(algo_id), (False, "failed")
                 )
-                cancel_success, cancel_reason = self._normalize_cancel_result(result)
                 if cancel_success or cancel_reason == "already_gone":
                     logger.info(f"[平仓] 保护单已取消: {algo_id}")
                     continue
@@ -96,6 +94,26 @@ class PositionRecoveryManager:
         except Exception as e:
             logger.warning(f"[平仓] 取消保护单失败: {e}")
 
+    async def _cancel_algo_orders(
+        self, algo_ids: List[str]
+    ) -> Dict[str, Tuple[bool, str]]:
+        """取消保护单：支持批量接口时一次请求完成，否则逐单取消。"""
+        symbol = self._exchange.symbol
+        cancel_batch = getattr(self._exchange, "cancel_algo_orders", None)
+        if asyncio.iscoroutinefunction(cancel_batch):
+            logger.info(f"[平仓] 批量取消现有保护单: {algo_ids}")
+            try:
+                return await cancel_batch([str(i) for i in algo_ids], symbol)
+            except Exception as e:
+                logger.warning(f"[平仓] 批量取消保护单失败，改为逐单取消: {e}")
+
+        results: Dict[str, Tuple[bool, str]] = {}
+        for algo_id in algo_ids:
+            logger.info(f"[平仓] 取消现有保护单: {algo_id}")
+            result = await self._exchange.cancel_algo_order(str(algo_id), symbol)
+            results[str(algo_id)] = self._normalize_cancel_result(result)
+        return results
+
     async def _get_existing_stop_order_id(self) -> Optional[str]:
         """查询交易所中现有的止损单ID"""
         try:
@@ -0,0 +1,321 @@
+"""
+全流程回放回测
+
+用历史K线驱动真实的 AdaptiveTradingBot 交易周期，DecisionEngine、AISignalIntegrator、
+方向冷却与 _update_stop_loss 均照常执行：
+- 交易所替换为 SimulatedExchangeClient，市价单与止损/止盈算法单按K线撮合
+- 调度器替换为 ReplayScheduler，等待下一周期即推进虚拟时钟与K线，不真实 sleep
+- AI 客户端替换为 ReplayAIClient，提供商响应来自可插拔 responder
+
+回放期间状态目录与 ML 数据库重定向到临时目录（或指定目录），不会写入实盘
+状态文件与学习数据。
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from ..config.models import Config
+from ..exchange.models.candles import CandleSeries, as_candle_series
+from ..exchange.simulated import SimulatedExchangeClient, SimulatedTrade
+from ..utils.clock import VirtualClock, use_clock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayConfig:
+    """回放参数"""
+
+    initial_balance: float = 10000.0
+    fee_rate: float = 0.0005
+    slippage: float = 0.0
+    warmup_bars: int = 100  # 首个周期之前的历史K线数（技术指标至少需要 50 根）
+    cycle_minutes: Optional[int] = None  # 默认取 config.trading.cycle_minutes
+    tie_break: str = "stop_loss"  # 同一根K线同时触发止损和止盈时的成交顺序
+    close_at_end: bool = True
+    log_level: Optional[int] = logging.WARNING  # 回放期间包日志级别，None 不调整
+    state_dir: Optional[str] = None  # None 时使用临时目录
+
+
+@dataclass
+class ReplayResult:
+    """回放结果"""
+
+    cycles: int
+    initial_balance: float
+    final_equity: float
+    trades: List[SimulatedTrade]
+    equity_curve: List[Tuple[float, float]]  # (虚拟时间, 周期结束时权益)
+    total_fees: float
+    elapsed_seconds: float
+    simulated_seconds: float
+    cooldown_metrics: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_return(self) -> float:
+        return self.final_equity / self.initial_balance - 1
+
+    @property
+    def max_drawdown(self) -> float:
+        peak = self.initial_balance
+        drawdown = 0.0
+        for _, equity in self.equity_curve:
+            peak = max(peak, equity)
+            drawdown = max(drawdown, (peak - equity) / peak)
+        return drawdown
+
+    @property
+    def win_rate(self) -> float:
+        if not self.trades:
+            return 0.0
+        return sum(trade.pnl > 0 for trade in self.trades) / len(self.trades)
+
+    @property
+    def speedup(self) -> float:
+        """模拟时长 / 实际耗时"""
+        return self.simulated_seconds / max(self.elapsed_seconds, 1e-9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cycles": self.cycles,
+            "initial_balance": self.initial_balance,
+            "final_equity": self.final_equity,
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "total_trades": len(self.trades),
+            "win_rate": self.win_rate,
+            "total_fees": self.total_fees,
+            "elapsed_seconds": self.elapsed_seconds,
+            "simulated_seconds": self.simulated_seconds,
+            "speedup": self.speedup,
+            "cooldown_metrics": dict(self.cooldown_metrics),
+            "trades": [trade.__dict__ for trade in self.trades],
+        }
+
+
+class ReplayScheduler:
+    """以虚拟时钟代替 TradingScheduler：等待下一周期即推进模拟交易所的K线"""
+
+    def __init__(self, exchange: SimulatedExchangeClient, bars_per_cycle: int):
+        self.exchange = exchange
+        self.bars_per_cycle = bars_per_cycle
+
+    async def wait_for_next_cycle(self, first_run: bool = False) -> None:
+        if first_run:
+            return
+        self.exchange.advance(self.bars_per_cycle)
+
+    def get_next_cycle_seconds(self) -> float:
+        return self.bars_per_cycle * self.exchange.bar_seconds
+
+
+def _replay_bot_config(config: Config) -> Config:
+    """
+    复制配置并满足实盘闸门
+
+    回放中订单只会发往 SimulatedExchangeClient，放开闸门才能走到真实的下单与止损路径。
+    """
+    config = copy.deepcopy(config)
+    config.trading.test_mode = False
+    config.trading.real_trading_confirmed = True
+    config.trading.runtime_environment = config.trading.LIVE_ALLOWED_ENVIRONMENTS[0]
+    for name in ("api_key", "secret", "password"):
+        if not getattr(config.exchange, name):
+            setattr(config.exchange, name, "replay")
+    return config
+
+
+@contextmanager
+def _isolated_state_dir(state_dir: Optional[str]) -> Iterator[str]:
+    """回放期间把 TRADING_STATE_DIR 与 TRADING_ML_DB_PATH 指向独立目录"""
+    directory_cm = (
+        tempfile.TemporaryDirectory(prefix="replay-state-")
+        if state_dir is None
+        else nullcontext(state_dir)
+    )
+    with directory_cm as directory:
+        overrides = {
+            "TRADING_STATE_DIR": str(directory),
+            "TRADING_ML_DB_PATH": os.path.join(directory, "trading_data.db"),
+        }
+        previous = {name: os.environ.get(name) for name in overrides}
+        os.environ.update(overrides)
+        try:
+            yield str(directory)
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+@contextmanager
+def _package_log_level(level: Optional[int]) -> Iterator[None]:
+    if level is None:
+        yield
+        return
+    package_logger = logging.getLogger("alpha_trading_bot")
+    previous = package_logger.level
+    package_logger.setLevel(level)
+    try:
+        yield
+    finally:
+        package_logger.setLevel(previous)
+
+
+class ReplayBacktester:
+    """
+    回放回测器
+
+    用法:
+        backtester = ReplayBacktester(candles, config, responder=ModelResponder(model))
+        result = backtester.run_sync()
+    """
+
+    def __init__(
+        self,
+        candles: Union[CandleSeries, Iterable[Sequence[float]]],
+        config: Optional[Config] = None,
+        responder: Optional[Any] = None,
+        replay_config: Optional[ReplayConfig] = None,
+    ):
+        self.candles = as_candle_series(candles)
+        self.config = _replay_bot_config(config or Config())
+        self.responder = responder
+        self.replay_config = replay_config or ReplayConfig()
+        if len(self.candles) <= self.replay_config.warmup_bars:
+            raise ValueError(
+                f"K线数量 {len(self.candles)} 不足，"
+                f"至少需要 warmup_bars+1={self.replay_config.warmup_bars + 1} 根"
+            )
+
+    def _bars_per_cycle(self, bar_seconds: float) -> int:
+        cycle_minutes = (
+            self.replay_config.cycle_minutes or self.config.trading.cycle_minutes
+        )
+        bars = cycle_minutes * 60 / bar_seconds
+        if bars < 1 or abs(bars - round(bars)) > 1e-9:
+            raise ValueError(
+                f"交易周期 {cycle_minutes} 分钟必须是K线周期 "
+                f"{bar_seconds / 60:g} 分钟的整数倍"
+            )
+        return int(round(bars))
+
+    def build_exchange(self) -> SimulatedExchangeClient:
+        rc = self.replay_config
+        return SimulatedExchangeClient(
+            self.candles,
+            symbol=self.config.exchange.symbol,
+            initial_balance=rc.initial_balance,
+            fee_rate=rc.fee_rate,
+            slippage=rc.slippage,
+            allow_short_selling=self.config.trading.allow_short_selling,
+            max_position_usage=self.config.exchange.max_position_usage,
+            start_index=rc.warmup_bars - 1,
+            tie_break=rc.tie_break,
+            clock=VirtualClock(),
+        )
+
+    def build_bot(self, exchange: SimulatedExchangeClient) -> Any:
+        """按 AdaptiveTradingBot.initialize() 的方式装配组件，交易所/AI/调度器换成回放实现"""
+        from ..ai.replay_client import ReplayAIClient
+        from .adaptive_bot import AdaptiveTradingBot
+        from .adaptive_stop_loss import AdaptiveStopLossManager
+        from .position_recovery import PositionRecoveryManager
+
+        bot = AdaptiveTradingBot(self.config)
+        bot._exchange = exchange
+        bot._ai_client = ReplayAIClient(self.responder, config=self.config.ai)
+        if self.config.trading.cycle_record_path:
+            from .cycle_recorder import CycleRecorder
+
+            bot._cycle_recorder = CycleRecorder.open(
+                self.config.trading.cycle_record_path, self.config
+            )
+            bot._exchange = bot._cycle_recorder.wrap_exchange(exchange)
+            bot._cycle_recorder.wrap_ai_client(bot._ai_client)
+        bot._position_recovery = PositionRecoveryManager(
+            bot._exchange, bot.position_manager
+        )
+        bot._adaptive_stop_loss = AdaptiveStopLossManager(bot._exchange)
+        # 鸭子类型替换 TradingScheduler
+        bot.scheduler = cast(
+            Any, ReplayScheduler(exchange, self._bars_per_cycle(exchange.bar_seconds))
+        )
+        bot._initialized = True
+        return bot
+
+    async def run(self, max_cycles: Optional[int] = None) -> ReplayResult:
+        """逐周期回放，直到K线耗尽或达到 max_cycles"""
+        rc = self.replay_config
+        exchange = self.build_exchange()
+        with (
+            _isolated_state_dir(rc.state_dir),
+            use_clock(exchange.clock),
+            _package_log_level(rc.log_level),
+        ):
+            bot = self.build_bot(exchange)
+            await exchange.initialize()
+            await exchange.set_leverage(self.config.exchange.leverage)
+            scheduler: ReplayScheduler = bot.scheduler
+
+            started_at = exchange.clock.time()
+            started = time.perf_counter()
+            equity_curve: List[Tuple[float, float]] = []
+            cycles = 0
+            while True:
+                await bot._adaptive_trading_cycle(first_run=cycles == 0)
+                cycles += 1
+                equity_curve.append((exchange.clock.time(), exchange.equity()))
+                remaining = len(exchange.candles) - 1 - exchange.bar_index
+                if remaining < scheduler.bars_per_cycle:
+                    break
+                if max_cycles is not None and cycles >= max_cycles:
+                    break
+
+            if rc.close_at_end:
+                exchange.close_all()
+            elapsed = time.perf_counter() - started
+            await exchange.cleanup()
+            if bot._cycle_recorder is not None:
+                bot._cycle_recorder.close()
+
+        result = ReplayResult(
+            cycles=cycles,
+            initial_balance=rc.initial_balance,
+            final_equity=exchange.equity(),
+            trades=list(exchange.trades),
+            equity_curve=equity_curve,
+            total_fees=exchange.total_fees,
+            elapsed_seconds=elapsed,
+            simulated_seconds=exchange.clock.time() - started_at,
+            cooldown_metrics=bot.get_cooldown_metrics(),
+        )
+        logger.info(
+            f"[回放] 完成 {cycles} 个周期，交易 {len(result.trades)} 笔，"
+            f"收益 {result.total_return:.2%}，最大回撤 {result.max_drawdown:.2%}，"
+            f"耗时 {elapsed:.1f}s（{result.speedup:.0f}x 实时）"
+        )
+        return result
+
+    def run_sync(self, max_cycles: Optional[int] = None) -> ReplayResult:
+        return asyncio.run(self.run(max_cycles))
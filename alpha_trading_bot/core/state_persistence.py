@@ -6,18 +6,25 @@
 2. 止损单ID持久化
 3. 程序崩溃后状态恢复
 4. 交易历史记录
+5. 写后合并：每周期的持仓刷新只标记为脏，由后台线程在 write_delay 秒内合并写入；
+   保护单变化、开平仓与退出时同步落盘；内容未变化时跳过写入
 
-存储格式：JSON文件
+存储格式：状态为JSON文件；交易历史为只追加的JSONL流水（见 trade_journal）
 """
 
+import atexit
 import json
 import logging
 import os
-from dataclasses import asdict, dataclass
+import threading
+import weakref
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .trade_journal import FSYNC_POLICIES, JOURNAL_NAME, LEGACY_NAME, TradeJournal
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,16 +80,24 @@ class StatePersistence:
     # 默认数据目录（项目根目录/data/trading_state/）
     DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "trading_state"
 
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        journal_fsync: Optional[str] = None,
+        write_delay: float = 2.0,
+    ):
         """
         初始化持久化管理器
 
         Args:
             data_dir: 数据存储目录，默认为项目根目录/data/trading_state/
+            journal_fsync: 交易流水落盘策略 (always/interval/never)，
+                默认读取环境变量 TRADING_JOURNAL_FSYNC，未设置时为 interval
+            write_delay: 延迟写入（flush=False）的最长等待秒数
         """
         self.data_dir = resolve_state_data_dir(data_dir)
         self.state_file = self.data_dir / "trading_state.json"
-        self.history_file = self.data_dir / "trade_history.json"
+        self.history_file = self.data_dir / JOURNAL_NAME
         self.backup_dir = self.data_dir / "backups"
 
         # 确保目录存在
@@ -90,8 +105,26 @@ class StatePersistence:
 
         # 内存中的状态
         self._state: Optional[TradingState] = None
-        self._history_cache: Optional[List[Dict[str, Any]]] = None
-        self._history_cache_mtime: Optional[float] = None
+
+        # 写后合并：_lock 保护内存状态与脏标记，_write_lock 串行化文件写入
+        self.write_delay = write_delay
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._last_written: Optional[Dict[str, Any]] = None
+
+        # 交易历史流水（首次使用时迁移旧的 trade_history.json）
+        fsync = journal_fsync or os.getenv("TRADING_JOURNAL_FSYNC") or ""
+        fsync = fsync.strip().lower() or "interval"
+        if fsync not in FSYNC_POLICIES:
+            logger.warning(
+                f"[持久化] 未知的交易流水落盘策略: {fsync}，"
+                f"可选 {FSYNC_POLICIES}，使用 interval"
+            )
+            fsync = "interval"
+        self._journal = TradeJournal(self.history_file, fsync=fsync)
+        self._journal.migrate_legacy(self.data_dir / LEGACY_NAME)
 
         logger.info(f"[持久化] 数据目录: {self.data_dir}")
 
@@ -114,10 +147,13 @@ class StatePersistence:
         last_take_profit_price: float = 0.0,
         highest_price_since_entry: float = 0.0,
         lowest_price_since_entry: float = 0.0,
+        flush: bool = True,
     ) -> bool:
         """
         保存持仓状态
 
+        与当前持仓完全相同时不做任何修改（也不刷新时间戳）。
+
         Args:
             symbol: 交易对
             side: 方向 (long/short)
@@ -127,6 +163,8 @@ class StatePersistence:
             unrealized_pnl: 未实现盈亏
             highest_price_since_entry: 做多时追踪的最高价
             lowest_price_since_entry: 做空时追踪的最低价
+            flush: True 时同步写入；False 时只标记为脏，由后台线程在
+                write_delay 秒内合并写入
 
         Returns:
             是否保存成功
@@ -135,8 +173,7 @@ class StatePersistence:
             # 加载现有状态
             state = self.load_state()
 
-            # 更新持仓
-            state.position = PositionState(
+            position = PositionState(
                 symbol=symbol,
                 side=side,
                 amount=amount,
@@ -148,17 +185,30 @@ class StatePersistence:
                 last_take_profit_price=last_take_profit_price,
                 highest_price_since_entry=highest_price_since_entry,
                 lowest_price_since_entry=lowest_price_since_entry,
-                updated_at=datetime.now().isoformat(),
-            )
-            state.last_trade_time = datetime.now().isoformat()
-            state.total_trades += 1
-
-            # 保存到文件
-            self._save_state(state)
-
-            logger.info(
-                f"[持久化] 持仓状态已保存: {symbol} {side} {amount}@{entry_price}"
             )
+            with self._lock:
+                unchanged = state.position is not None and position == replace(
+                    state.position, updated_at=""
+                )
+                if not unchanged:
+                    # 更新持仓
+                    position.updated_at = datetime.now().isoformat()
+                    state.position = position
+                    state.last_trade_time = position.updated_at
+                    state.total_trades += 1
+
+            if unchanged:
+                if flush:
+                    self.flush()
+                return True
+            if flush:
+                self._save_state(state)
+                logger.info(
+                    f"[持久化] 持仓状态已保存: {symbol} {side} {amount}@{entry_price}"
+                )
+            else:
+                self._mark_dirty()
+                logger.debug(f"[持久化] 持仓状态待写入: {symbol} {side} {amount}")
             return True
 
         except Exception as e:
@@ -181,7 +231,8 @@ class StatePersistence:
                 logger.info(f"[持久化] 创建备份: 持仓 {state.position.symbol} 已平仓")
 
             # 清空持仓
-            state.position = None
+            with self._lock:
+                state.position = None
             self._save_state(state)
 
             logger.info("[持久化] 持仓状态已清空")
@@ -205,8 +256,9 @@ class StatePersistence:
             state = self.load_state()
 
             if state.position:
-                state.position.stop_order_id = stop_order_id
-                state.position.updated_at = datetime.now().isoformat()
+                with self._lock:
+                    state.position.stop_order_id = stop_order_id
+                    state.position.updated_at = datetime.now().isoformat()
                 self._save_state(state)
                 logger.info(f"[持久化] 止损单已更新: {stop_order_id}")
                 return True
@@ -285,31 +337,113 @@ class StatePersistence:
 
     def _save_state(self, state: TradingState) -> None:
         """
-        保存状态到文件
+        同步保存状态到文件（同时写出之前延迟的修改）
 
         Args:
             state: TradingState对象
         """
-        # 先写入临时文件，再重命名（原子操作）
-        temp_file = self.state_file.with_suffix(".tmp")
+        with self._lock:
+            self._state = state
+        self._write_current(force=True)
 
-        data = {
+    @staticmethod
+    def _snapshot(state: TradingState) -> Dict[str, Any]:
+        return {
             "position": asdict(state.position) if state.position else None,
             "last_trade_time": state.last_trade_time,
             "total_trades": state.total_trades,
             "daily_pnl": state.daily_pnl,
             "version": state.version,
-            "saved_at": datetime.now().isoformat(),
         }
 
+    def _write_current(self, force: bool) -> bool:
+        """
+        取当前状态快照并写入
+
+        快照在写锁内获取，保证后取的快照后落盘；锁顺序固定为 _write_lock → _lock。
+
+        Args:
+            force: False 时只在有延迟修改时写入
+
+        Returns:
+            是否执行了写入
+        """
+        with self._write_lock:
+            with self._lock:
+                # 与取消定时器同在锁内移出 _pending，避免覆盖并发 _mark_dirty 的登记
+                self._cancel_timer()
+                _pending.discard(self)
+                if not (force or self._dirty) or self._state is None:
+                    return False
+                self._dirty = False
+                data = self._snapshot(self._state)
+            try:
+                self._write_snapshot(data)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+        return True
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """写入状态快照；与上次写入的内容相同时跳过（调用方持有 _write_lock）"""
+        if data == self._last_written:
+            logger.debug("[持久化] 状态未变化，跳过写入")
+            return
+
+        # 先写入临时文件，再重命名（原子操作）
+        temp_file = self.state_file.with_suffix(".tmp")
         with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            json.dump(
+                {**data, "saved_at": datetime.now().isoformat()},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
 
         # 原子重命名
         temp_file.replace(self.state_file)
+        self._last_written = data
+
+    def _mark_dirty(self) -> None:
+        """标记为脏；第一次标记时启动定时器，之后的修改合并到同一次写入"""
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.write_delay, self._write_pending)
+                self._timer.daemon = True
+                self._timer.start()
+                _pending.add(self)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_pending(self) -> None:
+        """后台线程：写出脏状态，失败时稍后重试"""
+        try:
+            self._write_current(force=False)
+        except Exception as e:
+            logger.error(f"[持久化] 后台写入状态失败: {e}")
+            self._mark_dirty()
+
+    def flush(self) -> bool:
+        """
+        同步写出延迟的修改
 
-        # 更新内存缓存
-        self._state = state
+        Returns:
+            是否有待写入的修改
+        """
+        return self._write_current(force=False)
+
+    def close(self) -> None:
+        """退出前调用：写出延迟的修改"""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"[持久化] 退出时写入状态失败: {e}")
+        self._journal.close()
 
     def _create_backup(self, state: TradingState) -> None:
         """
@@ -376,10 +510,6 @@ class StatePersistence:
             是否记录成功
         """
         try:
-            # 加载现有历史
-            history = self._load_history()
-
-            # 添加新记录
             record = {
                 "timestamp": datetime.now().isoformat(),
                 "type": trade_type,
@@ -390,10 +520,7 @@ class StatePersistence:
                 "pnl": pnl,
                 "reason": reason,
             }
-            history.append(record)
-
-            # 保存
-            self._save_history(history)
+            self._journal.append(record)
 
             logger.info(
                 f"[持久化] 记录交易: {trade_type} {symbol} {side} {amount}@{price}"
@@ -404,38 +531,6 @@ class StatePersistence:
             logger.error(f"[持久化] 记录交易失败: {e}")
             return False
 
-    def _load_history(self) -> List[Dict[str, Any]]:
-        """加载交易历史"""
-        try:
-            if self.history_file.exists():
-                mtime = self.history_file.stat().st_mtime
-                if (
-                    self._history_cache is not None
-                    and self._history_cache_mtime == mtime
-                ):
-                    return list(self._history_cache)
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        self._history_cache = data
-                        self._history_cache_mtime = mtime
-                        return data
-        except Exception as e:
-            logger.warning(f"[持久化] 加载交易历史失败: {e}")
-
-        return []
-
-    def _save_history(self, history: List[Dict[str, Any]]) -> None:
-        """保存交易历史"""
-        temp_file = self.history_file.with_suffix(".tmp")
-
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-
-        temp_file.replace(self.history_file)
-        self._history_cache = list(history)
-        self._history_cache_mtime = self.history_file.stat().st_mtime
-
     def get_recent_trades(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         获取最近的交易记录
@@ -446,8 +541,11 @@ class StatePersistence:
         Returns:
             交易记录列表
         """
-        history = self._load_history()
-        return history[-limit:] if history else []
+        try:
+            return self._journal.tail(limit)
+        except Exception as e:
+            logger.warning(f"[持久化] 加载交易历史失败: {e}")
+            return []
 
     def get_state_summary(self) -> Dict[str, Any]:
         """
@@ -457,18 +555,32 @@ class StatePersistence:
             状态摘要字典
         """
         state = self.load_state()
-        history = self._load_history()
 
         return {
             "has_position": state.position is not None,
             "position": asdict(state.position) if state.position else None,
             "total_trades": state.total_trades,
             "daily_pnl": state.daily_pnl,
-            "history_count": len(history),
+            "history_count": self._journal.count(),
             "data_dir": str(self.data_dir),
         }
 
 
-def create_state_persistence(data_dir: Optional[Path] = None) -> StatePersistence:
+# 有延迟写入的实例，解释器退出时兜底写出（正常退出应先调用 close）
+_pending: "weakref.WeakSet[StatePersistence]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_at_exit() -> None:
+    for persistence in list(_pending):
+        try:
+            persistence.flush()
+        except Exception as e:
+            logger.error(f"[持久化] 退出时写入状态失败: {e}")
+
+
+def create_state_persistence(
+    data_dir: Optional[Path] = None, journal_fsync: Optional[str] = None
+) -> StatePersistence:
     """创建持久化管理器实例"""
-    return StatePersistence(data_dir)
+    return StatePersistence(data_dir, journal_fsync)
@@ -0,0 +1,395 @@
+"""
+只追加的交易流水（JSONL）
+
+StatePersistence 的交易历史原先是一个 JSON 数组，每记一笔都要整体读出、
+追加、再整体重写，耗时随历史长度线性增长。这里改为每行一条 JSON 的只追加文件：
+- append 只写一行；fsync 策略可选 always（每笔落盘）/ interval（最多每隔
+  fsync_interval 秒落盘一次）/ never（只 flush，由操作系统决定）
+- tail(n) 从文件末尾按块向前读取，取够 n 条有效记录即停（损坏行跳过不计数）；
+  当前文件读到开头仍不够时继续读归档
+- 进程崩溃留下的残缺尾行在下次打开追加前截断，读取时跳过损坏行
+- 首次使用时透明迁移旧的 trade_history.json（迁移后改名为 .migrated 保留）
+- 压缩与轮转是离线操作：
+
+    python -m alpha_trading_bot.core.trade_journal stats   [data_dir]
+    python -m alpha_trading_bot.core.trade_journal compact [data_dir] [--keep-days N]
+    python -m alpha_trading_bot.core.trade_journal rotate  [data_dir]
+        [--max-mb N] [--keep N]
+
+轮转把当前文件改名为 trade_history.<时间戳>.jsonl 归档，归档只读不再修改。
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+JOURNAL_NAME = "trade_history.jsonl"
+LEGACY_NAME = "trade_history.json"
+
+_BLOCK_SIZE = 64 * 1024
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _valid_end(path: Path) -> int:
+    """最后一个换行符之后的字节是残缺的尾行，返回应保留的长度"""
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(0, end - _BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(end - start)
+            index = block.rfind(b"\n")
+            if index >= 0:
+                return start + index + 1
+            end = start
+    return 0
+
+
+def _reverse_lines(path: Path) -> Iterator[bytes]:
+    """从文件末尾按块向前逐个产出完整行（由新到旧），最后一个换行符之后的残缺尾行丢弃"""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        pending = b""  # 块开头可能不完整的一段，与前一块拼接
+        seen_newline = False
+        while end > 0:
+            start = max(0, end - _BLOCK_SIZE)
+            f.seek(start)
+            parts = (f.read(end - start) + pending).split(b"\n")
+            end = start
+            pending = parts.pop(0)
+            if not seen_newline:
+                if not parts:
+                    continue
+                parts.pop()
+                seen_newline = True
+            for line in reversed(parts):
+                if line.strip():
+                    yield line
+        if seen_newline and pending.strip():
+            yield pending
+
+
+class TradeJournal:
+    """
+    交易流水
+
+    用法:
+        journal = TradeJournal(data_dir / "trade_history.jsonl", fsync="interval")
+        journal.migrate_legacy(data_dir / "trade_history.json")
+        journal.append({"type": "open", ...})
+        journal.tail(50)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"未知的 fsync 策略: {fsync}，可选 {FSYNC_POLICIES}")
+        self.path = Path(path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._file: Optional[BinaryIO] = None
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+        # 行数缓存：(已计数的字节数, 行数)，文件只追加时增量计数
+        self._counted = (0, 0)
+        self._archive_counts: Dict[str, int] = {}
+
+    # ==================== 写入 ====================
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        data = (line + "\n").encode("utf-8")
+        with self._lock:
+            f = self._open()
+            f.write(data)
+            f.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                self.fsync == "interval"
+                and now - self._last_sync >= self.fsync_interval
+            ):
+                os.fsync(f.fileno())
+                self._last_sync = now
+
+    def sync(self) -> None:
+        """立即落盘（interval/never 策略下关闭前调用）"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                if self.fsync != "never":
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def _open(self) -> BinaryIO:
+        if self._file is None or self._file.closed or not self.path.exists():
+            if self._file is not None:
+                self._file.close()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                valid = _valid_end(self.path)
+                if valid < self.path.stat().st_size:
+                    logger.warning(
+                        f"[交易流水] 截断残缺尾行 {self.path.stat().st_size - valid} 字节"
+                    )
+                    os.truncate(self.path, valid)
+            self._file = open(self.path, "ab")
+        return self._file
+
+    # ==================== 读取 ====================
+
+    def archives(self) -> List[Path]:
+        """归档文件，由旧到新"""
+        stem = self.path.name[: -len(self.path.suffix)]
+        return sorted(
+            p
+            for p in self.path.parent.glob(f"{stem}.*{self.path.suffix}")
+            if p != self.path
+        )
+
+    def tail(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """最近 limit 条记录（由旧到新），不读取更早的部分"""
+        records: List[Dict[str, Any]] = []  # 由新到旧
+        if limit <= 0:
+            return records
+        # 当前文件向前读到开头仍不足 limit 条（损坏行不计数）才继续读更早的归档
+        for path in [self.path, *reversed(self.archives())]:
+            if not path.exists():
+                continue
+            for line in _reverse_lines(path):
+                record = _decode(line)
+                if record is None:
+                    continue
+                records.append(record)
+                if len(records) >= limit:
+                    return records[::-1]
+        return records[::-1]
+
+    def iter_records(self, include_archives: bool = True) -> Iterator[Dict[str, Any]]:
+        """全部记录，由旧到新（跳过损坏行）"""
+        paths = [*self.archives(), self.path] if include_archives else [self.path]
+        for path in paths:
+            if not path.exists():
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 残缺尾行
+                    record = _decode(line)
+                    if record is not None:
+                        yield record
+
+    def count(self) -> int:
+        """记录行数（含归档），按字节增量计数，不解析 JSON"""
+        total = 0
+        for archive in self.archives():
+            if archive.name not in self._archive_counts:
+                with open(archive, "rb") as f:
+                    self._archive_counts[archive.name] = sum(
+                        block.count(b"\n")
+                        for block in iter(lambda: f.read(_BLOCK_SIZE), b"")
+                    )
+            total += self._archive_counts[archive.name]
+        if not self.path.exists():
+            return total
+
+        offset, lines = self._counted
+        if self.path.stat().st_size < offset:  # 被压缩/轮转过，重新计数
+            offset, lines = 0, 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            lines += sum(
+                block.count(b"\n") for block in iter(lambda: f.read(_BLOCK_SIZE), b"")
+            )
+            self._counted = (f.tell(), lines)
+        return total + lines
+
+    # ==================== 迁移 / 离线维护 ====================
+
+    def migrate_legacy(self, legacy_path: Union[str, Path]) -> int:
+        """
+        把旧的 JSON 数组历史迁移到流水文件
+
+        只在旧文件存在时执行；旧记录写在已有流水记录之前，
+        完成后旧文件改名为 .migrated。
+
+        Returns:
+            int: 迁移的记录数
+        """
+        legacy_path = Path(legacy_path)
+        if not legacy_path.exists():
+            return 0
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[交易流水] 旧历史文件无法解析，跳过迁移: {e}")
+            return 0
+        if not isinstance(data, list):
+            # 不是交易历史数组（如其他模块的同名文件），保持原样
+            logger.warning(f"[交易流水] {legacy_path.name} 不是交易记录数组，跳过迁移")
+            return 0
+        records = [r for r in data if isinstance(r, dict)]
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            existing = self.path.read_bytes() if self.path.exists() else b""
+            if existing and not existing.endswith(b"\n"):
+                existing = existing[: existing.rfind(b"\n") + 1]
+            self._write_atomic(
+                [
+                    (
+                        json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                    ).encode("utf-8")
+                    for r in records
+                ],
+                suffix=existing,
+            )
+            self._counted = (0, 0)
+        legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+        logger.info(f"[交易流水] 已迁移旧历史 {len(records)} 条 → {self.path.name}")
+        return len(records)
+
+    def compact(self, keep_days: Optional[float] = None) -> Dict[str, int]:
+        """
+        离线压缩当前流水文件：去掉损坏行与残缺尾行，可选丢弃超过 keep_days 天的记录
+
+        Returns:
+            Dict: kept / dropped / corrupt 计数
+        """
+        stats = {"kept": 0, "dropped": 0, "corrupt": 0}
+        if not self.path.exists():
+            return stats
+        cutoff = (
+            (datetime.now() - timedelta(days=keep_days)).isoformat()
+            if keep_days is not None
+            else None
+        )
+        lines: List[bytes] = []
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.path, "rb") as f:
+                for line in f:
+                    record = _decode(line) if line.endswith(b"\n") else None
+                    if record is None:
+                        stats["corrupt"] += 1
+                    elif cutoff and str(record.get("timestamp", "")) < cutoff:
+                        stats["dropped"] += 1
+                    else:
+                        stats["kept"] += 1
+                        lines.append(line)
+            self._write_atomic(lines)
+            self._counted = (0, 0)
+        logger.info(f"[交易流水] 压缩完成: {stats}")
+        return stats
+
+    def rotate(self, max_bytes: int = 0, keep: Optional[int] = None) -> Optional[Path]:
+        """
+        当前文件超过 max_bytes 时改名归档；keep 给出时只保留最近 keep 个归档
+
+        Returns:
+            Optional[Path]: 新归档路径（未轮转时为 None）
+        """
+        archive = None
+        with self._lock:
+            if self.path.exists() and self.path.stat().st_size > max_bytes:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                stem = self.path.name[: -len(self.path.suffix)]
+                archive = self.path.with_name(f"{stem}.{stamp}{self.path.suffix}")
+                self.path.replace(archive)
+                self._counted = (0, 0)
+                logger.info(f"[交易流水] 轮转归档: {archive.name}")
+        if keep is not None:
+            for old in self.archives()[: -keep or None]:
+                old.unlink()
+                self._archive_counts.pop(old.name, None)
+                logger.info(f"[交易流水] 删除旧归档: {old.name}")
+        return archive
+
+    def _write_atomic(self, lines: Sequence[bytes], suffix: bytes = b"") -> None:
+        temp_file = self.path.with_suffix(".tmp")
+        with open(temp_file, "wb") as f:
+            f.writelines(lines)
+            f.write(suffix)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """离线维护入口（机器人停止时运行）"""
+    from .state_persistence import resolve_state_data_dir
+
+    parser = argparse.ArgumentParser(description="交易流水离线维护")
+    parser.add_argument("command", choices=("stats", "compact", "rotate"))
+    parser.add_argument("data_dir", nargs="?", help="状态目录，默认同 StatePersistence")
+    parser.add_argument("--keep-days", type=float, help="compact: 只保留最近 N 天")
+    parser.add_argument(
+        "--max-mb", type=float, default=0, help="rotate: 超过该大小才轮转"
+    )
+    parser.add_argument("--keep", type=int, help="rotate: 保留的归档数")
+    args = parser.parse_args(argv)
+
+    data_dir = resolve_state_data_dir(Path(args.data_dir) if args.data_dir else None)
+    journal = TradeJournal(data_dir / JOURNAL_NAME)
+    journal.migrate_legacy(data_dir / LEGACY_NAME)
+
+    if args.command == "compact":
+        print(json.dumps(journal.compact(args.keep_days), ensure_ascii=False))
+    elif args.command == "rotate":
+        archive = journal.rotate(int(args.max_mb * 1024 * 1024), args.keep)
+        print(archive.name if archive else "未达到轮转大小")
+    else:
+        size = journal.path.stat().st_size if journal.path.exists() else 0
+        print(
+            json.dumps(
+                {
+                    "records": journal.count(),
+                    "bytes": size,
+                    "archives": [p.name for p in journal.archives()],
+                },
+                ensure_ascii=False,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,7 @@
 Exchange模块 - 交易所接口
 """
 
-from .account_service import AccountService, create_account_service
-from .client import ExchangeClient
-from .instrument_service import InstrumentService
-from .market_data import MarketDataService, create_market_data_service
-from .order_service import OrderService, create_order_service
+from ..utils.lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 
@@ -19,4 +15,18 @@ __all__ = [
     "create_market_data_service",
     "OrderService",
     "create_order_service",
+    "SimulatedExchangeClient",
 ]
+
+# ccxt 仅在真正使用交易所客户端/服务时导入
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".account_service": ("AccountService", "create_account_service"),
+        ".client": ("ExchangeClient",),
+        ".instrument_service": ("InstrumentService",),
+        ".market_data": ("MarketDataService", "create_market_data_service"),
+        ".order_service": ("OrderService", "create_order_service"),
+        ".simulated": ("SimulatedExchangeClient",),
+    },
+)
@@ -0,0 +1,151 @@
+"""
+算法单状态缓存
+
+以自身的创建/修改/取消响应（以及可选的 orders-algo 私有频道推送）维护
+当前挂单的算法单，REST 全量对账仅在超过对账间隔或出现不一致信号时进行。
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .okx_raw import parse_okx_algo_order
+
+logger = logging.getLogger(__name__)
+
+# orders-algo 频道中仍处于挂单状态的 state
+_PENDING_ALGO_STATES = {"live", "pause"}
+
+
+class AlgoOrderCache:
+    """按交易对缓存挂单中的算法单，并记录距离上次 REST 对账的时长"""
+
+    def __init__(
+        self,
+        reconcile_interval_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._orders: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._synced_at: Dict[str, float] = {}
+        self._stale_reason: Dict[str, str] = {}
+
+    def age_seconds(self, symbol: str) -> float:
+        """距上次 REST 全量对账的秒数，从未对账时返回 inf。"""
+        with self._lock:
+            synced_at = self._synced_at.get(symbol)
+        if synced_at is None:
+            return float("inf")
+        return max(0.0, self._clock() - synced_at)
+
+    def needs_reconcile(
+        self, symbol: str, max_age_seconds: Optional[float] = None
+    ) -> bool:
+        """是否需要 REST 对账：从未对账、被标记不一致或超过允许的缓存时长。"""
+        with self._lock:
+            if symbol in self._stale_reason:
+                return True
+        limit = (
+            self.reconcile_interval_seconds
+            if max_age_seconds is None
+            else max_age_seconds
+        )
+        return self.age_seconds(symbol) > limit
+
+    def get_orders(self, symbol: str) -> List[Dict[str, Any]]:
+        """返回缓存中的挂单算法单（浅拷贝）。"""
+        with self._lock:
+            return [dict(order) for order in self._orders.get(symbol, {}).values()]
+
+    def replace_all(self, symbol: str, orders: List[Dict[str, Any]]) -> None:
+        """以 REST 全量结果覆盖缓存并清除不一致标记。"""
+        with self._lock:
+            self._orders[symbol] = {
+                str(order.get("id")): order for order in orders if order.get("id")
+            }
+            self._synced_at[symbol] = self._clock()
+            self._stale_reason.pop(symbol, None)
+
+    def upsert(self, order: Dict[str, Any]) -> None:
+        """写入单条算法单（来自创建响应或频道推送）。"""
+        algo_id = str(order.get("id") or "")
+        if not algo_id:
+            return
+        with self._lock:
+            self._orders.setdefault(order.get("symbol", ""), {})[algo_id] = order
+
+    def record_created(
+        self,
+        symbol: str,
+        algo_id: str,
+        stop_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None,
+    ) -> None:
+        """根据本地创建成功的响应写入缓存。"""
+        info: Dict[str, Any] = {"algoId": algo_id, "state": "live"}
+        if stop_price is not None:
+            info["slTriggerPx"] = str(stop_price)
+        if take_profit_price is not None:
+            info["tpTriggerPx"] = str(take_profit_price)
+        self.upsert(parse_okx_algo_order(info, symbol))
+
+    def record_amended(
+        self,
+        symbol: str,
+        algo_id: str,
+        stop_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None,
+    ) -> None:
+        """原地修改成功后更新触发价；缓存中没有该单时标记不一致。"""
+        with self._lock:
+            order = self._orders.get(symbol, {}).get(algo_id)
+            if order is None:
+                self._stale_reason[symbol] = f"amended_unknown:{algo_id}"
+                return
+            info = dict(order.get("info") or {})
+            if stop_price is not None:
+                info["slTriggerPx"] = str(stop_price)
+            if take_profit_price is not None:
+                info["tpTriggerPx"] = str(take_profit_price)
+            self._orders[symbol][algo_id] = {**order, "info": info}
+
+    def remove(self, symbol: str, algo_id: str) -> None:
+        """取消成功或确认已不存在时移除。"""
+        with self._lock:
+            self._orders.get(symbol, {}).pop(str(algo_id), None)
+
+    def mark_stale(self, symbol: str, reason: str) -> None:
+        """标记缓存与交易所可能不一致，下次读取时强制 REST 对账。"""
+        with self._lock:
+            self._stale_reason[symbol] = reason
+        logger.debug(f"[算法单缓存] 标记待对账: symbol={symbol}, 原因={reason}")
+
+    def apply_push(self, message: Dict[str, Any], symbol: str) -> int:
+        """应用 orders-algo 私有频道推送，返回处理的条目数。"""
+        count = 0
+        for raw in message.get("data") or []:
+            algo_id = str(raw.get("algoId") or "")
+            if not algo_id:
+                continue
+            if str(raw.get("state", "")).lower() in _PENDING_ALGO_STATES:
+                self.upsert(parse_okx_algo_order(raw, symbol))
+            else:
+                self.remove(symbol, algo_id)
+            count += 1
+        return count
+
+    def snapshot(self, symbol: str) -> Dict[str, Any]:
+        """缓存状态（用于系统状态展示）。"""
+        age = self.age_seconds(symbol)
+        with self._lock:
+            stale_reason = self._stale_reason.get(symbol, "")
+            order_count = len(self._orders.get(symbol, {}))
+        return {
+            "orders": order_count,
+            "age_seconds": None if age == float("inf") else round(age, 3),
+            "stale_reason": stale_reason,
+            "reconcile_interval_seconds": self.reconcile_interval_seconds,
+        }
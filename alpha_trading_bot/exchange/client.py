@@ -6,15 +6,18 @@
 import asyncio
 import logging
 import time
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import ccxt
 
 from .account_service import AccountService, create_account_service
+from .algo_order_cache import AlgoOrderCache
 from .instrument_service import InstrumentService
 from .market_data import MarketDataService, create_market_data_service
+from .models.candles import CandleSeries
 from .models.instruments import InstrumentSpec
-from .models.orders import OrderIntent, OrderResult, OrderStatus
+from .models.orders import BatchOrderRequest, OrderIntent, OrderResult, OrderStatus
 from .okx_raw import (
     ensure_okx_success,
     get_callable,
@@ -44,6 +47,9 @@ class ExchangeClient:
         max_position_usage: float = 0.30,
         order_confirm_timeout_seconds: float = 5.0,
         order_confirm_poll_interval_seconds: float = 0.25,
+        algo_cache_reconcile_seconds: float = 60.0,
+        instrument_cache_dir: Optional[str] = None,
+        instrument_cache_ttl_seconds: float = 86400.0,
     ):
         self.api_key = api_key
         self.secret = secret
@@ -63,6 +69,9 @@ class ExchangeClient:
         self._raw_executor: Optional[OkxRawExecutor] = None
         self._instrument_service: Optional[InstrumentService] = None
         self._instrument_spec: Optional[InstrumentSpec] = None
+        self._algo_cache = AlgoOrderCache(algo_cache_reconcile_seconds)
+        self._instrument_cache_dir = instrument_cache_dir
+        self._instrument_cache_ttl_seconds = instrument_cache_ttl_seconds
 
     async def initialize(self) -> None:
         """初始化"""
@@ -92,17 +101,37 @@ class ExchangeClient:
         )
         self._order_service = create_order_service(self.exchange, self.symbol)
         self._raw_executor = OkxRawExecutor(self.exchange)
-        self._instrument_service = InstrumentService(self.exchange, self.symbol)
-        self._instrument_spec = await self._instrument_service.load()
+        # TTL 为 0 时不使用磁盘缓存
+        cache_dir = (
+            Path(self._instrument_cache_dir)
+            if self._instrument_cache_dir and self._instrument_cache_ttl_seconds > 0
+            else None
+        )
+        self._instrument_service = InstrumentService(
+            self.exchange,
+            self.symbol,
+            cache_dir=cache_dir,
+            cache_ttl_seconds=self._instrument_cache_ttl_seconds,
+        )
 
-        await asyncio.get_event_loop().run_in_executor(
-            None, lambda: self.exchange.fetch_time()
+        # 合约规格与连通性检查互不依赖，并发执行
+        self._instrument_spec, _ = await asyncio.gather(
+            self._instrument_service.load(),
+            asyncio.get_event_loop().run_in_executor(
+                None, lambda: self.exchange.fetch_time()
+            ),
         )
         logger.info("交易所客户端初始化完成")
 
     @property
     def instrument_spec(self) -> InstrumentSpec:
         """返回已初始化的 OKX 合约规格。"""
+        if (
+            self._instrument_service is not None
+            and self._instrument_service.spec is not None
+        ):
+            # 磁盘缓存启动时，后台刷新完成后使用最新规格
+            self._instrument_spec = self._instrument_service.spec
         if self._instrument_spec is None:
             raise RuntimeError("instrument metadata is not initialized")
         return self._instrument_spec
@@ -203,6 +232,12 @@ class ExchangeClient:
         """获取K线数据"""
         return await self._market_data_service.get_ohlcv(timeframe, limit)
 
+    async def get_candles(
+        self, timeframe: str = "1h", limit: int = 100
+    ) -> CandleSeries:
+        """获取K线数据（列式序列）"""
+        return await self._market_data_service.get_candles(timeframe, limit)
+
     async def get_market_data(self) -> Dict[str, Any]:
         """获取市场数据 - 包含技术指标"""
         return await self._market_data_service.get_market_data()
@@ -281,8 +316,14 @@ class ExchangeClient:
         amount: float,
         intent: OrderIntent,
         position_side: str,
+        attached_stop_price: Optional[float] = None,
+        attach_algo_cl_ord_id: str = "",
     ) -> OrderResult:
-        """提交市价单并等待交易所确认成交或终态。"""
+        """提交市价单并等待交易所确认成交或终态。
+
+        传入 attached_stop_price 时随单附带止损（OKX attachAlgoOrds），
+        成交即受保护，可用 find_attached_algo_order 按 attach_algo_cl_ord_id 找回算法单ID。
+        """
         if self.test_mode:
             return await self.create_order_with_status(
                 symbol=symbol,
@@ -296,6 +337,16 @@ class ExchangeClient:
         if self._order_service is None:
             raise RuntimeError("Order service is not initialized")
 
+        attach_kwargs = {}
+        if attached_stop_price:
+            if not attach_algo_cl_ord_id:
+                raise ValueError("attach_algo_cl_ord_id is required for attached stop")
+            attach_kwargs["attach_algo_ords"] = [
+                self._order_service.build_attached_stop_loss(
+                    attached_stop_price, attach_algo_cl_ord_id
+                )
+            ]
+
         return await self._order_service.create_confirmed_market_order(
             symbol,
             side,
@@ -304,7 +355,38 @@ class ExchangeClient:
             position_side,
             self._order_confirm_timeout_seconds,
             self._order_confirm_poll_interval_seconds,
+            **attach_kwargs,
+        )
+
+    async def find_attached_algo_order(
+        self,
+        symbol: str,
+        attach_algo_cl_ord_id: str,
+        max_attempts: int = 3,
+        retry_delay: float = 0.2,
+    ) -> Optional[Dict[str, Any]]:
+        """按 algoClOrdId 查找开仓单成交后生成的附带止损算法单。"""
+        if self.test_mode:
+            return {
+                "id": f"SIMULATED_STOP_{int(time.time())}",
+                "status": OrderStatus.OPEN.value,
+                "symbol": symbol,
+                "type": "conditional",
+                "info": {"algoClOrdId": attach_algo_cl_ord_id},
+            }
+
+        for attempt in range(max_attempts):
+            for order in await self.get_algo_orders(symbol):
+                info = order.get("info") or {}
+                if info.get("algoClOrdId") == attach_algo_cl_ord_id:
+                    return order
+            if attempt < max_attempts - 1:
+                await asyncio.sleep(retry_delay)
+
+        logger.warning(
+            f"[附带止损] 未找到附带止损算法单: algoClOrdId={attach_algo_cl_ord_id}"
         )
+        return None
 
     async def get_order_status(self, order_id: str, symbol: str) -> OrderResult:
         """查询普通订单状态。"""
@@ -326,9 +408,12 @@ class ExchangeClient:
             )
             return simulated_id
 
-        return await self._order_service.create_stop_loss(
+        algo_id = await self._order_service.create_stop_loss(
             symbol, side, amount, stop_price
         )
+        if algo_id:
+            self._algo_cache.record_created(symbol, str(algo_id), stop_price=stop_price)
+        return algo_id
 
     async def create_take_profit(
         self,
@@ -347,9 +432,15 @@ class ExchangeClient:
             )
             return simulated_id
 
-        return await self._order_service.create_take_profit(
+        result = await self._order_service.create_take_profit(
             symbol, side, amount, take_profit_price
         )
+        algo_id = str(getattr(result, "order_id", result) or "")
+        if algo_id and getattr(result, "is_success", True):
+            self._algo_cache.record_created(
+                symbol, algo_id, take_profit_price=take_profit_price
+            )
+        return result
 
     async def cancel_order(self, order_id: str, symbol: str) -> tuple[bool, str]:
         """取消订单
@@ -365,7 +456,103 @@ class ExchangeClient:
         Returns:
             tuple: (success: bool, reason: str)
         """
-        return await self._order_service.cancel_algo_order(algo_id, symbol)
+        result = await self._order_service.cancel_algo_order(algo_id, symbol)
+        self._record_algo_cancel(symbol, algo_id, result)
+        return result
+
+    def _record_algo_cancel(
+        self, symbol: str, algo_id: str, result: tuple[bool, str]
+    ) -> None:
+        """按撤单结果更新算法单缓存，失败时标记待对账。"""
+        success, reason = result
+        if success or reason == "already_gone":
+            self._algo_cache.remove(symbol, algo_id)
+        else:
+            self._algo_cache.mark_stale(symbol, f"cancel_{reason}:{algo_id}")
+
+    async def create_orders_batch(
+        self, requests: List[BatchOrderRequest]
+    ) -> List[OrderResult]:
+        """批量下单，按请求顺序返回逐单结果。"""
+        if self.test_mode:
+            logger.warning(
+                f"[交易保护] TEST_MODE=true，跳过真实批量下单: count={len(requests)}"
+            )
+            timestamp = int(time.time())
+            return [
+                OrderResult(
+                    order_id=(
+                        f"SIMULATED_ORDER_{request.side.upper()}_{timestamp}_{index}"
+                    ),
+                    status=OrderStatus.CLOSED,
+                    symbol=request.symbol,
+                    side=request.side,
+                    order_type=request.order_type,
+                    requested_amount=request.amount,
+                    filled_amount=request.amount,
+                    remaining_amount=0.0,
+                    average_price=request.price or 0.0,
+                )
+                for index, request in enumerate(requests)
+            ]
+
+        return await self._order_service.create_orders_batch(requests)
+
+    async def cancel_orders_batch(
+        self, order_ids: List[str], symbol: str
+    ) -> Dict[str, tuple[bool, str]]:
+        """批量取消普通订单
+
+        Returns:
+            dict: order_id -> (success: bool, reason: str)
+        """
+        return await self._order_service.cancel_orders_batch(order_ids, symbol)
+
+    async def cancel_algo_orders(
+        self, algo_ids: List[str], symbol: str
+    ) -> Dict[str, tuple[bool, str]]:
+        """批量取消算法单（止损单、止盈单等），一次请求完成
+
+        Returns:
+            dict: algo_id -> (success: bool, reason: str)
+        """
+        results = await self._order_service.cancel_algo_orders(algo_ids, symbol)
+        for algo_id, result in results.items():
+            self._record_algo_cancel(symbol, algo_id, result)
+        return results
+
+    async def amend_algo_order(
+        self,
+        algo_id: str,
+        symbol: str,
+        new_stop_price: Optional[float] = None,
+        new_take_profit_price: Optional[float] = None,
+    ) -> tuple[bool, str]:
+        """原地修改算法单触发价
+
+        Returns:
+            tuple: (success: bool, reason: str)
+        """
+        if self.test_mode:
+            logger.warning(
+                "[交易保护] TEST_MODE=true，跳过真实算法单修改: "
+                f"algo_id={algo_id}, new_stop_price={new_stop_price}, "
+                f"new_take_profit_price={new_take_profit_price}"
+            )
+            return (True, "success")
+
+        success, reason = await self._order_service.amend_algo_order(
+            algo_id, symbol, new_stop_price, new_take_profit_price
+        )
+        if success:
+            self._algo_cache.record_amended(
+                symbol, algo_id, new_stop_price, new_take_profit_price
+            )
+        elif reason == "already_gone":
+            self._algo_cache.remove(symbol, algo_id)
+        elif reason == "failed":
+            self._algo_cache.mark_stale(symbol, f"amend_failed:{algo_id}")
+        return (success, reason)
 
     async def get_open_orders(self, symbol: str) -> list:
         """获取当前未成交订单（普通订单）"""
@@ -411,11 +598,40 @@ class ExchangeClient:
                 )
             else:
                 raise RuntimeError("OKX raw algo-orders endpoint is unavailable")
+            self._algo_cache.replace_all(symbol, algo_orders)
             return algo_orders
         except Exception as e:
             logger.error(f"[算法订单查询] 获取算法订单失败: {e}")
+            self._algo_cache.mark_stale(symbol, "rest_query_failed")
             return []
 
+    @property
+    def algo_order_cache(self) -> AlgoOrderCache:
+        """算法单状态缓存。"""
+        return self._algo_cache
+
+    async def get_cached_algo_orders(
+        self,
+        symbol: str,
+        max_age_seconds: Optional[float] = None,
+        force_refresh: bool = False,
+    ) -> list:
+        """读取算法单缓存，超过对账间隔、被标记不一致或强制刷新时走 REST 全量对账。
+
+        Args:
+            max_age_seconds: 本次允许的最大缓存时长，默认使用对账间隔
+            force_refresh: 风险关键路径强制 REST 刷新
+        """
+        if force_refresh or self._algo_cache.needs_reconcile(symbol, max_age_seconds):
+            return await self.get_algo_orders(symbol)
+        return self._algo_cache.get_orders(symbol)
+
+    def apply_algo_order_push(
+        self, message: Dict[str, Any], symbol: Optional[str] = None
+    ) -> int:
+        """应用 orders-algo 私有频道推送到算法单缓存。"""
+        return self._algo_cache.apply_push(message, symbol or self.symbol)
+
     async def get_algo_order_history(
         self,
         symbol: str,
@@ -468,9 +684,7 @@ class ExchangeClient:
                     collected.append(order)
             except Exception as e:
                 last_error = e
-                logger.warning(
-                    f"[算法订单查询] ordType={ord_type} 查询失败: {e}"
-                )
+                logger.warning(f"[算法订单查询] ordType={ord_type} 查询失败: {e}")
 
         if last_error and not collected:
             logger.error(f"[算法订单查询] 全部 ordType 查询失败: {last_error}")
@@ -478,5 +692,7 @@ class ExchangeClient:
 
     async def cleanup(self) -> None:
         """清理"""
+        if self._instrument_service is not None:
+            await self._instrument_service.close()
         if self.exchange:
             logger.info("交易所客户端清理完成")
@@ -1,7 +1,12 @@
 """OKX 合约元数据加载服务。"""
 
 import asyncio
-from typing import Any, Optional
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
 
 from alpha_trading_bot.exchange.models import InstrumentSpec
 from alpha_trading_bot.exchange.okx_raw import (
@@ -10,20 +15,91 @@ from alpha_trading_bot.exchange.okx_raw import (
     okx_inst_id_from_symbol,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class InstrumentService:
-    """加载并缓存指定永续合约的 OKX 元数据。"""
+    """加载并缓存指定永续合约的 OKX 元数据。
+
+    配置 cache_dir 时规格同时持久化到磁盘：重启时在 TTL 内直接使用磁盘缓存，
+    并在后台刷新；磁盘缓存过期且拉取失败时退回过期缓存。
+    """
 
-    def __init__(self, exchange: Any, symbol: str) -> None:
+    def __init__(
+        self,
+        exchange: Any,
+        symbol: str,
+        cache_dir: Optional[Path] = None,
+        cache_ttl_seconds: float = 86400.0,
+    ) -> None:
         self.exchange = exchange
         self.symbol = symbol
+        self.cache_ttl_seconds = cache_ttl_seconds
         self._cached: Optional[InstrumentSpec] = None
+        self._cache_path: Optional[Path] = (
+            Path(cache_dir) / f"instrument_{okx_inst_id_from_symbol(symbol)}.json"
+            if cache_dir is not None
+            else None
+        )
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def spec(self) -> Optional[InstrumentSpec]:
+        """当前已加载的合约规格（后台刷新后会更新）。"""
+        return self._cached
 
     async def load(self) -> InstrumentSpec:
-        """通过 OKX 原始公开接口加载合约规格。"""
+        """加载合约规格：内存缓存 → 未过期磁盘缓存（后台刷新） → OKX 原始公开接口。"""
         if self._cached is not None:
             return self._cached
 
+        disk = self._read_disk_cache()
+        if disk is not None and disk[1] <= self.cache_ttl_seconds:
+            self._cached = disk[0]
+            logger.info(
+                f"[合约规格] 使用磁盘缓存: {self._cached.inst_id}, "
+                f"缓存时长={disk[1]:.0f}秒，后台刷新"
+            )
+            self._refresh_task = asyncio.create_task(self._refresh())
+            return self._cached
+
+        try:
+            spec = await self._fetch()
+        except Exception as e:
+            if disk is None:
+                raise
+            logger.warning(f"[合约规格] 拉取失败，使用过期磁盘缓存: {e}")
+            self._cached = disk[0]
+            return self._cached
+
+        self._cached = spec
+        self._write_disk_cache(spec)
+        return spec
+
+    async def close(self) -> None:
+        """取消未完成的后台刷新。"""
+        task = self._refresh_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh(self) -> None:
+        """后台刷新规格并回写磁盘缓存。"""
+        try:
+            spec = await self._fetch()
+        except Exception as e:
+            logger.warning(f"[合约规格] 后台刷新失败，继续使用缓存: {e}")
+            return
+        if spec != self._cached:
+            logger.warning(f"[合约规格] 规格已变化，更新缓存: {spec.to_okx()}")
+        self._cached = spec
+        self._write_disk_cache(spec)
+
+    async def _fetch(self) -> InstrumentSpec:
+        """通过 OKX 原始公开接口加载合约规格。"""
         method = get_callable(
             self.exchange,
             "public_get_public_instruments",
@@ -54,5 +130,34 @@ class InstrumentService:
                 f"expected {inst_id}, got {raw.get('instId')}"
             )
 
-        self._cached = InstrumentSpec.from_okx(raw)
-        return self._cached
+        return InstrumentSpec.from_okx(raw)
+
+    def _read_disk_cache(self) -> Optional[Tuple[InstrumentSpec, float]]:
+        """读取磁盘缓存，返回 (规格, 缓存时长秒)；缺失或损坏时返回 None。"""
+        if self._cache_path is None or not self._cache_path.exists():
+            return None
+        try:
+            payload = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            spec = InstrumentSpec.from_okx(payload["instrument"])
+            age = max(0.0, time.time() - float(payload["saved_at"]))
+        except Exception as e:
+            logger.warning(f"[合约规格] 磁盘缓存无效，忽略: {e}")
+            return None
+        if spec.inst_id != okx_inst_id_from_symbol(self.symbol):
+            return None
+        return spec, age
+
+    def _write_disk_cache(self, spec: InstrumentSpec) -> None:
+        """原子写入磁盘缓存，失败只记录日志。"""
+        if self._cache_path is None:
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cache_path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps({"saved_at": time.time(), "instrument": spec.to_okx()}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"[合约规格] 写入磁盘缓存失败: {e}")
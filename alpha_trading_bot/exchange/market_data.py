@@ -4,8 +4,9 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence
 
+from .models.candles import CandleSeries
 from .okx_raw import (
     ensure_okx_success,
     get_callable,
@@ -58,24 +59,15 @@ class MarketDataService:
         }
         return timeframe_map.get(timeframe, timeframe)
 
-    def _parse_okx_ohlcv(self, response: Dict[str, Any]) -> List[List[float]]:
+    def _parse_okx_candles(self, response: Dict[str, Any]) -> CandleSeries:
         ensure_okx_success(response, "candles")
 
-        candles = []
-        for raw in response.get("data") or []:
-            if len(raw) < 6:
-                continue
-            candles.append(
-                [
-                    int(to_float(raw[0])),
-                    to_float(raw[1]),
-                    to_float(raw[2]),
-                    to_float(raw[3]),
-                    to_float(raw[4]),
-                    to_float(raw[5]),
-                ]
-            )
-        candles.sort(key=lambda candle: candle[0])
+        rows = [raw for raw in response.get("data") or [] if len(raw) >= 6]
+        # OKX 按时间倒序返回，按时间戳排序后逐列写入
+        rows.sort(key=lambda raw: to_float(raw[0]))
+        candles = CandleSeries(capacity=len(rows))
+        for raw in rows:
+            candles.append([to_float(value) for value in raw[:6]])
         return candles
 
     def _parse_okx_ticker(self, response: Dict[str, Any]) -> Dict[str, Any]:
@@ -103,7 +95,13 @@ class MarketDataService:
     async def get_ohlcv(
         self, timeframe: str = "1h", limit: int = 100
     ) -> List[List[float]]:
-        """获取K线数据"""
+        """获取K线数据（行格式）"""
+        return (await self.get_candles(timeframe, limit)).to_rows()
+
+    async def get_candles(
+        self, timeframe: str = "1h", limit: int = 100
+    ) -> CandleSeries:
+        """获取K线数据（列式序列）"""
         try:
             method = self._get_okx_candles_method()
             if method is not None:
@@ -112,15 +110,15 @@ class MarketDataService:
                     "bar": self._okx_bar_from_timeframe(timeframe),
                     "limit": str(limit),
                 }
-                ohlcv = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: self._parse_okx_ohlcv(method(params))
+                candles = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: self._parse_okx_candles(method(params))
                 )
             else:
                 raise RuntimeError("OKX raw candles endpoint is unavailable")
-            return ohlcv
+            return candles
         except Exception as e:
             logger.error(f"获取K线数据失败: {e}")
-            return []
+            return CandleSeries()
 
     async def get_ticker(self) -> Dict[str, Any]:
         """获取 ticker 数据"""
@@ -152,22 +150,20 @@ class MarketDataService:
             if not self.validate_price_data(current_price, "last_valid_ticker"):
                 logger.warning("价格数据无效，使用 0")
 
-        ohlcv = await self.get_ohlcv(limit=100)
-
-        closes = [c[4] for c in ohlcv] if ohlcv else []
-        highs = [c[2] for c in ohlcv] if ohlcv else []
-        lows = [c[3] for c in ohlcv] if ohlcv else []
+        candles = await self.get_candles(limit=100)
+        closes = candles.closes
 
         from ..utils.technical import calculate_all_indicators
 
         technical_data = {}
         if len(closes) >= 50:
-            technical_data = calculate_all_indicators(closes, highs, lows, closes)
+            technical_data = calculate_all_indicators(
+                closes, candles.highs, candles.lows, closes
+            )
 
         recent_drop = self._calculate_recent_drop(closes)
         short_term_drop = self._calculate_short_term_drop(closes)
         short_term_rise = self._calculate_short_term_rise(closes)
-        hourly_changes = self._calculate_hourly_changes(closes)
 
         return {
             "symbol": self.symbol,
@@ -180,11 +176,12 @@ class MarketDataService:
             "recent_drop_percent": recent_drop,
             "short_term_drop_percent": short_term_drop,
             "short_term_rise_percent": short_term_rise,
-            "price_history": closes,
-            "hourly_changes": hourly_changes,
+            "price_history": closes.tolist(),
+            "hourly_changes": candles.returns.tolist(),
+            "candles": candles,
         }
 
-    def _calculate_recent_drop(self, closes: List[float]) -> float:
+    def _calculate_recent_drop(self, closes: Sequence[float]) -> float:
         if len(closes) < 2:
             return 0.0
 
@@ -198,7 +195,7 @@ class MarketDataService:
 
         return 0.0
 
-    def _calculate_short_term_drop(self, closes: List[float]) -> float:
+    def _calculate_short_term_drop(self, closes: Sequence[float]) -> float:
         if len(closes) < 4:
             return 0.0
 
@@ -211,7 +208,7 @@ class MarketDataService:
 
         return 0.0
 
-    def _calculate_short_term_rise(self, closes: List[float]) -> float:
+    def _calculate_short_term_rise(self, closes: Sequence[float]) -> float:
         if len(closes) < 4:
             return 0.0
 
@@ -224,17 +221,7 @@ class MarketDataService:
 
         return 0.0
 
-    def _calculate_hourly_changes(self, closes: List[float]) -> List[float]:
-        if len(closes) < 2:
-            return []
-        changes = []
-        for i in range(1, len(closes)):
-            if closes[i - 1] > 0:
-                change = (closes[i] - closes[i - 1]) / closes[i - 1]
-                changes.append(change)
-        return changes
-
-    def calculate_1h_drop(self, ohlcv: List[List[float]]) -> float:
+    def calculate_1h_drop(self, ohlcv: Sequence[Sequence[float]]) -> float:
         if not ohlcv or len(ohlcv) < 2:
             return 0.0
 
@@ -1,9 +1,18 @@
 """订单模型"""
 
+from .candles import CandleSeries
 from .instruments import InstrumentSpec
-from .orders import OrderIntent, OrderResult, OrderStatus, StopOrderResult
+from .orders import (
+    BatchOrderRequest,
+    OrderIntent,
+    OrderResult,
+    OrderStatus,
+    StopOrderResult,
+)
 
 __all__ = [
+    "BatchOrderRequest",
+    "CandleSeries",
     "InstrumentSpec",
     "OrderIntent",
     "OrderResult",
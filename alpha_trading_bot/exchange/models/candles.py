@@ -0,0 +1,199 @@
+"""
+列式K线序列
+
+以标准库 array('d') 按列存储 OHLCV，列访问返回只读 memoryview（零拷贝），
+切片返回共享底层缓冲区的视图。缓冲区按容量预分配，追加 K 线不会使已导出的
+视图失效；容量不足时换用新缓冲区，旧视图保留扩容前的快照。
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+# 列顺序与 OKX / ccxt OHLCV 行一致
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+_MIN_CAPACITY = 128
+
+
+class CandleSeries:
+    """按时间从旧到新排列的 OHLCV 序列"""
+
+    __slots__ = ("_columns", "_start", "_stop", "_readonly", "_derived")
+
+    def __init__(self, capacity: int = _MIN_CAPACITY) -> None:
+        capacity = max(int(capacity), 1)
+        self._columns: List[array] = [array("d", bytes(8 * capacity)) for _ in COLUMNS]
+        self._start = 0
+        self._stop = 0
+        self._readonly = False
+        self._derived: Dict[str, memoryview] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[float]]) -> "CandleSeries":
+        """由 [ts, open, high, low, close, volume] 行构建"""
+        rows = list(rows)
+        series = cls(capacity=max(len(rows), _MIN_CAPACITY))
+        for row in rows:
+            series.append(row)
+        return series
+
+    # ------------------------------------------------------------------
+    # 序列协议
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __bool__(self) -> bool:
+        return self._stop > self._start
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[List[float], "CandleSeries"]:
+        if isinstance(index, slice):
+            return self._slice(index)
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("candle index out of range")
+        return self._row(self._start + index)
+
+    def __iter__(self) -> Iterator[List[float]]:
+        for i in range(self._start, self._stop):
+            yield self._row(i)
+
+    def __repr__(self) -> str:
+        return f"CandleSeries(len={len(self)})"
+
+    def to_rows(self) -> List[List[float]]:
+        """转换为 OHLCV 行列表（时间戳为 int）"""
+        return list(self)
+
+    # ------------------------------------------------------------------
+    # 列视图
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> memoryview:
+        """返回指定列的只读零拷贝视图"""
+        buffer = self._columns[COLUMNS.index(name)]
+        return memoryview(buffer)[self._start : self._stop].toreadonly()
+
+    @property
+    def timestamps(self) -> memoryview:
+        return self.column("timestamp")
+
+    @property
+    def opens(self) -> memoryview:
+        return self.column("open")
+
+    @property
+    def highs(self) -> memoryview:
+        return self.column("high")
+
+    @property
+    def lows(self) -> memoryview:
+        return self.column("low")
+
+    @property
+    def closes(self) -> memoryview:
+        return self.column("close")
+
+    @property
+    def volumes(self) -> memoryview:
+        return self.column("volume")
+
+    @property
+    def returns(self) -> memoryview:
+        """
+        相邻收盘价变化率（缓存，数据变更后重新计算）"""
+        cached = self._derived.get("returns")
+        if cached is None:
+            cached = memoryview(close_returns(self.closes)).toreadonly()
+            self._derived["returns"] = cached
+        return cached
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+
+    def append(self, candle: Sequence[float]) -> None:
+        """追加一根K线"""
+        self._ensure_writable()
+        if self._stop == len(self._columns[0]):
+            self._grow()
+        for buffer, value in zip(self._columns, candle[: len(COLUMNS)]):
+            buffer[self._stop] = float(value)
+        self._stop += 1
+        self._derived.clear()
+
+    def update_last(self, candle: Sequence[float]) -> None:
+        """原地更新最后一根（未收盘）K线"""
+        self._ensure_writable()
+        if not self:
+            raise IndexError("update_last on empty CandleSeries")
+        for buffer, value in zip(self._columns, candle[: len(COLUMNS)]):
+            buffer[self._stop - 1] = float(value)
+        self._derived.clear()
+
+    def upsert(self, candle: Sequence[float]) -> None:
+        """同一时间戳则更新最后一根，否则追加"""
+        if self and self._columns[0][self._stop - 1] == float(candle[0]):
+            self.update_last(candle)
+        else:
+            self.append(candle)
+
+    # ------------------------------------------------------------------
+    # 内部方法
+    # ------------------------------------------------------------------
+
+    def _row(self, i: int) -> List[float]:
+        row = [buffer[i] for buffer in self._columns]
+        row[0] = int(row[0])
+        return row
+
+    def _slice(self, index: slice) -> "CandleSeries":
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return CandleSeries.from_rows(self.to_rows()[index])
+        view = CandleSeries.__new__(CandleSeries)
+        view._columns = self._columns
+        view._start = self._start + start
+        view._stop = self._start + max(start, stop)
+        view._readonly = True
+        view._derived = {}
+        return view
+
+    def _grow(self) -> None:
+        capacity = max(len(self._columns[0]) * 2, _MIN_CAPACITY)
+        grown: List[array] = []
+        for buffer in self._columns:
+            new_buffer = array("d", bytes(8 * capacity))
+            new_buffer[: self._stop] = buffer[: self._stop]
+            grown.append(new_buffer)
+        self._columns = grown
+
+    def _ensure_writable(self) -> None:
+        if self._readonly:
+            raise ValueError("CandleSeries slice views are read-only")
+
+
+def close_returns(closes: Sequence[float]) -> array:
+    """相邻收盘价变化率，前一根收盘价非正时跳过该项"""
+    return array(
+        "d",
+        (
+            (closes[i] - closes[i - 1]) / closes[i - 1]
+            for i in range(1, len(closes))
+            if closes[i - 1] > 0
+        ),
+    )
+
+
+def as_candle_series(
+    candles: Optional[Union["CandleSeries", Iterable[Sequence[float]]]],
+) -> CandleSeries:
+    """将 CandleSeries 或 OHLCV 行列表统一为 CandleSeries"""
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_rows(candles or [])
@@ -60,6 +60,19 @@ class InstrumentSpec:
             tick_size=_decimal(raw.get("tickSz")),
         )
 
+    def to_okx(self) -> Dict[str, str]:
+        return {
+            "instId": self.inst_id,
+            "instType": self.inst_type,
+            "settleCcy": self.settle_currency,
+            "ctVal": str(self.contract_value),
+            "ctMult": str(self.contract_multiplier),
+            "ctValCcy": self.contract_value_currency,
+            "minSz": str(self.minimum_size),
+            "lotSz": str(self.lot_size),
+            "tickSz": str(self.tick_size),
+        }
+
     @property
     def base_currency(self) -> str:
         return self.inst_id.split("-", 1)[0]
@@ -26,6 +26,19 @@ class OrderIntent(Enum):
     REDUCE = "reduce"
 
 
+@dataclass
+class BatchOrderRequest:
+    """批量下单中的单个订单"""
+
+    symbol: str
+    side: str
+    amount: float
+    price: Optional[float] = None
+    order_type: str = "market"
+    intent: OrderIntent = OrderIntent.OPEN
+    position_side: str = ""
+
+
 @dataclass
 class OrderResult:
     """订单执行结果"""
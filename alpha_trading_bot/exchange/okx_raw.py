@@ -103,16 +103,16 @@ def parse_okx_algo_orders(
 ) -> List[Dict[str, Any]]:
     """解析 OKX 算法单列表。"""
     ensure_okx_success(response, "algo orders")
-    orders = []
-    for raw in response.get("data") or []:
-        algo_id = raw.get("algoId") or raw.get("id") or ""
-        orders.append(
-            {
-                "id": str(algo_id),
-                "status": okx_order_status(raw.get("state")).value,
-                "symbol": symbol,
-                "type": raw.get("ordType", "conditional"),
-                "info": raw,
-            }
-        )
-    return orders
+    return [parse_okx_algo_order(raw, symbol) for raw in response.get("data") or []]
+
+
+def parse_okx_algo_order(raw: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+    """解析单条 OKX 算法单（REST 列表项或 orders-algo 频道推送）。"""
+    algo_id = raw.get("algoId") or raw.get("id") or ""
+    return {
+        "id": str(algo_id),
+        "status": okx_order_status(raw.get("state")).value,
+        "symbol": symbol,
+        "type": raw.get("ordType", "conditional"),
+        "info": raw,
+    }
@@ -6,9 +6,15 @@
 import asyncio
 import logging
 from dataclasses import replace
-from typing import Any, Dict, Optional
-
-from .models.orders import OrderIntent, OrderResult, OrderStatus, StopOrderResult
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models.orders import (
+    BatchOrderRequest,
+    OrderIntent,
+    OrderResult,
+    OrderStatus,
+    StopOrderResult,
+)
 from .okx_raw import (
     ensure_okx_success,
     first_data,
@@ -28,6 +34,10 @@ class OrderService:
     POS_MODE_HEDGE = "long_short_mode"
     POS_MODE_UNKNOWN = "unknown"
 
+    # OKX 批量接口单次请求上限
+    BATCH_ORDER_LIMIT = 20
+    BATCH_CANCEL_ALGO_LIMIT = 10
+
     def __init__(self, exchange, symbol: str):
         self.exchange = exchange
         self.symbol = symbol
@@ -119,6 +129,7 @@ class OrderService:
         order_type: str = "market",
         intent: OrderIntent = OrderIntent.OPEN,
         position_side: str = "",
+        attach_algo_ords: Optional[List[Dict[str, str]]] = None,
     ) -> OrderResult:
         """
         创建订单并返回完整状态
@@ -129,13 +140,15 @@ class OrderService:
             amount: 数量
             price: 价格（限价单）
             order_type: 订单类型 (market/limit)
+            attach_algo_ords: 随单附带的止盈止损 (OKX attachAlgoOrds)
 
         Returns:
             OrderResult: 订单执行结果
         """
         logger.info(
             f"[订单创建] 提交订单: symbol={symbol}, side={side}, "
-            f"type={order_type}, amount={amount}, price={price}"
+            f"type={order_type}, amount={amount}, price={price}, "
+            f"attached={len(attach_algo_ords or [])}"
         )
 
         try:
@@ -154,6 +167,7 @@ class OrderService:
                         order_type,
                         intent,
                         position_side,
+                        attach_algo_ords,
                     ),
                 )
             else:
@@ -228,6 +242,7 @@ class OrderService:
         position_side: str,
         timeout_seconds: float,
         poll_interval_seconds: float,
+        attach_algo_ords: Optional[List[Dict[str, str]]] = None,
     ) -> OrderResult:
         """提交一次市价单，并轮询到终态或撤销超时剩余数量。"""
         result = await self.create_order_with_status(
@@ -237,6 +252,7 @@ class OrderService:
             order_type="market",
             intent=intent,
             position_side=position_side,
+            attach_algo_ords=attach_algo_ords,
         )
         if not result.order_id or result.is_rejected or result.is_terminal:
             return result
@@ -280,9 +296,44 @@ class OrderService:
         order_type: str,
         intent: OrderIntent = OrderIntent.OPEN,
         position_side: str = "",
+        attach_algo_ords: Optional[List[Dict[str, str]]] = None,
     ) -> Dict[str, Any]:
         """绕过 ccxt load_markets，直接调用 OKX 普通下单接口。"""
-        params = {
+        params = self._build_order_params(
+            symbol,
+            side,
+            amount,
+            price,
+            order_type,
+            intent,
+            position_side,
+            attach_algo_ords,
+        )
+
+        response = method(params)
+        self._ensure_okx_order_item_success(response, "place order")
+        raw = first_data(response)
+        raw.setdefault("state", "live")
+        raw.setdefault("side", side)
+        raw.setdefault("ordType", order_type)
+        raw.setdefault("sz", params["sz"])
+        if price is not None:
+            raw.setdefault("avgPx", format_okx_number(price))
+        return parse_okx_order(raw, symbol, amount)
+
+    def _build_order_params(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float],
+        order_type: str,
+        intent: OrderIntent = OrderIntent.OPEN,
+        position_side: str = "",
+        attach_algo_ords: Optional[List[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """构造 OKX 普通下单参数（单笔与批量下单共用）。"""
+        params: Dict[str, Any] = {
             "instId": okx_inst_id_from_symbol(symbol),
             "tdMode": "cross",
             "side": side,
@@ -301,17 +352,23 @@ class OrderService:
             params["reduceOnly"] = "true"
             if pos_mode != self.POS_MODE_HEDGE:
                 params["posSide"] = "net"
+        if attach_algo_ords:
+            if intent != OrderIntent.OPEN:
+                raise ValueError("attachAlgoOrds is only supported on open orders")
+            params["attachAlgoOrds"] = [dict(item) for item in attach_algo_ords]
+        return params
 
-        response = method(params)
-        self._ensure_okx_order_item_success(response, "place order")
-        raw = first_data(response)
-        raw.setdefault("state", "live")
-        raw.setdefault("side", side)
-        raw.setdefault("ordType", order_type)
-        raw.setdefault("sz", params["sz"])
-        if price is not None:
-            raw.setdefault("avgPx", format_okx_number(price))
-        return parse_okx_order(raw, symbol, amount)
+    @staticmethod
+    def build_attached_stop_loss(
+        stop_price: float, attach_algo_cl_ord_id: str
+    ) -> Dict[str, str]:
+        """构造随开仓单附带的止损参数（成交后由交易所生成 conditional 算法单）。"""
+        return {
+            "attachAlgoClOrdId": attach_algo_cl_ord_id,
+            "slTriggerPx": format_okx_number(stop_price),
+            "slOrdPx": "-1",
+            "slTriggerPxType": "last",
+        }
 
     @staticmethod
     def _ensure_okx_order_item_success(
@@ -656,6 +713,272 @@ class OrderService:
                 )
                 return (False, "failed")
 
+    async def create_orders_batch(
+        self, requests: List[BatchOrderRequest]
+    ) -> List[OrderResult]:
+        """批量下单（OKX batch-orders），按请求顺序返回逐单结果
+
+        单笔参数错误或交易所逐单拒绝只影响该笔，返回 REJECTED 结果。
+        """
+        if not requests:
+            return []
+        logger.info(f"[批量下单] 提交 {len(requests)} 笔订单")
+
+        results: List[Optional[OrderResult]] = [None] * len(requests)
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        for index, request in enumerate(requests):
+            try:
+                params = self._build_order_params(
+                    request.symbol,
+                    request.side,
+                    request.amount,
+                    request.price,
+                    request.order_type,
+                    request.intent,
+                    request.position_side,
+                )
+            except Exception as e:
+                results[index] = self._rejected_result(request, str(e))
+                continue
+            pending.append((index, params))
+
+        method = get_callable(
+            self.exchange,
+            "private_post_trade_batch_orders",
+            "privatePostTradeBatchOrders",
+        )
+        for start in range(0, len(pending), self.BATCH_ORDER_LIMIT):
+            chunk = pending[start : start + self.BATCH_ORDER_LIMIT]
+            try:
+                if method is None:
+                    raise RuntimeError("OKX raw batch-orders endpoint is unavailable")
+                response = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: method([params for _, params in chunk])
+                )
+                items = self._batch_items(response, "batch place orders", len(chunk))
+            except Exception as e:
+                logger.error(f"[批量下单] 批量下单异常: {e}")
+                for index, _ in chunk:
+                    results[index] = self._rejected_result(requests[index], str(e))
+                continue
+
+            for (index, params), raw in zip(chunk, items):
+                request = requests[index]
+                if str(raw.get("sCode", "0")) != "0":
+                    results[index] = self._rejected_result(
+                        request, str(raw.get("sMsg", "")), str(raw.get("sCode"))
+                    )
+                    continue
+                raw = dict(raw)
+                raw.setdefault("state", "live")
+                raw.setdefault("side", request.side)
+                raw.setdefault("ordType", request.order_type)
+                raw.setdefault("sz", params["sz"])
+                results[index] = self._parse_order_response(
+                    parse_okx_order(raw, request.symbol, request.amount),
+                    request.amount,
+                )
+
+        rejected = sum(1 for result in results if result and result.is_rejected)
+        logger.info(f"[批量下单] 完成: 成功={len(results) - rejected}, 拒绝={rejected}")
+        return [result for result in results if result is not None]
+
+    async def cancel_orders_batch(
+        self, order_ids: List[str], symbol: str
+    ) -> Dict[str, tuple[bool, str]]:
+        """批量撤销普通订单（OKX cancel-batch-orders）
+
+        Returns:
+            dict: order_id -> (success, reason)，reason 语义同 cancel_order
+        """
+        return await self._cancel_batch(
+            order_ids,
+            symbol,
+            id_field="ordId",
+            snake_name="private_post_trade_cancel_batch_orders",
+            camel_name="privatePostTradeCancelBatchOrders",
+            chunk_size=self.BATCH_ORDER_LIMIT,
+            log_tag="[批量撤单]",
+        )
+
+    async def cancel_algo_orders(
+        self, algo_ids: List[str], symbol: str
+    ) -> Dict[str, tuple[bool, str]]:
+        """批量撤销算法单（OKX cancel-algos 列表请求）
+
+        Returns:
+            dict: algo_id -> (success, reason)，reason 语义同 cancel_algo_order
+        """
+        return await self._cancel_batch(
+            algo_ids,
+            symbol,
+            id_field="algoId",
+            snake_name="private_post_trade_cancel_algos",
+            camel_name="privatePostTradeCancelAlgos",
+            chunk_size=self.BATCH_CANCEL_ALGO_LIMIT,
+            log_tag="[批量算法单取消]",
+        )
+
+    async def _cancel_batch(
+        self,
+        ids: List[str],
+        symbol: str,
+        id_field: str,
+        snake_name: str,
+        camel_name: str,
+        chunk_size: int,
+        log_tag: str,
+    ) -> Dict[str, tuple[bool, str]]:
+        """按批次调用 OKX 撤单接口并逐项归类结果。"""
+        unique_ids = list(dict.fromkeys(str(i) for i in ids if i))
+        if not unique_ids:
+            return {}
+        inst_id = okx_inst_id_from_symbol(symbol)
+        logger.info(f"{log_tag} 取消 {len(unique_ids)} 笔: {unique_ids}")
+
+        method = get_callable(self.exchange, snake_name, camel_name)
+        results: Dict[str, tuple[bool, str]] = {}
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start : start + chunk_size]
+            payload = [{"instId": inst_id, id_field: item} for item in chunk]
+            try:
+                if method is None:
+                    raise RuntimeError(f"OKX raw {snake_name} endpoint is unavailable")
+                response = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: method(payload)
+                )
+                items = self._batch_items(response, "batch cancel", len(chunk))
+            except Exception as e:
+                logger.error(f"{log_tag} 批量取消异常: {e}")
+                for item in chunk:
+                    results[item] = (False, self._cancel_failure_reason(str(e)))
+                continue
+
+            by_id = {str(raw.get(id_field, "")): raw for raw in items}
+            for position, item in enumerate(chunk):
+                raw = by_id.get(item) or items[position]
+                if str(raw.get("sCode", "0")) == "0":
+                    results[item] = (True, "success")
+                    continue
+                error_msg = f"{raw.get('sCode')} {raw.get('sMsg', '')}"
+                results[item] = (False, self._cancel_failure_reason(error_msg))
+                logger.warning(f"{log_tag} 取消失败: {item}, 错误={error_msg}")
+        return results
+
+    @staticmethod
+    def _batch_items(
+        response: Dict[str, Any], operation: str, expected: int
+    ) -> List[Dict[str, Any]]:
+        """取批量接口逐项结果；code=1/2 表示全部或部分失败，需逐项判断。"""
+        code = str(response.get("code", "0"))
+        items = response.get("data") or []
+        if code not in {"0", "1", "2"} or len(items) != expected:
+            raise RuntimeError(f"OKX {operation} failed: {response}")
+        return items
+
+    @staticmethod
+    def _cancel_failure_reason(error_msg: str) -> str:
+        """撤单失败归类：订单已成交/取消/不存在视为 already_gone。"""
+        if (
+            "51400" in error_msg
+            or "does not exist" in error_msg
+            or "filled" in error_msg
+        ):
+            return "already_gone"
+        return "failed"
+
+    @staticmethod
+    def _rejected_result(
+        request: BatchOrderRequest,
+        error_message: str,
+        error_code: Optional[str] = None,
+    ) -> OrderResult:
+        return OrderResult(
+            order_id="",
+            status=OrderStatus.REJECTED,
+            symbol=request.symbol,
+            side=request.side,
+            order_type=request.order_type,
+            requested_amount=request.amount,
+            filled_amount=0,
+            remaining_amount=request.amount,
+            average_price=0,
+            error_message=error_message,
+            error_code=error_code,
+        )
+
+    async def amend_algo_order(
+        self,
+        algo_id: str,
+        symbol: str,
+        new_stop_price: Optional[float] = None,
+        new_take_profit_price: Optional[float] = None,
+    ) -> tuple[bool, str]:
+        """原地修改算法单触发价（OKX amend-algos），不产生无保护窗口
+
+        Args:
+            algo_id: 算法单ID (algoId)
+            symbol: 交易对，如 BTC/USDT:USDT
+            new_stop_price: 新止损触发价
+            new_take_profit_price: 新止盈触发价
+
+        Returns:
+            tuple: (success: bool, reason: str)
+                - (True, "success") - 修改成功
+                - (False, "already_gone") - 算法单已触发/取消/不存在
+                - (False, "unsupported") - 接口不可用或该单不支持修改
+                - (False, "failed") - 修改失败（原算法单保持不变）
+        """
+        params: Dict[str, str] = {
+            "instId": okx_inst_id_from_symbol(symbol),
+            "algoId": str(algo_id),
+        }
+        if new_stop_price is not None:
+            params["newSlTriggerPx"] = format_okx_number(new_stop_price)
+            params["newSlOrdPx"] = "-1"
+        if new_take_profit_price is not None:
+            params["newTpTriggerPx"] = format_okx_number(new_take_profit_price)
+            params["newTpOrdPx"] = "-1"
+
+        method = get_callable(
+            self.exchange,
+            "private_post_trade_amend_algos",
+            "privatePostTradeAmendAlgos",
+        )
+        if method is None:
+            logger.warning("[算法单修改] amend-algos 接口不可用")
+            return (False, "unsupported")
+
+        try:
+            logger.info(f"[算法单修改] 修改算法单: ID={algo_id}, 参数={params}")
+            response = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: method(params)
+            )
+            self._ensure_okx_order_item_success(response, "amend algo order")
+            logger.info(f"[算法单修改] 算法单修改成功: {algo_id}")
+            return (True, "success")
+        except Exception as e:
+            error_msg = str(e)
+            if (
+                "51400" in error_msg
+                or "51503" in error_msg
+                or "does not exist" in error_msg
+                or "filled" in error_msg
+            ):
+                logger.warning(
+                    f"[算法单修改] 算法单已不存在: {algo_id}, 错误={error_msg}"
+                )
+                return (False, "already_gone")
+            if type(e).__name__ == "NotSupported" or any(
+                marker in error_msg.lower() for marker in ("not support", "unsupported")
+            ):
+                logger.warning(
+                    f"[算法单修改] 算法单不支持修改: {algo_id}, 错误={error_msg}"
+                )
+                return (False, "unsupported")
+            logger.error(f"[算法单修改] 修改算法单失败: {algo_id}, 错误={error_msg}")
+            return (False, "failed")
+
     async def get_order_status(self, order_id: str, symbol: str) -> OrderResult:
         """
         查询订单状态
@@ -0,0 +1,712 @@
+"""
+模拟交易所客户端 - 按历史K线回放
+
+与 ExchangeClient 保持相同的异步接口，供回放回测驱动完整的 AdaptiveTradingBot 周期：
+- 行情：复用 MarketDataService 的指标计算，只把网络请求替换为历史K线切片
+- 市价单：按当前K线收盘价（含滑点）即时成交，净持仓模式（反向单先减仓）
+- 算法单：advance() 推进K线时用最高/最低价检查止损/止盈触发，跳空按开盘价成交，
+  同一根K线同时触发时按 tie_break 决定先后
+- 触发价约束与 OKX 一致（做多止损须低于最新价），违规时抛出与 OKX 相同措辞的异常
+
+时间以虚拟时钟表示：第 i 根K线收盘时刻 = 开盘时间戳 + K线周期。
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
+
+from ..utils.clock import VirtualClock
+from .market_data import MarketDataService
+from .models.candles import CandleSeries, as_candle_series
+from .models.orders import BatchOrderRequest, OrderIntent, OrderResult, OrderStatus
+from .okx_raw import okx_inst_id_from_symbol, parse_okx_algo_order
+
+logger = logging.getLogger(__name__)
+
+TIE_BREAKS = ("stop_loss", "take_profit")
+
+_EPSILON = 1e-12
+
+
+@dataclass
+class SimulatedTrade:
+    """一笔平仓成交（全部或部分平仓）"""
+
+    side: str  # 持仓方向 long/short
+    amount: float
+    entry_price: float
+    exit_price: float
+    entry_time: float  # Unix 秒（虚拟时间）
+    exit_time: float
+    pnl: float  # 扣除开平仓手续费后的已实现盈亏
+    fee: float
+    reason: str  # signal / stop_loss / take_profit / end_of_replay
+
+    @property
+    def pnl_percent(self) -> float:
+        if self.entry_price <= 0:
+            return 0.0
+        sign = 1 if self.side == "long" else -1
+        return sign * (self.exit_price - self.entry_price) / self.entry_price
+
+
+@dataclass
+class _Position:
+    side: str
+    amount: float
+    entry_price: float
+    entry_time: float
+    entry_fee: float = 0.0  # 尚未分摊到平仓成交的开仓手续费
+
+
+@dataclass
+class _AlgoOrder:
+    algo_id: str
+    kind: str  # stop_loss / take_profit
+    side: str  # 平仓方向 buy/sell
+    amount: float
+    trigger_price: float
+    created_at: float
+    cl_ord_id: str = ""
+    state: str = "live"  # live / effective / canceled
+    fill_price: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def triggers_on_fall(self) -> bool:
+        """卖出止损与买入止盈在价格下跌时触发"""
+        return (self.side == "sell") == (self.kind == "stop_loss")
+
+    def to_order(self, symbol: str) -> Dict[str, Any]:
+        """转换为与 OKX REST 解析结果一致的算法单字典"""
+        price_key = "slTriggerPx" if self.kind == "stop_loss" else "tpTriggerPx"
+        raw: Dict[str, Any] = {
+            "algoId": self.algo_id,
+            "instId": okx_inst_id_from_symbol(symbol),
+            "ordType": "conditional",
+            "side": self.side,
+            "sz": str(self.amount),
+            "state": self.state,
+            price_key: str(self.trigger_price),
+            "cTime": str(int(self.created_at * 1000)),
+            "uTime": str(int((self.updated_at or self.created_at) * 1000)),
+        }
+        if self.cl_ord_id:
+            raw["algoClOrdId"] = self.cl_ord_id
+        if self.state == "effective":
+            raw["actualPx"] = str(self.fill_price)
+            raw["triggerTime"] = raw["uTime"]
+        return parse_okx_algo_order(raw, symbol)
+
+
+class _ReplayMarketData(MarketDataService):
+    """行情服务：网络请求替换为历史K线切片，指标计算沿用 MarketDataService"""
+
+    def __init__(self, replay: "SimulatedExchangeClient") -> None:
+        super().__init__(exchange=None, symbol=replay.symbol)
+        self._replay = replay
+
+    async def get_candles(
+        self, timeframe: str = "1h", limit: int = 100
+    ) -> CandleSeries:
+        # 回放序列只有一种周期，timeframe 仅为接口兼容
+        return self._replay.history(limit)
+
+    async def get_ticker(self) -> Dict[str, Any]:
+        return self._replay.ticker()
+
+
+@dataclass
+class _Ledger:
+    cash: float
+    trades: List[SimulatedTrade] = field(default_factory=list)
+    fees: float = 0.0
+
+
+class SimulatedExchangeClient:
+    """按历史K线回放的进程内交易所（单一交易对、净持仓模式）"""
+
+    SIMULATED_PREFIX = "REPLAY_"
+
+    def __init__(
+        self,
+        candles: Union[CandleSeries, Iterable[Sequence[float]]],
+        symbol: str = "BTC/USDT:USDT",
+        initial_balance: float = 10000.0,
+        fee_rate: float = 0.0005,
+        slippage: float = 0.0,
+        allow_short_selling: bool = True,
+        max_position_usage: float = 0.30,
+        start_index: int = 99,
+        tie_break: str = "stop_loss",
+        clock: Optional[VirtualClock] = None,
+    ):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"tie_break 必须是 {TIE_BREAKS} 之一: {tie_break}")
+        self.candles = as_candle_series(candles)
+        if len(self.candles) < 2:
+            raise ValueError("回放至少需要 2 根K线")
+        if not 0 <= start_index < len(self.candles):
+            raise ValueError(f"start_index 越界: {start_index}")
+
+        self.symbol = symbol
+        self.allow_short_selling = allow_short_selling
+        self.test_mode = False
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.tie_break = tie_break
+        self.initial_balance = initial_balance
+        self.leverage = 1
+        self._max_position_usage = max_position_usage
+
+        timestamps = self.candles.timestamps
+        self.bar_seconds = (timestamps[1] - timestamps[0]) / 1000
+        # 24h 涨跌/高低点窗口
+        self._ticker_window = max(1, int(round(86400 / self.bar_seconds)))
+
+        self.clock = clock or VirtualClock()
+        self._index = start_index
+        self.clock.set(self._bar_close_time(start_index))
+
+        self._market = _ReplayMarketData(self)
+        self._ledger = _Ledger(cash=initial_balance)
+        self._position: Optional[_Position] = None
+        self._algo_orders: Dict[str, _AlgoOrder] = {}
+        self._algo_history: List[_AlgoOrder] = []
+        self._orders: Dict[str, OrderResult] = {}
+        self._sequence = 0
+
+    # === 回放控制 ===
+
+    @property
+    def bar_index(self) -> int:
+        return self._index
+
+    @property
+    def is_finished(self) -> bool:
+        return self._index >= len(self.candles) - 1
+
+    @property
+    def current_price(self) -> float:
+        return self.candles.closes[self._index]
+
+    @property
+    def trades(self) -> List[SimulatedTrade]:
+        return self._ledger.trades
+
+    @property
+    def total_fees(self) -> float:
+        return self._ledger.fees
+
+    def _bar_close_time(self, index: int) -> float:
+        return self.candles.timestamps[index] / 1000 + self.bar_seconds
+
+    def advance(self, bars: int = 1) -> int:
+        """推进若干根K线，逐根检查算法单触发；返回实际推进的根数"""
+        target = min(self._index + bars, len(self.candles) - 1)
+        advanced = target - self._index
+        if not self._algo_orders:
+            # 无挂单时无需逐根检查
+            self._index = target
+        else:
+            while self._index < target:
+                self._index += 1
+                self._trigger_algo_orders(self._index)
+        self.clock.set(self._bar_close_time(self._index))
+        return advanced
+
+    def history(self, limit: int) -> CandleSeries:
+        """截至当前K线（含）的最近 limit 根K线，零拷贝视图"""
+        stop = self._index + 1
+        # 切片总是返回 CandleSeries 视图
+        return cast(CandleSeries, self.candles[max(0, stop - limit) : stop])
+
+    def ticker(self) -> Dict[str, Any]:
+        """按最近 24h K线合成 ticker"""
+        stop = self._index + 1
+        start = max(0, stop - self._ticker_window)
+        last = self.current_price
+        open_24h = self.candles.opens[start]
+        return {
+            "symbol": self.symbol,
+            "last": last,
+            "high": max(self.candles.highs[start:stop]),
+            "low": min(self.candles.lows[start:stop]),
+            "baseVolume": sum(self.candles.volumes[start:stop]),
+            "percentage": ((last - open_24h) / open_24h * 100 if open_24h > 0 else 0.0),
+            "info": {},
+        }
+
+    def equity(self) -> float:
+        """按当前收盘价计算的账户权益"""
+        return self._ledger.cash + self._unrealized_pnl(self.current_price)
+
+    def close_all(self, reason: str = "end_of_replay") -> Optional[SimulatedTrade]:
+        """按当前收盘价平掉全部持仓并撤销挂单（回放结束时调用）"""
+        trade = None
+        if self._position is not None:
+            close_side = "sell" if self._position.side == "long" else "buy"
+            price = self._slipped(close_side, self.current_price)
+            trade = self._close(self._position.amount, price, reason)
+        for order in list(self._algo_orders.values()):
+            self._finish_algo(order, "canceled")
+        return trade
+
+    # === 行情 ===
+
+    async def initialize(self) -> None:
+        logger.info(
+            f"[模拟交易所] 回放 {len(self.candles)} 根K线，"
+            f"起始索引={self._index}，周期={self.bar_seconds:.0f}秒"
+        )
+
+    async def set_leverage(self, leverage: int, symbol: Optional[str] = None) -> None:
+        if leverage is None or not isinstance(leverage, int) or leverage < 1:
+            raise ValueError(
+                f"Invalid leverage: {leverage}. Must be a positive integer."
+            )
+        self.leverage = leverage
+
+    async def get_ohlcv(
+        self, timeframe: str = "1h", limit: int = 100
+    ) -> List[List[float]]:
+        return self.history(limit).to_rows()
+
+    async def get_candles(
+        self, timeframe: str = "1h", limit: int = 100
+    ) -> CandleSeries:
+        return self.history(limit)
+
+    async def get_market_data(self) -> Dict[str, Any]:
+        return await self._market.get_market_data()
+
+    # === 账户 ===
+
+    async def get_balance(self) -> float:
+        """可用余额 = 权益 - 占用保证金"""
+        margin = 0.0
+        if self._position is not None:
+            margin = self._position.amount * self.current_price / self.leverage
+        return self.equity() - margin
+
+    async def get_position(self) -> Optional[Dict[str, Any]]:
+        position = self._position
+        if position is None:
+            return None
+        side = position.side
+        if side == "short" and not self.allow_short_selling:
+            side = "short_to_close"
+        return {
+            "symbol": self.symbol,
+            "side": side,
+            "amount": position.amount,
+            "entry_price": position.entry_price,
+            "unrealized_pnl": self._unrealized_pnl(self.current_price),
+        }
+
+    async def get_position_with_retry(
+        self, max_retries: int = 3, retry_delay: float = 1.0
+    ) -> Optional[Dict[str, Any]]:
+        return await self.get_position()
+
+    @property
+    def last_query_failed(self) -> bool:
+        return False
+
+    async def calculate_max_contracts(self, price: float, leverage: int) -> float:
+        return await self._market.calculate_max_contracts(
+            price, leverage, self.get_balance, self._max_position_usage
+        )
+
+    # === 普通订单 ===
+
+    @staticmethod
+    def is_simulated_order(order_id: str) -> bool:
+        return bool(order_id) and order_id.startswith(
+            SimulatedExchangeClient.SIMULATED_PREFIX
+        )
+
+    async def create_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        order_type: str = "market",
+        intent: OrderIntent = OrderIntent.OPEN,
+        position_side: str = "",
+    ) -> str:
+        result = self._market_order(symbol, side, amount)
+        return result.order_id if result.is_success else ""
+
+    async def create_order_with_status(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        order_type: str = "market",
+        intent: OrderIntent = OrderIntent.OPEN,
+        position_side: str = "",
+    ) -> OrderResult:
+        return self._market_order(symbol, side, amount)
+
+    async def create_confirmed_market_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        intent: OrderIntent,
+        position_side: str,
+        attached_stop_price: Optional[float] = None,
+        attach_algo_cl_ord_id: str = "",
+    ) -> OrderResult:
+        """市价单即时成交；附带止损在成交后以 algoClOrdId 挂出"""
+        if attached_stop_price:
+            if not attach_algo_cl_ord_id:
+                raise ValueError("attach_algo_cl_ord_id is required for attached stop")
+            stop_side = "sell" if side == "buy" else "buy"
+            error = self._trigger_price_error(
+                "stop_loss", stop_side, attached_stop_price
+            )
+            if error:
+                # OKX 对附带止损违规的开仓单整单拒绝
+                return self._rejected(symbol, side, amount, error)
+
+        result = self._market_order(symbol, side, amount)
+        if attached_stop_price and result.is_success:
+            self._place_algo(
+                "stop_loss",
+                "sell" if side == "buy" else "buy",
+                result.filled_amount,
+                attached_stop_price,
+                cl_ord_id=attach_algo_cl_ord_id,
+            )
+        return result
+
+    async def create_orders_batch(
+        self, requests: List[BatchOrderRequest]
+    ) -> List[OrderResult]:
+        return [
+            self._market_order(request.symbol, request.side, request.amount)
+            for request in requests
+        ]
+
+    async def get_order_status(self, order_id: str, symbol: str) -> OrderResult:
+        result = self._orders.get(order_id)
+        if result is None:
+            return OrderResult(
+                order_id=order_id,
+                status=OrderStatus.UNKNOWN,
+                symbol=symbol,
+                side="",
+                order_type="market",
+                requested_amount=0.0,
+                filled_amount=0.0,
+                remaining_amount=0.0,
+                average_price=0.0,
+                error_message="order not found",
+            )
+        return result
+
+    async def cancel_order(self, order_id: str, symbol: str) -> Tuple[bool, str]:
+        # 市价单即时成交，不存在可撤的普通挂单
+        return (False, "already_gone")
+
+    async def cancel_orders_batch(
+        self, order_ids: List[str], symbol: str
+    ) -> Dict[str, Tuple[bool, str]]:
+        return {order_id: (False, "already_gone") for order_id in order_ids}
+
+    async def get_open_orders(self, symbol: str) -> list:
+        return []
+
+    # === 算法单 ===
+
+    async def create_stop_loss(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        stop_price: float,
+    ) -> str:
+        error = self._trigger_price_error("stop_loss", side, stop_price)
+        if error:
+            raise RuntimeError(error)
+        return self._place_algo("stop_loss", side, amount, stop_price)
+
+    async def create_take_profit(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        take_profit_price: float,
+    ) -> str:
+        error = self._trigger_price_error("take_profit", side, take_profit_price)
+        if error:
+            raise RuntimeError(error)
+        return self._place_algo("take_profit", side, amount, take_profit_price)
+
+    async def find_attached_algo_order(
+        self,
+        symbol: str,
+        attach_algo_cl_ord_id: str,
+        max_attempts: int = 3,
+        retry_delay: float = 0.2,
+    ) -> Optional[Dict[str, Any]]:
+        for order in self._algo_orders.values():
+            if order.cl_ord_id == attach_algo_cl_ord_id:
+                return order.to_order(self.symbol)
+        return None
+
+    async def amend_algo_order(
+        self,
+        algo_id: str,
+        symbol: str,
+        new_stop_price: Optional[float] = None,
+        new_take_profit_price: Optional[float] = None,
+    ) -> Tuple[bool, str]:
+        order = self._algo_orders.get(algo_id)
+        if order is None:
+            return (False, "already_gone")
+        new_price = new_stop_price if order.kind == "stop_loss" else None
+        if order.kind == "take_profit":
+            new_price = new_take_profit_price
+        if new_price is None:
+            return (False, "failed")
+        error = self._trigger_price_error(order.kind, order.side, new_price)
+        if error:
+            logger.warning(f"[模拟交易所] 修改算法单失败: {error}")
+            return (False, "failed")
+        order.trigger_price = new_price
+        order.updated_at = self.clock.time()
+        return (True, "success")
+
+    async def cancel_algo_order(self, algo_id: str, symbol: str) -> Tuple[bool, str]:
+        order = self._algo_orders.get(algo_id)
+        if order is None:
+            return (False, "already_gone")
+        self._finish_algo(order, "canceled")
+        return (True, "success")
+
+    async def cancel_algo_orders(
+        self, algo_ids: List[str], symbol: str
+    ) -> Dict[str, Tuple[bool, str]]:
+        return {
+            algo_id: await self.cancel_algo_order(algo_id, symbol)
+            for algo_id in algo_ids
+        }
+
+    async def get_algo_orders(self, symbol: str) -> list:
+        return [order.to_order(self.symbol) for order in self._algo_orders.values()]
+
+    async def get_cached_algo_orders(
+        self,
+        symbol: str,
+        max_age_seconds: Optional[float] = None,
+        force_refresh: bool = False,
+    ) -> list:
+        return await self.get_algo_orders(symbol)
+
+    async def get_algo_order_history(
+        self,
+        symbol: str,
+        algo_id: str = "",
+        limit: int = 20,
+        ord_types: Optional[list] = None,
+    ) -> list:
+        history = [
+            order
+            for order in reversed(self._algo_history)
+            if not algo_id or order.algo_id == algo_id
+        ]
+        return [order.to_order(self.symbol) for order in history[:limit]]
+
+    async def cleanup(self) -> None:
+        logger.info("[模拟交易所] 回放结束")
+
+    # === 撮合 ===
+
+    def _next_id(self, kind: str) -> str:
+        self._sequence += 1
+        return f"{self.SIMULATED_PREFIX}{kind}_{self._sequence}"
+
+    def _slipped(self, side: str, price: float) -> float:
+        return price * (1 + self.slippage if side == "buy" else 1 - self.slippage)
+
+    def _unrealized_pnl(self, price: float) -> float:
+        position = self._position
+        if position is None:
+            return 0.0
+        sign = 1 if position.side == "long" else -1
+        return sign * (price - position.entry_price) * position.amount
+
+    def _rejected(
+        self, symbol: str, side: str, amount: float, error: str
+    ) -> OrderResult:
+        result = OrderResult(
+            order_id=self._next_id("ORDER"),
+            status=OrderStatus.REJECTED,
+            symbol=symbol,
+            side=side,
+            order_type="market",
+            requested_amount=amount,
+            filled_amount=0.0,
+            remaining_amount=amount,
+            average_price=0.0,
+            error_message=error,
+        )
+        self._orders[result.order_id] = result
+        return result
+
+    def _market_order(self, symbol: str, side: str, amount: float) -> OrderResult:
+        if amount <= 0 or side not in ("buy", "sell"):
+            return self._rejected(symbol, side, amount, "invalid order")
+        price = self._slipped(side, self.current_price)
+        self._fill(side, amount, price, "signal")
+        result = OrderResult(
+            order_id=self._next_id("ORDER"),
+            status=OrderStatus.CLOSED,
+            symbol=symbol,
+            side=side,
+            order_type="market",
+            requested_amount=amount,
+            filled_amount=amount,
+            remaining_amount=0.0,
+            average_price=price,
+        )
+        self._orders[result.order_id] = result
+        return result
+
+    def _fill(self, side: str, amount: float, price: float, reason: str) -> None:
+        """净持仓成交：反向部分先平仓，剩余部分开仓或加仓"""
+        direction = "long" if side == "buy" else "short"
+        remaining = amount
+        if self._position is not None and self._position.side != direction:
+            closed = min(remaining, self._position.amount)
+            self._close(closed, price, reason)
+            remaining -= closed
+        if remaining <= _EPSILON:
+            return
+
+        fee = remaining * price * self.fee_rate
+        self._ledger.cash -= fee
+        self._ledger.fees += fee
+        position = self._position
+        if position is None:
+            self._position = _Position(
+                side=direction,
+                amount=remaining,
+                entry_price=price,
+                entry_time=self.clock.time(),
+                entry_fee=fee,
+            )
+            return
+        total = position.amount + remaining
+        position.entry_price = (
+            position.entry_price * position.amount + price * remaining
+        ) / total
+        position.amount = total
+        position.entry_fee += fee
+
+    def _close(self, amount: float, price: float, reason: str) -> SimulatedTrade:
+        position = self._position
+        assert position is not None
+        sign = 1 if position.side == "long" else -1
+        gross = sign * (price - position.entry_price) * amount
+        exit_fee = amount * price * self.fee_rate
+        entry_fee = position.entry_fee * amount / position.amount
+
+        self._ledger.cash += gross - exit_fee
+        self._ledger.fees += exit_fee
+        position.entry_fee -= entry_fee
+        position.amount -= amount
+        if position.amount <= _EPSILON:
+            self._position = None
+
+        trade = SimulatedTrade(
+            side=position.side,
+            amount=amount,
+            entry_price=position.entry_price,
+            exit_price=price,
+            entry_time=position.entry_time,
+            exit_time=self.clock.time(),
+            pnl=gross - exit_fee - entry_fee,
+            fee=exit_fee + entry_fee,
+            reason=reason,
+        )
+        self._ledger.trades.append(trade)
+        return trade
+
+    def _trigger_price_error(
+        self, kind: str, side: str, trigger_price: float
+    ) -> Optional[str]:
+        """按 OKX 规则校验触发价与最新价的相对位置"""
+        last = self.current_price
+        label = "SL" if kind == "stop_loss" else "TP"
+        order = _AlgoOrder("", kind, side, 0.0, trigger_price, 0.0)
+        if order.triggers_on_fall and trigger_price >= last:
+            return f"{label} trigger price must be lower than the last price {last}"
+        if not order.triggers_on_fall and trigger_price <= last:
+            return f"{label} trigger price must be higher than the last price {last}"
+        return None
+
+    def _place_algo(
+        self,
+        kind: str,
+        side: str,
+        amount: float,
+        trigger_price: float,
+        cl_ord_id: str = "",
+    ) -> str:
+        order = _AlgoOrder(
+            algo_id=self._next_id("ALGO"),
+            kind=kind,
+            side=side,
+            amount=amount,
+            trigger_price=trigger_price,
+            created_at=self.clock.time(),
+            cl_ord_id=cl_ord_id,
+        )
+        self._algo_orders[order.algo_id] = order
+        return order.algo_id
+
+    def _finish_algo(self, order: _AlgoOrder, state: str) -> None:
+        order.state = state
+        order.updated_at = self.clock.time()
+        del self._algo_orders[order.algo_id]
+        self._algo_history.append(order)
+
+    def _trigger_algo_orders(self, index: int) -> None:
+        """用第 index 根K线的 OHLC 检查算法单触发"""
+        candles = self.candles
+        open_, high, low = (
+            candles.opens[index],
+            candles.highs[index],
+            candles.lows[index],
+        )
+        self.clock.set(self._bar_close_time(index))
+
+        triggered = []
+        for order in self._algo_orders.values():
+            trigger = order.trigger_price
+            if order.triggers_on_fall:
+                hit, gapped = low <= trigger, open_ <= trigger
+            else:
+                hit, gapped = high >= trigger, open_ >= trigger
+            if hit:
+                # 开盘即越过触发价的先成交；同根K线内其余按 tie_break 排序
+                priority = (not gapped, order.kind != self.tie_break)
+                triggered.append((priority, order, open_ if gapped else trigger))
+        triggered.sort(key=lambda item: item[0])
+
+        for _, order, price in triggered:
+            position = self._position
+            if position is None or (position.side == "long") != (order.side == "sell"):
+                # 只减仓：无对应持仓时触发失败
+                self._finish_algo(order, "canceled")
+                continue
+            fill_price = self._slipped(order.side, price)
+            self._close(min(order.amount, position.amount), fill_price, order.kind)
+            order.fill_price = fill_price
+            self._finish_algo(order, "effective")
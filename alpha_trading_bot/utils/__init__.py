@@ -2,25 +2,7 @@
 工具模块
 """
 
-from .technical import (
-    calculate_rsi,
-    calculate_macd,
-    calculate_ema,
-    calculate_adx,
-    calculate_trend,
-    calculate_atr,
-    calculate_bollinger_bands,
-    calculate_true_range,
-    calculate_all_indicators,
-)
-from .formatters import format_indicators_for_ai
-from .observability import (
-    get_runtime_metrics,
-    get_runtime_slo_snapshot,
-    record_fallback_invocation,
-    record_gemini_request,
-    record_live_guard_block,
-)
+from .lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 
@@ -41,6 +23,40 @@ __all__ = [
     "record_gemini_request",
     "record_fallback_invocation",
     "record_live_guard_block",
+    "record_loop_stall",
+    "record_result_cache",
     "get_runtime_metrics",
     "get_runtime_slo_snapshot",
+    # 结果缓存
+    "ResultCache",
+    "content_hash",
+    "get_result_cache",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".technical": (
+            "calculate_rsi",
+            "calculate_macd",
+            "calculate_ema",
+            "calculate_adx",
+            "calculate_trend",
+            "calculate_atr",
+            "calculate_bollinger_bands",
+            "calculate_true_range",
+            "calculate_all_indicators",
+        ),
+        ".formatters": ("format_indicators_for_ai",),
+        ".observability": (
+            "get_runtime_metrics",
+            "get_runtime_slo_snapshot",
+            "record_fallback_invocation",
+            "record_gemini_request",
+            "record_live_guard_block",
+            "record_loop_stall",
+            "record_result_cache",
+        ),
+        ".result_cache": ("ResultCache", "content_hash", "get_result_cache"),
+    },
+)
@@ -0,0 +1,76 @@
+"""
+可替换的时间源
+
+实盘使用系统时间；回放回测通过 use_clock() 安装 VirtualClock 后，
+方向冷却、熔断冷却、持仓时长等依赖时间的逻辑改为读取虚拟时间，
+无需真实等待即可按历史节奏推进。
+"""
+
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime, tzinfo
+from typing import Iterator, Optional, Union
+
+
+class SystemClock:
+    """系统时间"""
+
+    def time(self) -> float:
+        return _time.time()
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        return datetime.now(tz)
+
+
+class VirtualClock:
+    """手动推进的虚拟时间（Unix 秒），只进不退"""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+
+    def time(self) -> float:
+        return self._now
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        return datetime.fromtimestamp(self._now, tz)
+
+    def set(self, timestamp: float) -> None:
+        """跳到指定时间点"""
+        if timestamp < self._now:
+            raise ValueError(f"虚拟时钟不能回拨: {timestamp} < {self._now}")
+        self._now = float(timestamp)
+
+    def advance(self, seconds: float) -> None:
+        """向前推进若干秒"""
+        self.set(self._now + seconds)
+
+
+Clock = Union[SystemClock, VirtualClock]
+
+_clock: Clock = SystemClock()
+
+
+def time() -> float:
+    """当前时间戳（秒）"""
+    return _clock.time()
+
+
+def now(tz: Optional[tzinfo] = None) -> datetime:
+    """当前时间"""
+    return _clock.now(tz)
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """在上下文内替换全局时间源，退出时恢复"""
+    global _clock
+    previous = _clock
+    _clock = clock
+    try:
+        yield clock
+    finally:
+        _clock = previous
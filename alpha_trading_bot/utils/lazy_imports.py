@@ -0,0 +1,40 @@
+"""
+包级延迟导出
+
+包的 __init__ 只声明 “名称 → 子模块” 映射，首次访问属性时才导入对应子模块，
+避免 `from alpha_trading_bot.config import ...` 之类的轻量导入拖入整个包树。
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, Iterable[str]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    生成模块级 __getattr__ / __dir__
+
+    Args:
+        package: 包名（传入 __name__）
+        exports: {相对或绝对模块名: 导出名称列表}
+
+    Returns:
+        (__getattr__, __dir__)，在包 __init__ 中赋值给同名全局变量
+    """
+    targets = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module_name = targets.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 写回包命名空间，后续访问不再经过 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(targets))
+
+    return __getattr__, __dir__
@@ -0,0 +1,183 @@
+"""事件循环延迟看门狗。
+
+协程每隔 ``interval`` 秒请求一次调度，实际唤醒时间与期望时间之差即为
+循环调度延迟。独立的采样线程观察心跳，心跳停滞超过阈值时抓取事件循环
+线程的调用栈，用于定位阻塞止损处理的同步调用（pandas/SQLite/optuna 等）。
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from .observability import record_loop_stall
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopStall:
+    """一次事件循环阻塞记录。"""
+
+    detected_at: float
+    blocked_seconds: float
+    stack: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "detected_at": self.detected_at,
+            "blocked_seconds": self.blocked_seconds,
+            "stack": list(self.stack),
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """最近秩百分位，输入须已排序。"""
+    if not sorted_values:
+        return 0.0
+    rank = int(round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[min(max(rank, 0), len(sorted_values) - 1)]
+
+
+class EventLoopWatchdog:
+    """事件循环延迟看门狗
+
+    使用方式：
+        watchdog = EventLoopWatchdog(threshold=0.25)
+        task = asyncio.create_task(watchdog.run())
+        ...
+        watchdog.snapshot()  # {"p50": ..., "p99": ..., "stalls": ...}
+        watchdog.stop()
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        threshold: float = 0.25,
+        window: int = 2048,
+        max_stalls: int = 20,
+        stack_limit: int = 30,
+    ):
+        """
+        Args:
+            interval: 心跳间隔（秒）
+            threshold: 判定为阻塞的延迟阈值（秒）
+            window: 用于计算百分位的延迟样本数量
+            max_stalls: 保留的阻塞调用栈数量
+            stack_limit: 每次抓取的最大栈帧数
+        """
+        if interval <= 0 or threshold <= 0:
+            raise ValueError("interval 和 threshold 必须大于0")
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._stalls: Deque[LoopStall] = deque(maxlen=max_stalls)
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._running = False
+
+    async def run(self) -> None:
+        """在事件循环中持续测量调度延迟，直到 stop() 或任务被取消。"""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._running = True
+        self._stop_event.clear()
+        self._start_sampler()
+        logger.info(
+            f"[事件循环] 看门狗启动: 间隔={self.interval}s, 阈值={self.threshold}s"
+        )
+
+        try:
+            while self._running:
+                expected = loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                lag = max(loop.time() - expected, 0.0)
+                self._heartbeat = time.monotonic()
+                with self._lock:
+                    self._samples.append(lag)
+                if lag >= self.threshold:
+                    logger.warning(f"[事件循环] 调度延迟 {lag * 1000:.0f}ms")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """停止测量和采样线程。"""
+        self._running = False
+        self._stop_event.set()
+        sampler = self._sampler
+        if sampler is not None and sampler is not threading.current_thread():
+            sampler.join(timeout=self.interval * 2)
+        self._sampler = None
+
+    def _start_sampler(self) -> None:
+        if self._sampler is not None and self._sampler.is_alive():
+            return
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="loop-watchdog", daemon=True
+        )
+        self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        """采样线程：心跳停滞超过阈值时抓取一次事件循环线程的调用栈。"""
+        poll = min(self.interval, self.threshold) / 2
+        captured_for: Optional[float] = None
+        while not self._stop_event.wait(poll):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold:
+                continue
+            if captured_for == heartbeat:
+                continue
+            captured_for = heartbeat
+            self._capture_stall(blocked)
+
+    def _capture_stall(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id or -1)
+        stack = traceback.format_stack(frame, limit=self.stack_limit) if frame else []
+        stall = LoopStall(detected_at=time.time(), blocked_seconds=blocked, stack=stack)
+        with self._lock:
+            self._stalls.append(stall)
+        record_loop_stall()
+        location = stack[-1].strip() if stack else "unknown"
+        logger.warning(
+            f"[事件循环] 检测到阻塞 >= {blocked * 1000:.0f}ms，当前位置: {location}"
+        )
+
+    def get_lag_percentiles(self) -> Dict[str, float]:
+        """返回延迟百分位（秒）。"""
+        with self._lock:
+            values = sorted(self._samples)
+        return {
+            "count": float(len(values)),
+            "p50": _percentile(values, 50),
+            "p90": _percentile(values, 90),
+            "p99": _percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    def get_stalls(self) -> List[LoopStall]:
+        """返回最近的阻塞记录。"""
+        with self._lock:
+            return list(self._stalls)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """返回延迟百分位与阻塞记录快照。"""
+        stalls = self.get_stalls()
+        return {
+            **self.get_lag_percentiles(),
+            "threshold": self.threshold,
+            "stalls": len(stalls),
+            "last_stall": stalls[-1].to_dict() if stalls else None,
+        }
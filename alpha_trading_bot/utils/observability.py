@@ -14,6 +14,10 @@ class RuntimeMetrics:
     gemini_failure_total: int = 0
     fallback_invocations_total: int = 0
     live_guard_block_total: int = 0
+    loop_stall_total: int = 0
+    result_cache_hits_total: int = 0
+    result_cache_misses_total: int = 0
+    result_cache_evictions_total: int = 0
 
 
 _METRICS = RuntimeMetrics()
@@ -42,6 +46,20 @@ def record_live_guard_block() -> None:
         _METRICS.live_guard_block_total += 1
 
 
+def record_loop_stall() -> None:
+    """记录事件循环阻塞次数。"""
+    with _LOCK:
+        _METRICS.loop_stall_total += 1
+
+
+def record_result_cache(hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+    """记录结果缓存命中/未命中/淘汰次数（子进程的统计也通过此函数汇总）。"""
+    with _LOCK:
+        _METRICS.result_cache_hits_total += hits
+        _METRICS.result_cache_misses_total += misses
+        _METRICS.result_cache_evictions_total += evictions
+
+
 def get_runtime_metrics() -> Dict[str, int]:
     """返回当前指标快照。"""
     with _LOCK:
@@ -58,9 +76,19 @@ def get_runtime_slo_snapshot() -> Dict[str, float]:
         fallback_rate = (
             _METRICS.fallback_invocations_total / requests if requests > 0 else 0.0
         )
+        cache_lookups = float(
+            _METRICS.result_cache_hits_total + _METRICS.result_cache_misses_total
+        )
+        cache_hit_rate = (
+            _METRICS.result_cache_hits_total / cache_lookups
+            if cache_lookups > 0
+            else 0.0
+        )
 
         return {
             "gemini_success_rate": success_rate,
             "gemini_fallback_rate": fallback_rate,
             "live_guard_block_total": float(_METRICS.live_guard_block_total),
+            "loop_stall_total": float(_METRICS.loop_stall_total),
+            "result_cache_hit_rate": cache_hit_rate,
         }
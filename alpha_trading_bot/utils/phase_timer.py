@@ -0,0 +1,39 @@
+"""
+交易周期分阶段计时
+
+start() 开始一个周期，mark(name) 记录距上一个标记点的耗时（毫秒），
+finish() 把剩余耗时计入收尾阶段并保存到 last。每个标记只调用一次 perf_counter，常驻开启。
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class PhaseTimer:
+    """按标记点切分的周期计时器"""
+
+    def __init__(self) -> None:
+        self.last: Dict[str, float] = {}
+        self._phases: Dict[str, float] = {}
+        self._mark: Optional[float] = None
+
+    def start(self) -> None:
+        self._phases = {}
+        self._mark = time.perf_counter()
+
+    def mark(self, name: str) -> None:
+        """上一个标记点到现在的耗时计入 name（同名阶段累加）"""
+        if self._mark is None:
+            return
+        now = time.perf_counter()
+        self._phases[name] = self._phases.get(name, 0.0) + (now - self._mark) * 1000
+        self._mark = now
+
+    def finish(self, name: str = "execution") -> Dict[str, float]:
+        """结束本周期，返回各阶段耗时"""
+        if self._mark is None:
+            return self.last
+        self.mark(name)
+        self.last = self._phases
+        self._mark = None
+        return self.last
@@ -0,0 +1,337 @@
+"""
+按内容寻址的计算结果磁盘缓存
+
+回测、权重学习等计算的结果按"输入数据切片 + 参数"的哈希存到磁盘，
+输入不变时（如两次定时学习之间没有新信号）直接读取：
+- content_hash 对嵌套的 dict/list/数据类/NumPy 数组/日期做规范化编码后取 sha256，
+  与对象身份无关，跨进程稳定
+- 每个命名空间一个子目录，条目为 pickle 文件，写入走临时文件 + os.replace
+- 总大小超过上限时按最近使用时间淘汰（命中会刷新文件 mtime）
+- 失效是显式的：invalidate(namespace) / invalidate(namespace, key)，
+  调用方在计算逻辑变化时递增自己的版本号（参与哈希）
+- 命中/未命中/淘汰次数按命名空间统计，并计入 observability 运行时指标
+"""
+
+import dataclasses
+import enum
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from .observability import record_result_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SUFFIX = ".pkl"
+
+
+def _feed(digest: "hashlib._Hash", value: Any) -> None:
+    """把 value 的规范化编码写入 digest（类型标签 + 长度前缀，避免拼接歧义）"""
+
+    def tagged(tag: bytes, payload: bytes) -> None:
+        digest.update(tag)
+        digest.update(struct.pack(">Q", len(payload)))
+        digest.update(payload)
+
+    if isinstance(value, enum.Enum):
+        tagged(b"enum", type(value).__qualname__.encode())
+        _feed(digest, value.value)
+        return
+    if value is None or isinstance(value, (bool, int, float, str)):
+        tagged(type(value).__name__.encode(), repr(value).encode())
+        return
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        tagged(b"bytes", bytes(value))
+        return
+    if isinstance(value, (datetime, date, time)):
+        tagged(b"time", value.isoformat().encode())
+        return
+    if isinstance(value, timedelta):
+        tagged(b"delta", repr(value.total_seconds()).encode())
+        return
+
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                digest.update(b"ndarray-object")
+                _feed(digest, value.tolist())
+            else:
+                header = f"{value.dtype.str}{value.shape}".encode()
+                tagged(b"ndarray", header)
+                tagged(b"data", np.ascontiguousarray(value).tobytes())
+            return
+        if isinstance(value, np.generic):
+            _feed(digest, value.item())
+            return
+
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: repr(item[0]))
+        tagged(b"dict", str(len(items)).encode())
+        for key, item in items:
+            _feed(digest, key)
+            _feed(digest, item)
+        return
+    if isinstance(value, (list, tuple)):
+        tagged(b"seq", str(len(value)).encode())
+        for item in value:
+            _feed(digest, item)
+        return
+    if isinstance(value, (set, frozenset)):
+        _feed(digest, sorted(value, key=repr))
+        return
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        tagged(b"dataclass", type(value).__qualname__.encode())
+        for f in dataclasses.fields(value):
+            _feed(digest, f.name)
+            _feed(digest, getattr(value, f.name))
+        return
+    if hasattr(value, "isoformat"):  # pandas.Timestamp 等
+        tagged(b"time", value.isoformat().encode())
+        return
+    raise TypeError(f"无法计算内容哈希的类型: {type(value).__name__}")
+
+
+def content_hash(*parts: Any) -> str:
+    """输入的内容哈希（sha256 十六进制）"""
+    digest = hashlib.sha256()
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """单个命名空间的缓存统计"""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**dataclasses.asdict(self), "hit_rate": self.hit_rate}
+
+
+class ResultCache:
+    """
+    按内容寻址的结果缓存
+
+    用法:
+        cache = get_result_cache("data_json/result_cache")
+        result = cache.get_or_compute(
+            "signal_backtest", (VERSION, signals, holding_hours), compute
+        )
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, CacheStats] = {}
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return content_hash(*parts)
+
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.directory / namespace / f"{key}{_SUFFIX}"
+
+    def _stats(self, namespace: str) -> CacheStats:
+        return self.stats.setdefault(namespace, CacheStats())
+
+    def lookup(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        """返回 (是否命中, 值)"""
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            value = _MISSING
+        except Exception as e:  # 截断/损坏的条目视为未命中并删除
+            logger.warning(f"[结果缓存] 条目损坏，已删除 {namespace}/{key[:12]}: {e}")
+            path.unlink(missing_ok=True)
+            value = _MISSING
+
+        with self._lock:
+            stats = self._stats(namespace)
+            if value is _MISSING:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+        if value is _MISSING:
+            record_result_cache(misses=1)
+            return False, None
+
+        record_result_cache(hits=1)
+        try:
+            os.utime(path)  # 刷新最近使用时间
+        except OSError:
+            pass
+        logger.debug(f"[结果缓存] 命中 {namespace}/{key[:12]}")
+        return True, value
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            logger.debug(f"[结果缓存] 条目超过容量上限，不缓存 {namespace}")
+            return
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._stats(namespace).stores += 1
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(payload)
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def get_or_compute(
+        self, namespace: str, parts: Tuple[Any, ...], compute: Callable[[], T]
+    ) -> T:
+        """命中时返回缓存值，否则计算并写入"""
+        key = self.key(*parts)
+        hit, value = self.lookup(namespace, key)
+        if hit:
+            return cast(T, value)
+        value = compute()
+        self.put(namespace, key, value)
+        return value
+
+    def invalidate(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        """
+        显式失效
+
+        Args:
+            namespace: 命名空间，None 时清空全部
+            key: 只删除该条目
+
+        Returns:
+            int: 删除的条目数
+        """
+        if key is not None:
+            if namespace is None:
+                raise ValueError("按键失效时必须指定命名空间")
+            paths = [self._path(namespace, key)]
+        else:
+            root = self.directory if namespace is None else self.directory / namespace
+            paths = list(root.rglob(f"*{_SUFFIX}")) if root.exists() else []
+
+        removed = 0
+        for path in paths:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._size = None
+        logger.info(f"[结果缓存] 失效 {namespace or '全部'}: 删除 {removed} 个条目")
+        return removed
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return self._size
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    def _entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        if not self.directory.exists():
+            return
+        for path in self.directory.rglob(f"*{_SUFFIX}"):
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:  # 其他进程刚刚淘汰
+                continue
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _evict(self) -> None:
+        """按最近使用时间淘汰，直到总大小不超过上限（多进程共享目录时以实际扫描为准）"""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        evicted: Dict[str, int] = {}
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            total -= stat.st_size
+            namespace = path.parent.name
+            evicted[namespace] = evicted.get(namespace, 0) + 1
+
+        with self._lock:
+            self._size = total
+            for namespace, count in evicted.items():
+                self._stats(namespace).evictions += count
+        if evicted:
+            record_result_cache(evictions=sum(evicted.values()))
+            logger.info(
+                f"[结果缓存] 超过容量上限，淘汰 {sum(evicted.values())} 个条目，"
+                f"当前 {total / 1024 / 1024:.1f}MB"
+            )
+
+
+_MISSING = object()
+
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(
+    directory: Union[str, Path] = "data_json/result_cache",
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> ResultCache:
+    """获取目录对应的共享缓存实例"""
+    resolved = str(Path(directory).resolve())
+    with _caches_lock:
+        cache = _caches.get(resolved)
+        if cache is None:
+            cache = _caches[resolved] = ResultCache(directory, max_bytes)
+        return cache
@@ -3,7 +3,7 @@
 纯Python实现，不依赖外部库
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence
 
 from .momentum import calculate_ema, calculate_macd, calculate_rsi
 from .trend import calculate_adx, calculate_trend
@@ -27,7 +27,10 @@ __all__ = [
 
 
 def calculate_all_indicators(
-    prices: List[float], highs: List[float], lows: List[float], closes: List[float]
+    prices: Sequence[float],
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
 ) -> Dict[str, Any]:
     """计算所有技术指标"""
     result: Dict[str, Any] = {}
@@ -2,13 +2,13 @@
 动量指标 - RSI、MACD、EMA
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 
 
-def calculate_ema(data: List[float], period: int) -> List[float]:
+def calculate_ema(data: Sequence[float], period: int) -> List[float]:
     """计算指数移动平均"""
     if len(data) < period:
-        return data
+        return list(data)
 
     multiplier = 2 / (period + 1)
     ema = [sum(data[:period]) / period]
@@ -19,7 +19,7 @@ def calculate_ema(data: List[float], period: int) -> List[float]:
     return ema
 
 
-def calculate_rsi(prices: List[float], period: int = 14) -> float:
+def calculate_rsi(prices: Sequence[float], period: int = 14) -> float:
     """计算RSI"""
     if len(prices) < period + 1:
         return 50.0
@@ -41,7 +41,7 @@ def calculate_rsi(prices: List[float], period: int = 14) -> float:
 
 
 def calculate_macd(
-    prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9
+    prices: Sequence[float], fast: int = 12, slow: int = 26, signal: int = 9
 ) -> Dict[str, float]:
     """计算MACD"""
     if len(prices) < slow + signal:
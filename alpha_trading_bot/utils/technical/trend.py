@@ -2,11 +2,14 @@
 趋势指标 - ADX、趋势方向和强度
 """
 
-from typing import Dict, List, Any
+from typing import Dict, Any, Sequence
 
 
 def calculate_adx(
-    high: List[float], low: List[float], close: List[float], period: int = 14
+    high: Sequence[float],
+    low: Sequence[float],
+    close: Sequence[float],
+    period: int = 14,
 ) -> float:
     """计算ADX"""
     if len(high) < period * 2:
@@ -59,7 +62,7 @@ def calculate_adx(
 
 
 def calculate_trend(
-    prices: List[float], short_period: int = 10, long_period: int = 20
+    prices: Sequence[float], short_period: int = 10, long_period: int = 20
 ) -> Dict[str, Any]:
     """计算趋势方向和强度
 
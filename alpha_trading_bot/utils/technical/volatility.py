@@ -2,11 +2,11 @@
 波动率指标 - ATR、布林带、真实波幅
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 
 
 def calculate_true_range(
-    high: List[float], low: List[float], close: List[float]
+    high: Sequence[float], low: Sequence[float], close: Sequence[float]
 ) -> List[float]:
     """计算真实波幅 (TR)"""
     tr = []
@@ -22,7 +22,10 @@ def calculate_true_range(
 
 
 def calculate_atr(
-    high: List[float], low: List[float], close: List[float], period: int = 14
+    high: Sequence[float],
+    low: Sequence[float],
+    close: Sequence[float],
+    period: int = 14,
 ) -> tuple:
     """计算ATR"""
     if len(high) < period + 1:
@@ -43,7 +46,7 @@ def calculate_atr(
 
 
 def calculate_bollinger_bands(
-    prices: List[float], period: int = 20, std_dev: float = 2.0
+    prices: Sequence[float], period: int = 20, std_dev: float = 2.0
 ) -> Dict[str, float]:
     """计算布林带"""
     if len(prices) < period:
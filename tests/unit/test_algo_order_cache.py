@@ -0,0 +1,173 @@
+"""算法单状态缓存测试
+
+覆盖:
+1. 创建/修改/取消响应与 orders-algo 推送更新缓存
+2. 超过对账间隔、不一致标记、强制刷新时才走 REST
+3. _get_existing_stop_order_id 读缓存，本地止损单缺失时强制对账
+"""
+
+import sys
+import types
+from typing import Any, Dict, List
+
+import pytest
+
+from alpha_trading_bot.exchange.algo_order_cache import AlgoOrderCache
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _order(algo_id: str, stop_price: str = "99") -> Dict[str, Any]:
+    return {
+        "id": algo_id,
+        "status": "open",
+        "symbol": SYMBOL,
+        "type": "conditional",
+        "info": {"algoId": algo_id, "slTriggerPx": stop_price},
+    }
+
+
+def test_cache_tracks_age_and_reconcile_triggers() -> None:
+    clock = _Clock()
+    cache = AlgoOrderCache(reconcile_interval_seconds=30, clock=clock)
+
+    assert cache.age_seconds(SYMBOL) == float("inf")
+    assert cache.needs_reconcile(SYMBOL)
+
+    cache.replace_all(SYMBOL, [_order("sl-1")])
+    clock.now += 10
+    assert cache.age_seconds(SYMBOL) == 10
+    assert not cache.needs_reconcile(SYMBOL)
+    assert cache.needs_reconcile(SYMBOL, max_age_seconds=5)
+
+    clock.now += 25
+    assert cache.needs_reconcile(SYMBOL)
+
+    cache.replace_all(SYMBOL, [])
+    cache.mark_stale(SYMBOL, "cancel_failed:sl-1")
+    assert cache.needs_reconcile(SYMBOL)
+    assert cache.snapshot(SYMBOL)["stale_reason"] == "cancel_failed:sl-1"
+
+
+def test_cache_applies_own_responses_and_push() -> None:
+    cache = AlgoOrderCache()
+    cache.replace_all(SYMBOL, [])
+
+    cache.record_created(SYMBOL, "sl-1", stop_price=99.5)
+    cache.record_created(SYMBOL, "tp-1", take_profit_price=101.0)
+    cache.record_amended(SYMBOL, "sl-1", stop_price=99.8)
+    cache.remove(SYMBOL, "tp-1")
+
+    orders = cache.get_orders(SYMBOL)
+    assert [o["id"] for o in orders] == ["sl-1"]
+    assert orders[0]["info"]["slTriggerPx"] == "99.8"
+
+    handled = cache.apply_push(
+        {
+            "arg": {"channel": "orders-algo"},
+            "data": [
+                {"algoId": "sl-1", "state": "effective"},
+                {"algoId": "sl-2", "state": "live", "slTriggerPx": "99.9"},
+            ],
+        },
+        SYMBOL,
+    )
+
+    assert handled == 2
+    assert [o["id"] for o in cache.get_orders(SYMBOL)] == ["sl-2"]
+
+    cache.record_amended(SYMBOL, "unknown", stop_price=1.0)
+    assert cache.needs_reconcile(SYMBOL)
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, rest_orders: List[Dict[str, Any]]):
+    fake_ccxt = types.ModuleType("ccxt")
+    fake_ccxt.okx = object
+    monkeypatch.setitem(sys.modules, "ccxt", fake_ccxt)
+    from alpha_trading_bot.exchange.client import ExchangeClient
+
+    client = ExchangeClient(test_mode=False, algo_cache_reconcile_seconds=60)
+    rest_calls: List[str] = []
+
+    class _Executor:
+        async def call(self, snake, camel, params, parser):
+            rest_calls.append(params["ordType"])
+            return [dict(order) for order in rest_orders]
+
+    client.exchange = type(
+        "Exch", (), {"private_get_trade_orders_algo_pending": lambda self, p: None}
+    )()
+    client._raw_executor = _Executor()
+    client._raw_executor.exchange = client.exchange
+
+    class _OrderService:
+        async def cancel_algo_order(self, algo_id, symbol):
+            return (False, "failed") if algo_id == "bad" else (True, "success")
+
+        async def amend_algo_order(self, algo_id, symbol, sl=None, tp=None):
+            return (True, "success")
+
+    client._order_service = _OrderService()
+    return client, rest_calls
+
+
+@pytest.mark.asyncio
+async def test_client_reads_cache_until_reconcile_needed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, rest_calls = _client(monkeypatch, [_order("sl-1"), _order("tp-1")])
+
+    first = await client.get_cached_algo_orders(SYMBOL)
+    second = await client.get_cached_algo_orders(SYMBOL)
+    assert len(first) == len(second) == 2
+    assert rest_calls == ["conditional"]
+
+    await client.cancel_algo_order("tp-1", SYMBOL)
+    await client.amend_algo_order("sl-1", SYMBOL, new_stop_price=99.7)
+    cached = await client.get_cached_algo_orders(SYMBOL)
+    assert [o["id"] for o in cached] == ["sl-1"]
+    assert cached[0]["info"]["slTriggerPx"] == "99.7"
+    assert len(rest_calls) == 1
+
+    await client.get_cached_algo_orders(SYMBOL, force_refresh=True)
+    assert len(rest_calls) == 2
+
+    await client.cancel_algo_order("bad", SYMBOL)
+    await client.get_cached_algo_orders(SYMBOL)
+    assert len(rest_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_existing_stop_lookup_forces_reconcile_on_mismatch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from alpha_trading_bot.config.models import Config, ExchangeConfig
+    from alpha_trading_bot.core.adaptive_bot import AdaptiveTradingBot
+
+    client, rest_calls = _client(monkeypatch, [_order("sl-new", "99.25")])
+    client.symbol = SYMBOL
+    bot = AdaptiveTradingBot(
+        Config(exchange=ExchangeConfig(api_key="k", secret="s", password="p"))
+    )
+    bot._exchange = client
+
+    assert await bot._get_existing_stop_order_id() == ("sl-new", 99.25)
+    assert await bot._get_existing_stop_order_id() == ("sl-new", 99.25)
+    assert len(rest_calls) == 1
+
+    # 本地记录的止损单不在缓存中 → 强制 REST 对账
+    bot.position_manager.set_stop_order("sl-local", 99.0)
+    await bot._get_existing_stop_order_id()
+    assert len(rest_calls) == 2
+
+    await bot._get_existing_stop_order_id(force_refresh=True)
+    assert len(rest_calls) == 3
+    assert client.algo_order_cache.snapshot(SYMBOL)["orders"] == 1
@@ -0,0 +1,286 @@
+"""开仓单附带止损（OKX attachAlgoOrds）测试
+
+覆盖:
+1. OrderService 下单参数携带 attachAlgoOrds，仅允许开仓单附带
+2. ExchangeClient 按 algoClOrdId 找回成交后生成的止损算法单
+3. _execute_trade 附带止损生效时跳过单独止损单；查询未命中时先强制对账收养，
+   对账也找不到才回退为单独止损单
+"""
+
+import sys
+import types
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from alpha_trading_bot.config.models import (
+    Config,
+    ExchangeConfig,
+    StopLossConfig,
+    TradingConfig,
+)
+from alpha_trading_bot.core.adaptive_bot import AdaptiveTradingBot
+from alpha_trading_bot.core.position_manager import PositionManager
+from alpha_trading_bot.exchange.models.orders import (
+    OrderIntent,
+    OrderResult,
+    OrderStatus,
+)
+
+
+def _install_fake_ccxt(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_ccxt = types.ModuleType("ccxt")
+    fake_ccxt.okx = object
+    monkeypatch.setitem(sys.modules, "ccxt", fake_ccxt)
+
+
+class _RawExchange:
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    def private_post_trade_order(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(params)
+        return {"code": "0", "data": [{"ordId": "ord-1", "sCode": "0"}]}
+
+
+@pytest.mark.asyncio
+async def test_order_service_sends_attach_algo_ords(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    exchange = _RawExchange()
+    service = OrderService(exchange, "BTC/USDT:USDT")
+    monkeypatch.setattr(service, "_detect_pos_mode", lambda: service.POS_MODE_ONEWAY)
+    attached = [OrderService.build_attached_stop_loss(62501.4, "slabc")]
+
+    result = await service.create_order_with_status(
+        "BTC/USDT:USDT", "buy", 0.01, attach_algo_ords=attached
+    )
+
+    assert result.order_id == "ord-1"
+    assert exchange.calls[0]["attachAlgoOrds"] == [
+        {
+            "attachAlgoClOrdId": "slabc",
+            "slTriggerPx": "62501.4",
+            "slOrdPx": "-1",
+            "slTriggerPxType": "last",
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_order_service_rejects_attach_on_close(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    exchange = _RawExchange()
+    service = OrderService(exchange, "BTC/USDT:USDT")
+    monkeypatch.setattr(service, "_detect_pos_mode", lambda: service.POS_MODE_ONEWAY)
+
+    result = await service.create_order_with_status(
+        "BTC/USDT:USDT",
+        "sell",
+        0.01,
+        intent=OrderIntent.CLOSE,
+        attach_algo_ords=[OrderService.build_attached_stop_loss(1.0, "x")],
+    )
+
+    assert result.is_rejected
+    assert exchange.calls == []
+
+
+@pytest.mark.asyncio
+async def test_client_finds_attached_algo_by_client_id(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.client import ExchangeClient
+
+    client = ExchangeClient(test_mode=False)
+    polls = []
+
+    async def _get_algo_orders(symbol: str) -> List[Dict[str, Any]]:
+        polls.append(symbol)
+        if len(polls) < 2:
+            return []
+        return [
+            {"id": "other", "info": {"algoClOrdId": ""}},
+            {"id": "algo-9", "info": {"algoClOrdId": "slabc"}},
+        ]
+
+    monkeypatch.setattr(client, "get_algo_orders", _get_algo_orders)
+
+    order = await client.find_attached_algo_order(
+        "BTC/USDT:USDT", "slabc", retry_delay=0
+    )
+
+    assert order is not None and order["id"] == "algo-9"
+    assert len(polls) == 2
+
+
+def _config(attach: bool = True) -> Config:
+    return Config(
+        exchange=ExchangeConfig(api_key="k", secret="s", password="p"),
+        trading=TradingConfig(
+            test_mode=False,
+            real_trading_confirmed=True,
+            runtime_environment="prod",
+        ),
+        stop_loss=StopLossConfig(attach_stop_loss_on_entry=attach),
+    )
+
+
+@dataclass
+class _Regime:
+    value: str = "trend"
+
+
+class _Deps:
+    regime = _Regime()
+
+    def __init__(self) -> None:
+        self.stop_calls: List[float] = []
+
+    def get_parameters(self) -> Dict[str, float]:
+        return {"fusion_threshold": 0.5}
+
+    def calculate_trade_params(self, *args: Any, **kwargs: Any) -> Dict[str, float]:
+        return {"suggested_position": 0.01, "stop_loss_price": 99.5}
+
+    def detect(self, market_data: Dict[str, Any]) -> "_Deps":
+        return self
+
+    def record_trade(self, **kwargs: Any) -> None:
+        return None
+
+    async def create_stop_loss_with_retry(
+        self, amount, stop_price, current_price, max_retries, position_side
+    ) -> str:
+        self.stop_calls.append(stop_price)
+        return "separate-stop"
+
+
+class _Exchange:
+    symbol = "BTC/USDT:USDT"
+
+    def __init__(
+        self,
+        attached_id: Optional[str],
+        pending: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        self.attached_id = attached_id
+        self.pending = pending or []
+        self.order_kwargs: Dict[str, Any] = {}
+        self.lookups: List[str] = []
+        self.refreshes: List[bool] = []
+
+    async def create_confirmed_market_order(
+        self, symbol, side, amount, intent, position_side, **kwargs
+    ) -> OrderResult:
+        self.order_kwargs = kwargs
+        return OrderResult(
+            order_id="ord-1",
+            status=OrderStatus.CLOSED,
+            symbol=symbol,
+            side=side,
+            order_type="market",
+            requested_amount=amount,
+            filled_amount=amount,
+            remaining_amount=0.0,
+            average_price=100.0,
+        )
+
+    async def find_attached_algo_order(
+        self, symbol: str, attach_algo_cl_ord_id: str
+    ) -> Optional[Dict[str, Any]]:
+        self.lookups.append(attach_algo_cl_ord_id)
+        if self.attached_id is None:
+            return None
+        return {"id": self.attached_id, "info": {}}
+
+    async def get_cached_algo_orders(
+        self, symbol: str, force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        self.refreshes.append(force_refresh)
+        return self.pending
+
+
+async def _open(bot: AdaptiveTradingBot, tmp_path: Any, exchange: _Exchange) -> _Deps:
+    deps = _Deps()
+    bot.position_manager = PositionManager(bot.config, data_dir=tmp_path)
+    bot.param_manager = deps
+    bot.risk_manager = deps
+    bot.regime_detector = deps
+    bot.performance_tracker = deps
+    bot._adaptive_stop_loss = deps
+    bot._take_profit_calculator = None
+    bot._exchange = exchange
+    await bot._execute_trade(
+        action="open",
+        current_price=100.0,
+        has_position=False,
+        position_data={},
+        market_data={"technical": {}},
+        cached_rule_result={"adjustments": {"position_multiplier": 1.0}},
+    )
+    return deps
+
+
+@pytest.mark.asyncio
+async def test_open_uses_attached_stop_without_separate_order(tmp_path: Any) -> None:
+    bot = AdaptiveTradingBot(_config())
+    exchange = _Exchange(attached_id="algo-7")
+
+    deps = await _open(bot, tmp_path, exchange)
+
+    assert exchange.order_kwargs["attached_stop_price"] == 99.5
+    assert exchange.lookups == [exchange.order_kwargs["attach_algo_cl_ord_id"]]
+    assert len(exchange.lookups[0]) <= 32
+    assert deps.stop_calls == []
+    assert bot.position_manager.stop_order_id == "algo-7"
+    assert bot.position_manager.last_stop_price == 99.5
+
+
+@pytest.mark.asyncio
+async def test_open_falls_back_when_attached_stop_missing(tmp_path: Any) -> None:
+    bot = AdaptiveTradingBot(_config())
+    exchange = _Exchange(attached_id=None)
+
+    deps = await _open(bot, tmp_path, exchange)
+
+    assert exchange.refreshes == [True]
+    assert deps.stop_calls == [99.5]
+    assert bot.position_manager.stop_order_id == "separate-stop"
+
+
+@pytest.mark.asyncio
+async def test_open_adopts_attached_stop_found_by_reconcile(tmp_path: Any) -> None:
+    bot = AdaptiveTradingBot(_config())
+    exchange = _Exchange(
+        attached_id=None,
+        pending=[{"id": "algo-8", "info": {"algoId": "algo-8", "slTriggerPx": "99.4"}}],
+    )
+
+    deps = await _open(bot, tmp_path, exchange)
+
+    assert exchange.refreshes == [True]
+    assert deps.stop_calls == []
+    assert bot.position_manager.stop_order_id == "algo-8"
+    assert bot.position_manager.last_stop_price == 99.4
+
+
+@pytest.mark.asyncio
+async def test_open_without_attach_config_keeps_separate_path(tmp_path: Any) -> None:
+    bot = AdaptiveTradingBot(_config(attach=False))
+    exchange = _Exchange(attached_id="algo-7")
+
+    deps = await _open(bot, tmp_path, exchange)
+
+    assert exchange.order_kwargs == {}
+    assert exchange.lookups == []
+    assert deps.stop_calls == [99.5]
@@ -0,0 +1,317 @@
+"""OHLC 回测内核测试
+
+覆盖:
+1. 内核与逐K线参考实现的交易列表、权益曲线一致（多/空、复利、反向信号平仓、tie-break）
+2. 收盘价回测看不到的K线内止损/止盈、跳空按开盘价成交
+3. BacktestEngine / BacktestValidator 基于内核保持原有结果结构
+   （Trade.pnl / total_pnl 为扣除双边手续费后的净盈亏，平仓K线不再反手开仓，
+   回测结束时未平仓的持仓记为 end_of_backtest 卖出记录）
+4. 一年 1 分钟K线的单组参数回测耗时预算
+"""
+
+import time
+from itertools import product
+
+import numpy as np
+import pytest
+
+from alpha_trading_bot.ai.backtest_validator import (
+    BacktestConfig as ValidatorConfig,
+    BacktestValidator,
+    TradeResult,
+)
+from alpha_trading_bot.ai.optimizer.backtest_engine import (
+    BacktestConfig,
+    BacktestEngine,
+)
+from alpha_trading_bot.ai.optimizer.backtest_kernel import (
+    KernelConfig,
+    OHLCArrays,
+    simulate,
+)
+
+
+def _random_ohlc(n: int, seed: int, volatility: float = 0.004) -> OHLCArrays:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    # 开盘价带跳空，覆盖按开盘价成交的分支
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, volatility / 2, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility, n)))
+    return OHLCArrays(open_, high, low, close)
+
+
+def _reference(ohlc, signals, confidence, cfg):
+    """逐K线参考实现"""
+    o, h, l, c = ohlc.open, ohlc.high, ohlc.low, ohlc.close
+    n = len(c)
+    equity = cfg.initial_capital
+    position = None
+    curve, trades = [], []
+    for t in range(n):
+        if position is not None:
+            side, entry, qty, entry_fee, notional, i = position
+            stop = entry * (1 - side * cfg.stop_loss_percent)
+            target = entry * (1 + side * cfg.take_profit_percent)
+            stop_hit = l[t] <= stop if side == 1 else h[t] >= stop
+            target_hit = h[t] >= target if side == 1 else l[t] <= target
+            gapped_stop = side * (o[t] - stop) <= 0
+            gapped_target = side * (o[t] - target) >= 0
+            exit_ = None
+            if t == i:
+                exit_ = (c[t], "end_of_backtest") if t == n - 1 else None
+            elif stop_hit and target_hit:
+                if gapped_stop:
+                    exit_ = (o[t], "stop_loss")
+                elif gapped_target:
+                    exit_ = (o[t], "take_profit")
+                elif cfg.tie_break == "take_profit":
+                    exit_ = (target, "take_profit")
+                else:
+                    exit_ = (stop, "stop_loss")
+            elif stop_hit:
+                exit_ = (o[t] if gapped_stop else stop, "stop_loss")
+            elif target_hit:
+                exit_ = (o[t] if gapped_target else target, "take_profit")
+            elif cfg.exit_on_signal and signals[t] == -side:
+                exit_ = (c[t], "signal")
+            elif t == n - 1:
+                exit_ = (c[t], "end_of_backtest")
+            if exit_ is None:
+                curve.append(equity - entry_fee + side * qty * (c[t] - entry))
+                continue
+            price, reason = exit_
+            pct = side * (price - entry) / entry
+            pnl = notional * pct - entry_fee - qty * price * cfg.fee_percent
+            equity += pnl
+            trades.append((i, t, side, price, reason, pnl))
+            position = None
+            curve.append(equity)
+            continue
+
+        side = int(signals[t])
+        if (
+            side
+            and confidence[t] >= cfg.min_confidence
+            and (side == 1 or cfg.allow_short)
+        ):
+            base = equity if cfg.compound else cfg.initial_capital
+            notional = base * cfg.position_size
+            position = (
+                side,
+                c[t],
+                notional / c[t],
+                notional * cfg.fee_percent,
+                notional,
+                t,
+            )
+            if t == n - 1:
+                pnl = -notional * cfg.fee_percent * 2
+                equity += pnl
+                trades.append((t, t, side, c[t], "end_of_backtest", pnl))
+                position = None
+                curve.append(equity)
+                continue
+            curve.append(equity - notional * cfg.fee_percent)
+            continue
+        curve.append(equity)
+    return np.array(curve), trades
+
+
+@pytest.mark.parametrize(
+    "allow_short,exit_on_signal,compound,tie_break",
+    list(
+        product(
+            [False, True], [False, True], [False, True], ["stop_loss", "take_profit"]
+        )
+    ),
+)
+def test_kernel_matches_bar_by_bar_reference(
+    allow_short, exit_on_signal, compound, tie_break
+):
+    for seed in range(3):
+        ohlc = _random_ohlc(600, seed)
+        rng = np.random.default_rng(seed + 100)
+        signals = rng.choice([1, -1, 0, 0, 0, 0], size=600).astype(np.int8)
+        confidence = rng.random(600)
+        cfg = KernelConfig(
+            stop_loss_percent=0.01,
+            take_profit_percent=0.015,
+            min_confidence=0.3,
+            allow_short=allow_short,
+            exit_on_signal=exit_on_signal,
+            compound=compound,
+            tie_break=tie_break,
+        )
+
+        result = simulate(ohlc, signals, confidence, cfg)
+        curve, trades = _reference(ohlc, signals, confidence, cfg)
+
+        t = result.trades
+        assert list(
+            zip(
+                t.entry_index.tolist(),
+                t.exit_index.tolist(),
+                t.side.tolist(),
+                t.reason_names(),
+            )
+        ) == [(i, j, side, reason) for i, j, side, _, reason, _ in trades]
+        assert t.exit_price == pytest.approx([trade[3] for trade in trades])
+        assert t.pnl == pytest.approx([trade[5] for trade in trades])
+        assert result.equity == pytest.approx(curve)
+
+
+def test_intrabar_stop_is_visible_only_with_high_low():
+    close = [100.0, 100.0, 100.5, 101.0]
+    signals = [1, 0, 0, 0]
+    # 第 2 根K线最低价跌破止损但收盘收回
+    ohlc = OHLCArrays(
+        open=np.array(close),
+        high=np.array([100.0, 100.2, 100.6, 101.0]),
+        low=np.array([100.0, 97.5, 100.2, 100.8]),
+        close=np.array(close),
+    )
+    cfg = KernelConfig(stop_loss_percent=0.02, take_profit_percent=0.06)
+
+    close_only = simulate(OHLCArrays.from_close(close), signals, config=cfg)
+    with_range = simulate(ohlc, signals, config=cfg)
+
+    assert close_only.trades.reason_names() == ["end_of_backtest"]
+    assert with_range.trades.reason_names() == ["stop_loss"]
+    assert with_range.trades.exit_price.tolist() == [pytest.approx(98.0)]
+    assert with_range.trades.exit_index.tolist() == [1]
+
+
+@pytest.mark.parametrize(
+    "tie_break,open_price,expected",
+    [
+        ("stop_loss", 100.0, ("stop_loss", 98.0)),
+        ("take_profit", 100.0, ("take_profit", 106.0)),
+        # 开盘即跳空越过触发价，按开盘价成交
+        ("take_profit", 97.0, ("stop_loss", 97.0)),
+        ("stop_loss", 107.0, ("take_profit", 107.0)),
+    ],
+)
+def test_tie_break_and_gap_fills(tie_break, open_price, expected):
+    ohlc = OHLCArrays(
+        open=np.array([100.0, open_price]),
+        high=np.array([100.0, 108.0]),
+        low=np.array([100.0, 96.0]),
+        close=np.array([100.0, 100.0]),
+    )
+
+    result = simulate(ohlc, [1, 0], config=KernelConfig(tie_break=tie_break))
+
+    assert (
+        result.trades.reason_names()[0],
+        result.trades.exit_price[0],
+    ) == pytest.approx(expected)
+
+
+def test_invalid_tie_break_is_rejected():
+    with pytest.raises(ValueError, match="tie_break"):
+        KernelConfig(tie_break="close")
+
+
+def test_engine_keeps_result_shape_and_uninvested_capital():
+    candles = [
+        {
+            "timestamp": f"t{i}",
+            "open": p,
+            "high": p * 1.001,
+            "low": p * 0.999,
+            "close": p,
+        }
+        for i, p in enumerate([100, 101, 102, 110, 111, 109, 100])
+    ]
+    signals = [{"signal": "buy", "confidence": 0.8}] + [{"signal": "hold"}] * 6
+
+    engine = BacktestEngine(BacktestConfig(fee_percent=0.0))
+    result = engine.run_backtest(candles, signals)
+
+    assert [t["action"] for t in result.trade_history] == ["buy", "sell"]
+    assert result.trade_history[1]["reason"] == "take_profit"
+    assert result.trade_history[1]["timestamp"] == "t3"
+    assert result.winning_trades == 1 and result.losing_trades == 0
+    # 跳空高开越过止盈价，按开盘价 110 成交；仅 10% 仓位参与交易，其余资金保留
+    assert result.total_return == pytest.approx(0.1 * 0.10)
+    assert engine.get_capital_history()[0] == 10000
+    assert len(engine.get_capital_history()) == len(candles) + 1
+    assert set(result.to_dict()) >= {"sharpe_ratio", "max_drawdown", "trade_history"}
+
+
+def test_validator_runs_long_and_short_trades():
+    prices = [100.0, 101.0, 103.0, 106.5, 105.0, 104.0, 101.5, 98.0, 99.0, 99.5]
+    signals = [{"signal": "buy", "confidence": 0.8}] + [{"signal": "hold"}] * 9
+    signals[4] = {"signal": "sell", "confidence": 0.75}
+    signals[8] = {"signal": "buy", "confidence": 0.4}  # 低于阈值，忽略
+    timestamps = [f"2026-0{1 + i // 5}-{10 + i}" for i in range(10)]
+
+    validator = BacktestValidator(ValidatorConfig())
+    result = validator.run_backtest(signals, prices, timestamps)
+
+    assert [(t.side, t.reason, t.result) for t in result.trades] == [
+        ("buy", "take_profit", TradeResult.WIN),
+        ("sell", "take_profit", TradeResult.WIN),
+    ]
+    assert result.win_rate == 1.0
+    assert result.total_pnl == pytest.approx(sum(t.pnl for t in result.trades))
+    assert result.monthly_returns.keys() == {"2026-01", "2026-02"}
+    assert len(validator.capital_history) == len(prices) + 1
+    assert "回测报告" in validator.generate_report(result)
+
+    with pytest.raises(ValueError):
+        validator.run_backtest(signals, prices[:-1], timestamps)
+
+
+def test_validator_total_pnl_is_net_of_fees_without_reentry_on_exit_bar():
+    prices = [100.0, 107.0, 108.0]
+    signals = [
+        {"signal": "buy", "confidence": 0.8},
+        {"signal": "buy", "confidence": 0.8},  # 平仓K线上的信号不再开仓
+        {"signal": "hold"},
+    ]
+
+    result = BacktestValidator(ValidatorConfig()).run_backtest(
+        signals, prices, ["t0", "t1", "t2"]
+    )
+
+    assert [(t.reason, t.exit_time) for t in result.trades] == [("take_profit", "t1")]
+    # 名义本金 10000 * 0.1，毛收益 7% 扣除开仓 0.1% 与按平仓价计的 0.1% 手续费
+    notional = 10000 * 0.1
+    assert result.total_pnl == pytest.approx(notional * (0.07 - 0.001 - 1.07 * 0.001))
+    assert result.total_return == pytest.approx(result.total_pnl / 10000)
+
+
+def test_engine_records_end_of_backtest_sell():
+    candles = [
+        {"timestamp": f"t{i}", "close": p} for i, p in enumerate([100, 101, 102])
+    ]
+    signals = [{"signal": "buy", "confidence": 0.8}]
+
+    result = BacktestEngine().run_backtest(candles, signals)
+
+    assert [t["action"] for t in result.trade_history] == ["buy", "sell"]
+    assert result.trade_history[1]["reason"] == "end_of_backtest"
+    assert result.trade_history[1]["timestamp"] == "t2"
+    # 强制平仓不计入胜负统计
+    assert result.winning_trades == 0 and result.losing_trades == 0
+
+
+def test_year_of_minute_bars_runs_within_budget():
+    n = 525_600
+    ohlc = _random_ohlc(n, seed=7, volatility=0.0008)
+    rng = np.random.default_rng(7)
+    signals = np.where(rng.random(n) < 0.005, rng.choice([1, -1], n), 0)
+    cfg = KernelConfig(
+        stop_loss_percent=0.005, take_profit_percent=0.01, allow_short=True
+    )
+
+    simulate(ohlc, signals, config=cfg)
+    started = time.perf_counter()
+    result = simulate(ohlc, signals, config=cfg)
+    elapsed = time.perf_counter() - started
+
+    assert len(result.trades) > 500
+    # 预算为实测值的数倍，用于发现回归而非精确计时
+    assert elapsed < 0.5
@@ -0,0 +1,212 @@
+"""批量下单/撤单测试
+
+覆盖:
+1. batch-orders 逐单结果解析为 OrderResult（部分拒绝、参数错误、分批）
+2. cancel-batch-orders / cancel-algos 逐项归类 success / already_gone / failed
+3. 平仓前保护单取消使用一次批量请求，客户端不支持时逐单回退
+"""
+
+import sys
+import types
+from typing import Any, Dict, List
+
+import pytest
+
+from alpha_trading_bot.core.position_recovery import PositionRecoveryManager
+from alpha_trading_bot.exchange.models.orders import (
+    BatchOrderRequest,
+    OrderIntent,
+    OrderStatus,
+)
+
+
+def _install_fake_ccxt(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_ccxt = types.ModuleType("ccxt")
+    fake_ccxt.okx = object
+    monkeypatch.setitem(sys.modules, "ccxt", fake_ccxt)
+
+
+def _service(monkeypatch: pytest.MonkeyPatch, exchange: Any):
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    service = OrderService(exchange, "BTC/USDT:USDT")
+    monkeypatch.setattr(service, "_detect_pos_mode", lambda: service.POS_MODE_ONEWAY)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_batch_orders_parses_per_item_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: List[List[Dict[str, Any]]] = []
+
+    class _Exchange:
+        def private_post_trade_batch_orders(self, params):
+            calls.append(params)
+            return {
+                "code": "2",
+                "data": [
+                    {"ordId": "ord-1", "sCode": "0", "sMsg": ""},
+                    {"ordId": "", "sCode": "51008", "sMsg": "Insufficient balance"},
+                ],
+            }
+
+    service = _service(monkeypatch, _Exchange())
+    requests = [
+        BatchOrderRequest("BTC/USDT:USDT", "buy", 0.01, position_side="long"),
+        BatchOrderRequest("BTC/USDT:USDT", "sell", 0.02, intent=OrderIntent.CLOSE),
+        BatchOrderRequest("BTC/USDT:USDT", "buy", 0.03, position_side="long"),
+    ]
+    monkeypatch.setattr(service, "_detect_pos_mode", lambda: service.POS_MODE_HEDGE)
+
+    results = await service.create_orders_batch(requests)
+
+    # 对冲模式下第二笔缺少 position_side，本地拒绝且不提交
+    assert [len(c) for c in calls] == [2]
+    assert calls[0][0]["sz"] == "0.01" and calls[0][1]["sz"] == "0.03"
+    assert [r.status for r in results] == [
+        OrderStatus.OPEN,
+        OrderStatus.REJECTED,
+        OrderStatus.REJECTED,
+    ]
+    assert results[0].order_id == "ord-1"
+    assert "position_side" in results[1].error_message
+    assert results[2].error_code == "51008"
+    assert results[2].requested_amount == 0.03
+
+
+@pytest.mark.asyncio
+async def test_batch_orders_chunks_by_okx_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sizes: List[int] = []
+
+    class _Exchange:
+        def private_post_trade_batch_orders(self, params):
+            sizes.append(len(params))
+            return {
+                "code": "0",
+                "data": [{"ordId": f"o{i}", "sCode": "0"} for i in range(len(params))],
+            }
+
+    service = _service(monkeypatch, _Exchange())
+    requests = [BatchOrderRequest("BTC/USDT:USDT", "buy", 0.01)] * 25
+
+    results = await service.create_orders_batch(requests)
+
+    assert sizes == [20, 5]
+    assert len(results) == 25
+    assert not any(r.is_rejected for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancel_algo_orders_classifies_each_item(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: List[List[Dict[str, str]]] = []
+
+    class _Exchange:
+        def private_post_trade_cancel_algos(self, params):
+            calls.append(params)
+            return {
+                "code": "2",
+                "data": [
+                    {"algoId": "sl-1", "sCode": "0"},
+                    {"algoId": "tp-1", "sCode": "51400", "sMsg": "does not exist"},
+                    {"algoId": "x-1", "sCode": "50001", "sMsg": "service busy"},
+                ],
+            }
+
+    service = _service(monkeypatch, _Exchange())
+
+    results = await service.cancel_algo_orders(
+        ["sl-1", "tp-1", "x-1", "sl-1"], "BTC/USDT:USDT"
+    )
+
+    assert calls == [
+        [
+            {"instId": "BTC-USDT-SWAP", "algoId": "sl-1"},
+            {"instId": "BTC-USDT-SWAP", "algoId": "tp-1"},
+            {"instId": "BTC-USDT-SWAP", "algoId": "x-1"},
+        ]
+    ]
+    assert results == {
+        "sl-1": (True, "success"),
+        "tp-1": (False, "already_gone"),
+        "x-1": (False, "failed"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_batch_reports_failure_when_request_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _Exchange:
+        def private_post_trade_cancel_batch_orders(self, params):
+            raise RuntimeError("network down")
+
+    service = _service(monkeypatch, _Exchange())
+
+    results = await service.cancel_orders_batch(["o1", "o2"], "BTC/USDT:USDT")
+
+    assert results == {"o1": (False, "failed"), "o2": (False, "failed")}
+
+
+class _PositionManager:
+    def __init__(self) -> None:
+        self.stop_order_id = "sl-1"
+        self.take_profit_order_id = "tp-1"
+        self.cleared = False
+
+    def clear_protection_orders(self) -> None:
+        self.cleared = True
+
+
+@pytest.mark.asyncio
+async def test_recovery_cancels_protection_in_one_batch() -> None:
+    batches: List[List[str]] = []
+
+    class _Exchange:
+        symbol = "BTC/USDT:USDT"
+
+        async def get_algo_orders(self, symbol):
+            return [{"id": "sl-old", "info": {"slTriggerPx": "99"}}]
+
+        async def cancel_algo_orders(self, algo_ids, symbol):
+            batches.append(algo_ids)
+            return {
+                "sl-1": (True, "success"),
+                "tp-1": (False, "already_gone"),
+                "sl-old": (True, "success"),
+            }
+
+        async def cancel_algo_order(self, algo_id, symbol):
+            raise AssertionError("single cancel should not be used")
+
+    position_manager = _PositionManager()
+    manager = PositionRecoveryManager(_Exchange(), position_manager)
+
+    await manager.cancel_protection_orders_before_close()
+
+    assert batches == [["sl-1", "tp-1", "sl-old"]]
+    assert position_manager.cleared
+
+
+@pytest.mark.asyncio
+async def test_recovery_keeps_local_state_when_batch_item_fails() -> None:
+    class _Exchange:
+        symbol = "BTC/USDT:USDT"
+
+        async def get_algo_orders(self, symbol):
+            return []
+
+        async def cancel_algo_orders(self, algo_ids, symbol):
+            return {"sl-1": (True, "success"), "tp-1": (False, "failed")}
+
+    position_manager = _PositionManager()
+    manager = PositionRecoveryManager(_Exchange(), position_manager)
+
+    await manager.cancel_protection_orders_before_close()
+
+    assert not position_manager.cleared
@@ -0,0 +1,122 @@
+"""贝叶斯优化器并行/剪枝/时间预算测试
+
+覆盖:
+1. KernelObjective 分段上报累计收益，末值与逐段 simulate 之和一致
+2. 上报中间值的目标函数在进程内运行时被 Median 剪枝
+3. 多进程共享 study 完成指定试验数
+4. 时间预算到期强制终止试验进程，残留 RUNNING 试验标记为 FAIL
+"""
+
+import math
+import random
+import time
+
+import numpy as np
+import optuna
+import pytest
+
+from alpha_trading_bot.ai.optimizer.backtest_kernel import OHLCArrays, simulate
+from alpha_trading_bot.ai.optimizer.bayesian_optimizer import (
+    BayesianOptimizer,
+    KernelObjective,
+)
+
+
+def _kernel_objective(n=2000, steps=4):
+    rnd = random.Random(5)
+    price = 100.0
+    close = []
+    for i in range(n):
+        price *= math.exp(rnd.gauss(0, 0.005) + 0.001 * math.sin(i / 50))
+        close.append(price)
+    close = np.array(close)
+    ohlc = OHLCArrays(close, close * 1.003, close * 0.997, close)
+    directions = np.array([rnd.choice([1, -1, 0, 0]) for _ in range(n)])
+    return KernelObjective(ohlc, directions, steps=steps)
+
+
+def _slow_objective(params):
+    time.sleep(30)
+    return 0.0
+
+
+def _optimizer(tmp_path, **kwargs):
+    optimizer = BayesianOptimizer(
+        study_name="test", storage_path=str(tmp_path / "db" / "study.db"), **kwargs
+    )
+    optimizer.define_search_space()
+    return optimizer
+
+
+def test_kernel_objective_reports_cumulative_return():
+    objective = _kernel_objective()
+    reported = []
+
+    value = objective(
+        {"stop_loss_percent": 0.01, "fusion_threshold": 0.5},
+        report=lambda step, v: reported.append((step, v)),
+    )
+
+    assert [step for step, _ in reported] == [0, 1, 2, 3]
+    assert reported[-1][1] == pytest.approx(value)
+    first_start, first_stop = objective.segments[0]
+    segment = OHLCArrays(
+        *(
+            getattr(objective.ohlc, name)[first_start:first_stop]
+            for name in ("open", "high", "low", "close")
+        )
+    )
+    first = simulate(
+        segment,
+        objective.directions[first_start:first_stop],
+        config=objective.base_config.__class__(stop_loss_percent=0.01),
+    )
+    assert reported[0][1] == pytest.approx(first.final_equity / 10000 - 1)
+
+
+def test_in_process_trials_are_pruned(tmp_path):
+    optimizer = _optimizer(tmp_path, n_trials=20, pruner="median")
+
+    def objective(params, report):
+        # 前几步即可区分优劣：低阈值的试验一路落后
+        for step in range(10):
+            report(step, params["fusion_threshold"] * (step + 1))
+        return params["fusion_threshold"] * 10
+
+    optimizer.set_objective(objective)
+    result = optimizer.optimize()
+
+    details = result.learning_details
+    assert details["trials_pruned"] > 0
+    assert details["trials_completed"] + details["trials_pruned"] == 20
+    assert 0.3 <= result.best_params["fusion_threshold"] <= 0.8
+
+
+def test_parallel_workers_share_study(tmp_path):
+    optimizer = _optimizer(tmp_path, n_trials=6, n_workers=2, pruner="hyperband")
+    optimizer.set_objective(_kernel_objective())
+
+    result = optimizer.optimize()
+
+    study = optuna.load_study(
+        study_name="test", storage=f"sqlite:///{tmp_path / 'db' / 'study.db'}"
+    )
+    assert 6 <= len(study.trials) < 8
+    assert result.learning_details["timed_out"] is False
+    assert result.best_params
+
+
+def test_wall_clock_budget_terminates_workers(tmp_path):
+    optimizer = _optimizer(tmp_path, n_trials=4, n_workers=2, timeout_seconds=2)
+    optimizer.set_objective(_slow_objective)
+
+    started = time.time()
+    result = optimizer.optimize()
+
+    assert time.time() - started < 10
+    assert result.learning_details["timed_out"] is True
+    assert result.best_params == {}
+    study = optuna.load_study(
+        study_name="test", storage=f"sqlite:///{tmp_path / 'db' / 'study.db'}"
+    )
+    assert all(t.state != optuna.trial.TrialState.RUNNING for t in study.trials)
@@ -0,0 +1,112 @@
+"""列式K线序列测试
+
+覆盖:
+1. 列视图与切片零拷贝、只读
+2. 追加/原地更新最后一根K线，已导出视图不失效，收益率缓存随之失效
+3. MarketDataService.get_market_data 以 CandleSeries 贯通指标与检测器
+"""
+
+import sys
+import types
+
+import pytest
+
+from alpha_trading_bot.ai.sustained_decline_detector import SustainedDeclineDetector
+from alpha_trading_bot.exchange.models.candles import CandleSeries, close_returns
+
+ROWS = [
+    [1000, 100.0, 101.0, 99.0, 100.0, 5.0],
+    [2000, 100.0, 102.0, 99.5, 101.0, 6.0],
+    [3000, 101.0, 103.0, 100.5, 99.99, 7.0],
+]
+
+
+def test_columns_and_slices_share_buffers() -> None:
+    series = CandleSeries.from_rows(ROWS)
+
+    closes = series.closes
+    tail = series[1:]
+
+    assert closes.tolist() == [100.0, 101.0, 99.99]
+    assert closes.readonly
+    assert series[-1] == ROWS[-1]
+    assert isinstance(series[-1][0], int)
+    assert tail.closes.tolist() == [101.0, 99.99]
+    assert tail.closes.obj is closes.obj
+    with pytest.raises(ValueError, match="read-only"):
+        tail.append(ROWS[0])
+    assert series.to_rows() == ROWS
+
+
+def test_append_and_update_last_invalidate_cached_returns() -> None:
+    series = CandleSeries(capacity=2)
+    for row in ROWS[:2]:
+        series.append(row)
+    view = series.closes
+    returns = series.returns
+
+    assert returns is series.returns
+    assert returns.tolist() == pytest.approx([0.01])
+
+    series.upsert([2000, 100.0, 102.0, 99.0, 102.0, 8.0])
+    assert view.tolist() == [100.0, 102.0]
+    assert series.returns.tolist() == pytest.approx([0.02])
+
+    # 超出容量扩容，旧视图保留扩容前的快照
+    series.upsert(ROWS[2])
+    assert len(series) == 3
+    assert view.tolist() == [100.0, 102.0]
+    assert series.returns.tolist() == pytest.approx([0.02, 99.99 / 102.0 - 1])
+
+
+def test_close_returns_skips_non_positive_previous_close() -> None:
+    assert close_returns([0.0, 10.0, 11.0]).tolist() == pytest.approx([0.1])
+
+
+@pytest.mark.asyncio
+async def test_market_data_threads_candle_series_to_detectors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_ccxt = types.ModuleType("ccxt")
+    fake_ccxt.okx = object
+    monkeypatch.setitem(sys.modules, "ccxt", fake_ccxt)
+    from alpha_trading_bot.exchange.market_data import MarketDataService
+
+    closes = [100.0 - i * 0.3 for i in range(60)]
+
+    class _Exchange:
+        def public_get_market_ticker(self, params):
+            return {"code": "0", "data": [{"last": str(closes[-1]), "open24h": "100"}]}
+
+        def public_get_market_candles(self, params):
+            # OKX 按时间倒序返回
+            return {
+                "code": "0",
+                "data": [
+                    [str(i * 3600000), str(c), str(c + 1), str(c - 1), str(c), "1"]
+                    for i, c in reversed(list(enumerate(closes)))
+                ],
+            }
+
+    market_data = await MarketDataService(
+        _Exchange(), "BTC/USDT:USDT"
+    ).get_market_data()
+
+    candles = market_data["candles"]
+    assert isinstance(candles, CandleSeries)
+    assert market_data["price_history"] == pytest.approx(closes)
+    assert market_data["hourly_changes"] == pytest.approx(candles.returns.tolist())
+    assert market_data["technical"]["rsi"] < 30
+
+    detector = SustainedDeclineDetector()
+    from_candles = detector.detect(
+        {"price": closes[-1], "candles": candles, "cycle_start_price": closes[0]}
+    )
+    from_history = detector.detect(
+        {
+            "price": closes[-1],
+            "price_history": closes,
+            "cycle_start_price": closes[0],
+        }
+    )
+    assert from_candles.metrics == from_history.metrics
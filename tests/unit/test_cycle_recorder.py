@@ -0,0 +1,224 @@
+"""周期录制与回放测试
+
+覆盖:
+1. 值编码往返（CandleSeries / OrderResult / tuple）与配置快照脱敏
+2. 帧日志只追加、残缺尾帧读取时忽略并在续写前截断
+3. 录制代理保留协程/签名探测结果
+4. 录制模拟盘周期后回放无分歧；篡改录制后报告分歧与阶段耗时
+"""
+
+import asyncio
+import inspect
+import math
+import random
+
+import pytest
+
+from alpha_trading_bot.ai.replay_client import ModelResponder, rsi_trend_model
+from alpha_trading_bot.config.models import Config
+from alpha_trading_bot.core.cycle_recorder import (
+    REDACTED,
+    CycleLogWriter,
+    CycleRecorder,
+    config_from_snapshot,
+    config_snapshot,
+    decode_value,
+    encode_value,
+    read_cycle_log,
+)
+from alpha_trading_bot.core.cycle_replay import CycleReplayer, compare_cycles
+from alpha_trading_bot.core.replay import ReplayBacktester, ReplayConfig
+from alpha_trading_bot.exchange.models.candles import CandleSeries
+from alpha_trading_bot.exchange.models.orders import OrderResult, OrderStatus
+from alpha_trading_bot.exchange.simulated import SimulatedExchangeClient
+
+
+def _candles(n, seed=1):
+    rnd = random.Random(seed)
+    price = 30000.0
+    rows = []
+    for i in range(n):
+        open_ = price
+        price *= math.exp(rnd.gauss(0, 0.004) + 0.003 * math.sin(i / 60))
+        rows.append(
+            [
+                1_700_000_000_000 + i * 900_000,
+                open_,
+                max(open_, price) * 1.002,
+                min(open_, price) * 0.998,
+                price,
+                100.0,
+            ]
+        )
+    return rows
+
+
+def _record(tmp_path, n=400):
+    path = tmp_path / "cycles.rec"
+    config = Config()
+    config.trading.cycle_record_path = str(path)
+    result = ReplayBacktester(
+        _candles(n),
+        config,
+        responder=ModelResponder(rsi_trend_model),
+        replay_config=ReplayConfig(state_dir=str(tmp_path / "live-state")),
+    ).run_sync()
+    return path, result
+
+
+def test_values_round_trip_with_type_tags():
+    order = OrderResult(
+        order_id="1",
+        status=OrderStatus.CLOSED,
+        symbol="BTC/USDT:USDT",
+        side="buy",
+        order_type="market",
+        requested_amount=0.1,
+        filled_amount=0.1,
+        remaining_amount=0.0,
+        average_price=30000.5,
+    )
+    value = {
+        "candles": CandleSeries.from_rows([[1, 2.0, 3.0, 1.0, 2.5, 10.0]]),
+        "order": order,
+        "pair": (True, "success"),
+        "nested": [{"x": 0.1}],
+    }
+
+    decoded = decode_value(encode_value(value))
+
+    assert decoded["candles"].to_rows() == [[1, 2.0, 3.0, 1.0, 2.5, 10.0]]
+    assert decoded["order"] == order
+    assert decoded["pair"] == (True, "success")
+    assert decoded["nested"] == [{"x": 0.1}]
+
+
+def test_config_snapshot_redacts_credentials_and_round_trips():
+    config = Config()
+    config.exchange.api_key = "key"
+    config.ai.api_keys = {"deepseek": "sk-secret"}
+    config.trading.cycle_minutes = 5
+
+    snapshot = config_snapshot(config)
+    snapshot["trading"]["removed_in_future"] = 1
+    restored = config_from_snapshot(snapshot)
+
+    assert snapshot["exchange"]["api_key"] == REDACTED
+    assert snapshot["exchange"]["secret"] == ""
+    assert "sk-secret" not in str(snapshot)
+    assert restored.trading.cycle_minutes == 5
+    assert restored.ai.api_keys == {"deepseek": REDACTED}
+
+
+def test_log_ignores_and_truncates_partial_tail(tmp_path):
+    path = tmp_path / "log.rec"
+    writer = CycleLogWriter(path)
+    writer.write({"type": "cycle", "seq": 0})
+    writer.write({"type": "cycle", "seq": 1})
+    writer.close()
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x10\x00\x01partial")
+
+    assert [r["seq"] for r in read_cycle_log(path)] == [0, 1]
+
+    writer = CycleLogWriter(path)
+    writer.write({"type": "cycle", "seq": 2})
+    writer.close()
+    assert [r["seq"] for r in read_cycle_log(path)] == [0, 1, 2]
+
+    (tmp_path / "other.rec").write_bytes(b"not a log")
+    with pytest.raises(ValueError):
+        list(read_cycle_log(tmp_path / "other.rec"))
+
+
+def test_recording_proxy_keeps_capability_probes():
+    exchange = SimulatedExchangeClient(_candles(3), start_index=0)
+    recorder = CycleRecorder()
+    proxy = recorder.wrap_exchange(exchange)
+
+    assert asyncio.iscoroutinefunction(proxy.amend_algo_order)
+    assert "intent" in inspect.signature(proxy.create_order).parameters
+    assert proxy.symbol == exchange.symbol
+
+    recorder.begin_cycle()
+    position = asyncio.run(proxy.get_position())
+    assert proxy.last_query_failed is False
+    recorder.end_cycle({})
+
+    assert position is None
+    assert [e["call"] for e in recorder.last_cycle["exchange"]] == [
+        "get_position",
+        "last_query_failed",
+    ]
+
+
+def test_recorded_cycles_replay_without_divergence(tmp_path):
+    path, result = _record(tmp_path)
+    records = list(read_cycle_log(path))
+
+    assert records[0]["type"] == "header"
+    assert len(records) == result.cycles + 1
+    assert any(
+        event["call"] == "create_confirmed_market_order"
+        for record in records[1:]
+        for event in record["exchange"]
+    )
+
+    report = CycleReplayer(path, state_dir=str(tmp_path / "replay")).run_sync()
+
+    assert report.sessions == 1 and report.cycles == result.cycles
+    assert not report.diverged, report.format()
+    summary = report.phase_summary()
+    assert {"market_data", "ai_signal", "decision", "execution"} <= set(summary)
+    assert set(report.phase_summary(recorded=True)) == set(summary)
+    assert "分歧 0 处" in report.format()
+
+
+def test_tampered_recording_reports_divergence(tmp_path):
+    path, _ = _record(tmp_path)
+    records = list(read_cycle_log(path))
+    target = next(
+        record
+        for record in records[1:]
+        if any(e["call"] == "create_confirmed_market_order" for e in record["exchange"])
+    )
+    # 交易所返回已有持仓：机器人应跳过开仓，与录制的决策不同
+    for event in target["exchange"]:
+        if event["call"] == "get_position_with_retry":
+            event["result"] = {
+                "symbol": "BTC/USDT:USDT",
+                "side": "long",
+                "amount": 0.01,
+                "entry_price": 30000.0,
+                "unrealized_pnl": 0.0,
+            }
+
+    tampered = tmp_path / "tampered.rec"
+    writer = CycleLogWriter(tampered)
+    for record in records:
+        writer.write(record)
+    writer.close()
+
+    report = CycleReplayer(tampered, state_dir=str(tmp_path / "replay")).run_sync(
+        max_cycles=target["seq"] + 1
+    )
+
+    kinds = {(d.cycle, d.kind) for d in report.divergences}
+    assert (target["seq"], "decision") in kinds
+    assert (target["seq"], "missing") in kinds
+    assert "create_confirmed_market_order" in report.format()
+
+
+def test_compare_cycles_ignores_generated_client_ids():
+    call = {
+        "call": "create_confirmed_market_order",
+        "args": ["BTC/USDT:USDT", "buy", 0.1],
+        "kwargs": {"attach_algo_cl_ord_id": "sl1"},
+    }
+    changed = dict(call, kwargs={"attach_algo_cl_ord_id": "sl2"})
+    resized = dict(call, args=["BTC/USDT:USDT", "buy", 0.2])
+
+    cycle = {"signal": "BUY", "decision": {"action": "open"}, "exchange": [call]}
+    assert compare_cycles(cycle, dict(cycle, exchange=[changed])) == []
+    [(kind, name, _, _)] = compare_cycles(cycle, dict(cycle, exchange=[resized]))
+    assert (kind, name) == ("args", "create_confirmed_market_order")
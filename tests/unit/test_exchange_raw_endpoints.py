@@ -546,8 +546,9 @@ async def test_exchange_client_loads_instrument_metadata_for_order_arithmetic(
     assert client.normalize_trigger_price(99999.96, "long") == pytest.approx(99999.9)
     assert client.normalize_trigger_price(99999.96, "short") == pytest.approx(100000.0)
     assert client.calculate_notional_usdt(2.0, 100000.0) == pytest.approx(2000.0)
-    assert calls == [
-        ("sandbox", True),
+    # 合约规格与 fetch_time 并发执行，二者顺序不固定
+    assert calls[0] == ("sandbox", True)
+    assert sorted(calls[1:], key=lambda call: call[0]) == [
         (
             "instruments",
             {"instType": "SWAP", "instId": "BTC-USDT-SWAP"},
@@ -0,0 +1,106 @@
+"""周期特征上下文测试
+
+覆盖:
+1. 特征惰性计算、按周期缓存，compute_counts 证明每个特征只计算一次
+2. 集成器、策略库、Prompt 构建、持续下跌检测共享同一上下文
+3. 市场环境检测每周期只调用一次（不再重复累计 regime 变化）
+"""
+
+from typing import Any, Dict
+
+from alpha_trading_bot.ai.adaptive.market_regime import MarketRegimeDetector
+from alpha_trading_bot.ai.adaptive.strategy_library import StrategyLibrary
+from alpha_trading_bot.ai.feature_context import FeatureContext
+from alpha_trading_bot.ai.integrator import AISignalIntegrator, IntegrationConfig
+from alpha_trading_bot.ai.prompt_builder import PromptBuilder
+from alpha_trading_bot.exchange.models.candles import CandleSeries
+
+
+def _market_data() -> Dict[str, Any]:
+    closes = [77000 + (i % 6) * 120 - i * 15 for i in range(40)]
+    candles = CandleSeries.from_rows(
+        [i * 3600000, c, c + 50, c - 50, c, 1.0] for i, c in enumerate(closes)
+    )
+    return {
+        "price": closes[-1],
+        "change_percent": -0.8,
+        "technical": {
+            "rsi": 42.0,
+            "atr_percent": 0.01,
+            "trend_direction": "down",
+            "trend_strength": 0.3,
+            "adx": 22,
+        },
+        "price_history": candles.closes.tolist(),
+        "candles": candles,
+    }
+
+
+class _CountingRegimeDetector(MarketRegimeDetector):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def detect(self, market_data: Dict[str, Any]) -> Any:
+        self.calls += 1
+        return super().detect(market_data)
+
+
+def test_features_are_memoised_per_context() -> None:
+    market_data = _market_data()
+    detector = _CountingRegimeDetector()
+    features = FeatureContext.of(market_data, regime_detector=detector)
+
+    assert FeatureContext.of(market_data) is features
+    assert features.regime is features.regime
+    assert features.returns is market_data["candles"].returns
+    assert features.price_range(0, 7) == (
+        min(market_data["price_history"][:7]),
+        max(market_data["price_history"][:7]),
+    )
+    features.price_range(0, 7)
+    assert FeatureContext.of({}).price_range(0, 7) == (0.0, 0.0)
+
+    assert detector.calls == 1
+    assert features.compute_counts == {
+        "regime": 1,
+        "returns": 1,
+        ("price_range", 0, 7): 1,
+    }
+
+
+def test_consumers_share_one_context_per_cycle() -> None:
+    market_data = _market_data()
+    detector = _CountingRegimeDetector()
+    features = FeatureContext.of(market_data, regime_detector=detector)
+
+    # 交易周期内的消费者依次读取同一份 market_data
+    features.regime
+    StrategyLibrary().get_all_signals(market_data)
+    PromptBuilder.build(market_data, "deepseek")
+    PromptBuilder.build(market_data, "kimi")
+    AISignalIntegrator(IntegrationConfig()).process(
+        market_data=market_data, original_signal="HOLD"
+    )
+    features.regime
+
+    assert market_data["features"] is features
+    assert features.structure_analyzer is not None
+    assert features.swing_points == (
+        features.structure.swing_highs,
+        features.structure.swing_lows,
+    )
+    assert market_data["market_structure"] == features.structure.structure
+    assert detector.calls == 1
+    assert set(features.compute_counts.values()) == {1}
+    assert {"regime", "returns", "structure"} <= set(features.compute_counts)
+    assert ("price_range", 0, 7) in features.compute_counts
+    assert ("price_range", -30, None) in features.compute_counts
+
+
+def test_context_without_candles_uses_price_history() -> None:
+    market_data = {"price": 10.5, "price_history": [0.0, 10.0, 11.0]}
+
+    returns = FeatureContext.of(market_data).returns
+
+    assert list(returns) == [0.1]
@@ -0,0 +1,79 @@
+"""包导入开销基准测试
+
+覆盖:
+1. 轻量入口（配置、核心机器人、AI 客户端）不会拖入 ccxt/pandas/NumPy/optuna
+2. 包级延迟导出在首次访问时解析，并可正常 from-import 子模块
+3. 冷启动导入耗时不超过预算（子进程中测量，避免受已导入模块影响）
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("ccxt", "pandas", "numpy", "optuna")
+
+# 预算为实测值的数倍，用于发现回归而非精确计时
+IMPORT_BUDGET_SECONDS = {
+    "alpha_trading_bot.config": 0.3,
+    "alpha_trading_bot.ai.ml": 0.3,
+    "alpha_trading_bot.core.adaptive_bot": 1.0,
+    "alpha_trading_bot.ai.client": 1.0,
+}
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed": elapsed,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+    "package_modules": sorted(
+        m for m in sys.modules if m.startswith("alpha_trading_bot")
+    ),
+}}))
+"""
+
+
+def _probe(module: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_SECONDS))
+def test_light_entry_points_skip_heavy_dependencies(module: str) -> None:
+    result = _probe(module)
+
+    assert result["heavy"] == []
+    # 取三次最小值，降低 CI 抖动影响
+    elapsed = min([result["elapsed"]] + [_probe(module)["elapsed"] for _ in range(2)])
+    assert elapsed < IMPORT_BUDGET_SECONDS[module]
+
+
+def test_config_import_does_not_load_bot_or_ai_modules() -> None:
+    modules = _probe("alpha_trading_bot.config")["package_modules"]
+
+    assert not [m for m in modules if m.startswith("alpha_trading_bot.core")]
+    assert not [m for m in modules if m.startswith("alpha_trading_bot.ai")]
+
+
+def test_lazy_exports_resolve_on_first_access() -> None:
+    import alpha_trading_bot
+    import alpha_trading_bot.ai as ai
+    from alpha_trading_bot.config.models import Config
+    from alpha_trading_bot.exchange import models as exchange_models
+
+    assert alpha_trading_bot.Config is Config
+    assert "TradingBot" in dir(alpha_trading_bot)
+    assert ai.AIClient.__name__ == "AIClient"
+    assert "AIClient" in vars(ai)
+    assert exchange_models.OrderStatus is not None
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        getattr(ai, "Missing")
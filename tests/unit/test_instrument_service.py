@@ -1,3 +1,7 @@
+import json
+import time
+from decimal import Decimal
+
 import pytest
 
 from alpha_trading_bot.exchange.instrument_service import InstrumentService
@@ -50,3 +54,82 @@ async def test_instrument_service_rejects_metadata_for_a_different_instrument():
 
     with pytest.raises(RuntimeError, match="instrument metadata instId mismatch"):
         await InstrumentService(Exchange(), "BTC/USDT:USDT").load()
+
+
+class _CountingExchange:
+    def __init__(self, tick_size: str = "0.1", fail: bool = False) -> None:
+        self.calls = 0
+        self.tick_size = tick_size
+        self.fail = fail
+
+    def public_get_public_instruments(self, params):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("network down")
+        return {
+            "code": "0",
+            "data": [{**_instrument_metadata(), "tickSz": self.tick_size}],
+        }
+
+
+def _write_cache(tmp_path, saved_at: float, tick_size: str = "0.1") -> None:
+    payload = {
+        "saved_at": saved_at,
+        "instrument": {**_instrument_metadata(), "tickSz": tick_size},
+    }
+    (tmp_path / "instrument_BTC-USDT-SWAP.json").write_text(json.dumps(payload))
+
+
+@pytest.mark.asyncio
+async def test_instrument_service_writes_disk_cache_that_round_trips(tmp_path):
+    exchange = _CountingExchange()
+
+    spec = await InstrumentService(exchange, "BTC/USDT:USDT", cache_dir=tmp_path).load()
+    restored = await InstrumentService(
+        _CountingExchange(fail=True), "BTC/USDT:USDT", cache_dir=tmp_path
+    ).load()
+
+    assert exchange.calls == 1
+    assert restored == spec
+
+
+@pytest.mark.asyncio
+async def test_instrument_service_uses_fresh_disk_cache_and_refreshes_in_background(
+    tmp_path,
+):
+    _write_cache(tmp_path, time.time() - 60, tick_size="0.5")
+    exchange = _CountingExchange(tick_size="0.1")
+    service = InstrumentService(exchange, "BTC/USDT:USDT", cache_dir=tmp_path)
+
+    spec = await service.load()
+    assert spec.tick_size == Decimal("0.5")
+
+    await service._refresh_task
+    assert exchange.calls == 1
+    assert service.spec.tick_size == Decimal("0.1")
+    saved = json.loads((tmp_path / "instrument_BTC-USDT-SWAP.json").read_text())
+    assert saved["instrument"]["tickSz"] == "0.1"
+
+
+@pytest.mark.asyncio
+async def test_instrument_service_refetches_expired_cache_and_falls_back_on_error(
+    tmp_path,
+):
+    _write_cache(tmp_path, time.time() - 7200, tick_size="0.5")
+
+    exchange = _CountingExchange(tick_size="0.1")
+    service = InstrumentService(
+        exchange, "BTC/USDT:USDT", cache_dir=tmp_path, cache_ttl_seconds=3600
+    )
+    assert (await service.load()).tick_size == Decimal("0.1")
+    assert exchange.calls == 1
+    assert service._refresh_task is None
+
+    _write_cache(tmp_path, time.time() - 7200, tick_size="0.5")
+    stale = await InstrumentService(
+        _CountingExchange(fail=True),
+        "BTC/USDT:USDT",
+        cache_dir=tmp_path,
+        cache_ttl_seconds=3600,
+    ).load()
+    assert stale.tick_size == Decimal("0.5")
@@ -0,0 +1,160 @@
+"""信号集成流水线测试
+
+覆盖:
+1. 默认阶段顺序下的结果与重构前一致（golden）
+2. 前置条件不满足的阶段被跳过，每个阶段都有计时记录
+3. 阶段顺序可由 IntegrationConfig.stages 组合，未知阶段报错
+4. 阶段异常：有 error_label 时记录并继续，否则向上抛出
+"""
+
+import logging
+from typing import Any, Dict
+
+import pytest
+
+from alpha_trading_bot.ai.integrator import AISignalIntegrator
+from alpha_trading_bot.ai.integrator_config import IntegrationConfig
+from alpha_trading_bot.ai.integrator_pipeline import IntegratorStage, SignalState
+from alpha_trading_bot.ai.integrator_stages import DEFAULT_STAGES
+
+
+def _market_data(trend: str, rsi: float, drift: float) -> Dict[str, Any]:
+    closes = [
+        100000 * (1 + drift) ** i * (1 + 0.003 * ((i * 7) % 5 - 2)) for i in range(48)
+    ]
+    return {
+        "price": closes[-1],
+        "recent_change_percent": drift * 300,
+        "technical": {
+            "rsi": rsi,
+            "macd_hist": 5.0,
+            "bb_position": 0.7,
+            "trend_direction": trend,
+            "trend_strength": 0.35,
+            "adx": 28,
+            "atr_percent": 0.012,
+            "price_position": 0.8,
+        },
+        "price_history": closes,
+        "hourly_changes": [drift * 100] * 24,
+        "cycle_start_price": closes[0],
+    }
+
+
+@pytest.mark.parametrize(
+    "signal,market_data,expected",
+    [
+        (
+            "BUY",
+            _market_data("up", 62, 0.002),
+            (
+                "BUY",
+                0.608,
+                [
+                    "自适应买入: breakout_confirmation模式通过",
+                    "R/R过滤: R/R=1.00勉强, 置信度降低15%(92%→78%)",
+                ],
+            ),
+        ),
+        (
+            "SHORT",
+            _market_data("down", 40, -0.003),
+            ("SHORT", 0.84, ["SHORT优化: 持续下跌趋势中，置信度增加19% (70%→84%)"]),
+        ),
+        (
+            "HOLD",
+            _market_data("neutral", 50, 0.0),
+            ("HOLD", 0.7, ["市场结构确认: R/R=0.84不足，HOLD决策合理"]),
+        ),
+    ],
+)
+def test_default_pipeline_matches_golden_results(signal, market_data, expected):
+    result = AISignalIntegrator().process(
+        market_data=market_data, original_signal=signal, original_confidence=0.7
+    )
+
+    assert (
+        result.final_signal,
+        result.final_confidence,
+        result.adjustments_made,
+    ) == expected
+
+
+def test_stages_are_timed_and_skipped_by_precondition():
+    integrator = AISignalIntegrator()
+
+    result = integrator.process(
+        market_data=_market_data("neutral", 50, 0.0),
+        original_signal="HOLD",
+        original_confidence=0.7,
+    )
+
+    assert [t.name for t in result.stage_timings] == list(DEFAULT_STAGES)
+    assert {t.name for t in result.stage_timings if t.skipped} == {
+        "short_signal",
+        "high_price_filter",
+    }
+    assert all(t.elapsed_ms >= 0 and not t.failed for t in result.stage_timings)
+
+    stats = integrator.get_statistics()["pipeline"]
+    assert stats["high_price_filter"]["skips"] == 1
+    assert stats["adaptive_buy"]["runs"] == 1
+    integrator.reset()
+    assert integrator.get_statistics()["pipeline"]["adaptive_buy"]["runs"] == 0
+
+
+def test_stages_compose_from_config():
+    integrator = AISignalIntegrator(
+        IntegrationConfig(stages=["sustained_decline", "hold_to_short"])
+    )
+    market_data = _market_data("down", 40, -0.003)
+    market_data["short_term_drop_percent"] = -2.0
+
+    result = integrator.process(
+        market_data=market_data, original_signal="HOLD", original_confidence=0.5
+    )
+
+    assert integrator.pipeline.stage_names == ["sustained_decline", "hold_to_short"]
+    assert result.final_signal == "SHORT"
+    assert result.final_confidence == 0.65
+    assert "market_structure" not in market_data
+    assert integrator.pipeline.describe()[1]["outputs"] == ["signal", "confidence"]
+
+    with pytest.raises(ValueError, match="未知的流水线阶段"):
+        AISignalIntegrator(IntegrationConfig(stages=["adaptive_buy", "missing"]))
+
+
+class _BrokenStage(IntegratorStage):
+    name = "broken"
+    error_label = "测试阶段失败"
+
+    def run(self, state: SignalState) -> None:
+        state.confidence = 0.1
+        raise RuntimeError("boom")
+
+
+class _StrictStage(_BrokenStage):
+    name = "strict"
+    error_label = None
+
+
+def test_stage_failure_is_logged_unless_stage_is_strict(caplog):
+    integrator = AISignalIntegrator(
+        IntegrationConfig(stages=[_BrokenStage, "signal_optimizer"])
+    )
+
+    with caplog.at_level(logging.WARNING):
+        result = integrator.process(
+            market_data={"price": 100.0}, original_signal="SELL"
+        )
+
+    assert [(t.name, t.failed) for t in result.stage_timings] == [
+        ("broken", True),
+        ("signal_optimizer", False),
+    ]
+    assert "测试阶段失败: boom" in caplog.text
+
+    with pytest.raises(RuntimeError, match="boom"):
+        AISignalIntegrator(IntegrationConfig(stages=[_StrictStage])).process(
+            market_data={"price": 100.0}
+        )
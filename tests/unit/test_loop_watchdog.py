@@ -0,0 +1,72 @@
+"""事件循环延迟看门狗单元测试
+
+覆盖路径:
+- 同步阻塞调用被检测并抓取调用栈
+- 延迟百分位快照
+- 参数与配置校验
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from alpha_trading_bot.config.models import TradingConfig
+from alpha_trading_bot.utils.loop_watchdog import EventLoopWatchdog, _percentile
+from alpha_trading_bot.utils.observability import get_runtime_metrics
+
+
+def _blocking_json_write(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_captured_with_stack() -> None:
+    before = get_runtime_metrics()["loop_stall_total"]
+    watchdog = EventLoopWatchdog(interval=0.05, threshold=0.1)
+    task = asyncio.create_task(watchdog.run())
+
+    await asyncio.sleep(0.15)
+    _blocking_json_write(0.4)
+    await asyncio.sleep(0.15)
+
+    watchdog.stop()
+    await task
+
+    stalls = watchdog.get_stalls()
+    assert stalls
+    assert any("_blocking_json_write" in line for line in stalls[0].stack)
+    assert stalls[0].blocked_seconds >= 0.1
+    assert get_runtime_metrics()["loop_stall_total"] > before
+
+    snapshot = watchdog.snapshot()
+    assert snapshot["count"] >= 3
+    assert snapshot["max"] >= 0.3
+    assert snapshot["stalls"] == len(stalls)
+    assert snapshot["last_stall"]["stack"]
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_records_no_stall() -> None:
+    watchdog = EventLoopWatchdog(interval=0.02, threshold=0.5)
+    task = asyncio.create_task(watchdog.run())
+    await asyncio.sleep(0.15)
+    task.cancel()
+    await task
+
+    assert watchdog.get_stalls() == []
+    assert watchdog.get_lag_percentiles()["p50"] < 0.5
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(i) for i in range(101)]
+    assert _percentile(values, 50) == 50.0
+    assert _percentile(values, 99) == 99.0
+    assert _percentile([], 99) == 0.0
+
+
+def test_invalid_threshold_rejected() -> None:
+    with pytest.raises(ValueError):
+        EventLoopWatchdog(threshold=0)
+    errors = TradingConfig(loop_lag_threshold_seconds=0).validate()
+    assert "事件循环延迟阈值必须大于0" in errors
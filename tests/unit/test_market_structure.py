@@ -4,6 +4,8 @@ import pytest
 from alpha_trading_bot.ai.market_structure import (
     MarketStructureAnalyzer,
     MarketStructureResult,
+    SwingPointTracker,
+    find_swing_points,
 )
 
 
@@ -139,4 +141,74 @@ class TestMarketStructureAnalyzer:
         price_history = [100, 110, 100, 105, 103]
         result = self.analyzer.analyze(price_history, current_price=103)
 
-        assert result.current_price == 103
\ No newline at end of file
+        assert result.current_price == 103
+
+
+def _reference_swing_points(price_history, window):
+    """嵌套循环参考实现（线性实现需与之逐值一致）"""
+    swing_highs, swing_lows = [], []
+    prices = list(reversed(price_history))
+    if len(prices) < 2 * window + 1:
+        if len(prices) >= 3:
+            swing_highs.append(max(prices))
+            swing_lows.append(min(prices))
+        return swing_highs, swing_lows
+    for i in range(window, len(prices) - window):
+        is_high = is_low = True
+        for j in range(i - window, i + window + 1):
+            if j == i:
+                continue
+            if prices[j] >= prices[i]:
+                is_high = False
+            if prices[j] <= prices[i]:
+                is_low = False
+        if is_high:
+            swing_highs.append(prices[i])
+        if is_low:
+            swing_lows.append(prices[i])
+    return swing_highs, swing_lows
+
+
+class TestLinearSwingPoints:
+    """O(n) 摆动点识别与增量跟踪"""
+
+    @pytest.mark.parametrize("window", [0, 1, 3, 5])
+    @pytest.mark.parametrize("size", [0, 2, 5, 7, 60, 1000, 5000])
+    def test_matches_nested_loop_reference(self, window, size):
+        import random
+
+        rng = random.Random(size * 31 + window)
+        # 取整制造大量相等价格，覆盖严格比较的平局情形
+        prices = [round(100 + rng.gauss(0, 3), 0) for _ in range(size)]
+
+        assert find_swing_points(prices, window) == _reference_swing_points(
+            prices, window
+        )
+        analyzer = MarketStructureAnalyzer(swing_window=window)
+        assert analyzer._find_swing_points(prices) == _reference_swing_points(
+            prices, window
+        )
+
+    @pytest.mark.parametrize("window", [1, 3])
+    def test_tracker_matches_full_recompute_after_each_append(self, window):
+        import random
+
+        rng = random.Random(window)
+        tracker = SwingPointTracker(window)
+        prices = []
+        for _ in range(300):
+            prices.append(round(100 + rng.gauss(0, 2), 1))
+            tracker.append(prices[-1])
+            assert tracker.swing_points() == _reference_swing_points(prices, window)
+
+    def test_analyze_accepts_precomputed_swing_points(self):
+        price_history = [100, 102, 101, 104, 103, 106, 105, 108, 104, 103]
+        tracker = SwingPointTracker()
+        tracker.extend(price_history)
+        analyzer = MarketStructureAnalyzer()
+
+        incremental = analyzer.analyze(
+            price_history, current_price=104, swing_points=tracker.swing_points()
+        )
+
+        assert incremental == analyzer.analyze(price_history, current_price=104)
@@ -0,0 +1,162 @@
+"""ML学习子进程执行单元测试
+
+覆盖路径:
+- 学习流水线在空数据库上同步执行
+- 子进程执行、进度回调、超时终止、取消终止
+- 事件循环侧权重应用
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from alpha_trading_bot.core.ml_learning_worker import (
+    LearningJob,
+    LearningJobResult,
+    LearningWorker,
+    run_learning_job,
+)
+from alpha_trading_bot.core.ml_optimization_task import MLOptimizationTask
+
+
+def _quick_target(job, report):
+    report("backtest", 0.0)
+    report("done", 1.0)
+    return LearningJobResult(
+        job_id=job.job_id,
+        success=True,
+        optimized_weights={"deepseek": 0.7, "kimi": 0.3},
+        confidence=0.8,
+    )
+
+
+def _slow_target(job, report):
+    report("backtest", 0.0)
+    time.sleep(30)
+    return LearningJobResult(job_id=job.job_id, success=True)
+
+
+def _make_task(worker=None):
+    bot = SimpleNamespace(
+        _running=True,
+        config=SimpleNamespace(ai=SimpleNamespace(fusion_weights={"deepseek": 0.5})),
+    )
+    return (
+        MLOptimizationTask(
+            bot,
+            performance_tracker=None,
+            backtest_learner=SimpleNamespace(db_path="custom.db"),
+            simple_learning=None,
+            weight_optimizer=None,
+            worker=worker or LearningWorker(),
+        ),
+        bot,
+    )
+
+
+def test_run_learning_job_on_empty_database(tmp_path) -> None:
+    stages = []
+    job = LearningJob(db_path=str(tmp_path / "trading_data.db"))
+
+    result = run_learning_job(job, lambda stage, fraction: stages.append(stage))
+
+    assert result.job_id == job.job_id
+    assert result.success, result.error
+    assert result.total_signals == 0
+    assert stages[0] == "backtest"
+    assert stages[-1] == "done"
+    assert LearningJobResult.from_dict(result.to_dict()) == result
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_in_subprocess_with_progress() -> None:
+    progress = []
+    worker = LearningWorker(
+        timeout_seconds=60,
+        poll_interval=0.05,
+        on_progress=lambda job_id, stage, fraction: progress.append(stage),
+        target=_quick_target,
+    )
+    job = LearningJob(db_path="unused.db")
+
+    result = await worker.submit(job)
+
+    assert result.success
+    assert result.optimized_weights == {"deepseek": 0.7, "kimi": 0.3}
+    assert progress == ["backtest", "done"]
+    assert worker.last_progress["fraction"] == 1.0
+    assert not worker.busy
+
+
+@pytest.mark.asyncio
+async def test_worker_terminates_process_on_timeout() -> None:
+    worker = LearningWorker(
+        timeout_seconds=1.5, poll_interval=0.05, target=_slow_target
+    )
+
+    started = time.monotonic()
+    result = await worker.submit(LearningJob(db_path="unused.db"))
+
+    assert not result.success
+    assert result.error == "timeout"
+    assert time.monotonic() - started < 10
+    assert not worker.busy
+
+
+@pytest.mark.asyncio
+async def test_worker_terminates_process_on_cancel() -> None:
+    worker = LearningWorker(timeout_seconds=60, poll_interval=0.05, target=_slow_target)
+    task = asyncio.create_task(worker.submit(LearningJob(db_path="unused.db")))
+    await asyncio.sleep(1.0)
+    process = worker._process
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert process is not None and not process.is_alive()
+
+
+def test_handle_result_applies_weights_as_new_dict() -> None:
+    task, bot = _make_task()
+    previous = bot.config.ai.fusion_weights
+
+    task._handle_result(
+        LearningJobResult(
+            job_id="a",
+            success=True,
+            optimized_weights={"deepseek": 0.6, "kimi": 0.4},
+            confidence=0.7,
+        )
+    )
+
+    assert bot.config.ai.fusion_weights == {"deepseek": 0.6, "kimi": 0.4}
+    assert bot.config.ai.fusion_weights is not previous
+    assert previous == {"deepseek": 0.5}
+
+
+def test_handle_result_skips_low_confidence_invalid_and_failed() -> None:
+    task, bot = _make_task()
+    original = bot.config.ai.fusion_weights
+
+    task._handle_result(
+        LearningJobResult(
+            job_id="a", success=True, optimized_weights={"kimi": 1.0}, confidence=0.5
+        )
+    )
+    task._handle_result(
+        LearningJobResult(
+            job_id="b", success=True, optimized_weights={"kimi": -1.0}, confidence=0.9
+        )
+    )
+    task._handle_result(LearningJobResult(job_id="c", success=False, error="timeout"))
+
+    assert bot.config.ai.fusion_weights is original
+    assert task.last_result.error == "timeout"
+
+
+def test_resolve_db_path_from_components() -> None:
+    task, _ = _make_task()
+    assert task._resolve_db_path() == "custom.db"
@@ -0,0 +1,135 @@
+"""蒙特卡洛稳健性分析测试
+
+覆盖:
+1. 逐笔盈亏 → 相对交易前权益的收益率（忽略未平仓交易）
+2. 向量化路径统计与逐条路径的朴素计算一致；块长等于序列长度时为循环平移
+3. 破产/亏损概率的边界情况
+4. 1 万条路径在 1 秒内完成
+5. KernelObjective 的回撤约束扣减目标值
+"""
+
+import math
+import random
+import time
+
+import numpy as np
+import pytest
+
+from alpha_trading_bot.ai.backtest_validator import Trade, TradeResult
+from alpha_trading_bot.ai.optimizer.backtest_kernel import OHLCArrays
+from alpha_trading_bot.ai.optimizer.bayesian_optimizer import KernelObjective
+from alpha_trading_bot.ai.optimizer.monte_carlo import (
+    MonteCarloConfig,
+    _resample_steps,
+    bar_returns,
+    run_monte_carlo,
+    trade_returns,
+)
+
+
+def _trade(pnl, result=TradeResult.WIN):
+    return Trade(
+        entry_time="t0",
+        exit_time="t1",
+        entry_price=100.0,
+        exit_price=101.0,
+        side="buy",
+        pnl=pnl,
+        pnl_percent=pnl / 100,
+        result=result,
+        confidence=0.7,
+        reason="signal",
+    )
+
+
+def _path_stats(returns):
+    equity = np.cumprod(1 + np.asarray(returns))
+    peaks = np.maximum.accumulate(np.concatenate(([1.0], equity)))[1:]
+    return float(((peaks - equity) / peaks).max()), float(equity[-1])
+
+
+def test_trade_returns_are_relative_to_equity_before_trade():
+    returns = trade_returns([1000.0, -550.0, 0.0], initial_capital=10000)
+    assert returns == pytest.approx([0.1, -0.05, 0.0])
+
+    trades = [_trade(1000.0), _trade(50.0, TradeResult.OPEN), _trade(-550.0)]
+    assert trade_returns(trades, 10000) == pytest.approx([0.1, -0.05])
+
+    assert bar_returns([110.0, 99.0], initial_capital=100) == pytest.approx([0.1, -0.1])
+
+
+def test_vectorized_paths_match_naive_computation():
+    returns = np.random.default_rng(3).normal(0.002, 0.03, 40)
+    config = MonteCarloConfig(n_paths=200, seed=11)
+
+    result = run_monte_carlo(returns, config)
+
+    index = _resample_steps(np.random.default_rng(11), 40, range(0, 40), 200, None, 1)
+    for path in range(0, 200, 37):
+        drawdown, terminal = _path_stats(returns[index[:, path]])
+        assert result.max_drawdown[path] == pytest.approx(drawdown)
+        assert result.terminal_equity[path] == pytest.approx(terminal)
+
+
+def test_full_length_blocks_are_rotations():
+    returns = np.array([0.1, -0.2, 0.05, 0.03, -0.04])
+    result = run_monte_carlo(
+        returns, MonteCarloConfig(n_paths=50, method="block", block_size=5, seed=0)
+    )
+
+    rotations = {
+        round(_path_stats(np.roll(returns, -k))[0], 10) for k in range(len(returns))
+    }
+    assert result.terminal_equity == pytest.approx(np.prod(1 + returns))
+    assert {round(dd, 10) for dd in result.max_drawdown} <= rotations
+
+
+def test_ruin_and_loss_probabilities():
+    losing = run_monte_carlo([-0.3, -0.3, 0.01], MonteCarloConfig(n_paths=500))
+    assert losing.ruin_probability > 0.5 and losing.loss_probability > 0.5
+
+    winning = run_monte_carlo([0.01, 0.02], MonteCarloConfig(n_paths=500))
+    assert winning.ruin_probability == 0 and winning.drawdown_quantile(0.99) == 0
+    assert winning.terminal_quantile(0.05) > 1
+
+    empty = run_monte_carlo([], MonteCarloConfig(n_paths=10))
+    assert empty.summary()["max_drawdown_p95"] == 0
+    assert "10 条路径" in empty.format()
+
+    with pytest.raises(ValueError):
+        MonteCarloConfig(method="stationary")
+
+
+def test_ten_thousand_paths_under_one_second():
+    returns = np.random.default_rng(5).normal(0.001, 0.02, 500)
+
+    for method in ("bootstrap", "block"):
+        started = time.perf_counter()
+        result = run_monte_carlo(returns, MonteCarloConfig(method=method))
+        assert time.perf_counter() - started < 1.0
+        assert result.n_paths == 10000
+
+
+def test_kernel_objective_penalizes_fragile_drawdowns():
+    rnd = random.Random(2)
+    price = 100.0
+    close = []
+    for i in range(1500):
+        price *= math.exp(rnd.gauss(0, 0.006) + 0.001 * math.sin(i / 40))
+        close.append(price)
+    close = np.array(close)
+    ohlc = OHLCArrays(close, close * 1.003, close * 0.997, close)
+    directions = np.array([rnd.choice([1, -1, 0, 0]) for _ in range(1500)])
+    params = {"stop_loss_percent": 0.01}
+    robustness = MonteCarloConfig(n_paths=2000, seed=1)
+
+    plain = KernelObjective(ohlc, directions, steps=4)(params)
+    loose = KernelObjective(
+        ohlc, directions, steps=4, robustness=robustness, max_drawdown=1.0
+    )
+    strict = KernelObjective(
+        ohlc, directions, steps=4, robustness=robustness, max_drawdown=0.0
+    )
+
+    assert loose(params) == pytest.approx(plain)
+    assert strict(params) < plain
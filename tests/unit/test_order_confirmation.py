@@ -8,6 +8,7 @@ import pytest
 from alpha_trading_bot.config.models import Config, ExchangeConfig, TradingConfig
 from alpha_trading_bot.core.adaptive_bot import AdaptiveTradingBot
 from alpha_trading_bot.core.bot import TradingBot
+from alpha_trading_bot.core.state_persistence import resolve_state_data_dir
 from alpha_trading_bot.exchange.models.orders import (
     OrderIntent,
     OrderResult,
@@ -422,5 +423,8 @@ async def test_bot_initialization_passes_confirmation_settings_to_exchange_clien
             "max_position_usage": 0.30,
             "order_confirm_timeout_seconds": 7.5,
             "order_confirm_poll_interval_seconds": 0.4,
+            "algo_cache_reconcile_seconds": 60.0,
+            "instrument_cache_dir": str(resolve_state_data_dir()),
+            "instrument_cache_ttl_seconds": 86400.0,
         }
     ]
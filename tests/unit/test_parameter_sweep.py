@@ -0,0 +1,139 @@
+"""回测参数扫描测试
+
+覆盖:
+1. 网格/随机/拉丁超立方采样（参数名校验、分层覆盖）
+2. 多进程扫描结果与逐个运行 BacktestValidator 一致，且按指标排序
+3. 结果逐行回调、无效参数点单独记录、共享内存用后释放
+"""
+
+import math
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from alpha_trading_bot.ai.backtest_validator import BacktestConfig, BacktestValidator
+from alpha_trading_bot.ai.optimizer import parameter_sweep
+from alpha_trading_bot.ai.optimizer.parameter_sweep import (
+    ParameterSweep,
+    SweepRow,
+    SweepTable,
+    grid_points,
+    latin_hypercube_points,
+    random_points,
+)
+
+
+def _market(n=600, seed=3):
+    rnd = random.Random(seed)
+    price = 100.0
+    closes, highs, lows, signals, timestamps = [], [], [], [], []
+    for i in range(n):
+        price *= math.exp(rnd.gauss(0, 0.006) + 0.002 * math.sin(i / 40))
+        closes.append(price)
+        highs.append(price * (1 + abs(rnd.gauss(0, 0.004))))
+        lows.append(price * (1 - abs(rnd.gauss(0, 0.004))))
+        side = rnd.choice(["buy", "sell", "hold", "hold"])
+        signals.append({"signal": side, "confidence": round(rnd.uniform(0.4, 0.9), 2)})
+        timestamps.append(f"2026-{1 + i // 300:02d}-01 00:{i % 60:02d}")
+    return signals, closes, timestamps, highs, lows
+
+
+def test_samplers_cover_bounds_and_validate_names():
+    grid = grid_points({"stop_loss_percent": [0.01, 0.02], "tie_break": ["a", "b"]})
+    assert len(grid) == 4
+    assert {"stop_loss_percent": 0.02, "tie_break": "a"} in grid
+
+    bounds = {"stop_loss_percent": (0.01, 0.03), "take_profit_percent": (0.02, 0.1)}
+    lhs = latin_hypercube_points(bounds, n=50, seed=1)
+    assert latin_hypercube_points(bounds, n=50, seed=1) == lhs
+    for name, (low, high) in bounds.items():
+        values = np.array([p[name] for p in lhs])
+        strata = np.floor((values - low) / (high - low) * 50).astype(int)
+        # 每个等分区间恰好一个点
+        assert sorted(strata.tolist()) == list(range(50))
+
+    sample = random_points(bounds, n=20, seed=2)
+    assert all(0.01 <= p["stop_loss_percent"] < 0.03 for p in sample)
+
+    with pytest.raises(ValueError):
+        grid_points({"stop_loss": [0.01]})
+
+
+def test_parallel_sweep_matches_serial_validator():
+    signals, closes, timestamps, highs, lows = _market()
+    base = BacktestConfig(position_size=0.2)
+    points = grid_points(
+        {
+            "stop_loss_percent": [0.005, 0.01, 0.02],
+            "take_profit_percent": [0.01, 0.03],
+            "min_confidence_threshold": [0.5, 0.7],
+        }
+    )
+    sweep = ParameterSweep.from_signals(
+        signals, closes, timestamps, highs, lows, base_config=base, max_workers=2
+    )
+    streamed = []
+
+    table = sweep.run(
+        points, metric="sharpe_ratio", on_result=lambda row, rank: streamed.append(row)
+    )
+
+    assert len(table) == len(points) == len(streamed)
+    for row in table.rows:
+        config = BacktestConfig(**{**base.__dict__, **row.params})
+        expected = BacktestValidator(config).run_backtest(
+            signals, closes, timestamps, highs, lows
+        )
+        assert row.total_trades == expected.total_trades
+        assert row.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+        assert row.max_drawdown == pytest.approx(expected.max_drawdown)
+        assert row.profit_factor == pytest.approx(expected.profit_factor)
+    sharpes = [row.sharpe_ratio for row in table.rows]
+    assert sharpes == sorted(sharpes, reverse=True)
+    assert "夏普" in table.format(top=5)
+
+
+def test_serial_sweep_ranks_invalid_points_separately():
+    signals, closes, timestamps, highs, lows = _market(200)
+    sweep = ParameterSweep.from_signals(signals, closes, max_workers=1)
+
+    table = sweep.run(
+        [{"stop_loss_percent": 0.01}, {"stop_loss_percent": -1.0}],
+        metric="max_drawdown",
+    )
+
+    assert len(table) == 1 and len(table.failed) == 1
+    assert "止损" in table.failed[0].error
+
+
+def test_table_orders_lower_is_better_metrics():
+    table = SweepTable("max_drawdown")
+    assert table.add(SweepRow({"a": 1}, max_drawdown=0.2)) == 1
+    assert table.add(SweepRow({"a": 2}, max_drawdown=0.1)) == 1
+    assert table.add(SweepRow({"a": 3}, max_drawdown=0.3)) == 3
+    assert [row.params["a"] for row in table.top(3)] == [2, 1, 3]
+
+    with pytest.raises(ValueError):
+        SweepTable("unknown")
+
+
+def test_shared_memory_released_after_sweep(monkeypatch):
+    created = []
+    share = parameter_sweep._share
+
+    def tracking_share(columns):
+        shm, layout = share(columns)
+        created.append(shm.name)
+        return shm, layout
+
+    monkeypatch.setattr(parameter_sweep, "_share", tracking_share)
+    signals, closes, *_ = _market(100)
+    ParameterSweep.from_signals(signals, closes, max_workers=2).run(
+        grid_points({"stop_loss_percent": [0.01, 0.02]})
+    )
+
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
@@ -0,0 +1,225 @@
+"""全流程回放回测测试
+
+覆盖:
+1. 模拟交易所：市价成交、附带止损、K线内触发与跳空按开盘价成交、触发价校验
+2. 虚拟时钟驱动方向冷却
+3. RecordedResponses 按虚拟时间查找录制响应
+4. 端到端回放真实交易周期，结果可复现，且满足耗时预算
+5. 回放的状态与 ML 数据库写入回放目录，不落到工作目录的 data_json
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+
+import pytest
+
+from alpha_trading_bot.ai.replay_client import (
+    ModelResponder,
+    RecordedResponses,
+    ReplayAIClient,
+    format_response,
+    rsi_trend_model,
+)
+from alpha_trading_bot.config.models import Config
+from alpha_trading_bot.core.adaptive_bot import AdaptiveTradingBot
+from alpha_trading_bot.core.replay import ReplayBacktester, ReplayConfig
+from alpha_trading_bot.exchange.models.orders import OrderIntent
+from alpha_trading_bot.exchange.simulated import SimulatedExchangeClient
+from alpha_trading_bot.utils import clock
+from alpha_trading_bot.utils.clock import VirtualClock, use_clock
+
+T0 = 1_700_000_000_000
+BAR_MS = 900_000
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """默认数据路径相对工作目录，切到临时目录避免在仓库里留下数据库"""
+    monkeypatch.chdir(tmp_path)
+
+
+def _bars(ohlc):
+    return [[T0 + i * BAR_MS, o, h, l, c, 10.0] for i, (o, h, l, c) in enumerate(ohlc)]
+
+
+def _synthetic_candles(n, seed=1):
+    rnd = random.Random(seed)
+    price = 30000.0
+    candles = []
+    for i in range(n):
+        open_ = price
+        price *= math.exp(rnd.gauss(0, 0.004) + 0.003 * math.sin(i / 60))
+        high = max(open_, price) * (1 + abs(rnd.gauss(0, 0.002)))
+        low = min(open_, price) * (1 - abs(rnd.gauss(0, 0.002)))
+        candles.append([T0 + i * BAR_MS, open_, high, low, price, 100 + rnd.random()])
+    return candles
+
+
+async def _open_long_with_stop(exchange, stop_price):
+    return await exchange.create_confirmed_market_order(
+        exchange.symbol,
+        "buy",
+        0.1,
+        OrderIntent.OPEN,
+        "long",
+        attached_stop_price=stop_price,
+        attach_algo_cl_ord_id="sl1",
+    )
+
+
+@pytest.mark.parametrize(
+    "next_bar,expected",
+    [
+        # 最低价跌破止损，按触发价成交
+        ((100.0, 101.0, 97.0, 100.5), 98.0),
+        # 开盘即跳空越过止损，按开盘价成交
+        ((96.0, 97.0, 95.0, 96.5), 96.0),
+    ],
+)
+def test_attached_stop_triggers_intrabar(next_bar, expected):
+    candles = _bars([(100.0, 100.0, 100.0, 100.0), next_bar])
+    exchange = SimulatedExchangeClient(candles, fee_rate=0.0, start_index=0)
+
+    async def scenario():
+        result = await _open_long_with_stop(exchange, 98.0)
+        assert result.is_success and result.average_price == 100.0
+        algo = await exchange.find_attached_algo_order(exchange.symbol, "sl1")
+        assert algo is not None
+        exchange.advance()
+        return await exchange.get_position(), algo["id"]
+
+    position, algo_id = asyncio.run(scenario())
+
+    assert position is None
+    [trade] = exchange.trades
+    assert (trade.reason, trade.exit_price) == ("stop_loss", pytest.approx(expected))
+    assert trade.pnl == pytest.approx(0.1 * (expected - 100.0))
+    assert exchange.clock.time() == (T0 + BAR_MS) / 1000 + 900
+    history = asyncio.run(exchange.get_algo_order_history(exchange.symbol))
+    assert history[0]["id"] == algo_id
+
+
+def test_invalid_trigger_price_rejects_order():
+    exchange = SimulatedExchangeClient(
+        _bars([(100.0, 100.0, 100.0, 100.0)] * 2), start_index=0
+    )
+
+    async def scenario():
+        rejected = await _open_long_with_stop(exchange, 101.0)
+        await exchange.create_order(exchange.symbol, "buy", 0.1)
+        with pytest.raises(RuntimeError, match="SL trigger price"):
+            await exchange.create_stop_loss(exchange.symbol, "sell", 0.1, 100.5)
+        return rejected
+
+    rejected = asyncio.run(scenario())
+
+    assert not rejected.is_success
+    assert exchange.trades == []
+    assert asyncio.run(exchange.get_position())["side"] == "long"
+
+
+def test_direction_cooldown_reads_virtual_clock():
+    bot = AdaptiveTradingBot(Config())
+    virtual = VirtualClock(1_000_000)
+
+    with use_clock(virtual):
+        bot._last_close_time = clock.time()
+        bot._last_close_side = "long"
+        bot._last_close_pnl_pct = -1.0
+        assert clock.now().timestamp() == 1_000_000
+        virtual.advance(60)
+        assert clock.time() - bot._last_close_time == 60
+
+    with pytest.raises(ValueError):
+        virtual.set(0)
+    assert clock.get_clock() is not virtual
+
+
+def test_recorded_responses_follow_virtual_time():
+    responses = RecordedResponses(
+        [
+            {"timestamp": 2_000_000, "response": "buy | confidence: 80%"},
+            {"timestamp": 1_000_000, "response": "sell | confidence: 70%"},
+            {"timestamp": 1_500_000, "response": "hold", "provider": "kimi"},
+        ],
+        max_age_seconds=1500,
+    )
+
+    seen = []
+    with use_clock(VirtualClock()) as virtual:
+        for ts in (500, 1200, 1600, 2100, 4000):
+            virtual.set(ts)
+            seen.append((responses("deepseek", {}), responses("kimi", {})))
+
+    default = format_response("hold", 0.5)
+    assert seen == [
+        (default, default),
+        ("sell | confidence: 70%", "sell | confidence: 70%"),
+        ("sell | confidence: 70%", "hold"),
+        ("buy | confidence: 80%", "hold"),
+        (default, default),
+    ]
+    assert len(responses) == 3 and responses.misses == 4
+
+
+def test_replay_ai_client_uses_responder_without_network():
+    client = ReplayAIClient(lambda provider, data: "short | confidence: 90%")
+    signal = asyncio.run(client._call_ai_with_retry("deepseek", {}, ""))
+    assert signal == "short | confidence: 90%" and client.calls == 1
+
+
+def test_replay_runs_real_cycles_deterministically(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_STATE_DIR", "/nonexistent-live-state")
+    monkeypatch.delenv("TRADING_ML_DB_PATH", raising=False)
+    candles = _synthetic_candles(500)
+    state_dir = tmp_path / "state"
+    replay_config = ReplayConfig(state_dir=str(state_dir))
+
+    first = ReplayBacktester(
+        candles, responder=ModelResponder(rsi_trend_model), replay_config=replay_config
+    ).run_sync()
+    second = ReplayBacktester(
+        candles, responder=ModelResponder(rsi_trend_model), replay_config=replay_config
+    ).run_sync()
+
+    assert first.cycles == 401
+    assert len(first.trades) > 5
+    assert [t.__dict__ for t in first.trades] == [t.__dict__ for t in second.trades]
+    assert first.final_equity == second.final_equity
+    assert first.simulated_seconds == 400 * 900
+    assert 0 <= first.max_drawdown < 1
+    # 回放结束恢复原状态目录与系统时钟
+    assert os.environ["TRADING_STATE_DIR"] == "/nonexistent-live-state"
+    assert "TRADING_ML_DB_PATH" not in os.environ
+    # 学习数据写入回放目录，不落到实盘默认的 data_json/trading_data.db
+    assert (state_dir / "trading_data.db").exists()
+    assert not (tmp_path / "data_json" / "trading_data.db").exists()
+    assert abs(clock.time() - time.time()) < 5
+
+
+def test_replay_rejects_cycle_not_multiple_of_bar():
+    backtester = ReplayBacktester(
+        _synthetic_candles(150), replay_config=ReplayConfig(cycle_minutes=20)
+    )
+    with pytest.raises(ValueError, match="整数倍"):
+        backtester.run_sync()
+
+
+def test_month_of_cycles_runs_within_budget(tmp_path):
+    candles = _synthetic_candles(30 * 96 + 100, seed=3)
+    backtester = ReplayBacktester(
+        candles,
+        responder=ModelResponder(rsi_trend_model),
+        replay_config=ReplayConfig(state_dir=str(tmp_path)),
+    )
+
+    started = time.perf_counter()
+    result = backtester.run_sync()
+    elapsed = time.perf_counter() - started
+
+    assert result.cycles == 30 * 96 + 1
+    # 目标为一分钟内回放一个月的 15 分钟周期
+    assert elapsed < 60
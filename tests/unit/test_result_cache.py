@@ -0,0 +1,205 @@
+"""按内容寻址的结果缓存测试
+
+覆盖:
+1. 内容哈希与对象身份/字典顺序无关，对数组内容与类型敏感
+2. 命中/未命中统计与运行时指标、损坏条目按未命中处理
+3. 超过容量上限按最近使用淘汰；显式失效
+4. 接入点：BacktestValidator、SignalBacktestLearner、定时学习任务重跑命中缓存
+"""
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from alpha_trading_bot.ai.backtest_validator import BacktestConfig, BacktestValidator
+from alpha_trading_bot.ai.ml.signal_backtest import SignalBacktestLearner
+from alpha_trading_bot.core.ml_learning_worker import LearningJob, run_learning_job
+from alpha_trading_bot.utils.observability import get_runtime_metrics
+from alpha_trading_bot.utils.result_cache import ResultCache, content_hash
+
+
+@dataclass
+class _Params:
+    window: int
+    threshold: float
+
+
+def test_content_hash_is_stable_and_content_sensitive():
+    a = {"x": [1, 2.5, "s"], "arr": np.arange(4.0), "p": _Params(3, 0.5)}
+    b = {"p": _Params(3, 0.5), "arr": np.arange(4.0), "x": [1, 2.5, "s"]}
+
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(np.arange(4.0)) != content_hash(np.arange(4))
+    assert content_hash([1, 2]) != content_hash([[1], 2])
+    assert content_hash(1) != content_hash(1.0)
+    assert content_hash(np.array(["a", None], dtype=object)) == content_hash(
+        np.array(["a", None], dtype=object)
+    )
+    with pytest.raises(TypeError):
+        content_hash(object())
+
+
+def test_lookup_counts_hits_and_treats_corrupt_entries_as_misses(tmp_path):
+    cache = ResultCache(tmp_path)
+    before = get_runtime_metrics()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": 42}
+
+    assert cache.get_or_compute("ns", ("v1", [1, 2]), compute) == {"value": 42}
+    assert cache.get_or_compute("ns", ("v1", [1, 2]), compute) == {"value": 42}
+    assert cache.get_or_compute("ns", ("v1", [1, 3]), compute) == {"value": 42}
+    assert len(calls) == 2
+
+    stats = cache.stats_snapshot()["ns"]
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 2, 2)
+    after = get_runtime_metrics()
+    assert after["result_cache_hits_total"] - before["result_cache_hits_total"] == 1
+    assert after["result_cache_misses_total"] - before["result_cache_misses_total"] == 2
+
+    key = cache.key("v1", [1, 2])
+    (tmp_path / "ns" / f"{key}.pkl").write_bytes(b"truncated")
+    assert cache.lookup("ns", key) == (False, None)
+    assert not (tmp_path / "ns" / f"{key}.pkl").exists()
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    payload = b"x" * 1000
+    cache = ResultCache(tmp_path, max_bytes=3500)
+    keys = [cache.key(i) for i in range(3)]
+    for age, key in zip((300, 200, 100), keys):
+        cache.put("ns", key, payload)
+        path = tmp_path / "ns" / f"{key}.pkl"
+        os.utime(path, (path.stat().st_atime - age,) * 2)
+
+    # 命中刷新最旧条目的使用时间，淘汰落到第二旧的条目
+    assert cache.lookup("ns", keys[0])[0]
+    cache.put("ns", cache.key(3), payload)
+
+    assert cache.lookup("ns", keys[1]) == (False, None)
+    assert cache.lookup("ns", keys[0])[0] and cache.lookup("ns", keys[2])[0]
+    assert cache.size_bytes <= 3500
+    assert cache.stats_snapshot()["ns"]["evictions"] == 1
+
+
+def test_invalidate_is_explicit(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put("a", "k1", 1)
+    cache.put("a", "k2", 2)
+    cache.put("b", "k1", 3)
+
+    assert cache.invalidate("a", "k1") == 1
+    assert cache.lookup("a", "k2") == (True, 2)
+    assert cache.invalidate("a") == 1
+    assert cache.invalidate() == 1
+    assert cache.size_bytes == 0
+
+
+def test_backtest_validator_reuses_cached_result(tmp_path):
+    cache = ResultCache(tmp_path)
+    prices = [100 + (i % 7) - 3 + i * 0.05 for i in range(200)]
+    signals = [
+        {"signal": ("buy", "sell", "hold")[i % 3], "confidence": 0.7}
+        for i in range(200)
+    ]
+    timestamps = [f"2026-01-{1 + i // 24:02d} {i % 24:02d}:00" for i in range(200)]
+
+    first = BacktestValidator(result_cache=cache).run_backtest(
+        signals, prices, timestamps
+    )
+    validator = BacktestValidator(result_cache=cache)
+    second = validator.run_backtest(signals, prices, timestamps)
+
+    assert second == first
+    assert validator.trades == first.trades
+    assert cache.stats_snapshot()["backtest_validator"]["hits"] == 1
+
+    other = BacktestValidator(BacktestConfig(stop_loss_percent=0.01), cache)
+    other.run_backtest(signals, prices, timestamps)
+    assert cache.stats_snapshot()["backtest_validator"]["misses"] == 2
+
+
+def _signal_db(path, n_signals=30):
+    base = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None) - timedelta(
+        days=2
+    )
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE ai_signals (timestamp TEXT, provider TEXT, symbol TEXT, "
+            "signal TEXT, confidence REAL, market_price REAL, trade_result TEXT, "
+            "pnl REAL, pnl_percent REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE market_data (timestamp TEXT, symbol TEXT, open REAL, "
+            "high REAL, low REAL, close REAL)"
+        )
+        for i in range(96):
+            ts = (base + timedelta(minutes=15 * i)).isoformat()
+            price = 60000 + (i * 37) % 50
+            conn.execute(
+                "INSERT INTO market_data VALUES (?, 'BTC/USDT', ?, ?, ?, ?)",
+                (ts, price, price + 10, price - 10, price + 5),
+            )
+        for i in range(n_signals):
+            ts = (base + timedelta(minutes=30 * i)).isoformat()
+            pnl = (i % 5 - 2) * 0.4
+            conn.execute(
+                "INSERT INTO ai_signals VALUES "
+                "(?, ?, 'BTC/USDT', 'BUY', 0.7, ?, ?, ?, ?)",
+                (
+                    ts,
+                    ("deepseek", "kimi")[i % 2],
+                    60000.0 + i,
+                    "win" if pnl > 0 else "loss",
+                    pnl * 6,
+                    pnl,
+                ),
+            )
+    return base
+
+
+def test_signal_backtest_hits_until_new_signal_arrives(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "trading_data.db")
+    base = _signal_db(db_path)
+    learner = SignalBacktestLearner(db_path, result_cache=ResultCache(tmp_path / "c"))
+    resolved = []
+    original = learner._resolve_pnls
+    monkeypatch.setattr(
+        learner,
+        "_resolve_pnls",
+        lambda *args: resolved.append(1) or original(*args),
+    )
+
+    first = learner.backtest_signals(days=60, holding_hours=4)
+    second = learner.backtest_signals(days=60, holding_hours=4)
+    assert second == first and len(resolved) == 1
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO ai_signals VALUES "
+            "(?, 'kimi', 'BTC/USDT', 'BUY', 0.8, 60100, NULL, NULL, NULL)",
+            ((base + timedelta(hours=20)).isoformat(),),
+        )
+    third = learner.backtest_signals(days=60, holding_hours=4)
+    assert third.total_signals == first.total_signals + 1
+    assert len(resolved) == 2
+
+
+def test_scheduled_learning_rerun_hits_cache(tmp_path):
+    db_path = str(tmp_path / "trading_data.db")
+    _signal_db(db_path)
+
+    first = run_learning_job(LearningJob(db_path=db_path))
+    second = run_learning_job(LearningJob(db_path=db_path))
+
+    assert first.success and second.success, (first.error, second.error)
+    assert first.cache_hits == 0 and first.cache_misses > 0
+    assert second.cache_hits > 0
+    assert second.backtest_weights == first.backtest_weights
+    assert (tmp_path / "result_cache" / "signal_backtest").is_dir()
@@ -0,0 +1,189 @@
+"""信号回测批量区间定位单元测试
+
+覆盖路径:
+- 批量计算与逐信号查询结果逐项一致（含真实数据与模拟回退）
+- backtest_signals 仅查询一次 market_data
+- 区间边界（BETWEEN 闭区间）与数据不足回退
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from alpha_trading_bot.ai.ml.signal_backtest import SignalBacktestLearner
+
+SYMBOL = "BTC/USDT"
+
+
+def _legacy_market_pnl(db_path, signal_time, signal_price, holding_hours):
+    """原实现：每个信号单独查询 market_data。"""
+    signal_dt = datetime.fromisoformat(signal_time.replace("Z", "+00:00"))
+    end_dt = signal_dt + timedelta(hours=holding_hours)
+    with sqlite3.connect(db_path) as conn:
+        df = pd.read_sql(
+            """
+            SELECT * FROM market_data
+            WHERE symbol = :symbol
+            AND timestamp BETWEEN :start AND :end
+            ORDER BY timestamp ASC
+            """,
+            conn,
+            params={
+                "symbol": SYMBOL,
+                "start": signal_dt.isoformat(),
+                "end": end_dt.isoformat(),
+            },
+        )
+    if df.empty or len(df) < 2:
+        return None
+    entry_price = df.iloc[0]["open"]
+    exit_price = df.iloc[-1]["close"]
+    return {
+        "entry_time": df.iloc[0]["timestamp"],
+        "entry_price": entry_price,
+        "exit_time": df.iloc[-1]["timestamp"],
+        "exit_price": exit_price,
+        "pnl": exit_price - entry_price,
+        "pnl_percent": (exit_price - entry_price) / entry_price * 100,
+        "high": df["high"].max(),
+        "low": df["low"].min(),
+        "source": "market_data",
+    }
+
+
+@pytest.fixture
+def backtest_db(tmp_path):
+    db_path = str(tmp_path / "trading_data.db")
+    base = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None) - timedelta(
+        days=3
+    )
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE ai_signals (timestamp TEXT, provider TEXT, symbol TEXT, "
+            "signal TEXT, confidence REAL, market_price REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE market_data (timestamp TEXT, symbol TEXT, open REAL, "
+            "high REAL, low REAL, close REAL)"
+        )
+        price = 60000.0
+        for i in range(48 * 4):
+            ts = base + timedelta(minutes=15 * i)
+            drift = ((i * 37) % 11 - 5) * 13.0
+            open_, close = price, price + drift
+            conn.execute(
+                "INSERT INTO market_data VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    ts.isoformat(),
+                    SYMBOL,
+                    open_,
+                    max(open_, close) + 7.5,
+                    min(open_, close) - 4.25,
+                    close,
+                ),
+            )
+            price = close
+        # 另一个交易对的数据不应被使用
+        conn.execute(
+            "INSERT INTO market_data VALUES (?, ?, 1, 1, 1, 1)",
+            ((base + timedelta(hours=1)).isoformat(), "ETH/USDT"),
+        )
+
+        providers = ["deepseek", "kimi", "qwen"]
+        for i in range(60):
+            # 部分信号落在行情区间外（走模拟路径），部分恰好落在K线时间点上
+            offset = timedelta(minutes=45 * i + (0 if i % 3 else 15))
+            ts = base + offset - timedelta(hours=6)
+            conn.execute(
+                "INSERT INTO ai_signals VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    ts.isoformat(),
+                    providers[i % 3],
+                    SYMBOL,
+                    "BUY",
+                    0.5 + (i % 5) / 10,
+                    60000.0 + i,
+                ),
+            )
+    return db_path
+
+
+def test_batch_pnl_matches_per_signal_queries(backtest_db) -> None:
+    learner = SignalBacktestLearner(backtest_db)
+    signals = learner.get_historical_signals(days=60, min_confidence=0.5)
+
+    batch = learner._calculate_hypothetical_pnls(
+        signals, holding_hours=4, symbol=SYMBOL
+    )
+
+    assert len(batch) == len(signals)
+    sources = set()
+    for signal, row in zip(signals, batch):
+        single = learner.calculate_hypothetical_pnl(
+            signal["timestamp"], signal["market_price"], 4, SYMBOL
+        )
+        legacy = _legacy_market_pnl(
+            backtest_db, signal["timestamp"], signal["market_price"], 4
+        )
+        if legacy is not None:
+            assert single == legacy
+        else:
+            assert single["source"] == "simulated"
+        assert {k: row[k] for k in single} == single
+        sources.add(row["source"])
+    assert sources == {"market_data", "simulated"}
+
+
+def test_backtest_signals_queries_market_data_once(backtest_db, monkeypatch) -> None:
+    learner = SignalBacktestLearner(backtest_db)
+    calls = []
+    original = learner.get_connection
+
+    def _counting_connection():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(learner, "get_connection", _counting_connection)
+
+    result = learner.backtest_signals(days=60, holding_hours=4, min_confidence=0.5)
+
+    assert result.total_signals == 60
+    # 一次读取信号 + 一次读取市场数据窗口
+    assert len(calls) == 2
+    assert set(result.provider_stats) == {"deepseek", "kimi", "qwen"}
+
+
+def test_window_boundaries_are_inclusive_and_sparse_ranges_fallback(tmp_path) -> None:
+    db_path = str(tmp_path / "trading_data.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE market_data (timestamp TEXT, symbol TEXT, open REAL, "
+            "high REAL, low REAL, close REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO market_data VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                ("2026-01-01T00:00:00", SYMBOL, 100.0, 110.0, 90.0, 105.0),
+                ("2026-01-01T04:00:00", SYMBOL, 105.0, 130.0, 80.0, 120.0),
+                ("2026-01-01T10:00:00", SYMBOL, 120.0, 121.0, 119.0, 120.0),
+            ],
+        )
+    learner = SignalBacktestLearner(db_path)
+    window = learner._load_market_window(
+        SYMBOL, "2026-01-01T00:00:00", "2026-01-01T12:00:00"
+    )
+
+    first, sparse = window.resolve(
+        ["2026-01-01T00:00:00", "2026-01-01T05:00:00"],
+        ["2026-01-01T04:00:00", "2026-01-01T09:00:00"],
+        [100.0, 100.0],
+    )
+
+    assert first["entry_price"] == 100.0
+    assert first["exit_price"] == 120.0
+    assert first["high"] == 130.0
+    assert first["low"] == 80.0
+    assert first["pnl_percent"] == pytest.approx(20.0)
+    assert sparse is None
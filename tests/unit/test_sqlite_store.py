@@ -0,0 +1,121 @@
+"""SQLite 数据访问层单元测试
+
+覆盖路径:
+- 同路径共享实例、同线程复用连接、不同线程独立连接
+- WAL 模式与索引自动创建（表缺失时跳过）
+- WAL 下读事务不阻塞写入
+- MLDataManager / SignalBacktestLearner 接入共享连接
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from alpha_trading_bot.ai.ml.ml_data_manager import MLDataManager
+from alpha_trading_bot.ai.ml.signal_backtest import SignalBacktestLearner
+from alpha_trading_bot.ai.ml.sqlite_store import (
+    close_sqlite_stores,
+    get_sqlite_store,
+)
+
+
+@pytest.fixture(autouse=True)
+def _close_stores():
+    yield
+    close_sqlite_stores()
+
+
+def _create_tables(db_path: str) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE ai_signals (timestamp TEXT, provider TEXT, confidence REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE trades (timestamp TEXT, status TEXT, symbol TEXT, pnl REAL)"
+        )
+
+
+def _index_names(db_path: str) -> set:
+    with sqlite3.connect(db_path) as conn:
+        return {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+
+
+def test_store_is_shared_and_connection_reused_per_thread(tmp_path) -> None:
+    db_path = str(tmp_path / "data" / "trading_data.db")
+    store = get_sqlite_store(db_path)
+
+    assert get_sqlite_store(db_path) is store
+    conn = store.connection()
+    assert store.connection() is conn
+    assert (tmp_path / "data").is_dir()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(store.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_wal_mode_and_indexes_created_for_existing_tables(tmp_path) -> None:
+    db_path = str(tmp_path / "trading_data.db")
+    _create_tables(db_path)
+
+    conn = get_sqlite_store(db_path).connection()
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = _index_names(db_path)
+    assert "idx_ai_signals_timestamp_provider" in indexes
+    assert "idx_trades_status_timestamp_symbol" in indexes
+    # market_data 表不存在时跳过
+    assert "idx_market_data_symbol_timestamp" not in indexes
+
+    with sqlite3.connect(db_path) as writer:
+        writer.execute(
+            "CREATE TABLE market_data (timestamp TEXT, symbol TEXT, close REAL)"
+        )
+    assert get_sqlite_store(db_path).ensure_indexes() == [
+        "idx_market_data_symbol_timestamp"
+    ]
+    assert get_sqlite_store(db_path).ensure_indexes() == []
+
+
+def test_reader_transaction_does_not_block_writer(tmp_path) -> None:
+    db_path = str(tmp_path / "trading_data.db")
+    _create_tables(db_path)
+    store = get_sqlite_store(db_path)
+    store.execute(
+        "INSERT INTO trades VALUES ('2026-01-01', 'closed', 'BTC', 1.0)",
+    )
+
+    reader = store.connection()
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+
+    writer = sqlite3.connect(db_path, timeout=0.1)
+    writer.execute("INSERT INTO trades VALUES ('2026-01-02', 'closed', 'BTC', 2.0)")
+    writer.commit()
+    writer.close()
+
+    # 读事务内保持快照一致
+    assert reader.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+    reader.execute("COMMIT")
+    rows = store.query(
+        "SELECT pnl FROM trades WHERE status = :status ORDER BY timestamp",
+        {"status": "closed"},
+    )
+    assert rows == [{"pnl": 1.0}, {"pnl": 2.0}]
+
+
+def test_ml_components_use_shared_connection(tmp_path) -> None:
+    db_path = str(tmp_path / "trading_data.db")
+    manager = MLDataManager(db_path=db_path)
+    learner = SignalBacktestLearner(db_path=db_path)
+
+    assert manager.get_connection() is learner.get_connection()
+    assert manager.save_model_weights({"deepseek": 0.6, "kimi": 0.4}, source="test")
+    assert "idx_model_weights_timestamp" in _index_names(db_path)
+    assert len(get_sqlite_store(db_path).query("SELECT * FROM model_weights")) == 2
@@ -0,0 +1,126 @@
+"""持仓状态写后合并测试
+
+覆盖:
+1. 延迟保存的多次修改合并为一次写入，flush 写出最新状态
+2. 后台线程在 write_delay 内写出脏状态
+3. 保护单变化同步落盘，并带出之前延迟的交易所刷新
+4. 内容未变化时跳过写入（不刷新时间戳）
+5. 退出时 close / atexit 兜底写出
+"""
+
+import json
+import time
+
+import pytest
+
+from alpha_trading_bot.config.models import Config
+from alpha_trading_bot.core import state_persistence
+from alpha_trading_bot.core.position_manager import PositionManager
+from alpha_trading_bot.core.state_persistence import StatePersistence
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = []
+    original = state_persistence.json.dump
+
+    def counting_dump(obj, *args, **kwargs):
+        calls.append(obj)
+        return original(obj, *args, **kwargs)
+
+    monkeypatch.setattr(state_persistence.json, "dump", counting_dump)
+    return calls
+
+
+def _save(persistence, highest, flush=False, **kwargs):
+    return persistence.save_position(
+        "BTC/USDT:USDT",
+        "long",
+        0.01,
+        100000.0,
+        highest_price_since_entry=highest,
+        flush=flush,
+        **kwargs,
+    )
+
+
+def _on_disk(persistence):
+    return json.loads(persistence.state_file.read_text(encoding="utf-8"))
+
+
+def test_deferred_updates_coalesce_until_flush(tmp_path, writes):
+    persistence = StatePersistence(tmp_path, write_delay=60)
+
+    for i in range(50):
+        assert _save(persistence, 100000.0 + i)
+
+    assert writes == [] and not persistence.state_file.exists()
+    assert persistence.load_state().position.highest_price_since_entry == 100049.0
+
+    assert persistence.flush() is True
+    assert len(writes) == 1
+    assert _on_disk(persistence)["position"]["highest_price_since_entry"] == 100049.0
+    assert persistence.flush() is False
+
+
+def test_background_thread_writes_within_delay(tmp_path):
+    persistence = StatePersistence(tmp_path, write_delay=0.05)
+    _save(persistence, 100100.0)
+
+    deadline = time.monotonic() + 5
+    while not persistence.state_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert _on_disk(persistence)["position"]["highest_price_since_entry"] == 100100.0
+    assert persistence.flush() is False
+
+
+def test_protective_order_change_flushes_synchronously(tmp_path, writes):
+    manager = PositionManager(Config(), data_dir=tmp_path)
+    manager._persistence.write_delay = 60
+    manager.update_position(0.01, 100000.0, "BTC/USDT:USDT", side="long")
+    opened = len(writes)
+
+    for amount in (0.01, 0.02, 0.03):
+        manager.update_from_exchange(
+            {
+                "symbol": "BTC/USDT:USDT",
+                "side": "long",
+                "amount": amount,
+                "entry_price": 100000.0,
+            }
+        )
+    assert len(writes) == opened
+
+    manager.set_stop_order("sl-1", 99500.0)
+    position = _on_disk(manager._persistence)["position"]
+    assert len(writes) == opened + 1
+    assert position["amount"] == 0.03 and position["stop_order_id"] == "sl-1"
+
+
+def test_identical_content_skips_write(tmp_path, writes):
+    persistence = StatePersistence(tmp_path)
+    _save(persistence, 100000.0, flush=True)
+    updated_at = persistence.load_state().position.updated_at
+    total_trades = persistence.load_state().total_trades
+
+    _save(persistence, 100000.0, flush=True)
+    _save(persistence, 100000.0)
+
+    assert len(writes) == 1
+    state = persistence.load_state()
+    assert state.position.updated_at == updated_at
+    assert state.total_trades == total_trades
+    assert persistence.flush() is False
+
+
+def test_close_and_exit_hook_flush_pending_state(tmp_path):
+    persistence = StatePersistence(tmp_path / "a", write_delay=60)
+    _save(persistence, 100200.0)
+    persistence.close()
+    assert _on_disk(persistence)["position"]["highest_price_since_entry"] == 100200.0
+
+    other = StatePersistence(tmp_path / "b", write_delay=60)
+    _save(other, 100300.0)
+    state_persistence._flush_pending_at_exit()
+    assert _on_disk(other)["position"]["highest_price_since_entry"] == 100300.0
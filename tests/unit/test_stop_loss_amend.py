@@ -0,0 +1,216 @@
+"""止损原地修改（OKX amend-algos）测试
+
+覆盖:
+1. OrderService.amend_algo_order 请求参数与错误分类
+2. _update_stop_loss 优先原地修改，仅在不支持时回退为取消+新建
+3. 修改失败时保留原止损单，不产生无保护窗口
+"""
+
+import sys
+import types
+from typing import Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+
+from alpha_trading_bot.config.models import (
+    Config,
+    ExchangeConfig,
+    StopLossConfig,
+    TradingConfig,
+)
+from alpha_trading_bot.core.adaptive_bot import AdaptiveTradingBot
+
+
+def _install_fake_ccxt(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_ccxt = types.ModuleType("ccxt")
+    fake_ccxt.okx = object
+    monkeypatch.setitem(sys.modules, "ccxt", fake_ccxt)
+
+
+@pytest.mark.asyncio
+async def test_order_service_amends_stop_trigger_price(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    calls = []
+
+    class _Exchange:
+        def private_post_trade_amend_algos(self, params):
+            calls.append(params)
+            return {"code": "0", "data": [{"algoId": params["algoId"], "sCode": "0"}]}
+
+    service = OrderService(_Exchange(), "BTC/USDT:USDT")
+
+    result = await service.amend_algo_order(
+        "algo-1", "BTC/USDT:USDT", new_stop_price=62600.5
+    )
+
+    assert result == (True, "success")
+    assert calls == [
+        {
+            "instId": "BTC-USDT-SWAP",
+            "algoId": "algo-1",
+            "newSlTriggerPx": "62600.5",
+            "newSlOrdPx": "-1",
+        }
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "s_code, s_msg, expected",
+    [
+        ("51400", "Order does not exist", "already_gone"),
+        ("51000", "Parameter newSlTriggerPx not supported", "unsupported"),
+        ("51277", "SL trigger price cannot be higher than the last price", "failed"),
+    ],
+)
+async def test_order_service_classifies_amend_errors(
+    monkeypatch: pytest.MonkeyPatch, s_code: str, s_msg: str, expected: str
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    class _Exchange:
+        def private_post_trade_amend_algos(self, params):
+            return {
+                "code": "0",
+                "data": [{"algoId": params["algoId"], "sCode": s_code, "sMsg": s_msg}],
+            }
+
+    service = OrderService(_Exchange(), "BTC/USDT:USDT")
+
+    assert await service.amend_algo_order("a", "BTC/USDT:USDT", 1.0) == (
+        False,
+        expected,
+    )
+
+
+@pytest.mark.asyncio
+async def test_order_service_reports_missing_amend_endpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_ccxt(monkeypatch)
+    from alpha_trading_bot.exchange.order_service import OrderService
+
+    service = OrderService(object(), "BTC/USDT:USDT")
+
+    assert await service.amend_algo_order("a", "BTC/USDT:USDT", 1.0) == (
+        False,
+        "unsupported",
+    )
+
+
+def _make_bot() -> AdaptiveTradingBot:
+    config = Config(
+        exchange=ExchangeConfig(api_key="k", secret="s", password="p"),
+        trading=TradingConfig(test_mode=True),
+        stop_loss=StopLossConfig(
+            stop_loss_entry_based=True,
+            stop_loss_percent=0.005,
+            stop_loss_tick_tolerance=0.1,
+        ),
+    )
+    bot = AdaptiveTradingBot(config)
+    entry = 62815.5
+    bot.position_manager._position = type(
+        "P",
+        (),
+        {
+            "symbol": "BTC/USDT:USDT",
+            "side": "long",
+            "amount": 0.01,
+            "entry_price": entry,
+        },
+    )()
+    bot.position_manager._entry_price = entry
+    bot.position_manager._highest_price_since_entry = entry * 1.005
+    return bot
+
+
+def _patch_exchange(
+    bot: AdaptiveTradingBot, amend_result: Tuple[bool, str]
+) -> Tuple[AsyncMock, AsyncMock, AsyncMock]:
+    bot._get_existing_stop_order_id = AsyncMock(  # type: ignore[assignment]
+        return_value=("OLD_ALGO", 62501.4)
+    )
+    amend_mock = AsyncMock(return_value=amend_result)
+    cancel_mock = AsyncMock(return_value=(True, "success"))
+    create_mock = AsyncMock(return_value="NEW_ALGO_ID")
+    bot._exchange = type(
+        "Exch",
+        (),
+        {
+            "symbol": "BTC/USDT:USDT",
+            "amend_algo_order": amend_mock,
+            "cancel_algo_order": cancel_mock,
+        },
+    )()
+    bot._create_stop_loss_with_retry = create_mock  # type: ignore[assignment]
+    return amend_mock, cancel_mock, create_mock
+
+
+async def _tighten(bot: AdaptiveTradingBot) -> None:
+    entry = 62815.5
+    await bot._update_stop_loss(
+        current_price=entry * 1.004,
+        position_data={"side": "long", "entry_price": entry, "amount": 0.01},
+        market_data={"technical": {"atr_percent": 0.4}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_stop_loss_amends_in_place() -> None:
+    bot = _make_bot()
+    amend_mock, cancel_mock, create_mock = _patch_exchange(bot, (True, "success"))
+
+    await _tighten(bot)
+
+    amend_mock.assert_awaited_once()
+    args, kwargs = amend_mock.call_args
+    assert args == ("OLD_ALGO", "BTC/USDT:USDT")
+    assert kwargs["new_stop_price"] > 62501.4
+    cancel_mock.assert_not_called()
+    create_mock.assert_not_called()
+    assert bot.position_manager.stop_order_id == "OLD_ALGO"
+    assert bot.position_manager.last_stop_price == kwargs["new_stop_price"]
+
+
+@pytest.mark.asyncio
+async def test_update_stop_loss_falls_back_when_amend_unsupported() -> None:
+    bot = _make_bot()
+    amend_mock, cancel_mock, create_mock = _patch_exchange(bot, (False, "unsupported"))
+
+    await _tighten(bot)
+
+    amend_mock.assert_awaited_once()
+    cancel_mock.assert_awaited_once_with("OLD_ALGO", "BTC/USDT:USDT")
+    create_mock.assert_awaited_once()
+    assert bot.position_manager.stop_order_id == "NEW_ALGO_ID"
+
+
+@pytest.mark.asyncio
+async def test_update_stop_loss_keeps_old_stop_when_amend_fails() -> None:
+    bot = _make_bot()
+    amend_mock, cancel_mock, create_mock = _patch_exchange(bot, (False, "failed"))
+
+    await _tighten(bot)
+
+    amend_mock.assert_awaited_once()
+    cancel_mock.assert_not_called()
+    create_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_stop_loss_recreates_when_stop_already_gone() -> None:
+    bot = _make_bot()
+    amend_mock, cancel_mock, create_mock = _patch_exchange(bot, (False, "already_gone"))
+
+    await _tighten(bot)
+
+    cancel_mock.assert_not_called()
+    create_mock.assert_awaited_once()
+    assert bot.position_manager.stop_order_id == "NEW_ALGO_ID"
@@ -0,0 +1,170 @@
+"""交易流水测试
+
+覆盖:
+1. StatePersistence 记录交易只追加一行，最近记录从文件末尾读取
+2. 旧 trade_history.json 透明迁移；非交易数组的同名文件保持原样
+3. 残缺尾行追加前截断，损坏行读取时跳过、压缩时删除；tail 跳过损坏行后仍按时间顺序
+4. 轮转归档后 tail / count 跨归档；离线维护入口
+5. fsync 策略；环境变量大小写不敏感，未知取值回退为 interval
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from alpha_trading_bot.core import trade_journal
+from alpha_trading_bot.core.state_persistence import StatePersistence
+from alpha_trading_bot.core.trade_journal import TradeJournal
+
+
+def _record(i, **extra):
+    return {"timestamp": f"2026-01-01T00:00:{i:02d}", "type": "open", "n": i, **extra}
+
+
+def test_record_trade_appends_single_line(tmp_path):
+    persistence = StatePersistence(tmp_path)
+    for i in range(3):
+        assert persistence.record_trade("open", "BTC/USDT", "long", 0.1 * i, 60000)
+
+    lines = persistence.history_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[-1])["amount"] == pytest.approx(0.2)
+
+    recent = persistence.get_recent_trades(limit=2)
+    assert [r["amount"] for r in recent] == pytest.approx([0.1, 0.2])
+    assert persistence.get_state_summary()["history_count"] == 3
+
+
+def test_tail_reads_only_from_the_end(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_journal, "_BLOCK_SIZE", 64)
+    journal = TradeJournal(tmp_path / "trade_history.jsonl")
+    for i in range(40):
+        journal.append(_record(i, note="交易" * (i % 3)))
+
+    reads = []
+    original = trade_journal._decode
+    monkeypatch.setattr(
+        trade_journal, "_decode", lambda line: reads.append(line) or original(line)
+    )
+
+    assert [r["n"] for r in journal.tail(5)] == [35, 36, 37, 38, 39]
+    assert len(reads) == 5
+    assert [r["n"] for r in journal.tail(100)] == list(range(40))
+    assert journal.tail(0) == []
+
+
+def test_legacy_history_is_migrated(tmp_path):
+    legacy = [_record(i) for i in range(3)]
+    (tmp_path / "trade_history.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    persistence = StatePersistence(tmp_path)
+    persistence.record_trade("close", "BTC/USDT", "long", 0.1, 61000, pnl=10.0)
+
+    assert not (tmp_path / "trade_history.json").exists()
+    assert (tmp_path / "trade_history.json.migrated").exists()
+    recent = persistence.get_recent_trades(limit=10)
+    assert [r.get("n") for r in recent] == [0, 1, 2, None]
+    assert recent[-1]["pnl"] == 10.0
+
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "trade_history.json").write_text('{"trades": []}', encoding="utf-8")
+    assert (
+        TradeJournal(other / "trade_history.jsonl").migrate_legacy(
+            other / "trade_history.json"
+        )
+        == 0
+    )
+    assert (other / "trade_history.json").exists()
+
+
+def test_torn_tail_and_corrupt_lines(tmp_path):
+    path = tmp_path / "trade_history.jsonl"
+    path.write_bytes(
+        b'{"n": 0}\nnot json\n{"n": 1}\n{"n": 2, "trunc'  # 崩溃留下的残缺尾行
+    )
+    journal = TradeJournal(path)
+
+    assert [r["n"] for r in journal.tail(10)] == [0, 1]
+    journal.append({"n": 3})
+    assert [r["n"] for r in journal.iter_records()] == [0, 1, 3]
+
+    stats = journal.compact()
+    assert stats == {"kept": 3, "dropped": 0, "corrupt": 1}
+    assert path.read_bytes().count(b"\n") == 3
+    journal.append({"n": 4})
+    assert journal.count() == 4
+
+
+def test_tail_skips_corrupt_line_before_falling_back_to_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_journal, "_BLOCK_SIZE", 16)
+    journal = TradeJournal(tmp_path / "trade_history.jsonl")
+    for name in ("arch0", "arch1", "arch2"):
+        journal.append({"n": name})
+    journal.rotate()
+    for i in range(10):
+        journal.append({"n": i})
+    journal.close()
+    lines = journal.path.read_bytes().split(b"\n")
+    lines[8] = b"not json"
+    journal.path.write_bytes(b"\n".join(lines))
+
+    assert [r["n"] for r in journal.tail(3)] == [6, 7, 9]
+    assert [r["n"] for r in journal.tail(10)] == ["arch2", 0, 1, 2, 3, 4, 5, 6, 7, 9]
+
+
+def test_compact_drops_old_records(tmp_path):
+    journal = TradeJournal(tmp_path / "trade_history.jsonl")
+    now = datetime.now()
+    for days in (40, 20, 1):
+        journal.append({"timestamp": (now - timedelta(days=days)).isoformat()})
+
+    assert journal.compact(keep_days=30) == {"kept": 2, "dropped": 1, "corrupt": 0}
+    assert journal.count() == 2
+
+
+def test_rotation_keeps_tail_and_count_across_archives(tmp_path, capsys):
+    journal = TradeJournal(tmp_path / "trade_history.jsonl")
+    for i in range(5):
+        journal.append(_record(i))
+    first = journal.rotate()
+    for i in range(5, 8):
+        journal.append(_record(i))
+
+    assert first is not None and journal.archives() == [first]
+    assert [r["n"] for r in journal.tail(5)] == [3, 4, 5, 6, 7]
+    assert journal.count() == 8
+    assert journal.rotate(max_bytes=10**6) is None
+
+    journal.close()
+    assert trade_journal.main(["rotate", str(tmp_path), "--keep", "1"]) == 0
+    assert trade_journal.main(["stats", str(tmp_path)]) == 0
+    stats = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert stats["records"] == 3 and len(stats["archives"]) == 1
+
+
+@pytest.mark.parametrize(
+    "policy, interval, expected",
+    [("always", 1.0, 3), ("interval", 3600, 1), ("never", 1.0, 0)],
+)
+def test_fsync_policy(tmp_path, monkeypatch, policy, interval, expected):
+    calls = []
+    monkeypatch.setattr(trade_journal.os, "fsync", lambda fd: calls.append(fd))
+    journal = TradeJournal(tmp_path / "j.jsonl", fsync=policy, fsync_interval=interval)
+
+    for i in range(3):
+        journal.append(_record(i))
+
+    assert len(calls) == expected
+    with pytest.raises(ValueError):
+        TradeJournal(tmp_path / "j.jsonl", fsync="sometimes")
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("Always", "always"), ("bogus", "interval")]
+)
+def test_state_persistence_normalizes_fsync_env(tmp_path, monkeypatch, value, expected):
+    monkeypatch.setenv("TRADING_JOURNAL_FSYNC", value)
+    persistence = StatePersistence(tmp_path)
+    assert persistence._journal.fsync == expected
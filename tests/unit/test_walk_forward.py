@@ -0,0 +1,143 @@
+"""滚动窗口优化测试
+
+覆盖:
+1. 折切分：按步长滚动、丢弃不完整尾部
+2. 折结果按内容哈希缓存：重跑全部命中；K线追加只计算新折；搜索空间变化全部失效
+3. 稳定性检查未通过时不调用 ConfigUpdater，通过时应用最近一折参数
+4. 多进程并行与顺序运行得到相同的折集合
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from alpha_trading_bot.ai.optimizer.backtest_kernel import OHLCArrays
+from alpha_trading_bot.ai.optimizer.walk_forward import (
+    DEFAULT_SEARCH_SPACE,
+    FoldResult,
+    WalkForwardConfig,
+    WalkForwardOptimizer,
+    WalkForwardReport,
+    make_folds,
+)
+
+
+def _market(n, seed=9):
+    rnd = random.Random(seed)
+    price = 100.0
+    close = []
+    for i in range(n):
+        price *= math.exp(rnd.gauss(0, 0.004) + 0.001 * math.sin(i / 30))
+        close.append(price)
+    close = np.array(close)
+    ohlc = OHLCArrays(close, close * 1.002, close * 0.998, close)
+    directions = np.array([rnd.choice([1, -1, 0, 0, 0]) for _ in range(n)])
+    timestamps = 1_700_000_000_000 + np.arange(n) * 900_000.0
+    return ohlc, directions, timestamps
+
+
+def _pipeline(tmp_path, n, **kwargs):
+    ohlc, directions, timestamps = _market(1000)
+    config = WalkForwardConfig(
+        train_bars=300,
+        test_bars=100,
+        n_trials=4,
+        pruner="none",
+        cache_dir=str(tmp_path / "cache"),
+        **kwargs,
+    )
+    sliced = OHLCArrays(ohlc.open[:n], ohlc.high[:n], ohlc.low[:n], ohlc.close[:n])
+    return WalkForwardOptimizer(
+        sliced, directions[:n], timestamps=timestamps[:n], config=config
+    )
+
+
+def _fold(index, test_value, stop_loss):
+    return FoldResult(
+        index=index,
+        train_period=(0.0, 1.0),
+        test_period=(1.0, 2.0),
+        best_params={"stop_loss_percent": stop_loss},
+        train_value=0.03,
+        test_value=test_value,
+        trials=4,
+    )
+
+
+def test_make_folds_rolls_by_step():
+    folds = make_folds(1000, train_bars=300, test_bars=100, step_bars=100)
+
+    assert len(folds) == 7
+    assert folds[0].train == (0, 300) and folds[0].test == (300, 400)
+    assert folds[-1].test == (900, 1000)
+    assert len(make_folds(450, 300, 100, 100)) == 1
+
+
+def test_fold_results_are_cached_by_content(tmp_path):
+    first = _pipeline(tmp_path, 600).run()
+    assert len(first.folds) == 3 and first.computed == 3
+
+    again = _pipeline(tmp_path, 600).run()
+    assert again.computed == 0
+    assert [f.best_params for f in again.folds] == [f.best_params for f in first.folds]
+
+    grown = _pipeline(tmp_path, 800).run()
+    assert len(grown.folds) == 5 and grown.computed == 2
+
+    changed = _pipeline(tmp_path, 600)
+    changed.search_space = {
+        **DEFAULT_SEARCH_SPACE,
+        "stop_loss_percent": {"type": "float", "low": 0.003, "high": 0.01},
+    }
+    assert changed.run().computed == 3
+
+
+def test_report_gates_config_updater():
+    class Updater:
+        def __init__(self):
+            self.applied = []
+
+        def apply_optimized_params(self, params, reason):
+            self.applied.append(params)
+            return True
+
+    config = WalkForwardConfig(train_bars=300, test_bars=100, min_folds=3)
+    updater = Updater()
+
+    unstable = WalkForwardReport(
+        [_fold(0, -0.01, 0.004), _fold(1, -0.02, 0.012), _fold(2, 0.01, 0.002)],
+        config,
+    )
+    assert not unstable.stable
+    assert any("正收益" in r for r in unstable.instability_reasons())
+    assert any("stop_loss_percent" in r for r in unstable.instability_reasons())
+    assert unstable.apply(updater) is False and updater.applied == []
+
+    stable = WalkForwardReport(
+        [_fold(0, 0.01, 0.005), _fold(1, 0.012, 0.0055), _fold(2, 0.009, 0.006)],
+        config,
+    )
+    assert stable.stable, stable.format()
+    assert "稳定性检查: 通过" in stable.format()
+    assert stable.apply(updater) is True
+    assert updater.applied == [{"stop_loss_percent": 0.006}]
+
+
+def test_parallel_folds_match_fold_layout(tmp_path):
+    report = _pipeline(tmp_path, 600, n_workers=2).run()
+
+    assert [f.index for f in report.folds] == [0, 1, 2]
+    assert report.folds[0].test_period == (
+        1_700_000_000_000 + 300 * 900_000.0,
+        1_700_000_000_000 + 399 * 900_000.0,
+    )
+    assert all(f.trials == 4 and f.best_params for f in report.folds)
+    assert not list((tmp_path / "cache" / "studies").glob("*.db"))
+    assert _pipeline(tmp_path, 600).run().computed == 0
+
+
+def test_config_rejects_invalid_windows():
+    with pytest.raises(ValueError):
+        WalkForwardConfig(train_bars=0)
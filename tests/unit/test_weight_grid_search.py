@@ -0,0 +1,126 @@
+"""向量化权重搜索单元测试
+
+覆盖路径:
+- 充分统计量 + 矩阵评分与逐候选循环计算一致（win_rate / return / sharpe）
+- Dirichlet 与 simplex 网格候选满足和为1、最低权重约束
+- 最优解方向与性能（10万候选）
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alpha_trading_bot.ai.ml.adaptive_weight_optimizer import AdaptiveWeightOptimizer
+
+
+def _signals():
+    rows = []
+    pnls = {
+        "deepseek": [1.2, -0.4, 0.8, 0.5, -0.2, 0.9],
+        "kimi": [-0.6, 0.3, -0.8, 0.1],
+        "qwen": [0.2, 0.2, -0.1, 0.4, 0.3],
+    }
+    for provider, values in pnls.items():
+        for pnl in values:
+            rows.append({"provider": provider, "trade_status": "closed", "pnl": pnl})
+    rows.append({"provider": "kimi", "trade_status": "open", "pnl": 9.0})
+    return rows
+
+
+def _optimizer(signals, min_trades=5):
+    optimizer = AdaptiveWeightOptimizer(
+        db_path="/tmp/not-exist.db", min_trades=min_trades
+    )
+    optimizer.data_manager = SimpleNamespace(
+        get_ai_signals_with_outcomes=lambda days: signals,
+        calculate_provider_performance=lambda signals: {},
+    )
+    return optimizer
+
+
+def _reference_score(df, weights, objective):
+    closed = df[df["trade_status"] == "closed"]
+    scaled = closed["pnl"].to_numpy() * closed["provider"].map(weights).to_numpy()
+    if objective == "win_rate":
+        return sum(
+            weights[p] * (group["pnl"] > 0).mean() * len(group)
+            for p, group in closed.groupby("provider")
+        ) / len(closed)
+    if objective == "return":
+        return scaled.mean()
+    return scaled.mean() / scaled.std()
+
+
+@pytest.mark.parametrize("objective", ["win_rate", "return", "sharpe"])
+def test_matrix_scores_match_per_candidate_loop(objective) -> None:
+    df = pd.DataFrame(_signals())
+    providers, stats = AdaptiveWeightOptimizer._provider_statistics(df)
+    candidates = AdaptiveWeightOptimizer._sample_weight_candidates(
+        50, len(providers), seed=7
+    )
+
+    scores = AdaptiveWeightOptimizer._score_weight_candidates(
+        candidates, stats, objective
+    )
+
+    for row, score in zip(candidates, scores):
+        weights = dict(zip(providers, row))
+        assert score == pytest.approx(_reference_score(df, weights, objective))
+
+
+@pytest.mark.parametrize("method", ["dirichlet", "simplex"])
+def test_candidates_lie_on_floored_simplex(method) -> None:
+    candidates = AdaptiveWeightOptimizer._sample_weight_candidates(
+        500, 3, method=method, min_weight=0.1, seed=1
+    )
+
+    assert 0 < len(candidates) <= 500
+    np.testing.assert_allclose(candidates.sum(axis=1), 1.0)
+    assert candidates.min() >= 0.1 - 1e-12
+    if method == "simplex":
+        assert len(np.unique(candidates.round(9), axis=0)) == len(candidates)
+
+
+def test_grid_search_prefers_best_provider_and_is_deterministic() -> None:
+    optimizer = _optimizer(_signals())
+
+    weights, score = optimizer.optimize_weights_grid_search(
+        n_iterations=2000, objective="return", seed=3
+    )
+    again, _ = optimizer.optimize_weights_grid_search(
+        n_iterations=2000, objective="return", seed=3
+    )
+
+    assert weights == again
+    assert max(weights, key=weights.get) == "deepseek"
+    assert weights["kimi"] == pytest.approx(0.05, abs=0.02)
+    assert sum(weights.values()) == pytest.approx(1.0)
+    assert 0 < score
+
+
+def test_grid_search_falls_back_without_closed_signals() -> None:
+    signals = [
+        {"provider": p, "trade_status": "open", "pnl": 0.0}
+        for p in ["deepseek", "kimi"] * 5
+    ]
+    optimizer = _optimizer(signals)
+
+    weights, score = optimizer.optimize_weights_grid_search()
+
+    assert score == 0.0
+    assert sum(weights.values()) == pytest.approx(1.0)
+
+
+def test_hundred_thousand_candidates_under_a_second() -> None:
+    optimizer = _optimizer(_signals() * 200)
+
+    started = time.perf_counter()
+    weights, _ = optimizer.optimize_weights_grid_search(
+        n_iterations=100_000, objective="sharpe", seed=0
+    )
+
+    assert time.perf_counter() - started < 1.0
+    assert set(weights) == {"deepseek", "kimi", "qwen"}